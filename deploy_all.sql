@@ -80,10 +80,33 @@ CREATE OR REPLACE GIT REPOSITORY SNOWFLAKE_EXAMPLE.DEMO_REPO.sfe_simple_stream_r
 -- STEP 2: Deploy Pipeline from Git
 -- ============================================================================
 
+-- Transformation engine for STAGING and ANALYTICS:
+--   'TASKS'          stream + tasks + stored procedure (default)
+--   'DYNAMIC_TABLES' STG_BADGE_EVENTS / FCT_ACCESS_EVENTS as incremental dynamic tables
+SET TRANSFORM_MODE = 'TASKS';
+-- Target lag for FCT_ACCESS_EVENTS when TRANSFORM_MODE = 'DYNAMIC_TABLES'
+SET DT_TARGET_LAG = '1 minute';
+
 EXECUTE IMMEDIATE FROM @SNOWFLAKE_EXAMPLE.DEMO_REPO.sfe_simple_stream_repo/branches/main/sql/02_core/01_core.sql;
 EXECUTE IMMEDIATE FROM @SNOWFLAKE_EXAMPLE.DEMO_REPO.sfe_simple_stream_repo/branches/main/sql/03_transformations/02_analytics.sql;
-EXECUTE IMMEDIATE FROM @SNOWFLAKE_EXAMPLE.DEMO_REPO.sfe_simple_stream_repo/branches/main/sql/03_transformations/03_tasks.sql;
+
+EXECUTE IMMEDIATE $$
+DECLARE
+  transform_dir VARCHAR DEFAULT '@SNOWFLAKE_EXAMPLE.DEMO_REPO.sfe_simple_stream_repo/branches/main/sql/03_transformations/';
+  transform_mode VARCHAR;
+BEGIN
+  transform_mode := COALESCE(GETVARIABLE('TRANSFORM_MODE'), 'TASKS');
+  IF (transform_mode = 'DYNAMIC_TABLES') THEN
+    EXECUTE IMMEDIATE 'EXECUTE IMMEDIATE FROM ' || transform_dir || '05_dynamic_tables.sql';
+  ELSE
+    EXECUTE IMMEDIATE 'EXECUTE IMMEDIATE FROM ' || transform_dir || '03_tasks.sql';
+  END IF;
+  RETURN 'Transformation mode: ' || transform_mode;
+END;
+$$;
+
 EXECUTE IMMEDIATE FROM @SNOWFLAKE_EXAMPLE.DEMO_REPO.sfe_simple_stream_repo/branches/main/sql/04_monitoring/04_monitoring.sql;
+EXECUTE IMMEDIATE FROM @SNOWFLAKE_EXAMPLE.DEMO_REPO.sfe_simple_stream_repo/branches/main/sql/04_monitoring/06_dashboard_snapshot.sql;
 
 -- ============================================================================
 -- METADATA: Store Deployment Info (Silent - No Output)
@@ -114,14 +137,14 @@ WITH object_counts AS (
 
   UNION ALL
 
-  SELECT 'Tables', COUNT(*), 7
+  SELECT 'Tables', COUNT(*), 14
   FROM SNOWFLAKE_EXAMPLE.INFORMATION_SCHEMA.TABLES
   WHERE TABLE_SCHEMA IN ('RAW_INGESTION', 'STAGING_LAYER', 'ANALYTICS_LAYER')
     AND TABLE_TYPE = 'BASE TABLE'
 
   UNION ALL
 
-  SELECT 'Views', COUNT(*), 7
+  SELECT 'Views', COUNT(*), 17
   FROM SNOWFLAKE_EXAMPLE.INFORMATION_SCHEMA.VIEWS
   WHERE TABLE_SCHEMA = 'RAW_INGESTION'
 )
@@ -140,11 +163,12 @@ SELECT
   IFF(COUNT(*) = 1, 'PASS', 'FAIL') AS status
 FROM TABLE(RESULT_SCAN(LAST_QUERY_ID()));
 
+-- Tasks: 3 in TASKS mode, 1 (dashboard snapshot) in DYNAMIC_TABLES mode
 SHOW TASKS IN SCHEMA SNOWFLAKE_EXAMPLE.RAW_INGESTION;
 SELECT
   'Tasks' AS component,
-  COUNT(*) || ' / 2' AS count,
-  IFF(COUNT(*) = 2, 'PASS', 'FAIL') AS status
+  COUNT(*) || ' / ' || IFF($TRANSFORM_MODE = 'DYNAMIC_TABLES', 1, 3) AS count,
+  IFF(COUNT(*) = IFF($TRANSFORM_MODE = 'DYNAMIC_TABLES', 1, 3), 'PASS', 'FAIL') AS status
 FROM TABLE(RESULT_SCAN(LAST_QUERY_ID()));
 
 -- ============================================================================
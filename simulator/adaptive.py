@@ -0,0 +1,212 @@
+"""
+Adaptive Ingest - AIMD batch size and in-flight limit for a streaming channel
+
+Author: SE Community
+Purpose: Tune batch size and the number of uncommitted batches continuously
+         from measured append latency and the channel's committed offset,
+         instead of a fixed batch size that underfills or overwhelms
+
+USAGE:
+    from adaptive import AdaptiveChannelSink
+    from event_stream import EventStream, sample_event_source
+
+    with StreamingSession(config) as session:
+        sink = AdaptiveChannelSink(session, target_latency_ms=200)
+        EventStream(sample_event_source(100_000), sink, max_buffered=20_000).run()
+        print(sink.metrics())
+
+CONTROL LOOP (AIMD, as in TCP congestion control):
+    slow start until the first decrease, each append under target doubles
+               the batch size (reaches a useful size in a few batches)
+    increase   afterwards each append under target_latency_ms adds
+               batch_increase rows; every max_in_flight such appends add one
+               in-flight batch
+    decrease   append latency over target, a wait for commits longer than the
+               target, or an append error halves both (at most once per
+               target-latency window, so one burst of slow appends counts once)
+    in flight  batches whose end offset the server has not committed yet
+               (get_latest_committed_offset_token); at the limit, write() waits
+
+Offset tokens are the running row count of this sink, so the committed offset
+also tells how many rows are durable.
+
+Try it without an account: python tools/bench_adaptive.py
+"""
+
+import statistics
+import time
+from collections import deque
+from typing import Any, Dict, List, Optional
+
+from event_stream import Event, Sink
+
+
+class AimdController:
+    """Additive-increase / multiplicative-decrease of batch size and in-flight limit."""
+
+    def __init__(self, batch_size: int = 100, min_batch_size: int = 10, max_batch_size: int = 10_000,
+                 batch_increase: int = 100, max_in_flight: int = 2, min_in_flight: int = 1,
+                 in_flight_limit: int = 16, decrease_factor: float = 0.5,
+                 target_latency_ms: float = 200.0, slow_start: bool = True):
+        self.batch_size = batch_size
+        self.min_batch_size = min_batch_size
+        self.max_batch_size = max_batch_size
+        self.batch_increase = batch_increase
+        self.max_in_flight = max_in_flight
+        self.min_in_flight = min_in_flight
+        self.in_flight_limit = in_flight_limit
+        self.decrease_factor = decrease_factor
+        self.target_latency_ms = target_latency_ms
+        self.slow_start = slow_start
+        self.increases = 0
+        self.decreases = 0
+        self.last_decrease_reason: Optional[str] = None
+        self._window = 0
+        self._last_decrease = float("-inf")
+
+    def on_success(self, latency_ms: float):
+        if latency_ms > self.target_latency_ms:
+            self.on_congestion("append latency")
+            return
+        if self.slow_start and self.decreases == 0:
+            self.batch_size = min(self.max_batch_size, self.batch_size * 2)
+        else:
+            self.batch_size = min(self.max_batch_size, self.batch_size + self.batch_increase)
+        self._window += 1
+        if self._window >= self.max_in_flight:
+            self.max_in_flight = min(self.in_flight_limit, self.max_in_flight + 1)
+            self._window = 0
+        self.increases += 1
+
+    def on_congestion(self, reason: str):
+        now = time.monotonic()
+        if (now - self._last_decrease) * 1000 < self.target_latency_ms:
+            return
+        self._last_decrease = now
+        self.batch_size = max(self.min_batch_size, int(self.batch_size * self.decrease_factor))
+        self.max_in_flight = max(self.min_in_flight, int(self.max_in_flight * self.decrease_factor))
+        self._window = 0
+        self.decreases += 1
+        self.last_decrease_reason = reason
+
+
+class AdaptiveChannelSink(Sink):
+    """ChannelSink that sizes its own batches (preferred_batch_size) and limits uncommitted batches."""
+
+    def __init__(self, session, channel_name: Optional[str] = None,
+                 controller: Optional[AimdController] = None, target_latency_ms: float = 200.0,
+                 commit_timeout: float = 30.0, poll_interval: float = 0.005):
+        self.session = session
+        self.channel_name = channel_name
+        self.controller = controller or AimdController(target_latency_ms=target_latency_ms)
+        self.commit_timeout = commit_timeout
+        self.poll_interval = poll_interval
+        self.batches = 0
+        self.commit_waits = 0
+        self._in_flight: deque = deque()  # (end_offset, appended_at)
+        self._append_ms: deque = deque(maxlen=500)
+        self._commit_ms: deque = deque(maxlen=500)
+        self._history: deque = deque(maxlen=10_000)
+        self.committed_offset = self._read_committed()
+        self.appended_offset = self.committed_offset
+
+    @property
+    def preferred_batch_size(self) -> int:
+        return self.controller.batch_size
+
+    def _read_committed(self) -> int:
+        token = self.session.committed_offset(self.channel_name)
+        return int(token) if token else 0
+
+    def _refresh_committed(self):
+        self.committed_offset = self._read_committed()
+        now = time.monotonic()
+        while self._in_flight and self._in_flight[0][0] <= self.committed_offset:
+            _, appended_at = self._in_flight.popleft()
+            self._commit_ms.append((now - appended_at) * 1000)
+
+    def _wait_for_commits(self, max_in_flight: int, timeout: float) -> float:
+        """Wait until at most max_in_flight batches are uncommitted; returns seconds waited."""
+        started = time.monotonic()
+        self._refresh_committed()
+        while len(self._in_flight) > max_in_flight:
+            if time.monotonic() - started > timeout:
+                raise TimeoutError(
+                    f"{self.appended_offset - self.committed_offset} rows not committed after {timeout:.0f}s"
+                )
+            time.sleep(self.poll_interval)
+            self._refresh_committed()
+        return time.monotonic() - started
+
+    def write(self, rows: List[Event]):
+        controller = self.controller
+        waited = self._wait_for_commits(controller.max_in_flight - 1, self.commit_timeout)
+        if waited > 0:
+            self.commit_waits += 1
+            if waited * 1000 > controller.target_latency_ms:
+                controller.on_congestion("commit backlog")
+
+        end_offset = self.appended_offset + len(rows)
+        started = time.perf_counter()
+        try:
+            self.session.append_rows(rows, self.channel_name, offset_token=str(end_offset))
+        except Exception:
+            controller.on_congestion("append error")
+            raise
+        latency_ms = (time.perf_counter() - started) * 1000
+
+        self.appended_offset = end_offset
+        self._in_flight.append((end_offset, time.monotonic()))
+        self._append_ms.append(latency_ms)
+        self.batches += 1
+        controller.on_success(latency_ms)
+        self._history.append({
+            "batch": self.batches,
+            "rows": len(rows),
+            "append_ms": round(latency_ms, 1),
+            "batch_size": controller.batch_size,
+            "max_in_flight": controller.max_in_flight,
+            "in_flight": len(self._in_flight),
+        })
+
+    def flush(self):
+        """Wait until every appended row is committed."""
+        self._wait_for_commits(0, self.commit_timeout)
+
+    def close(self):
+        self.flush()
+        self.session.close_channel(self.channel_name)
+
+    @property
+    def history(self) -> List[Dict[str, Any]]:
+        """Per-batch trace of the chosen parameters (last 10,000 batches)."""
+        return list(self._history)
+
+    def metrics(self) -> Dict[str, Any]:
+        """Chosen parameters and observed latencies (for metrics output)."""
+        controller = self.controller
+        return {
+            "batch_size": controller.batch_size,
+            "max_in_flight": controller.max_in_flight,
+            "in_flight": len(self._in_flight),
+            "batches": self.batches,
+            "appended_offset": self.appended_offset,
+            "committed_offset": self.committed_offset,
+            "append_p50_ms": _percentile(self._append_ms, 50),
+            "append_p95_ms": _percentile(self._append_ms, 95),
+            "commit_p50_ms": _percentile(self._commit_ms, 50),
+            "commit_p95_ms": _percentile(self._commit_ms, 95),
+            "commit_waits": self.commit_waits,
+            "increases": controller.increases,
+            "decreases": controller.decreases,
+            "last_decrease_reason": controller.last_decrease_reason,
+            "target_latency_ms": controller.target_latency_ms,
+        }
+
+
+def _percentile(values, pct: int) -> Optional[float]:
+    if not values:
+        return None
+    if len(values) == 1:
+        return round(values[0], 1)
+    return round(statistics.quantiles(values, n=100, method="inclusive")[pct - 1], 1)
@@ -0,0 +1,341 @@
+"""
+Anomaly Detection - streaming security and reader-health checks on badge events
+
+Author: SE Community
+Purpose: Flag impossible travel, tailgating (rapid repeat entries) and reader
+         signal degradation while events flow to Snowflake, with fixed-size
+         state per badge and per reader
+
+USAGE:
+    from anomaly import AnomalyDetector, DetectingSink
+    from event_stream import ChannelSink, EventStream, MemorySink
+
+    detector = AnomalyDetector(site_transit_seconds=900)
+    alerts = MemorySink()     # send_events.py --detect: a channel on sfe_badge_alerts_pipe
+    EventStream(source, DetectingSink(ChannelSink(session), detector, alerts)).run()
+    print(detector.metrics())
+
+    # Without a pipeline
+    for alert in detector.observe(event):
+        print(alert["alert_type"], alert["detail"])
+
+RULES:
+    IMPOSSIBLE_TRAVEL   a badge is seen in another zone sooner than the minimum
+                        transit time: zone_transit_seconds within a site,
+                        site_transit_seconds between sites (HIGH across sites)
+    TAILGATING          repeat_entries or more entries by one badge at one zone
+                        within tailgate_window_seconds (badge passback)
+    SIGNAL_DEGRADATION  a reader's rolling average signal (EWMA) falls below
+                        degraded_dbm, the WEAK bucket of the PIPE, after
+                        min_reader_samples scans; it re-arms above recovered_dbm
+
+    Each badge raises a rule at most once per cooldown_seconds.
+
+STATE:
+    per badge    one tuple: last zone, site and time, last entry zone and
+                 time, last alert times. Badges idle for longer than every
+                 window are swept, so memory follows the active badges.
+    tailgating   count-min sketch of entries per (badge, zone) over two
+                 tumbling windows (sliding-window estimate). Its size is fixed
+                 for any number of badges; it can only overestimate, and a hit
+                 also needs the badge's last entry at the same zone inside the
+                 window.
+    per reader   EWMA, sample count and degraded flag
+
+Event time drives every window, so a replayed file raises the same alerts as
+the live run. Late events (older than the badge's last event) update the
+reader average only.
+
+Alerts are dicts with the columns of RAW_INGESTION.BADGE_ALERTS.
+
+Benchmark: python tools/bench_anomaly.py
+"""
+
+from array import array
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from event_stream import DEFAULT_SITE_ID, Event, Sink
+
+Alert = Dict[str, Any]
+
+IMPOSSIBLE_TRAVEL = "IMPOSSIBLE_TRAVEL"
+TAILGATING = "TAILGATING"
+SIGNAL_DEGRADATION = "SIGNAL_DEGRADATION"
+ALERT_TYPES = (IMPOSSIBLE_TRAVEL, TAILGATING, SIGNAL_DEGRADATION)
+
+ENTRY_DIRECTIONS = ("entry", "ENTRY")
+NEVER = float("-inf")
+
+
+def event_seconds(value) -> float:
+    """Epoch seconds of an event_timestamp (ISO string, datetime or number); naive means UTC."""
+    if isinstance(value, str):
+        if value.endswith("Z"):
+            value = value[:-1] + "+00:00"
+        value = datetime.fromisoformat(value)
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return value.timestamp()
+    return float(value)
+
+
+class WindowedCountMin:
+    """Count-min sketch of the last window_seconds: current + weighted previous tumbling window."""
+
+    def __init__(self, window_seconds: float, width: int = 1 << 18, depth: int = 4):
+        if width & (width - 1):
+            raise ValueError("width must be a power of two")
+        self.window_seconds = window_seconds
+        self.width = width
+        self.depth = depth
+        self._mask = width - 1
+        self._offsets = [row * width for row in range(depth)]
+        self._window: Optional[int] = None
+        self._current = self._empty()
+        self._previous = self._empty()
+
+    def _empty(self) -> array:
+        return array("I", bytes(4 * self.width * self.depth))
+
+    @property
+    def nbytes(self) -> int:
+        return 2 * 4 * self.width * self.depth
+
+    def add(self, key, t: float) -> float:
+        """Count key at time t; return its estimated count over the last window_seconds."""
+        position = t / self.window_seconds
+        window = int(position)
+        if self._window is None or window > self._window:
+            if self._window is not None and window == self._window + 1:
+                self._previous = self._current
+            else:
+                self._previous = self._empty()
+            self._current = self._empty()
+            self._window = window
+        elif window < self._window - 1:
+            return 0.0  # Older than both windows
+
+        # Double hashing: one index per row from a single 64-bit hash
+        h = hash(key) & 0xFFFFFFFFFFFFFFFF
+        h1, h2 = h & 0xFFFFFFFF, (h >> 32) | 1
+        mask = self._mask
+        if window < self._window:
+            counts, other = self._previous, None
+        else:
+            counts, other = self._current, self._previous
+        count = other_count = 0xFFFFFFFF
+        for offset in self._offsets:
+            i = offset + (h1 & mask)
+            h1 += h2
+            value = counts[i] + 1
+            counts[i] = value
+            if value < count:
+                count = value
+            if other is not None and other[i] < other_count:
+                other_count = other[i]
+        if other is None:
+            return float(count)
+        return count + other_count * (1.0 - (position - window))
+
+
+class AnomalyDetector:
+    """Impossible travel, tailgating and signal degradation over a stream of badge events."""
+
+    def __init__(self, zone_transit_seconds: float = 2.0, site_transit_seconds: float = 900.0,
+                 transit_seconds: Optional[Callable[[str, str], Optional[float]]] = None,
+                 repeat_entries: int = 3, tailgate_window_seconds: float = 60.0,
+                 degraded_dbm: float = -80.0, recovered_dbm: float = -75.0,
+                 min_reader_samples: int = 50, signal_alpha: float = 0.05,
+                 cooldown_seconds: float = 300.0, sketch_width: int = 1 << 18, sketch_depth: int = 4):
+        """transit_seconds(from_zone, to_zone) overrides the site rule for a zone pair (None: use it)."""
+        self.zone_transit_seconds = zone_transit_seconds
+        self.site_transit_seconds = site_transit_seconds
+        self.transit_seconds = transit_seconds
+        self.repeat_entries = repeat_entries
+        self.tailgate_window_seconds = tailgate_window_seconds
+        self.degraded_dbm = degraded_dbm
+        self.recovered_dbm = recovered_dbm
+        self.min_reader_samples = min_reader_samples
+        self.signal_alpha = signal_alpha
+        self.cooldown_seconds = cooldown_seconds
+        # A badge idle this long can no longer take part in any rule
+        self.horizon_seconds = max(zone_transit_seconds, site_transit_seconds,
+                                   tailgate_window_seconds, cooldown_seconds)
+
+        self.entries = WindowedCountMin(tailgate_window_seconds, sketch_width, sketch_depth)
+        # badge_id -> (zone_id, site_id, t, entry_zone_id, entry_t, travel_alert_t, tailgate_alert_t)
+        self._badges: Dict[str, tuple] = {}
+        # reader_id -> [ewma_dbm, samples, degraded]
+        self._readers: Dict[str, list] = {}
+        self._next_sweep: Optional[float] = None
+
+        self.events = 0
+        self.late_events = 0
+        self.swept_badges = 0
+        self.alert_counts = {alert_type: 0 for alert_type in ALERT_TYPES}
+
+    def observe(self, event: Event) -> List[Alert]:
+        """Alerts raised by one event (usually none)."""
+        return self.observe_batch((event,))
+
+    def observe_batch(self, events: Iterable[Event]) -> List[Alert]:
+        """Alerts raised by a batch of events, in event order."""
+        alerts: List[Alert] = []
+        badges, readers = self._badges, self._readers
+        alpha, degraded_dbm, recovered_dbm = self.signal_alpha, self.degraded_dbm, self.recovered_dbm
+        min_samples, cooldown = self.min_reader_samples, self.cooldown_seconds
+        window, repeat_entries = self.tailgate_window_seconds, self.repeat_entries
+        count_entry = self.entries.add
+
+        for event in events:
+            self.events += 1
+            t = event_seconds(event["event_timestamp"])
+            zone = event["zone_id"]
+            if self._next_sweep is None:
+                self._next_sweep = t + self.horizon_seconds
+            elif t >= self._next_sweep:
+                self._sweep(t)
+
+            # Reader health: rolling average signal
+            signal = event.get("signal_strength")
+            if signal is not None and signal > -999:
+                reader = readers.get(event["reader_id"])
+                if reader is None:
+                    readers[event["reader_id"]] = [float(signal), 1, False]
+                else:
+                    reader[0] += alpha * (signal - reader[0])
+                    reader[1] += 1
+                    if reader[2]:
+                        reader[2] = reader[0] < recovered_dbm
+                    elif reader[0] < degraded_dbm and reader[1] >= min_samples:
+                        reader[2] = True
+                        alerts.append(self._alert(
+                            SIGNAL_DEGRADATION, "LOW", event, t, reader[0],
+                            f"Average signal {reader[0]:.1f} dBm over the last ~{round(1 / alpha)} scans "
+                            f"(WEAK below {degraded_dbm:.0f} dBm)", badge=False,
+                        ))
+
+            badge = event["badge_id"]
+            site = event.get("site_id") or DEFAULT_SITE_ID
+            is_entry = event.get("direction") in ENTRY_DIRECTIONS
+            state = badges.get(badge)
+            if state is None:
+                badges[badge] = (zone, site, t, zone if is_entry else None, t if is_entry else NEVER, NEVER, NEVER)
+                if is_entry:
+                    count_entry((badge, zone), t)
+                continue
+
+            last_zone, last_site, last_t, entry_zone, entry_t, travel_at, tailgate_at = state
+            if t < last_t:
+                self.late_events += 1
+                continue
+
+            if zone != last_zone and t - travel_at >= cooldown:
+                gap = t - last_t
+                minimum = self._min_transit(last_zone, last_site, zone, site)
+                if gap < minimum:
+                    travel_at = t
+                    alerts.append(self._alert(
+                        IMPOSSIBLE_TRAVEL, "HIGH" if site != last_site else "MEDIUM", event, t, gap,
+                        f"{last_zone} -> {zone} in {gap:.1f}s (minimum {minimum:.0f}s)",
+                    ))
+
+            if is_entry:
+                estimate = count_entry((badge, zone), t)
+                if (estimate >= repeat_entries and entry_zone == zone and t - entry_t <= window
+                        and t - tailgate_at >= cooldown):
+                    tailgate_at = t
+                    alerts.append(self._alert(
+                        TAILGATING, "MEDIUM", event, t, estimate,
+                        f"~{estimate:.0f} entries at {zone} within {window:.0f}s",
+                    ))
+                entry_zone, entry_t = zone, t
+
+            badges[badge] = (zone, site, t, entry_zone, entry_t, travel_at, tailgate_at)
+
+        for alert in alerts:
+            self.alert_counts[alert["alert_type"]] += 1
+        return alerts
+
+    def _min_transit(self, from_zone: str, from_site: str, to_zone: str, to_site: str) -> float:
+        if self.transit_seconds is not None:
+            minimum = self.transit_seconds(from_zone, to_zone)
+            if minimum is not None:
+                return minimum
+        return self.site_transit_seconds if from_site != to_site else self.zone_transit_seconds
+
+    def _sweep(self, now: float):
+        """Forget badges idle for longer than every window."""
+        cutoff = now - self.horizon_seconds
+        stale = [badge for badge, state in self._badges.items() if state[2] < cutoff]
+        for badge in stale:
+            del self._badges[badge]
+        self.swept_badges += len(stale)
+        self._next_sweep = now + self.horizon_seconds
+
+    def _alert(self, alert_type: str, severity: str, event: Event, t: float, metric_value: float,
+               detail: str, badge: bool = True) -> Alert:
+        timestamp = event["event_timestamp"]
+        return {
+            "alert_type": alert_type,
+            "severity": severity,
+            "site_id": event.get("site_id") or DEFAULT_SITE_ID,
+            "zone_id": event["zone_id"],
+            "reader_id": event["reader_id"],
+            "badge_id": event["badge_id"] if badge else None,
+            "user_id": event.get("user_id") if badge else None,
+            "event_timestamp": timestamp if isinstance(timestamp, str)
+            else datetime.fromtimestamp(t, timezone.utc).isoformat(),
+            "metric_value": round(float(metric_value), 2),
+            "detail": detail,
+            "detected_time": datetime.now(timezone.utc).isoformat(),
+        }
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "events": self.events,
+            "late_events": self.late_events,
+            "alerts": sum(self.alert_counts.values()),
+            **{alert_type.lower(): count for alert_type, count in self.alert_counts.items()},
+            "badges_tracked": len(self._badges),
+            "swept_badges": self.swept_badges,
+            "readers_tracked": len(self._readers),
+            "degraded_readers": sum(1 for reader in self._readers.values() if reader[2]),
+            "sketch_bytes": self.entries.nbytes,
+        }
+
+
+class DetectingSink(Sink):
+    """Run the detector over every batch, then pass it on; alerts go to alert_sink.
+
+    Wraps any sink (ChannelSink, SiteRoutingSink, AdaptiveChannelSink, ...).
+    Wrap the routing sink rather than one site's sink, so that travel between
+    sites is seen.
+    """
+
+    def __init__(self, sink: Sink, detector: AnomalyDetector, alert_sink: Sink):
+        self.sink = sink
+        self.detector = detector
+        self.alert_sink = alert_sink
+        self.alerts_written = 0
+
+    @property
+    def preferred_batch_size(self) -> Optional[int]:
+        return getattr(self.sink, "preferred_batch_size", None)
+
+    def write(self, rows: List[Event]):
+        alerts = self.detector.observe_batch(rows)
+        self.sink.write(rows)
+        if alerts:
+            self.alert_sink.write(alerts)
+            self.alerts_written += len(alerts)
+
+    def flush(self):
+        self.sink.flush()
+        self.alert_sink.flush()
+
+    def close(self):
+        self.sink.close()
+        self.alert_sink.close()
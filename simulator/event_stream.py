@@ -0,0 +1,444 @@
+"""
+Event Stream - embeddable producer pipeline: source -> transforms -> sink
+
+Author: SE Community
+Purpose: One high-throughput path for the simulator, load tests, replay and
+         reader gateways, without prints or sys.exit
+
+USAGE:
+    from event_stream import EventStream, sample_event_source, ChannelSink, JsonlSink, MemorySink
+    from streaming_session import StreamingSession
+
+    # Simulator: 10,000 live events to Snowflake
+    with StreamingSession(config) as session:
+        stats = EventStream(sample_event_source(10_000), ChannelSink(session)).run()
+
+    # Replay a capture file through a transform into a local file
+    EventStream(read_jsonl("capture.jsonl"), JsonlSink("out.jsonl"),
+                transforms=[drop_weak_signals]).run()
+
+    # Tests: no network
+    sink = MemorySink()
+    EventStream(sample_event_source(100), sink).run()
+    assert len(sink.rows) == 100
+
+    # 40 sites, one channel per site
+    layout = SiteLayout.generate(40, zones_per_site=10, readers_per_zone=2)
+    with StreamingSession(config) as session:
+        sink = SiteRoutingSink(lambda site_id: ChannelSink(session, f"{session.default_channel}_{site_id}"))
+        EventStream(sample_event_source(100_000, layout=layout), sink).run()
+
+PIPELINE:
+    source      any iterable of event dicts (generator, file reader, socket reader)
+    transforms  callables event -> event, or None to drop the event
+    buffer      bounded queue between the producer thread and the sink; when it
+                is full the source blocks (backpressure), so memory stays flat
+    sink        receives batches of up to batch_size rows (or the sink's own
+                preferred_batch_size, see adaptive.py); a partial batch is
+                written after flush_interval seconds, and everything buffered is
+                written and flushed before run() returns
+
+SITES:
+    site -> zones -> readers (SiteLayout). DEFAULT_LAYOUT is the single seeded
+    site (SITE-HQ with the five ZONE_READER_MAP zones); SiteLayout.generate()
+    builds SITE-001..SITE-nnn with ids that
+    ANALYTICS_LAYER.sfe_seed_sites() creates in DIM_SITES / DIM_ZONES.
+    SiteRoutingSink splits batches by site_id into one sink (channel) per site.
+"""
+
+import json
+import queue
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+Event = Dict[str, Any]
+Transform = Callable[[Event], Optional[Event]]
+
+# Sample data pools (match the seeded dimensions in sql/02_core/01_core.sql)
+BADGE_IDS = [f"BADGE-{str(i).zfill(4)}" for i in range(1, 51)]
+USER_IDS = ["USR-001", "USR-002", "USR-003", "USR-004", "USR-005"]
+ZONE_READER_MAP = {
+    "ZONE-LOBBY-1": "RDR-101",
+    "ZONE-OFFICE-2A": "RDR-201",
+    "ZONE-SERVER-B1": "RDR-B101",
+    "ZONE-CONF-3B": "RDR-301",
+    "ZONE-PARKING-1": "RDR-P01"
+}
+DIRECTIONS = ["entry", "exit"]
+SIGNAL_STRENGTH_RANGE = (-85, -30)  # dBm, inclusive
+DEFAULT_SITE_ID = "SITE-HQ"  # RAW_BADGE_EVENTS.site_id when an event has none
+MAX_GENERATED = 999  # Sites per layout and zones per site (3-digit ids)
+
+_END = object()
+
+
+# ============================================================================
+# Sites
+# ============================================================================
+
+class SiteLayout:
+    """Sites -> zones -> readers that sample events are drawn from."""
+
+    def __init__(self, sites: Dict[str, Dict[str, List[str]]]):
+        if not sites or not all(sites.values()):
+            raise ValueError("A layout needs at least one site, and every site at least one zone")
+        self.sites = sites
+        # Flat (site_id, zone_id, readers) list: one random.choice per event
+        self.zones = [
+            (site_id, zone_id, readers)
+            for site_id, zones in sites.items()
+            for zone_id, readers in zones.items()
+        ]
+
+    @classmethod
+    def generate(cls, sites: int, zones_per_site: int = 10, readers_per_zone: int = 2) -> "SiteLayout":
+        """SITE-001..: zones SITE-001-Z001.., readers SITE-001-Z001-R1.. (ids of sfe_seed_sites())."""
+        if not (1 <= sites <= MAX_GENERATED and 1 <= zones_per_site <= MAX_GENERATED and readers_per_zone >= 1):
+            raise ValueError(f"sites and zones_per_site must be 1..{MAX_GENERATED}, readers_per_zone >= 1")
+        layout = {}
+        for s in range(1, sites + 1):
+            site_id = f"SITE-{s:03d}"
+            layout[site_id] = {
+                f"{site_id}-Z{z:03d}": [f"{site_id}-Z{z:03d}-R{r}" for r in range(1, readers_per_zone + 1)]
+                for z in range(1, zones_per_site + 1)
+            }
+        return cls(layout)
+
+    @property
+    def site_ids(self) -> List[str]:
+        return list(self.sites)
+
+    def only(self, site_id: str) -> "SiteLayout":
+        """The layout of one site (for one ingest process per site)."""
+        if site_id not in self.sites:
+            raise ValueError(f"Unknown site {site_id} (layout has {len(self.sites)} sites)")
+        return SiteLayout({site_id: self.sites[site_id]})
+
+
+DEFAULT_LAYOUT = SiteLayout({
+    DEFAULT_SITE_ID: {zone_id: [reader_id] for zone_id, reader_id in ZONE_READER_MAP.items()}
+})
+
+
+# ============================================================================
+# Sources
+# ============================================================================
+
+def sample_event(event_time: datetime, layout: SiteLayout = DEFAULT_LAYOUT) -> Event:
+    """One random badge scan at event_time (schema of the PIPE transformation)."""
+    site_id, zone_id, readers = random.choice(layout.zones)
+    return {
+        "site_id": site_id,
+        "badge_id": random.choice(BADGE_IDS),
+        "user_id": random.choice(USER_IDS),
+        "zone_id": zone_id,
+        "reader_id": random.choice(readers),
+        "event_timestamp": event_time.isoformat(),
+        "signal_strength": random.randint(*SIGNAL_STRENGTH_RANGE),
+        "direction": random.choice(DIRECTIONS)
+    }
+
+
+def sample_event_source(count: Optional[int] = None, rate: Optional[float] = None,
+                        layout: SiteLayout = DEFAULT_LAYOUT) -> Iterator[Event]:
+    """Live badge scans stamped with the current time; endless when count is None.
+
+    rate limits the source to that many events per second.
+    """
+    produced = 0
+    started = time.monotonic()
+    while count is None or produced < count:
+        if rate:
+            ahead = produced / rate - (time.monotonic() - started)
+            if ahead > 0:
+                time.sleep(ahead)
+        yield sample_event(datetime.now(timezone.utc), layout)
+        produced += 1
+
+
+def read_jsonl(path) -> Iterator[Event]:
+    """Replay events from a JSONL file (one event object per line)."""
+    with open(path, 'r') as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+# ============================================================================
+# Sinks
+# ============================================================================
+
+class Sink:
+    """Destination for batches. write() may buffer; flush() makes rows durable."""
+
+    def write(self, rows: List[Event]):
+        raise NotImplementedError
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.flush()
+
+
+class ChannelSink(Sink):
+    """Snowpipe Streaming channel via a StreamingSession (session owned by the caller)."""
+
+    def __init__(self, session, channel_name: Optional[str] = None):
+        self.session = session
+        self.channel_name = channel_name
+
+    def write(self, rows: List[Event]):
+        self.session.append_rows(rows, self.channel_name)
+
+    def close(self):
+        # Closing the channel waits for the SDK to flush its buffer
+        self.session.close_channel(self.channel_name)
+
+
+class SiteRoutingSink(Sink):
+    """One sink per site_id (e.g. one streaming channel per site), opened on first use.
+
+    Each batch is split by site_id, keeping row order within a site. Sites are
+    written one after another: a StreamingSession is not shared across threads,
+    so ingest parallelizes by running one process per site instead.
+    """
+
+    def __init__(self, make_sink: Callable[[str], Sink], default_site_id: str = DEFAULT_SITE_ID):
+        self.make_sink = make_sink
+        self.default_site_id = default_site_id
+        self.sinks: Dict[str, Sink] = {}
+        self.rows_by_site: Dict[str, int] = {}
+
+    def write(self, rows: List[Event]):
+        by_site: Dict[str, List[Event]] = {}
+        for row in rows:
+            by_site.setdefault(row.get("site_id") or self.default_site_id, []).append(row)
+        for site_id, site_rows in by_site.items():
+            sink = self.sinks.get(site_id)
+            if sink is None:
+                sink = self.sinks[site_id] = self.make_sink(site_id)
+            sink.write(site_rows)
+            self.rows_by_site[site_id] = self.rows_by_site.get(site_id, 0) + len(site_rows)
+
+    def flush(self):
+        for sink in self.sinks.values():
+            sink.flush()
+
+    def close(self):
+        for sink in self.sinks.values():
+            sink.close()
+
+
+class JsonlSink(Sink):
+    """Append events to a local JSONL file."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._file = open(self.path, 'a')
+
+    def write(self, rows: List[Event]):
+        self._file.writelines(json.dumps(row) + "\n" for row in rows)
+
+    def flush(self):
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+class ParquetSink(Sink):
+    """Write events to a local Parquet file, one row group per batch (needs pyarrow)."""
+
+    def __init__(self, path):
+        import pyarrow.parquet as pq
+
+        self.path = Path(path)
+        self._pq = pq
+        self._writer = None
+
+    def write(self, rows: List[Event]):
+        import pyarrow as pa
+
+        self._write_table(pa.Table.from_pylist(rows))
+
+    def write_columns(self, batch):
+        """Native path for columnar record batches (no per-row conversion)."""
+        import pyarrow as pa
+
+        self._write_table(pa.Table.from_batches([batch]))
+
+    def _write_table(self, table):
+        if self._writer is None:
+            self._writer = self._pq.ParquetWriter(self.path, table.schema)
+        self._writer.write_table(table.cast(self._writer.schema))
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+
+
+class MemorySink(Sink):
+    """In-memory sink for tests: keeps every batch; flushed rows in flushed_count."""
+
+    def __init__(self):
+        self.batches: List[List[Event]] = []
+        self.flushed_count = 0
+        self.closed = False
+
+    @property
+    def rows(self) -> List[Event]:
+        return [row for batch in self.batches for row in batch]
+
+    def write(self, rows: List[Event]):
+        self.batches.append(list(rows))
+
+    def flush(self):
+        self.flushed_count = sum(len(batch) for batch in self.batches)
+
+    def close(self):
+        self.flush()
+        self.closed = True
+
+
+def open_file_sink(path) -> Sink:
+    """JsonlSink or ParquetSink by file extension."""
+    return ParquetSink(path) if str(path).endswith(".parquet") else JsonlSink(path)
+
+
+# ============================================================================
+# Pipeline
+# ============================================================================
+
+@dataclass
+class StreamStats:
+    events_in: int = 0
+    events_dropped: int = 0
+    events_out: int = 0
+    batches: int = 0
+    max_buffered: int = 0
+    elapsed_seconds: float = 0.0
+    sink_seconds: float = 0.0
+    errors: List[str] = field(default_factory=list)
+
+    @property
+    def events_per_second(self) -> float:
+        return self.events_out / self.elapsed_seconds if self.elapsed_seconds else 0.0
+
+
+class EventStream:
+    """Pull events from a source through transforms into a sink in batches."""
+
+    def __init__(self, source: Iterable[Event], sink: Sink, transforms: Iterable[Transform] = (),
+                 batch_size: int = 500, max_buffered: int = 5000, flush_interval: float = 1.0,
+                 close_sink: bool = True):
+        if batch_size < 1 or max_buffered < batch_size:
+            raise ValueError("batch_size must be >= 1 and max_buffered >= batch_size")
+        self.source = source
+        self.sink = sink
+        self.transforms = list(transforms)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.close_sink = close_sink
+        self.stats = StreamStats()
+        self._buffer: "queue.Queue" = queue.Queue(maxsize=max_buffered)
+        self._stop = threading.Event()
+        self._producer_error: Optional[BaseException] = None
+
+    def stop(self):
+        """Stop pulling from the source; buffered events are still written."""
+        self._stop.set()
+
+    def _produce(self):
+        try:
+            for event in self.source:
+                if self._stop.is_set():
+                    break
+                self.stats.events_in += 1
+                for transform in self.transforms:
+                    event = transform(event)
+                    if event is None:
+                        break
+                if event is None:
+                    self.stats.events_dropped += 1
+                    continue
+                # Blocks while the buffer is full (backpressure on the source)
+                while not self._stop.is_set():
+                    try:
+                        self._buffer.put(event, timeout=0.1)
+                        break
+                    except queue.Full:
+                        continue
+        except BaseException as e:
+            self._producer_error = e
+        finally:
+            # After stop() nobody may be draining the buffer: give up instead of blocking
+            while True:
+                try:
+                    self._buffer.put(_END, timeout=0.1)
+                    break
+                except queue.Full:
+                    if self._stop.is_set():
+                        break
+
+    def _batch_target(self) -> int:
+        """batch_size, or the sink's current preferred_batch_size (adaptive sinks) capped by the buffer."""
+        preferred = getattr(self.sink, "preferred_batch_size", None)
+        return min(preferred, self._buffer.maxsize) if preferred else self.batch_size
+
+    def _write(self, batch: List[Event]):
+        started = time.perf_counter()
+        self.sink.write(batch)
+        self.stats.sink_seconds += time.perf_counter() - started
+        self.stats.events_out += len(batch)
+        self.stats.batches += 1
+
+    def run(self) -> StreamStats:
+        """Run until the source is exhausted (or stop()); returns stats. Sink errors propagate."""
+        started = time.perf_counter()
+        producer = threading.Thread(target=self._produce, name="event-stream-source", daemon=True)
+        producer.start()
+
+        batch: List[Event] = []
+        deadline = time.monotonic() + self.flush_interval
+        try:
+            while True:
+                try:
+                    item = self._buffer.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    item = None
+                self.stats.max_buffered = max(self.stats.max_buffered, self._buffer.qsize())
+
+                if item is _END:
+                    break
+                if item is not None:
+                    batch.append(item)
+                if len(batch) >= self._batch_target() or (item is None and batch):
+                    self._write(batch)
+                    batch = []
+                if item is None and not producer.is_alive() and self._buffer.empty():
+                    break  # Stopped while the buffer was full: the end marker was dropped
+                if item is None or not batch:
+                    deadline = time.monotonic() + self.flush_interval
+
+            if batch:
+                self._write(batch)
+            self.sink.flush()
+        except BaseException:
+            self.stop()
+            raise
+        finally:
+            producer.join(timeout=5)
+            if self.close_sink:
+                self.sink.close()
+            self.stats.elapsed_seconds = time.perf_counter() - started
+
+        if self._producer_error is not None:
+            self.stats.errors.append(str(self._producer_error))
+            raise self._producer_error
+        return self.stats
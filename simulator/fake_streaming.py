@@ -0,0 +1,259 @@
+"""
+Fake Streaming Client - in-process stand-in for the Snowpipe Streaming SDK
+
+Author: SE Community
+Purpose: Exercise StreamingSession, sinks and ingest loops without an account:
+         append latency and server commit throughput are injectable
+
+USAGE:
+    from fake_streaming import FakeStreamingClient, latency_model
+    from streaming_session import StreamingSession
+
+    client = FakeStreamingClient(
+        append_latency=latency_model(base=0.002, per_row=2e-6, spikes=[(5.0, 3.0, 0.4)]),
+        commit_rows_per_second=50_000,
+    )
+    with StreamingSession(config, client_factory=lambda: client) as session:
+        ...
+    client.server["simulator_channel_..."].rows   # committed rows, in order
+    client.commit_due()                            # from a probe thread: commit what is due
+
+MODEL:
+    append_rows   sleeps append_latency (seconds, or a callable(rows, channel))
+    commit        batches commit in order, no sooner than commit_latency after
+                  the append, at most commit_rows_per_second
+    reopen        opening a channel name again invalidates the previous instance
+                  and drops its uncommitted rows (as the service does); the
+                  committed offset token survives in client.server
+    faults        FaultInjector decides which appends / opens fail; a failed
+                  append invalidates the channel (uncommitted rows are lost)
+    commits       commits happen when the channel is next used (offset read,
+                  append, close) or on client.commit_due(); each is logged in
+                  FakeChannelState.commits with its wall-clock commit time.
+                  Channel state is guarded by client.lock, so another thread
+                  can read the server while the ingest loop appends.
+"""
+
+import random
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+Latency = Union[float, Callable[[int, "FakeChannel"], float]]
+
+
+class FakeChannelError(Exception):
+    """Raised by fake channels (closed / invalidated channel)."""
+
+
+@dataclass
+class FakeChannelState:
+    """Server-side state of one channel name."""
+    committed_offset_token: Optional[str] = None
+    rows: List[Dict[str, Any]] = field(default_factory=list)
+    dropped_rows: int = 0
+    commits: List[Tuple[int, float]] = field(default_factory=list)  # (len(rows) after the commit, time.time())
+
+    def commit(self, rows: List[Dict[str, Any]], token: Optional[str], committed_at: float):
+        self.rows.extend(rows)
+        self.commits.append((len(self.rows), committed_at))
+        if token is not None:
+            self.committed_offset_token = token
+
+
+class FaultInjector:
+    """Which fake calls fail.
+
+    fail_calls        append call numbers (1-based) that fail before the rows are accepted
+    failure_rate      probability that any append fails that way
+    lost_ack_rate     probability that an append is committed but the call still raises
+    outages           (start_seconds, duration_seconds) windows where appends and
+                      open_channel both fail
+    outage_calls      (append_call, failed_calls): from that append call number on,
+                      the next failed_calls appends and opens fail (an outage
+                      that does not depend on machine speed)
+    """
+
+    def __init__(self, fail_calls: Iterable[int] = (), failure_rate: float = 0.0,
+                 lost_ack_rate: float = 0.0, outages: Iterable[Tuple[float, float]] = (),
+                 outage_calls: Iterable[Tuple[int, int]] = (), seed: Optional[int] = None):
+        self.fail_calls = set(fail_calls)
+        self.failure_rate = failure_rate
+        self.lost_ack_rate = lost_ack_rate
+        self.outages = list(outages)
+        self.outage_calls = dict(outage_calls)
+        self.append_calls = 0
+        self.injected = 0
+        self._outage_calls_left = 0
+        self._random = random.Random(seed)
+        self._started = time.monotonic()
+
+    def in_outage(self) -> bool:
+        elapsed = time.monotonic() - self._started
+        return any(start <= elapsed < start + duration for start, duration in self.outages)
+
+    def _outage_call(self) -> bool:
+        """True (and one fewer to go) while an outage_calls outage is under way."""
+        if self._outage_calls_left > 0:
+            self._outage_calls_left -= 1
+            return True
+        return False
+
+    def on_append(self) -> Optional[str]:
+        """None, "before" (rows rejected) or "after" (rows accepted, error raised)."""
+        self.append_calls += 1
+        self._outage_calls_left += self.outage_calls.get(self.append_calls, 0)
+        if (self.append_calls in self.fail_calls or self._outage_call() or self.in_outage()
+                or self._random.random() < self.failure_rate):
+            self.injected += 1
+            return "before"
+        if self._random.random() < self.lost_ack_rate:
+            self.injected += 1
+            return "after"
+        return None
+
+    def on_open(self) -> bool:
+        if self._outage_call() or self.in_outage():
+            self.injected += 1
+            return True
+        return False
+
+
+def latency_model(base: float = 0.002, per_row: float = 2e-6, per_backlog_row: float = 0.0,
+                  spikes: Iterable[Tuple[float, float, float]] = ()) -> Callable[[int, "FakeChannel"], float]:
+    """Append latency = base + per_row * rows + per_backlog_row * uncommitted rows,
+    plus extra seconds during each (start_seconds, duration_seconds, extra_seconds) spike."""
+    started = time.monotonic()
+    spikes = list(spikes)
+
+    def latency(rows: int, channel: "FakeChannel") -> float:
+        elapsed = time.monotonic() - started
+        extra = sum(e for start, duration, e in spikes if start <= elapsed < start + duration)
+        return base + per_row * rows + per_backlog_row * channel.backlog_rows + extra
+
+    return latency
+
+
+class FakeChannel:
+    """Channel with SDK-shaped methods: append_rows, get_latest_committed_offset_token, close."""
+
+    def __init__(self, client: "FakeStreamingClient", name: str):
+        self.client = client
+        self.name = name
+        self.closed = False
+        self.appended_rows = 0
+        self._pending: deque = deque()  # (commit_at, end_offset_token, rows)
+        self._last_commit_at = time.monotonic()
+
+    @property
+    def state(self) -> FakeChannelState:
+        return self.client.server[self.name]
+
+    @property
+    def backlog_rows(self) -> int:
+        """Rows appended but not yet committed."""
+        self._commit_due()
+        return sum(len(rows) for _, _, rows in self._pending)
+
+    def append_rows(self, rows: List[Dict[str, Any]], start_offset_token: Optional[str] = None,
+                    end_offset_token: Optional[str] = None):
+        if self.closed:
+            raise FakeChannelError(f"Channel {self.name} is closed or invalidated")
+        fault = self.client.faults.on_append() if self.client.faults else None
+        if fault == "before":
+            self.invalidate()
+            raise FakeChannelError(f"Injected failure: channel {self.name} invalidated")
+        latency = self.client.append_latency
+        time.sleep(latency(len(rows), self) if callable(latency) else latency)
+
+        with self.client.lock:
+            now = time.monotonic()
+            start = max(now + self.client.commit_latency, self._last_commit_at)
+            self._last_commit_at = start + len(rows) / self.client.commit_rows_per_second
+            self._pending.append((self._last_commit_at, end_offset_token, list(rows)))
+            self.appended_rows += len(rows)
+            if fault == "after":
+                # The server kept the rows; only the response (and the channel) was lost
+                for _, token, pending_rows in self._pending:
+                    self.state.commit(pending_rows, token, time.time())
+                self._pending.clear()
+                self.closed = True
+        if fault == "after":
+            raise FakeChannelError(f"Injected failure: response lost, channel {self.name} invalidated")
+
+    def append_row(self, row: Dict[str, Any], offset_token: Optional[str] = None):
+        self.append_rows([row], end_offset_token=offset_token)
+
+    def _commit_due(self):
+        with self.client.lock:
+            now = time.monotonic()
+            wall_now = time.time()
+            while self._pending and self._pending[0][0] <= now:
+                commit_at, token, rows = self._pending.popleft()
+                self.state.commit(rows, token, wall_now - (now - commit_at))
+
+    def get_latest_committed_offset_token(self) -> Optional[str]:
+        if not self.closed:
+            self._commit_due()
+        return self.state.committed_offset_token
+
+    def is_closed(self) -> bool:
+        return self.closed
+
+    def invalidate(self):
+        """Server-side invalidation: uncommitted rows are lost."""
+        with self.client.lock:
+            self._commit_due()
+            self.state.dropped_rows += sum(len(rows) for _, _, rows in self._pending)
+            self._pending.clear()
+            self.closed = True
+
+    def close(self, drop: bool = False, wait_for_flush: bool = True, timeout_seconds: Optional[float] = None):
+        if self.closed:
+            return
+        if wait_for_flush and self._pending:
+            time.sleep(max(0.0, self._pending[-1][0] - time.monotonic()))
+        self.invalidate()
+
+
+class FakeStreamingClient:
+    """Client with SDK-shaped open_channel / close; server state kept per channel name."""
+
+    def __init__(self, append_latency: Latency = 0.002, commit_latency: float = 0.05,
+                 commit_rows_per_second: float = 100_000, faults: Optional[FaultInjector] = None):
+        self.append_latency = append_latency
+        self.faults = faults
+        self.commit_latency = commit_latency
+        self.commit_rows_per_second = commit_rows_per_second
+        self.server: Dict[str, FakeChannelState] = {}
+        self.channels: Dict[str, FakeChannel] = {}
+        self.open_count = 0
+        self.closed = False
+        self.lock = threading.RLock()
+
+    def open_channel(self, channel_name: str, offset_token: Optional[str] = None):
+        if self.faults and self.faults.on_open():
+            raise FakeChannelError(f"Injected failure: cannot open channel {channel_name}")
+        with self.lock:
+            previous = self.channels.get(channel_name)
+            if previous is not None:
+                previous.invalidate()
+            state = self.server.setdefault(channel_name, FakeChannelState())
+            channel = FakeChannel(self, channel_name)
+            self.channels[channel_name] = channel
+            self.open_count += 1
+        return channel, {"latest_committed_offset_token": state.committed_offset_token}
+
+    def commit_due(self):
+        """Commit what is due on every open channel (the server's own clock)."""
+        with self.lock:
+            for channel in list(self.channels.values()):
+                if not channel.closed:
+                    channel._commit_due()
+
+    def close(self):
+        for channel in self.channels.values():
+            channel.close()
+        self.closed = True
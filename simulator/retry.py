@@ -0,0 +1,258 @@
+"""
+Retry Engine - replay uncommitted rows after transient channel failures
+
+Author: SE Community
+Purpose: Keep a run going through channel invalidations, network errors and
+         short outages instead of aborting with rows in an unknown state
+
+USAGE:
+    from retry import ReliableSession, RetryPolicy
+    from event_stream import ChannelSink, EventStream
+
+    with StreamingSession(config) as session:
+        reliable = ReliableSession(session, RetryPolicy(max_attempts=8))
+        EventStream(source, ChannelSink(reliable)).run()   # or AdaptiveChannelSink(reliable)
+        print(reliable.metrics())
+
+HOW IT WORKS:
+    offsets        every batch is appended with an end offset token (running
+                   row count), so the committed offset says exactly which
+                   batches are durable
+    replay buffer  appended batches stay in memory until the server commits
+                   them; at max_buffered_rows, append_rows() waits for commits
+                   (backpressure) instead of growing without bound
+    recovery       on a failed append or offset read: back off (exponential,
+                   full jitter), reopen the channel, read the committed offset,
+                   drop committed batches and resend the rest in order. The
+                   server keeps the committed offset across reopen, so rows
+                   are neither lost nor re-sent once committed.
+    give up        after max_attempts consecutive failures RetryExhausted is
+                   raised; replay_buffer_rows in metrics() is what was not
+                   confirmed
+
+ReliableSession has the StreamingSession methods the sinks use (append_rows,
+committed_offset, close_channel), so it drops in under ChannelSink and
+AdaptiveChannelSink.
+
+Fault-injection check: python tools/check_retry.py
+"""
+
+import random
+import time
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional
+
+
+class RetryExhausted(Exception):
+    """Raised when a channel could not be recovered within RetryPolicy.max_attempts."""
+
+
+class RetryPolicy:
+    """Exponential backoff with full jitter: attempt n sleeps uniform(0, min(max_delay, base_delay * 2**(n-1)))."""
+
+    def __init__(self, max_attempts: int = 8, base_delay: float = 0.2, max_delay: float = 15.0):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def delay(self, attempt: int) -> float:
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+
+class ReplayBuffer:
+    """Batches appended but not yet committed, keyed by end offset (bounded by row count)."""
+
+    def __init__(self, max_rows: int = 100_000):
+        self.max_rows = max_rows
+        self.rows = 0
+        self._batches: deque = deque()  # (end_offset, rows)
+
+    def __len__(self) -> int:
+        return len(self._batches)
+
+    def has_room(self, count: int) -> bool:
+        # A single batch larger than the buffer is still accepted when the buffer is empty
+        return not self._batches or self.rows + count <= self.max_rows
+
+    def add(self, end_offset: int, rows: List[Dict[str, Any]]):
+        self._batches.append((end_offset, rows))
+        self.rows += len(rows)
+
+    def trim(self, committed_offset: int) -> int:
+        """Drop batches the server has committed; returns rows dropped."""
+        dropped = 0
+        while self._batches and self._batches[0][0] <= committed_offset:
+            dropped += len(self._batches.popleft()[1])
+        self.rows -= dropped
+        return dropped
+
+    def batches(self):
+        return list(self._batches)
+
+
+class _ChannelState:
+    def __init__(self, committed_offset: int, max_rows: int):
+        self.committed_offset = committed_offset
+        self.next_offset = committed_offset
+        self.buffer = ReplayBuffer(max_rows)
+
+
+class ReliableSession:
+    """StreamingSession wrapper that replays uncommitted rows after failures."""
+
+    def __init__(self, session, policy: Optional[RetryPolicy] = None, max_buffered_rows: int = 100_000,
+                 commit_timeout: float = 60.0, poll_interval: float = 0.05,
+                 sleep: Callable[[float], None] = time.sleep):
+        self.session = session
+        self.policy = policy or RetryPolicy()
+        self.max_buffered_rows = max_buffered_rows
+        self.commit_timeout = commit_timeout
+        self.poll_interval = poll_interval
+        self.sleep = sleep
+        self.failures = 0
+        self.recoveries = 0
+        self.retry_attempts = 0
+        self.resent_rows = 0
+        self.backoff_seconds = 0.0
+        self.buffer_waits = 0
+        self.max_buffer_rows_seen = 0
+        self.last_error: Optional[str] = None
+        self._channels: Dict[str, _ChannelState] = {}
+
+    @property
+    def default_channel(self) -> str:
+        return self.session.default_channel
+
+    def _state(self, name: str) -> _ChannelState:
+        if name not in self._channels:
+            committed = self._with_recovery(name, None, lambda: self._read_committed(name))
+            self._channels[name] = _ChannelState(committed, self.max_buffered_rows)
+        return self._channels[name]
+
+    def _read_committed(self, name: str) -> int:
+        token = self.session.committed_offset(name)
+        return int(token) if token else 0
+
+    def _sync(self, name: str, state: _ChannelState):
+        """Read the committed offset and drop committed batches from the replay buffer."""
+        reopens = self.session.reopen_count
+        state.committed_offset = self._read_committed(name)
+        state.buffer.trim(state.committed_offset)
+        if self.session.reopen_count != reopens:
+            # The session reopened a closed channel underneath: uncommitted rows were lost
+            self._replay(name, state)
+
+    def _replay(self, name: str, state: _ChannelState):
+        for end_offset, rows in state.buffer.batches():
+            self.session.append_rows(rows, name, str(end_offset), retry=False)
+            self.resent_rows += len(rows)
+
+    def _recover(self, name: str, state: _ChannelState):
+        """Reopen the channel and resend everything after the committed offset."""
+        self.session.reopen_channel(name)
+        state.committed_offset = self._read_committed(name)
+        state.buffer.trim(state.committed_offset)
+        self._replay(name, state)
+
+    def _with_recovery(self, name: str, state: Optional[_ChannelState], operation: Callable[[], Any]):
+        """Run operation; on failure back off, recover the channel and retry."""
+        try:
+            return operation()
+        except Exception as e:
+            error = e
+        self.failures += 1
+
+        for attempt in range(1, self.policy.max_attempts + 1):
+            self.last_error = f"{type(error).__name__}: {error}"
+            delay = self.policy.delay(attempt)
+            self.backoff_seconds += delay
+            self.retry_attempts += 1
+            self.sleep(delay)
+            try:
+                if state is not None:
+                    self._recover(name, state)
+                    self.recoveries += 1
+                    return None
+                self.session.reopen_channel(name)
+                result = operation()
+                self.recoveries += 1
+                return result
+            except Exception as e:
+                error = e
+
+        raise RetryExhausted(
+            f"Channel {name} not recovered after {self.policy.max_attempts} attempts: {self.last_error}"
+        ) from error
+
+    def append_rows(self, rows: List[Dict[str, Any]], channel_name: Optional[str] = None,
+                    offset_token: Optional[str] = None) -> int:
+        """Append a batch; it stays in the replay buffer until committed."""
+        name = channel_name or self.default_channel
+        state = self._state(name)
+
+        if not state.buffer.has_room(len(rows)):
+            self.buffer_waits += 1
+            started = time.monotonic()
+            while not state.buffer.has_room(len(rows)):
+                if time.monotonic() - started > self.commit_timeout:
+                    raise TimeoutError(
+                        f"Replay buffer full ({state.buffer.rows} rows) and nothing committed "
+                        f"for {self.commit_timeout:.0f}s"
+                    )
+                self.sleep(self.poll_interval)
+                self._with_recovery(name, state, lambda: self._sync(name, state))
+
+        end_offset = int(offset_token) if offset_token is not None else state.next_offset + len(rows)
+        state.buffer.add(end_offset, rows)
+        state.next_offset = end_offset
+        self.max_buffer_rows_seen = max(self.max_buffer_rows_seen, state.buffer.rows)
+
+        # On failure the recovery resends this batch too (it is already buffered)
+        self._with_recovery(
+            name, state, lambda: self.session.append_rows(rows, name, str(end_offset), retry=False)
+        )
+        return len(rows)
+
+    def committed_offset(self, channel_name: Optional[str] = None) -> Optional[str]:
+        name = channel_name or self.default_channel
+        state = self._state(name)
+        self._with_recovery(name, state, lambda: self._sync(name, state))
+        return str(state.committed_offset) if state.committed_offset else None
+
+    def flush(self, channel_name: Optional[str] = None, timeout: Optional[float] = None):
+        """Wait until every buffered row is committed (recovering the channel as needed)."""
+        name = channel_name or self.default_channel
+        state = self._state(name)
+        timeout = self.commit_timeout if timeout is None else timeout
+        started = time.monotonic()
+        self._with_recovery(name, state, lambda: self._sync(name, state))
+        while len(state.buffer):
+            if time.monotonic() - started > timeout:
+                raise TimeoutError(f"{state.buffer.rows} rows not committed after {timeout:.0f}s")
+            self.sleep(self.poll_interval)
+            self._with_recovery(name, state, lambda: self._sync(name, state))
+
+    def close_channel(self, channel_name: Optional[str] = None):
+        name = channel_name or self.default_channel
+        if name in self._channels:
+            self.flush(name)
+            del self._channels[name]
+        self.session.close_channel(name)
+
+    def close(self):
+        for name in list(self._channels):
+            self.close_channel(name)
+        self.session.close()
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "failures": self.failures,
+            "recoveries": self.recoveries,
+            "retry_attempts": self.retry_attempts,
+            "resent_rows": self.resent_rows,
+            "backoff_seconds": round(self.backoff_seconds, 2),
+            "buffer_waits": self.buffer_waits,
+            "replay_buffer_rows": sum(state.buffer.rows for state in self._channels.values()),
+            "max_replay_buffer_rows": self.max_buffer_rows_seen,
+            "last_error": self.last_error,
+        }
@@ -3,7 +3,7 @@ REM ############################################################################
 REM Event Simulator - Windows Wrapper
 REM
 REM PURPOSE: Activate virtual environment and run Python event simulator
-REM USAGE: send_events.bat [--count N]
+REM USAGE: send_events.bat [--count N] [--bursts N --interval SECONDS] [--output FILE] [--columnar] [--adaptive]
 REM ##############################################################################
 
 setlocal
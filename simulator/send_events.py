@@ -20,18 +20,28 @@ SDK REQUIREMENTS:
 """
 
 import argparse
+import importlib.util
 import json
 import sys
+from contextlib import nullcontext
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Dict, Any, List
-import random
+from typing import Dict, Any, List, Optional
+import time
 
-# Snowpipe Streaming SDK imports (high-performance architecture)
-# Package: snowpipe-streaming (pip install snowpipe-streaming)
-from snowflake.ingest.streaming import StreamingIngestClient
-from cryptography.hazmat.primitives import serialization
-from cryptography.hazmat.backends import default_backend
+from adaptive import AdaptiveChannelSink, AimdController
+from anomaly import AnomalyDetector, DetectingSink
+from event_stream import (
+    DEFAULT_LAYOUT, EventStream, ChannelSink, SiteLayout, SiteRoutingSink, open_file_sink, sample_event,
+)
+from retry import ReliableSession
+from streaming_session import DEFAULT_CLIENT_NAME, StreamingSession, load_private_key_pem
+
+# The Snowpipe Streaming SDK (snowflake.ingest.streaming) and cryptography are
+# imported inside the functions that use them (see streaming_session.py):
+# argument parsing, config loading and event generation start without paying
+# their import cost.
+# Benchmark: python tools/bench_import_time.py
 
 
 def load_config() -> Dict[str, Any]:
@@ -50,37 +60,21 @@ def load_config() -> Dict[str, Any]:
 
 
 def load_private_key(key_path: Path) -> str:
-    """Load and parse private key from file, return as PEM string"""
-    if not key_path.exists():
+    """Load and parse private key from file, return as PEM string (parsed once per file)"""
+    try:
+        return load_private_key_pem(key_path)
+    except FileNotFoundError:
         print(f"ERROR: Private key not found: {key_path}")
         print("Run ./tools/02_setup_and_test.sh to generate keys")
         sys.exit(1)
 
-    with open(key_path, 'rb') as f:
-        private_key_data = f.read()
-
-    # Parse the private key
-    private_key = serialization.load_pem_private_key(
-        private_key_data,
-        password=None,
-        backend=default_backend()
-    )
-
-    # Convert to PEM format string for Snowpipe Streaming SDK
-    private_key_pem = private_key.private_bytes(
-        encoding=serialization.Encoding.PEM,
-        format=serialization.PrivateFormat.PKCS8,
-        encryption_algorithm=serialization.NoEncryption()
-    ).decode('utf-8')
-
-    return private_key_pem
 
-
-def generate_sample_events(count: int) -> List[Dict[str, Any]]:
+def generate_sample_events(count: int, layout: SiteLayout = DEFAULT_LAYOUT) -> List[Dict[str, Any]]:
     """
     Generate sample RFID badge scan events.
 
     Event schema matches PIPE transformation in sql/02_core/01_core.sql:
+    - site_id: Site (building) the zone belongs to
     - badge_id: Badge identifier
     - user_id: User identifier
     - zone_id: Zone where scan occurred
@@ -90,106 +84,190 @@ def generate_sample_events(count: int) -> List[Dict[str, Any]]:
     - direction: 'entry' or 'exit'
     """
 
-    # Sample data pools
-    badge_ids = [f"BADGE-{str(i).zfill(4)}" for i in range(1, 51)]
-    user_ids = ["USR-001", "USR-002", "USR-003", "USR-004", "USR-005"]
-    zone_reader_map = {
-        "ZONE-LOBBY-1": "RDR-101",
-        "ZONE-OFFICE-2A": "RDR-201",
-        "ZONE-SERVER-B1": "RDR-B101",
-        "ZONE-CONF-3B": "RDR-301",
-        "ZONE-PARKING-1": "RDR-P01"
-    }
-    zone_ids = list(zone_reader_map.keys())
-    directions = ["entry", "exit"]
-
-    events = []
+    # Sample data pools and event shape: event_stream.sample_event
+    # Oldest first, as a reader would send them (anomaly.py windows run on event time)
     base_time = datetime.now(timezone.utc)
+    return [sample_event(base_time - timedelta(seconds=(count - 1 - i) * 5), layout) for i in range(count)]
 
-    for i in range(count):
-        zone_id = random.choice(zone_ids)
-        event = {
-            "badge_id": random.choice(badge_ids),
-            "user_id": random.choice(user_ids),
-            "zone_id": zone_id,
-            "reader_id": zone_reader_map[zone_id],
-            "event_timestamp": (base_time - timedelta(seconds=i*5)).isoformat(),
-            "signal_strength": random.randint(-85, -30),
-            "direction": random.choice(directions)
-        }
-        events.append(event)
 
-    return events
+def site_channel_name(session: StreamingSession, site_id: str) -> str:
+    """Channel of one site (distinct per site, so per-site processes never share a channel)"""
+    return f"{session.default_channel}_{site_id}"
 
 
-def stream_events(config: Dict[str, Any], events: List[Dict[str, Any]]) -> bool:
-    """Stream events using Snowpipe Streaming API (high-performance architecture)"""
+def open_alert_session(config: Dict[str, Any]) -> StreamingSession:
+    """Session on the alerts pipe (--detect); its own client, as a client writes to one pipe"""
+    return StreamingSession({**config, "pipe_name": config.get("alerts_pipe_name", "sfe_badge_alerts_pipe")},
+                            client_name=f"{DEFAULT_CLIENT_NAME}_alerts", channel_prefix="alerts_channel")
 
-    print(" Initializing Snowpipe Streaming SDK...")
 
-    # Load private key
-    key_path = Path(__file__).parent.parent / ".secrets" / config["private_key_path"]
-    private_key_pem = load_private_key(key_path)
-
-    # Initialize Streaming Client
+def stream_events(config: Dict[str, Any], events,
+                  session: Optional[StreamingSession] = None,
+                  controller: Optional[AimdController] = None,
+                  site_ids: Optional[List[str]] = None,
+                  detector: Optional[AnomalyDetector] = None,
+                  alert_session: Optional[StreamingSession] = None) -> bool:
+    """
+    Stream events using Snowpipe Streaming API (high-performance architecture).
+
+    events is a list of dicts or an Arrow record batch (see columnar.py).
+    Pass a StreamingSession to reuse its client and channel across calls; the
+    caller then owns it and closes it. Without one, a session is opened and
+    closed for this call. Pass an AimdController (--adaptive) to let it pick
+    batch size and in-flight limit; it keeps what it learned across calls.
+    Pass site_ids (--sites / --site) to send each site's rows to its own
+    channel; the adaptive mode needs a single site (one process per site).
+    Pass an AnomalyDetector (--detect) to check events on the way and stream
+    its alerts to the alerts pipe through alert_session (opened and closed
+    here when not given).
+    """
+    if controller and site_ids and len(site_ids) > 1:
+        raise ValueError("Adaptive mode sends to one channel: stream one site per process (--site)")
+
+    owns_session = session is None
+    if owns_session:
+        print(" Initializing Snowpipe Streaming SDK...")
+        session = StreamingSession(config)
+    owns_alert_session = detector is not None and alert_session is None
+    if owns_alert_session:
+        alert_session = open_alert_session(config)
+
+    # Initialize Streaming Client (no-op when the session already has one)
     try:
-        client = StreamingIngestClient(
-            client_name="simple_stream_simulator",
-            db_name=config["database"],
-            schema_name=config["schema"],
-            pipe_name=config["pipe_name"],
-            properties={
-                "account": config["account"],
-                "user": config["user"],
-                "role": config["role"],
-                "private_key": private_key_pem,
-                "url": f"https://{config['account']}.snowflakecomputing.com"
-            }
-        )
-        print(f"OK Connected to Snowflake account: {config['account']}")
-        print(f"OK Target pipe: {config['database']}.{config['schema']}.{config['pipe_name']}")
-        print()
+        session.client
+        if owns_session:
+            print(f"OK Connected to Snowflake account: {config['account']}")
+            print(f"OK Target pipe: {session.target}")
+            print()
     except Exception as e:
         print("ERROR: Failed to initialize Streaming Client")
         print(f"Details: {e}")
         return False
 
-    # Open channel for streaming
-    channel_name = f"simulator_channel_{datetime.now(timezone.utc).strftime('%Y%m%d_%H%M%S')}"
-
     try:
-        print(f"Opening channel: {channel_name}...")
-        channel, status = client.open_channel(channel_name)
-        print("Channel opened successfully")
-        print()
+        channel_name = site_channel_name(session, site_ids[0]) if site_ids and len(site_ids) == 1 else None
+        if owns_session and not (site_ids and len(site_ids) > 1):
+            print(f"Opening channel: {channel_name or session.default_channel}...")
+            session.channel(channel_name)
+            print("Channel opened successfully")
+            print()
 
-        # Stream events row by row
         print(f"Streaming {len(events)} events...")
-        for event in events:
-            channel.append_row(event)
-
-        print(f"Successfully sent {len(events)} events")
+        # Failed appends are retried with backoff and replayed from the committed offset
+        reliable = ReliableSession(session)
+        if site_ids and len(site_ids) > 1:
+            # One channel per site, opened on the site's first row
+            sink = SiteRoutingSink(lambda site_id: ChannelSink(reliable, site_channel_name(session, site_id)))
+        elif controller:
+            sink = AdaptiveChannelSink(reliable, channel_name, controller=controller)
+        else:
+            sink = ChannelSink(reliable, channel_name)
+        # Anomaly checks see every site's rows before they are routed
+        pipeline = DetectingSink(sink, detector, ChannelSink(alert_session)) if detector else sink
+        if hasattr(events, "num_rows"):
+            # Columnar batch: SDK rows are built at the sink
+            from columnar import write_record_batches
+            write_record_batches([events], pipeline, close_sink=False)
+        else:
+            EventStream(events, pipeline, max_buffered=max(len(events), 5000), close_sink=False).run()
+        if isinstance(sink, SiteRoutingSink):
+            for site_sink in sink.sinks.values():
+                reliable.flush(site_sink.channel_name)
+            site_rows = sink.rows_by_site.values()
+            print(f"  {len(sink.sinks)} site channel(s), {min(site_rows)}-{max(site_rows)} events per site")
+        else:
+            reliable.flush(channel_name)
+        print(f"Successfully sent {len(events)} events (committed)")
+        retries = reliable.metrics()
+        if retries["failures"]:
+            print(
+                f"  Recovered from {retries['failures']} channel failure(s): "
+                f"{retries['retry_attempts']} attempt(s), {retries['resent_rows']} rows resent, "
+                f"{retries['backoff_seconds']}s backoff (last: {retries['last_error']})"
+            )
+        if controller:
+            metrics = sink.metrics()
+            print(
+                f"  Adaptive: batch_size={metrics['batch_size']} max_in_flight={metrics['max_in_flight']} "
+                f"append_p95_ms={metrics['append_p95_ms']} commit_p95_ms={metrics['commit_p95_ms']} "
+                f"decreases={metrics['decreases']} committed_offset={metrics['committed_offset']}"
+            )
+        if detector:
+            found = detector.metrics()
+            print(
+                f"  Anomalies: {pipeline.alerts_written} alert(s) sent to {alert_session.target} "
+                f"(impossible_travel={found['impossible_travel']} tailgating={found['tailgating']} "
+                f"signal_degradation={found['signal_degradation']}, {found['badges_tracked']} badges tracked)"
+            )
         print()
 
-        # Close channel
-        channel.close()
-        client.close()
+        if owns_alert_session:
+            alert_session.close()
+        if owns_session:
+            # Close channel and client (flushes pending rows)
+            session.close()
 
-        print("=" * 70)
-        print("SUCCESS: All events delivered to Snowflake")
-        print("=" * 70)
+            print("=" * 70)
+            print("SUCCESS: All events delivered to Snowflake")
+            print("=" * 70)
         return True
 
     except Exception as e:
         print("ERROR: Failed to stream events")
         print(f"Details: {e}")
-        try:
-            client.close()
-        except Exception:
-            pass
+        for owned, open_session in ((owns_alert_session, alert_session), (owns_session, session)):
+            if owned:
+                try:
+                    open_session.close()
+                except Exception:
+                    pass
         return False
 
 
+def generate_events(count: int, columnar: bool = False, layout: SiteLayout = DEFAULT_LAYOUT):
+    """Sample events as a list of dicts, or as one Arrow record batch (--columnar, default site only)"""
+    if columnar:
+        from columnar import sample_record_batch
+        return sample_record_batch(count)
+    return generate_sample_events(count, layout)
+
+
+def stream_bursts(config: Dict[str, Any], event_count: int, bursts: int, interval: float,
+                  columnar: bool = False, controller: Optional[AimdController] = None,
+                  layout: SiteLayout = DEFAULT_LAYOUT, site_ids: Optional[List[str]] = None,
+                  detector: Optional[AnomalyDetector] = None) -> bool:
+    """Send several bursts through one session (key parsed once, client and channel reused)"""
+    print(" Initializing Snowpipe Streaming SDK...")
+    # The alerts pipe is only needed with a detector (--detect)
+    alerts = open_alert_session(config) if detector is not None else nullcontext()
+    with StreamingSession(config) as session, alerts as alert_session:
+        for burst in range(1, bursts + 1):
+            print(f"Burst {burst}/{bursts}")
+            events = generate_events(event_count, columnar, layout)
+            if not stream_events(config, events, session, controller, site_ids, detector, alert_session):
+                return False
+            if burst < bursts:
+                time.sleep(interval)
+        reopened = f" ({session.reopen_count} channel reopen(s))" if session.reopen_count else ""
+
+    print("=" * 70)
+    print(f"SUCCESS: {bursts * event_count} events delivered in {bursts} bursts{reopened}")
+    print("=" * 70)
+    return True
+
+
+def write_events_file(path: Path, event_count: int, columnar: bool = False,
+                      layout: SiteLayout = DEFAULT_LAYOUT):
+    """Write sample events to a local file through the same EventStream path"""
+    print(f"Writing {event_count} sample events to {path}...")
+    if columnar:
+        from columnar import write_record_batches
+        stats = write_record_batches([generate_events(event_count, columnar)], open_file_sink(path))
+    else:
+        stats = EventStream(generate_sample_events(event_count, layout), open_file_sink(path)).run()
+    print(f"Wrote {stats.events_out} events in {stats.batches} batch(es) ({stats.events_per_second:,.0f} events/s)")
+
+
 def main():
     """Main entry point"""
     parser = argparse.ArgumentParser(
@@ -200,8 +278,94 @@ def main():
         type=int,
         help="Number of events to generate (overrides config.json)"
     )
+    parser.add_argument(
+        "--bursts",
+        type=int,
+        default=1,
+        help="Send --count events this many times over one reused client/channel"
+    )
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=5.0,
+        help="Seconds between bursts (default: 5)"
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        help="Write events to a local .jsonl or .parquet file instead of Snowflake (no config needed)"
+    )
+    parser.add_argument(
+        "--adaptive",
+        action="store_true",
+        help="Tune batch size and in-flight batches from append latency (AIMD)"
+    )
+    parser.add_argument(
+        "--target-latency-ms",
+        type=float,
+        default=200.0,
+        help="Append latency the adaptive mode aims to stay under (default: 200)"
+    )
+    parser.add_argument(
+        "--columnar",
+        action="store_true",
+        help="Generate events as Arrow record batches (needs pyarrow, numpy)"
+    )
+    parser.add_argument(
+        "--sites",
+        type=int,
+        help="Generate events for this many sites (SITE-001..), one channel per site"
+    )
+    parser.add_argument(
+        "--zones-per-site",
+        type=int,
+        default=10,
+        help="Zones per generated site (default: 10)"
+    )
+    parser.add_argument(
+        "--readers-per-zone",
+        type=int,
+        default=2,
+        help="Readers per generated zone (default: 2)"
+    )
+    parser.add_argument(
+        "--site",
+        help="Only this site's events (run one process per site to ingest sites in parallel)"
+    )
+    parser.add_argument(
+        "--detect",
+        action="store_true",
+        help="Check events for impossible travel, tailgating and weak readers; alerts go to BADGE_ALERTS"
+    )
     args = parser.parse_args()
 
+    try:
+        layout = (SiteLayout.generate(args.sites, args.zones_per_site, args.readers_per_zone)
+                  if args.sites else DEFAULT_LAYOUT)
+        if args.site:
+            layout = layout.only(args.site)
+    except ValueError as e:
+        parser.error(str(e))
+    site_ids = layout.site_ids if args.sites or args.site else None
+    if args.columnar and site_ids and site_ids != DEFAULT_LAYOUT.site_ids:
+        parser.error("--columnar generates the default site only; drop --sites / --site")
+    if args.adaptive and site_ids and len(site_ids) > 1:
+        parser.error("--adaptive tunes one channel: add --site and run one process per site")
+    if args.detect and (args.columnar or args.output):
+        parser.error("--detect checks row events streamed to Snowflake; drop --columnar / --output")
+
+    if args.columnar:
+        # Check without importing: columnar.py (pyarrow, numpy) loads where a batch is built
+        missing = [name for name in ("pyarrow", "numpy") if importlib.util.find_spec(name) is None]
+        if missing:
+            print(f"ERROR: --columnar needs pyarrow and numpy (missing: {', '.join(missing)})")
+            print("Install: pip install pyarrow numpy")
+            sys.exit(1)
+
+    if args.output:
+        write_events_file(args.output, args.count or 10, args.columnar, layout)
+        sys.exit(0)
+
     # Load configuration
     print("=" * 70)
     print("Simple Stream - Event Simulator")
@@ -215,19 +379,32 @@ def main():
     print(f"  Role: {config['role']}")
     print(f"  Database: {config['database']}")
     print(f"  Schema: {config['schema']}")
+    if site_ids:
+        print(f"  Sites: {len(site_ids)} ({site_ids[0]}{'..' + site_ids[-1] if len(site_ids) > 1 else ''}), "
+              f"one channel per site")
     print()
 
     # Determine event count
     event_count = args.count if args.count else config.get("sample_events", 10)
 
-    # Generate sample events
-    print(f"Generating {event_count} sample events...")
-    events = generate_sample_events(event_count)
-    print(f"Generated {len(events)} RFID badge scan events")
-    print()
+    # Adaptive batch sizing (one controller for the whole run)
+    controller = AimdController(target_latency_ms=args.target_latency_ms) if args.adaptive else None
+    # One detector for the whole run, so windows span bursts
+    detector = AnomalyDetector() if args.detect else None
+
+    if args.bursts > 1:
+        # Repeated bursts reuse one session
+        success = stream_bursts(config, event_count, args.bursts, args.interval, args.columnar, controller,
+                                layout, site_ids, detector)
+    else:
+        # Generate sample events
+        print(f"Generating {event_count} sample events...")
+        events = generate_events(event_count, args.columnar, layout)
+        print(f"Generated {len(events)} RFID badge scan events")
+        print()
 
-    # Stream events
-    success = stream_events(config, events)
+        # Stream events
+        success = stream_events(config, events, controller=controller, site_ids=site_ids, detector=detector)
 
     if success:
         print()
@@ -235,6 +412,10 @@ def main():
         print("  1. Verify data in Snowsight:")
         print(f"     SELECT COUNT(*) FROM {config['database']}.{config['schema']}.RAW_BADGE_EVENTS;")
         print()
+        if args.sites:
+            print("  Generated sites join the fact table once they are in DIM_SITES / DIM_ZONES:")
+            print(f"     CALL {config['database']}.ANALYTICS_LAYER.sfe_seed_sites({args.sites}, {args.zones_per_site});")
+            print()
         print("  2. Check monitoring views:")
         print(
             "     SELECT ingestion_hour, event_count, events_per_second, unique_badges, unique_zones, "
@@ -243,6 +424,14 @@ def main():
             "ORDER BY ingestion_hour DESC LIMIT 24;"
         )
         print()
+        if detector:
+            print("  3. Review anomaly alerts:")
+            print(
+                "     SELECT alert_type, severity, site_id, zone_id, badge_id, detail, event_timestamp "
+                f"FROM {config['database']}.{config['schema']}.BADGE_ALERTS "
+                "ORDER BY detected_time DESC LIMIT 50;"
+            )
+            print()
         sys.exit(0)
     else:
         print()
@@ -3,7 +3,7 @@
 # Event Simulator - Unix/macOS Wrapper
 #
 # PURPOSE: Activate virtual environment and run Python event simulator
-# USAGE: ./send_events.sh [--count N]
+# USAGE: ./send_events.sh [--count N] [--bursts N --interval SECONDS] [--output FILE] [--columnar] [--adaptive]
 ################################################################################
 
 set -e
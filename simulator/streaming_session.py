@@ -0,0 +1,193 @@
+"""
+Streaming Session - long-lived Snowpipe Streaming client for repeated bursts
+
+Author: SE Community
+Purpose: Reuse one parsed key, one StreamingIngestClient and open channels
+         across many sends (loops, long-running gateways, load tests)
+
+USAGE:
+    from send_events import load_config, generate_sample_events
+    from streaming_session import StreamingSession
+
+    with StreamingSession(load_config()) as session:
+        for _ in range(10):
+            session.append_rows(generate_sample_events(100))
+
+BEHAVIOR:
+    - The private key is parsed once per file (cached on path + mtime)
+    - The client is created on first use and kept until close()
+    - Channels stay open between bursts; a closed or invalidated channel is
+      reopened and the failed batch is sent once more. Resent rows may be
+      duplicates; staging deduplicates on (badge_id, event_timestamp).
+      For replay from the committed offset with backoff, wrap the session in
+      retry.ReliableSession.
+"""
+
+import functools
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+SECRETS_DIR = Path(__file__).parent.parent / ".secrets"
+DEFAULT_CLIENT_NAME = "simple_stream_simulator"
+
+
+@functools.lru_cache(maxsize=8)
+def _parse_private_key(key_path: str, mtime_ns: int) -> str:
+    """Parse a PEM key file into the PKCS8 PEM string the SDK expects (cached)."""
+    from cryptography.hazmat.primitives import serialization
+    from cryptography.hazmat.backends import default_backend
+
+    with open(key_path, 'rb') as f:
+        private_key = serialization.load_pem_private_key(
+            f.read(),
+            password=None,
+            backend=default_backend()
+        )
+
+    return private_key.private_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PrivateFormat.PKCS8,
+        encryption_algorithm=serialization.NoEncryption()
+    ).decode('utf-8')
+
+
+def load_private_key_pem(key_path: Path) -> str:
+    """Return the key as a PKCS8 PEM string; re-parses only if the file changed."""
+    key_path = Path(key_path).resolve()
+    if not key_path.exists():
+        raise FileNotFoundError(f"Private key not found: {key_path}")
+    return _parse_private_key(str(key_path), key_path.stat().st_mtime_ns)
+
+
+class StreamingSession:
+    """One StreamingIngestClient plus its open channels, reused across bursts."""
+
+    def __init__(self, config: Dict[str, Any], client_name: str = DEFAULT_CLIENT_NAME,
+                 channel_prefix: str = "simulator_channel",
+                 client_factory: Optional[Callable[[], Any]] = None):
+        self.config = config
+        self.client_name = client_name
+        self.client_factory = client_factory
+        self.default_channel = f"{channel_prefix}_{datetime.now(timezone.utc).strftime('%Y%m%d_%H%M%S')}"
+        self._client = None
+        self._channels: Dict[str, Any] = {}
+        self.reopen_count = 0
+
+    @property
+    def target(self) -> str:
+        return f"{self.config['database']}.{self.config['schema']}.{self.config['pipe_name']}"
+
+    @property
+    def client(self):
+        """The StreamingIngestClient, created on first use."""
+        if self._client is None and self.client_factory is not None:
+            # Injected client (e.g. fake_streaming.FakeStreamingClient): no key, no network
+            self._client = self.client_factory()
+        if self._client is None:
+            # Snowpipe Streaming SDK (high-performance architecture)
+            # Package: snowpipe-streaming (pip install snowpipe-streaming)
+            from snowflake.ingest.streaming import StreamingIngestClient
+
+            private_key_pem = load_private_key_pem(SECRETS_DIR / self.config["private_key_path"])
+            self._client = StreamingIngestClient(
+                client_name=self.client_name,
+                db_name=self.config["database"],
+                schema_name=self.config["schema"],
+                pipe_name=self.config["pipe_name"],
+                properties={
+                    "account": self.config["account"],
+                    "user": self.config["user"],
+                    "role": self.config["role"],
+                    "private_key": private_key_pem,
+                    "url": f"https://{self.config['account']}.snowflakecomputing.com"
+                }
+            )
+        return self._client
+
+    def channel(self, name: Optional[str] = None):
+        """Return an open channel, opening (or reopening) it if needed."""
+        name = name or self.default_channel
+        channel = self._channels.get(name)
+        if channel is not None and not _is_closed(channel):
+            return channel
+        if channel is not None:
+            self.reopen_count += 1
+        channel, _status = self.client.open_channel(name)
+        self._channels[name] = channel
+        return channel
+
+    def reopen_channel(self, name: Optional[str] = None):
+        """Close (quietly) and reopen a channel; the server keeps its committed offset."""
+        name = name or self.default_channel
+        stale = self._channels.pop(name, None)
+        if stale is not None:
+            _close_quietly(stale)
+            self.reopen_count += 1
+        return self.channel(name)
+
+    def append_rows(self, rows: List[Dict[str, Any]], channel_name: Optional[str] = None,
+                    offset_token: Optional[str] = None, retry: bool = True) -> int:
+        """Append rows to a channel; reopen and resend once if the channel was invalidated.
+
+        offset_token marks the last row of the batch; the server reports it
+        back through committed_offset() once the rows are committed.
+        retry=False raises instead (retry.ReliableSession replays from the
+        committed offset itself).
+        """
+        name = channel_name or self.default_channel
+        try:
+            _append(self.channel(name), rows, offset_token)
+        except Exception:
+            if not retry:
+                raise
+            stale = self._channels.pop(name, None)
+            if stale is None:
+                raise
+            _close_quietly(stale)
+            self.reopen_count += 1
+            _append(self.channel(name), rows, offset_token)
+        return len(rows)
+
+    def committed_offset(self, channel_name: Optional[str] = None) -> Optional[str]:
+        """Latest offset token the server has committed for the channel (None if none yet)."""
+        return self.channel(channel_name).get_latest_committed_offset_token()
+
+    def close_channel(self, name: Optional[str] = None):
+        channel = self._channels.pop(name or self.default_channel, None)
+        if channel is not None:
+            channel.close()
+
+    def close(self):
+        """Close all channels (flushing pending rows) and the client."""
+        for name in list(self._channels):
+            _close_quietly(self._channels.pop(name))
+        if self._client is not None:
+            client, self._client = self._client, None
+            client.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def _append(channel, rows: List[Dict[str, Any]], offset_token: Optional[str] = None):
+    if hasattr(channel, "append_rows"):
+        channel.append_rows(rows, end_offset_token=offset_token)
+    else:
+        for i, row in enumerate(rows):
+            channel.append_row(row, offset_token if i == len(rows) - 1 else None)
+
+
+def _is_closed(channel) -> bool:
+    is_closed = getattr(channel, "is_closed", None)
+    return bool(is_closed()) if callable(is_closed) else False
+
+
+def _close_quietly(channel):
+    try:
+        channel.close()
+    except Exception:
+        pass
@@ -34,6 +34,8 @@ GRANT USAGE ON DATABASE SNOWFLAKE_EXAMPLE TO ROLE sfe_ingest_role;
 GRANT USAGE ON SCHEMA SNOWFLAKE_EXAMPLE.RAW_INGESTION TO ROLE sfe_ingest_role;
 GRANT INSERT ON TABLE SNOWFLAKE_EXAMPLE.RAW_INGESTION.RAW_BADGE_EVENTS TO ROLE sfe_ingest_role;
 GRANT OPERATE ON PIPE SNOWFLAKE_EXAMPLE.RAW_INGESTION.SFE_BADGE_EVENTS_PIPE TO ROLE sfe_ingest_role;
+GRANT INSERT ON TABLE SNOWFLAKE_EXAMPLE.RAW_INGESTION.BADGE_ALERTS TO ROLE sfe_ingest_role;
+GRANT OPERATE ON PIPE SNOWFLAKE_EXAMPLE.RAW_INGESTION.SFE_BADGE_ALERTS_PIPE TO ROLE sfe_ingest_role;
 
 -- ============================================================================
 -- STEP 3: Generate RSA key pair (requires OpenSSL)
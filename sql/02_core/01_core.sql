@@ -5,7 +5,8 @@
  * Created: 2025-12-02
  * Expires: 2026-02-05
  *
- * Creates: Database, schemas, raw table, pipe, stream
+ * Creates: Database, schemas, raw table (clustered by site), pipe, stream,
+ *          task mode history, anomaly alerts table and pipe
  * Time: 10 seconds
  ******************************************************************************/
 
@@ -23,8 +24,13 @@ CREATE SCHEMA IF NOT EXISTS ANALYTICS_LAYER
 
 USE SCHEMA RAW_INGESTION;
 
--- Raw landing table for Snowpipe Streaming
+-- Raw landing table for Snowpipe Streaming.
+-- Clustered by site first: a per-site query prunes to that site's
+-- micro-partitions. Producers stream one channel per site
+-- (simulator/send_events.py --sites), so freshly ingested partitions already
+-- hold a single site before automatic clustering touches them.
 CREATE OR REPLACE TABLE RAW_BADGE_EVENTS (
+    site_id VARCHAR(50) NOT NULL DEFAULT 'SITE-HQ',
     badge_id VARCHAR(50) NOT NULL,
     user_id VARCHAR(50) NOT NULL,
     zone_id VARCHAR(50) NOT NULL,
@@ -36,14 +42,16 @@ CREATE OR REPLACE TABLE RAW_BADGE_EVENTS (
     ingestion_time TIMESTAMP_NTZ DEFAULT CURRENT_TIMESTAMP(),
     raw_json VARIANT
 )
-COMMENT = 'DEMO: RFID badge events from Snowpipe Streaming REST API | Author: SE Community | Expires: 2026-02-05';
+COMMENT = 'DEMO: RFID badge events from Snowpipe Streaming REST API | Author: SE Community | Expires: 2026-02-05'
+CLUSTER BY (site_id, TO_DATE(ingestion_time));
 
--- Snowpipe with JSON transformation
+-- Snowpipe with JSON transformation (events without site_id belong to SITE-HQ)
 CREATE OR REPLACE PIPE sfe_badge_events_pipe
   COMMENT = 'DEMO: Snowpipe Streaming endpoint | Author: SE Community | Expires: 2026-02-05'
 AS COPY INTO RAW_BADGE_EVENTS
 FROM (
   SELECT
+    COALESCE($1:site_id::STRING, 'SITE-HQ') AS site_id,
     $1:badge_id::STRING AS badge_id,
     $1:user_id::STRING AS user_id,
     $1:zone_id::STRING AS zone_id,
@@ -65,3 +73,52 @@ FROM (
 CREATE OR REPLACE STREAM sfe_badge_events_stream
 ON TABLE RAW_BADGE_EVENTS
 COMMENT = 'DEMO: Change data capture stream | Author: SE Community | Expires: 2026-02-05';
+
+-- Transformation mode history (written by the task / dynamic-table scripts,
+-- read by sql/04_monitoring/05_latency_comparison.sql)
+CREATE TABLE IF NOT EXISTS TASK_SCHEDULE_HISTORY (
+    schedule_mode VARCHAR(20) NOT NULL,
+    schedule_detail VARCHAR(200),
+    effective_from TIMESTAMP_NTZ NOT NULL DEFAULT CURRENT_TIMESTAMP()
+)
+COMMENT = 'DEMO: Transformation schedule mode changes (latency comparison) | Author: SE Community | Expires: 2026-02-05';
+
+-- Anomaly alerts (impossible travel, tailgating, reader signal degradation).
+-- Raised by the streaming detector in the ingest process
+-- (simulator/anomaly.py; send_events.py --detect) and streamed through their
+-- own pipe on a separate channel. Polled by the dashboard's Security Alerts page.
+CREATE OR REPLACE TABLE BADGE_ALERTS (
+    alert_type VARCHAR(30) NOT NULL,
+    severity VARCHAR(10) NOT NULL,
+    site_id VARCHAR(50) NOT NULL DEFAULT 'SITE-HQ',
+    zone_id VARCHAR(50),
+    reader_id VARCHAR(50),
+    badge_id VARCHAR(50),
+    user_id VARCHAR(50),
+    event_timestamp TIMESTAMP_NTZ NOT NULL,
+    metric_value NUMBER(10, 2),
+    detail VARCHAR(500),
+    detected_time TIMESTAMP_NTZ,
+    ingestion_time TIMESTAMP_NTZ DEFAULT CURRENT_TIMESTAMP()
+)
+COMMENT = 'DEMO: Streaming anomaly alerts (one row per alert) | Author: SE Community | Expires: 2026-02-05';
+
+CREATE OR REPLACE PIPE sfe_badge_alerts_pipe
+  COMMENT = 'DEMO: Snowpipe Streaming endpoint for anomaly alerts | Author: SE Community | Expires: 2026-02-05'
+AS COPY INTO BADGE_ALERTS
+FROM (
+  SELECT
+    $1:alert_type::STRING AS alert_type,
+    $1:severity::STRING AS severity,
+    COALESCE($1:site_id::STRING, 'SITE-HQ') AS site_id,
+    $1:zone_id::STRING AS zone_id,
+    $1:reader_id::STRING AS reader_id,
+    $1:badge_id::STRING AS badge_id,
+    $1:user_id::STRING AS user_id,
+    TO_TIMESTAMP_NTZ($1:event_timestamp::STRING) AS event_timestamp,
+    $1:metric_value::NUMBER(10, 2) AS metric_value,
+    $1:detail::STRING AS detail,
+    TO_TIMESTAMP_NTZ($1:detected_time::STRING) AS detected_time,
+    CURRENT_TIMESTAMP() AS ingestion_time
+  FROM TABLE(DATA_SOURCE(TYPE => 'STREAMING'))
+);
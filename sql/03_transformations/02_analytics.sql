@@ -1,16 +1,48 @@
 /*******************************************************************************
  * Analytics Layer
- * Creates: Staging table, dimensions (users, zones, readers), fact table
+ * Creates: Staging table, dimensions (users, sites, zones, readers), fact table,
+ *          occupancy state (badge, zone), hourly data-quality counters,
+ *          sfe_seed_sites() for simulated sites
  * Time: 15 seconds
  ******************************************************************************/
 
 USE ROLE SYSADMIN;
 USE DATABASE SNOWFLAKE_EXAMPLE;
 
+-- Reverting from the dynamic-table variant (05_dynamic_tables.sql): drop the
+-- dynamic tables so the base tables below can be recreated (dependents first)
+EXECUTE IMMEDIATE $$
+DECLARE
+  dynamic_tables CURSOR FOR
+    SELECT table_schema, table_name
+    FROM SNOWFLAKE_EXAMPLE.INFORMATION_SCHEMA.TABLES
+    WHERE is_dynamic = 'YES'
+      AND table_schema || '.' || table_name IN (
+        'ANALYTICS_LAYER.DATA_QUALITY_HOURLY',
+        'ANALYTICS_LAYER.ZONE_OCCUPANCY',
+        'ANALYTICS_LAYER.BADGE_OCCUPANCY_STATE',
+        'ANALYTICS_LAYER.FCT_ACCESS_EVENTS',
+        'STAGING_LAYER.STG_BADGE_EVENTS'
+      )
+    ORDER BY CASE table_name
+      WHEN 'DATA_QUALITY_HOURLY' THEN 0
+      WHEN 'ZONE_OCCUPANCY' THEN 1
+      WHEN 'BADGE_OCCUPANCY_STATE' THEN 2
+      WHEN 'FCT_ACCESS_EVENTS' THEN 3
+      ELSE 4
+    END;
+BEGIN
+  FOR dt IN dynamic_tables DO
+    EXECUTE IMMEDIATE 'DROP DYNAMIC TABLE SNOWFLAKE_EXAMPLE.' || dt.table_schema || '.' || dt.table_name;
+  END FOR;
+END;
+$$;
+
 -- Staging table (transient for cost savings)
 USE SCHEMA STAGING_LAYER;
 
 CREATE OR REPLACE TRANSIENT TABLE STG_BADGE_EVENTS (
+    site_id VARCHAR(50) NOT NULL,
     badge_id VARCHAR(50) NOT NULL,
     user_id VARCHAR(50) NOT NULL,
     zone_id VARCHAR(50) NOT NULL,
@@ -47,9 +79,22 @@ CREATE OR REPLACE TABLE DIM_USERS (
 )
 COMMENT = 'DEMO: User dimension (Type 2 SCD)';
 
+CREATE OR REPLACE TABLE DIM_SITES (
+    site_key NUMBER AUTOINCREMENT PRIMARY KEY,
+    site_id VARCHAR(50) NOT NULL UNIQUE,
+    site_name VARCHAR(100) NOT NULL,
+    region VARCHAR(50),
+    timezone VARCHAR(50),
+    is_active BOOLEAN DEFAULT TRUE,
+    created_timestamp TIMESTAMP_NTZ DEFAULT CURRENT_TIMESTAMP(),
+    updated_timestamp TIMESTAMP_NTZ DEFAULT CURRENT_TIMESTAMP()
+)
+COMMENT = 'DEMO: Site (building campus) dimension';
+
 CREATE OR REPLACE TABLE DIM_ZONES (
     zone_key NUMBER AUTOINCREMENT PRIMARY KEY,
     zone_id VARCHAR(50) NOT NULL UNIQUE,
+    site_id VARCHAR(50) NOT NULL,
     reader_id VARCHAR(50),
     building_name VARCHAR(100) NOT NULL,
     floor_number NUMBER(3),
@@ -92,22 +137,28 @@ VALUES
     ('USR-004', 'Alice Williams', 'EMPLOYEE', 'Security', 'SECRET', TRUE, TRUE),
     ('USR-005', 'Mike Davis', 'VISITOR', 'External', 'PUBLIC', TRUE, TRUE);
 
+INSERT INTO DIM_SITES (site_id, site_name, region, timezone)
+VALUES
+    ('SITE-HQ', 'Headquarters', 'NA-WEST', 'America/Los_Angeles');
+
 INSERT INTO DIM_ZONES (
-    zone_id, reader_id, building_name, floor_number, zone_name, zone_type,
+    zone_id, site_id, reader_id, building_name, floor_number, zone_name, zone_type,
     capacity, requires_clearance, is_restricted, reader_location, reader_type
 )
 VALUES
-    ('ZONE-LOBBY-1', 'RDR-101', 'Main Building', 1, 'Main Lobby', 'LOBBY', 100, NULL, FALSE, 'Main Entrance', 'BIDIRECTIONAL'),
-    ('ZONE-OFFICE-2A', 'RDR-201', 'Main Building', 2, 'Engineering Office 2A', 'OFFICE', 30, 'CONFIDENTIAL', TRUE, 'Floor 2 East', 'ENTRY'),
-    ('ZONE-SERVER-B1', 'RDR-B101', 'Main Building', -1, 'Server Room B1', 'SECURE_AREA', 5, 'SECRET', TRUE, 'Basement Security Door', 'BIDIRECTIONAL'),
-    ('ZONE-CONF-3B', 'RDR-301', 'Main Building', 3, 'Conference Room 3B', 'CONFERENCE_ROOM', 20, NULL, FALSE, 'Floor 3 West', 'ENTRY'),
-    ('ZONE-PARKING-1', 'RDR-P01', 'Parking Structure', 1, 'Employee Parking Level 1', 'PARKING', 200, NULL, FALSE, 'Garage Entry', 'ENTRY');
+    ('ZONE-LOBBY-1', 'SITE-HQ', 'RDR-101', 'Main Building', 1, 'Main Lobby', 'LOBBY', 100, NULL, FALSE, 'Main Entrance', 'BIDIRECTIONAL'),
+    ('ZONE-OFFICE-2A', 'SITE-HQ', 'RDR-201', 'Main Building', 2, 'Engineering Office 2A', 'OFFICE', 30, 'CONFIDENTIAL', TRUE, 'Floor 2 East', 'ENTRY'),
+    ('ZONE-SERVER-B1', 'SITE-HQ', 'RDR-B101', 'Main Building', -1, 'Server Room B1', 'SECURE_AREA', 5, 'SECRET', TRUE, 'Basement Security Door', 'BIDIRECTIONAL'),
+    ('ZONE-CONF-3B', 'SITE-HQ', 'RDR-301', 'Main Building', 3, 'Conference Room 3B', 'CONFERENCE_ROOM', 20, NULL, FALSE, 'Floor 3 West', 'ENTRY'),
+    ('ZONE-PARKING-1', 'SITE-HQ', 'RDR-P01', 'Parking Structure', 1, 'Employee Parking Level 1', 'PARKING', 200, NULL, FALSE, 'Garage Entry', 'ENTRY');
 
--- Fact table (clustered for performance)
+-- Fact table. Clustered by site first, so per-site dashboards and queries
+-- scan only that site's micro-partitions.
 CREATE OR REPLACE TABLE FCT_ACCESS_EVENTS (
     event_key NUMBER AUTOINCREMENT PRIMARY KEY,
     user_key NUMBER NOT NULL,
     zone_key NUMBER NOT NULL,
+    site_id VARCHAR(50) NOT NULL,
     badge_id VARCHAR(50) NOT NULL,
     reader_id VARCHAR(50) NOT NULL,
     event_timestamp TIMESTAMP_NTZ NOT NULL,
@@ -126,4 +177,105 @@ CREATE OR REPLACE TABLE FCT_ACCESS_EVENTS (
     CONSTRAINT fk_fct_zone FOREIGN KEY (zone_key) REFERENCES DIM_ZONES(zone_key)
 )
 COMMENT = 'DEMO: Access events fact table'
-CLUSTER BY (event_date);
+CLUSTER BY (site_id, event_date);
+
+-- Occupancy state (maintained incrementally by sfe_process_badge_events())
+CREATE OR REPLACE TABLE BADGE_OCCUPANCY_STATE (
+    badge_id VARCHAR(50) NOT NULL PRIMARY KEY,
+    user_key NUMBER,
+    current_zone_id VARCHAR(50),
+    is_inside BOOLEAN NOT NULL,
+    last_direction VARCHAR(10),
+    last_event_timestamp TIMESTAMP_NTZ NOT NULL,
+    event_count_date DATE,
+    event_count_today NUMBER DEFAULT 0,
+    updated_time TIMESTAMP_NTZ DEFAULT CURRENT_TIMESTAMP()
+)
+COMMENT = 'DEMO: Current location per badge (one row per badge)';
+
+CREATE OR REPLACE TABLE ZONE_OCCUPANCY (
+    zone_id VARCHAR(50) NOT NULL PRIMARY KEY,
+    occupant_count NUMBER NOT NULL DEFAULT 0,
+    updated_time TIMESTAMP_NTZ DEFAULT CURRENT_TIMESTAMP()
+)
+COMMENT = 'DEMO: Current occupant count per zone (entry/exit deltas)';
+
+INSERT INTO ZONE_OCCUPANCY (zone_id, occupant_count)
+SELECT zone_id, 0 FROM DIM_ZONES;
+
+-- Data-quality counters per ingestion hour (maintained incrementally by
+-- sfe_raw_to_staging_task and sfe_process_badge_events(); read by
+-- RAW_INGESTION.sfe_data_quality_metrics())
+CREATE OR REPLACE TABLE DATA_QUALITY_HOURLY (
+    metric_hour TIMESTAMP_NTZ NOT NULL PRIMARY KEY,
+    raw_event_count NUMBER NOT NULL DEFAULT 0,
+    weak_signal_count NUMBER NOT NULL DEFAULT 0,
+    duplicate_count NUMBER NOT NULL DEFAULT 0,
+    staged_event_count NUMBER NOT NULL DEFAULT 0,
+    orphan_user_count NUMBER NOT NULL DEFAULT 0,
+    orphan_zone_count NUMBER NOT NULL DEFAULT 0,
+    fact_event_count NUMBER NOT NULL DEFAULT 0,
+    updated_time TIMESTAMP_NTZ DEFAULT CURRENT_TIMESTAMP()
+)
+COMMENT = 'DEMO: Hourly data-quality counters (one row per ingestion hour)';
+
+-- Simulated sites (simulator/send_events.py --sites N --zones-per-site Z).
+-- Ids match event_stream.SiteLayout.generate(): SITE-001, SITE-001-Z001,
+-- reader SITE-001-Z001-R1 (first reader of the zone). Every 10th zone is
+-- restricted. Re-running adds missing sites and zones only; ZONE_OCCUPANCY
+-- gets a zone's row with its first entry.
+--   CALL SNOWFLAKE_EXAMPLE.ANALYTICS_LAYER.sfe_seed_sites(40, 10);
+CREATE OR REPLACE PROCEDURE sfe_seed_sites(site_count NUMBER, zones_per_site NUMBER)
+RETURNS VARCHAR
+LANGUAGE SQL
+COMMENT = 'DEMO: Seed DIM_SITES / DIM_ZONES for simulated sites'
+EXECUTE AS OWNER
+AS
+$$
+BEGIN
+    IF (site_count NOT BETWEEN 1 AND 999 OR zones_per_site NOT BETWEEN 1 AND 999) THEN
+        RETURN 'site_count and zones_per_site must be 1..999';
+    END IF;
+
+    MERGE INTO SNOWFLAKE_EXAMPLE.ANALYTICS_LAYER.DIM_SITES d
+    USING (
+        SELECT 'SITE-' || LPAD(n::VARCHAR, 3, '0') AS site_id, 'Site ' || LPAD(n::VARCHAR, 3, '0') AS site_name
+        FROM (SELECT ROW_NUMBER() OVER (ORDER BY SEQ4()) AS n FROM TABLE(GENERATOR(ROWCOUNT => 999)))
+        WHERE n <= :site_count
+    ) s
+    ON d.site_id = s.site_id
+    WHEN NOT MATCHED THEN
+        INSERT (site_id, site_name)
+        VALUES (s.site_id, s.site_name);
+
+    MERGE INTO SNOWFLAKE_EXAMPLE.ANALYTICS_LAYER.DIM_ZONES d
+    USING (
+        WITH numbers AS (
+            SELECT ROW_NUMBER() OVER (ORDER BY SEQ4()) AS n
+            FROM TABLE(GENERATOR(ROWCOUNT => 999))
+        )
+        SELECT
+            'SITE-' || LPAD(s.n::VARCHAR, 3, '0') AS site_id,
+            'SITE-' || LPAD(s.n::VARCHAR, 3, '0') || '-Z' || LPAD(z.n::VARCHAR, 3, '0') AS zone_id,
+            z.n AS zone_number,
+            'Site ' || LPAD(s.n::VARCHAR, 3, '0') AS building_name
+        FROM numbers s
+        JOIN numbers z
+            ON z.n <= :zones_per_site
+        WHERE s.n <= :site_count
+    ) s
+    ON d.zone_id = s.zone_id
+    WHEN NOT MATCHED THEN
+        INSERT (
+            zone_id, site_id, reader_id, building_name, floor_number, zone_name, zone_type,
+            capacity, is_restricted, reader_type
+        )
+        VALUES (
+            s.zone_id, s.site_id, s.zone_id || '-R1', s.building_name, 1,
+            'Zone ' || LPAD(s.zone_number::VARCHAR, 3, '0'),
+            IFF(s.zone_number % 10 = 0, 'SECURE_AREA', 'OFFICE'), 50, s.zone_number % 10 = 0, 'BIDIRECTIONAL'
+        );
+
+    RETURN 'Seeded ' || site_count || ' site(s) x ' || zones_per_site || ' zone(s)';
+END;
+$$;
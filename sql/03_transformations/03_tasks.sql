@@ -13,13 +13,94 @@ ALTER TASK IF EXISTS sfe_raw_to_staging_task SUSPEND;
 CALL SYSTEM$WAIT(2);
 
 -- Task 1: Deduplicate RAW to STAGING (runs every 1 minute)
+-- Both statements read the same stream batch inside one transaction; the
+-- stream offset only advances at COMMIT.
 CREATE OR REPLACE TASK sfe_raw_to_staging_task
     WAREHOUSE = COMPUTE_WH
     SCHEDULE = '1 MINUTE'
     COMMENT = 'DEMO: Deduplication task'
 WHEN SYSTEM$STREAM_HAS_DATA('sfe_badge_events_stream')
 AS
+EXECUTE IMMEDIATE $$
+BEGIN
+    BEGIN TRANSACTION;
+
+    -- Data-quality counters for this batch, per ingestion hour. Counted before
+    -- deduplication so duplicates are visible; a duplicate is a repeat of
+    -- (badge_id, event_timestamp) within the batch or one already staged.
+    MERGE INTO SNOWFLAKE_EXAMPLE.ANALYTICS_LAYER.DATA_QUALITY_HOURLY q
+    USING (
+        WITH batch AS (
+            SELECT
+                badge_id,
+                user_id,
+                zone_id,
+                event_timestamp,
+                signal_quality,
+                ingestion_time,
+                ROW_NUMBER() OVER (PARTITION BY badge_id, event_timestamp ORDER BY ingestion_time DESC) AS copy_rank
+            FROM SNOWFLAKE_EXAMPLE.RAW_INGESTION.sfe_badge_events_stream
+            WHERE METADATA$ACTION = 'INSERT'
+        ),
+        already_staged AS (
+            SELECT DISTINCT s.badge_id, s.event_timestamp
+            FROM SNOWFLAKE_EXAMPLE.STAGING_LAYER.STG_BADGE_EVENTS s
+            JOIN batch b
+                ON s.badge_id = b.badge_id
+                AND s.event_timestamp = b.event_timestamp
+            WHERE s.event_timestamp BETWEEN (SELECT MIN(event_timestamp) FROM batch)
+                                        AND (SELECT MAX(event_timestamp) FROM batch)
+        )
+        SELECT
+            DATE_TRUNC('hour', b.ingestion_time) AS metric_hour,
+            COUNT(*) AS raw_event_count,
+            COUNT_IF(b.signal_quality = 'WEAK') AS weak_signal_count,
+            COUNT_IF(b.copy_rank > 1 OR a.badge_id IS NOT NULL) AS duplicate_count,
+            COUNT_IF(b.copy_rank = 1) AS staged_event_count,
+            COUNT_IF(b.copy_rank = 1 AND u.user_id IS NULL) AS orphan_user_count,
+            COUNT_IF(b.copy_rank = 1 AND z.zone_id IS NULL) AS orphan_zone_count
+        FROM batch b
+        LEFT JOIN already_staged a
+            ON b.badge_id = a.badge_id
+            AND b.event_timestamp = a.event_timestamp
+        LEFT JOIN SNOWFLAKE_EXAMPLE.ANALYTICS_LAYER.DIM_USERS u
+            ON b.user_id = u.user_id AND u.is_current = TRUE
+        LEFT JOIN SNOWFLAKE_EXAMPLE.ANALYTICS_LAYER.DIM_ZONES z
+            ON b.zone_id = z.zone_id
+        GROUP BY DATE_TRUNC('hour', b.ingestion_time)
+    ) d
+    ON q.metric_hour = d.metric_hour
+    WHEN MATCHED THEN
+        UPDATE SET
+            raw_event_count = q.raw_event_count + d.raw_event_count,
+            weak_signal_count = q.weak_signal_count + d.weak_signal_count,
+            duplicate_count = q.duplicate_count + d.duplicate_count,
+            staged_event_count = q.staged_event_count + d.staged_event_count,
+            orphan_user_count = q.orphan_user_count + d.orphan_user_count,
+            orphan_zone_count = q.orphan_zone_count + d.orphan_zone_count,
+            updated_time = CURRENT_TIMESTAMP()
+    WHEN NOT MATCHED THEN
+        INSERT (
+            metric_hour,
+            raw_event_count,
+            weak_signal_count,
+            duplicate_count,
+            staged_event_count,
+            orphan_user_count,
+            orphan_zone_count
+        )
+        VALUES (
+            d.metric_hour,
+            d.raw_event_count,
+            d.weak_signal_count,
+            d.duplicate_count,
+            d.staged_event_count,
+            d.orphan_user_count,
+            d.orphan_zone_count
+        );
+
     INSERT INTO SNOWFLAKE_EXAMPLE.STAGING_LAYER.STG_BADGE_EVENTS (
+        site_id,
         badge_id,
         user_id,
         zone_id,
@@ -31,6 +112,7 @@ AS
         ingestion_time
     )
     SELECT
+        site_id,
         badge_id,
         user_id,
         zone_id,
@@ -40,10 +122,14 @@ AS
         signal_quality,
         direction,
         ingestion_time
-    FROM sfe_badge_events_stream
+    FROM SNOWFLAKE_EXAMPLE.RAW_INGESTION.sfe_badge_events_stream
     WHERE METADATA$ACTION = 'INSERT'
     QUALIFY ROW_NUMBER() OVER (PARTITION BY badge_id, event_timestamp ORDER BY ingestion_time DESC) = 1;
 
+    COMMIT;
+END;
+$$;
+
 -- Stored procedure: Enrich STAGING to ANALYTICS
 USE SCHEMA STAGING_LAYER;
 
@@ -84,39 +170,30 @@ BEGIN
             CURRENT_TIMESTAMP()
         );
 
-    -- Load fact table with enriched data
-    INSERT INTO SNOWFLAKE_EXAMPLE.ANALYTICS_LAYER.FCT_ACCESS_EVENTS (
-        user_key,
-        zone_key,
-        badge_id,
-        reader_id,
-        event_timestamp,
-        event_date,
-        event_hour,
-        event_day_of_week,
-        direction,
-        signal_strength,
-        signal_quality,
-        is_restricted_access,
-        is_after_hours,
-        is_weekend,
-        ingestion_time
-    )
+    -- The batch: enriched staging rows not yet in the fact table. The fact
+    -- load, data-quality counters and occupancy deltas below all read this
+    -- table, so they cover exactly the rows this call inserts (a call that
+    -- overlaps another cannot pick up its rows by load time). Temporary-table
+    -- DDL commits implicitly, so both batch tables are built before the
+    -- transaction opens.
+    CREATE OR REPLACE TEMPORARY TABLE sfe_fact_batch AS
     SELECT
         u.user_key,
         z.zone_key,
+        z.zone_id,
+        z.site_id,
         s.badge_id,
         s.reader_id,
         s.event_timestamp,
-        DATE(s.event_timestamp),
-        HOUR(s.event_timestamp),
-        DAYOFWEEK(s.event_timestamp),
+        DATE(s.event_timestamp) AS event_date,
+        HOUR(s.event_timestamp) AS event_hour,
+        DAYOFWEEK(s.event_timestamp) AS event_day_of_week,
         s.direction,
         s.signal_strength,
         s.signal_quality,
-        z.is_restricted,
-        IFF(HOUR(s.event_timestamp) < 6 OR HOUR(s.event_timestamp) >= 22, TRUE, FALSE),
-        IFF(DAYOFWEEK(s.event_timestamp) IN (0, 6), TRUE, FALSE),
+        z.is_restricted AS is_restricted_access,
+        IFF(HOUR(s.event_timestamp) < 6 OR HOUR(s.event_timestamp) >= 22, TRUE, FALSE) AS is_after_hours,
+        IFF(DAYOFWEEK(s.event_timestamp) IN (0, 6), TRUE, FALSE) AS is_weekend,
         s.ingestion_time
     FROM SNOWFLAKE_EXAMPLE.STAGING_LAYER.STG_BADGE_EVENTS s
     JOIN SNOWFLAKE_EXAMPLE.ANALYTICS_LAYER.DIM_USERS u
@@ -128,6 +205,159 @@ BEGIN
         AND s.event_timestamp = f.event_timestamp
     WHERE f.event_key IS NULL;
 
+    -- Entry/exit deltas from this batch for the occupancy state.
+    -- Only the latest event per badge matters; events older than the badge's
+    -- current state (late arrivals) do not move it.
+    CREATE OR REPLACE TEMPORARY TABLE sfe_occupancy_batch AS
+    WITH latest AS (
+        SELECT badge_id, user_key, zone_id, direction, event_timestamp, event_date
+        FROM sfe_fact_batch
+        QUALIFY ROW_NUMBER() OVER (PARTITION BY badge_id ORDER BY event_timestamp DESC) = 1
+    )
+    SELECT
+        l.*,
+        COUNT_IF(b.event_date = l.event_date) AS batch_event_count
+    FROM latest l
+    JOIN sfe_fact_batch b
+        ON l.badge_id = b.badge_id
+    GROUP BY ALL;
+
+    -- Facts, counters and occupancy commit together: a failure leaves none of
+    -- them applied, and the next run retries the whole batch.
+    BEGIN TRANSACTION;
+
+    -- Load fact table with enriched data
+    INSERT INTO SNOWFLAKE_EXAMPLE.ANALYTICS_LAYER.FCT_ACCESS_EVENTS (
+        user_key,
+        zone_key,
+        site_id,
+        badge_id,
+        reader_id,
+        event_timestamp,
+        event_date,
+        event_hour,
+        event_day_of_week,
+        direction,
+        signal_strength,
+        signal_quality,
+        is_restricted_access,
+        is_after_hours,
+        is_weekend,
+        ingestion_time
+    )
+    SELECT
+        user_key,
+        zone_key,
+        site_id,
+        badge_id,
+        reader_id,
+        event_timestamp,
+        event_date,
+        event_hour,
+        event_day_of_week,
+        direction,
+        signal_strength,
+        signal_quality,
+        is_restricted_access,
+        is_after_hours,
+        is_weekend,
+        ingestion_time
+    FROM sfe_fact_batch;
+
+    -- Fact rows loaded by this call, per ingestion hour (data-quality counters)
+    MERGE INTO SNOWFLAKE_EXAMPLE.ANALYTICS_LAYER.DATA_QUALITY_HOURLY q
+    USING (
+        SELECT
+            DATE_TRUNC('hour', ingestion_time) AS metric_hour,
+            COUNT(*) AS fact_event_count
+        FROM sfe_fact_batch
+        GROUP BY DATE_TRUNC('hour', ingestion_time)
+    ) d
+    ON q.metric_hour = d.metric_hour
+    WHEN MATCHED THEN
+        UPDATE SET
+            fact_event_count = q.fact_event_count + d.fact_event_count,
+            updated_time = CURRENT_TIMESTAMP()
+    WHEN NOT MATCHED THEN
+        INSERT (metric_hour, fact_event_count)
+        VALUES (d.metric_hour, d.fact_event_count);
+
+    -- Apply this batch's entry/exit deltas to the occupancy state
+    MERGE INTO SNOWFLAKE_EXAMPLE.ANALYTICS_LAYER.ZONE_OCCUPANCY o
+    USING (
+        SELECT zone_id, SUM(delta) AS delta
+        FROM (
+            -- Leave the zone the badge was in
+            SELECT s.current_zone_id AS zone_id, -1 AS delta
+            FROM sfe_occupancy_batch b
+            JOIN SNOWFLAKE_EXAMPLE.ANALYTICS_LAYER.BADGE_OCCUPANCY_STATE s
+                ON b.badge_id = s.badge_id
+            WHERE s.is_inside
+                AND b.event_timestamp > s.last_event_timestamp
+
+            UNION ALL
+
+            -- Enter the new zone
+            SELECT b.zone_id, 1 AS delta
+            FROM sfe_occupancy_batch b
+            LEFT JOIN SNOWFLAKE_EXAMPLE.ANALYTICS_LAYER.BADGE_OCCUPANCY_STATE s
+                ON b.badge_id = s.badge_id
+            WHERE b.direction = 'ENTRY'
+                AND (s.badge_id IS NULL OR b.event_timestamp > s.last_event_timestamp)
+        )
+        GROUP BY zone_id
+        HAVING SUM(delta) <> 0
+    ) d
+    ON o.zone_id = d.zone_id
+    WHEN MATCHED THEN
+        UPDATE SET
+            occupant_count = o.occupant_count + d.delta,
+            updated_time = CURRENT_TIMESTAMP()
+    WHEN NOT MATCHED THEN
+        INSERT (zone_id, occupant_count)
+        VALUES (d.zone_id, d.delta);
+
+    MERGE INTO SNOWFLAKE_EXAMPLE.ANALYTICS_LAYER.BADGE_OCCUPANCY_STATE s
+    USING sfe_occupancy_batch b
+    ON s.badge_id = b.badge_id
+    WHEN MATCHED AND b.event_timestamp > s.last_event_timestamp THEN
+        UPDATE SET
+            user_key = b.user_key,
+            current_zone_id = b.zone_id,
+            is_inside = (b.direction = 'ENTRY'),
+            last_direction = b.direction,
+            last_event_timestamp = b.event_timestamp,
+            event_count_today = IFF(s.event_count_date = b.event_date, s.event_count_today + b.batch_event_count, b.batch_event_count),
+            event_count_date = b.event_date,
+            updated_time = CURRENT_TIMESTAMP()
+    WHEN MATCHED AND b.event_date = s.event_count_date THEN
+        UPDATE SET
+            event_count_today = s.event_count_today + b.batch_event_count,
+            updated_time = CURRENT_TIMESTAMP()
+    WHEN NOT MATCHED THEN
+        INSERT (
+            badge_id,
+            user_key,
+            current_zone_id,
+            is_inside,
+            last_direction,
+            last_event_timestamp,
+            event_count_date,
+            event_count_today
+        )
+        VALUES (
+            b.badge_id,
+            b.user_key,
+            b.zone_id,
+            b.direction = 'ENTRY',
+            b.direction,
+            b.event_timestamp,
+            b.event_date,
+            b.batch_event_count
+        );
+
+    COMMIT;
+
     RETURN 'COMPLETED';
 END;
 $$;
@@ -142,6 +372,10 @@ CREATE OR REPLACE TASK sfe_staging_to_analytics_task
 AS
     CALL SNOWFLAKE_EXAMPLE.STAGING_LAYER.sfe_process_badge_events();
 
+-- Record schedule mode (read by sql/04_monitoring/05_latency_comparison.sql)
+INSERT INTO TASK_SCHEDULE_HISTORY (schedule_mode, schedule_detail)
+VALUES ('SCHEDULED', 'SCHEDULE = 1 MINUTE | WAREHOUSE = COMPUTE_WH');
+
 -- Resume tasks (child first, then parent)
 ALTER TASK IF EXISTS sfe_staging_to_analytics_task SUSPEND;
 ALTER TASK IF EXISTS sfe_raw_to_staging_task SUSPEND;
@@ -0,0 +1,48 @@
+/*******************************************************************************
+ * Low-Latency Tasks (optional)
+ * Converts: sfe_raw_to_staging_task -> triggered, serverless root task
+ *           sfe_staging_to_analytics_task -> serverless child task
+ * Revert: re-run sql/03_transformations/03_tasks.sql (1-minute schedule)
+ * Compare: sql/04_monitoring/05_latency_comparison.sql
+ * Time: 10 seconds
+ ******************************************************************************/
+
+-- Serverless tasks need the account-level EXECUTE MANAGED TASK privilege
+USE ROLE ACCOUNTADMIN;
+GRANT EXECUTE MANAGED TASK ON ACCOUNT TO ROLE SYSADMIN;
+
+USE ROLE SYSADMIN;
+USE DATABASE SNOWFLAKE_EXAMPLE;
+USE SCHEMA RAW_INGESTION;
+
+-- Suspend the graph (parent first)
+ALTER TASK IF EXISTS sfe_raw_to_staging_task SUSPEND;
+ALTER TASK IF EXISTS sfe_staging_to_analytics_task SUSPEND;
+CALL SYSTEM$WAIT(2);
+
+-- Root task: drop the fixed schedule so the task fires when the stream has data
+-- (triggered task). The WHEN SYSTEM$STREAM_HAS_DATA clause is kept as-is.
+ALTER TASK sfe_raw_to_staging_task UNSET SCHEDULE;
+ALTER TASK sfe_raw_to_staging_task UNSET WAREHOUSE;
+ALTER TASK sfe_raw_to_staging_task SET
+    USER_TASK_MANAGED_INITIAL_WAREHOUSE_SIZE = 'XSMALL'
+    USER_TASK_MINIMUM_TRIGGER_INTERVAL_IN_SECONDS = 10
+    TARGET_COMPLETION_INTERVAL = '1 MINUTE'
+    COMMENT = 'DEMO: Deduplication task (triggered, serverless)';
+
+-- Child task: serverless so it does not wait on COMPUTE_WH resume
+ALTER TASK sfe_staging_to_analytics_task UNSET WAREHOUSE;
+ALTER TASK sfe_staging_to_analytics_task SET
+    USER_TASK_MANAGED_INITIAL_WAREHOUSE_SIZE = 'XSMALL'
+    TARGET_COMPLETION_INTERVAL = '1 MINUTE'
+    COMMENT = 'DEMO: Enrichment task (serverless)';
+
+-- Record the mode switch for latency comparison
+INSERT INTO TASK_SCHEDULE_HISTORY (schedule_mode, schedule_detail)
+VALUES ('TRIGGERED', 'Triggered on stream data | serverless XSMALL | min interval 10s | target completion 1 minute');
+
+-- Resume tasks (child first, then parent)
+ALTER TASK sfe_staging_to_analytics_task RESUME;
+ALTER TASK sfe_raw_to_staging_task RESUME;
+
+SHOW TASKS IN SCHEMA RAW_INGESTION;
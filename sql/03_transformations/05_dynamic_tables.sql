@@ -0,0 +1,213 @@
+/*******************************************************************************
+ * Dynamic Tables (optional alternative to 03_tasks.sql)
+ * Replaces: sfe_raw_to_staging_task, sfe_staging_to_analytics_task,
+ *           sfe_process_badge_events() with incremental dynamic tables
+ * Creates:  STAGING_LAYER.STG_BADGE_EVENTS        (dynamic, TARGET_LAG = DOWNSTREAM)
+ *           ANALYTICS_LAYER.FCT_ACCESS_EVENTS      (dynamic, TARGET_LAG = $DT_TARGET_LAG)
+ *           ANALYTICS_LAYER.BADGE_OCCUPANCY_STATE  (dynamic, TARGET_LAG = DOWNSTREAM)
+ *           ANALYTICS_LAYER.ZONE_OCCUPANCY         (dynamic, TARGET_LAG = $DT_TARGET_LAG)
+ *           ANALYTICS_LAYER.DATA_QUALITY_HOURLY    (dynamic, TARGET_LAG = 5 minutes)
+ * Select:   SET TRANSFORM_MODE = 'DYNAMIC_TABLES' in deploy_all.sql
+ * Revert:   re-run 02_analytics.sql and 03_tasks.sql
+ * Time: 15 seconds
+ *
+ * Differences from the task chain:
+ *   - staging_time / fact_load_time equal ingestion_time (incremental refresh
+ *     does not allow CURRENT_TIMESTAMP()); layer lag is reported by
+ *     V_TRANSFORM_REFRESH_COMPARISON from DYNAMIC_TABLE_REFRESH_HISTORY
+ *   - no event_key surrogate; unknown users are not auto-created and load
+ *     with a NULL user_key (visible as orphans in V_DATA_QUALITY_METRICS)
+ *   - DATA_QUALITY_HOURLY counts duplicates within an ingestion hour rather
+ *     than per task batch
+ ******************************************************************************/
+
+USE ROLE SYSADMIN;
+USE DATABASE SNOWFLAKE_EXAMPLE;
+USE SCHEMA RAW_INGESTION;
+
+-- Remove the task chain (parent first); the stream is kept for reverting
+ALTER TASK IF EXISTS sfe_raw_to_staging_task SUSPEND;
+ALTER TASK IF EXISTS sfe_staging_to_analytics_task SUSPEND;
+CALL SYSTEM$WAIT(2);
+
+DROP TASK IF EXISTS sfe_staging_to_analytics_task;
+DROP TASK IF EXISTS sfe_raw_to_staging_task;
+
+-- Drop the base tables created by 02_analytics.sql (dynamic tables cannot
+-- replace a regular table of the same name)
+EXECUTE IMMEDIATE $$
+DECLARE
+  base_tables CURSOR FOR
+    SELECT table_schema, table_name
+    FROM SNOWFLAKE_EXAMPLE.INFORMATION_SCHEMA.TABLES
+    WHERE is_dynamic = 'NO'
+      AND table_schema || '.' || table_name IN (
+        'ANALYTICS_LAYER.DATA_QUALITY_HOURLY',
+        'ANALYTICS_LAYER.ZONE_OCCUPANCY',
+        'ANALYTICS_LAYER.BADGE_OCCUPANCY_STATE',
+        'ANALYTICS_LAYER.FCT_ACCESS_EVENTS',
+        'STAGING_LAYER.STG_BADGE_EVENTS'
+      );
+BEGIN
+  FOR t IN base_tables DO
+    EXECUTE IMMEDIATE 'DROP TABLE SNOWFLAKE_EXAMPLE.' || t.table_schema || '.' || t.table_name;
+  END FOR;
+END;
+$$;
+
+-- Staging: deduplicate RAW on (badge_id, event_timestamp).
+-- TARGET_LAG = DOWNSTREAM refreshes only when the fact table needs it.
+CREATE OR REPLACE DYNAMIC TABLE SNOWFLAKE_EXAMPLE.STAGING_LAYER.STG_BADGE_EVENTS
+    TARGET_LAG = DOWNSTREAM
+    WAREHOUSE = COMPUTE_WH
+    REFRESH_MODE = INCREMENTAL
+    INITIALIZE = ON_CREATE
+    COMMENT = 'DEMO: Deduplicated staging (dynamic table)'
+AS
+    SELECT
+        site_id,
+        badge_id,
+        user_id,
+        zone_id,
+        reader_id,
+        event_timestamp,
+        signal_strength,
+        signal_quality,
+        direction,
+        ingestion_time,
+        ingestion_time AS staging_time
+    FROM SNOWFLAKE_EXAMPLE.RAW_INGESTION.RAW_BADGE_EVENTS
+    QUALIFY ROW_NUMBER() OVER (PARTITION BY badge_id, event_timestamp ORDER BY ingestion_time DESC) = 1;
+
+-- Analytics: enrich staging with user and zone dimensions
+CREATE OR REPLACE DYNAMIC TABLE SNOWFLAKE_EXAMPLE.ANALYTICS_LAYER.FCT_ACCESS_EVENTS
+    TARGET_LAG = '1 minute'
+    WAREHOUSE = COMPUTE_WH
+    REFRESH_MODE = INCREMENTAL
+    INITIALIZE = ON_CREATE
+    CLUSTER BY (site_id, event_date)
+    COMMENT = 'DEMO: Access events fact table (dynamic table)'
+AS
+    SELECT
+        u.user_key,
+        z.zone_key,
+        z.site_id,
+        s.badge_id,
+        s.reader_id,
+        s.event_timestamp,
+        DATE(s.event_timestamp) AS event_date,
+        HOUR(s.event_timestamp) AS event_hour,
+        DAYOFWEEK(s.event_timestamp) AS event_day_of_week,
+        s.direction,
+        s.signal_strength,
+        s.signal_quality,
+        z.is_restricted AS is_restricted_access,
+        IFF(HOUR(s.event_timestamp) < 6 OR HOUR(s.event_timestamp) >= 22, TRUE, FALSE) AS is_after_hours,
+        IFF(DAYOFWEEK(s.event_timestamp) IN (0, 6), TRUE, FALSE) AS is_weekend,
+        s.ingestion_time,
+        s.ingestion_time AS fact_load_time
+    FROM SNOWFLAKE_EXAMPLE.STAGING_LAYER.STG_BADGE_EVENTS s
+    JOIN SNOWFLAKE_EXAMPLE.ANALYTICS_LAYER.DIM_ZONES z
+        ON s.zone_id = z.zone_id
+    LEFT JOIN SNOWFLAKE_EXAMPLE.ANALYTICS_LAYER.DIM_USERS u
+        ON s.user_id = u.user_id AND u.is_current = TRUE;
+
+-- Occupancy: latest event per badge, then occupant count per zone
+CREATE OR REPLACE DYNAMIC TABLE SNOWFLAKE_EXAMPLE.ANALYTICS_LAYER.BADGE_OCCUPANCY_STATE
+    TARGET_LAG = DOWNSTREAM
+    WAREHOUSE = COMPUTE_WH
+    REFRESH_MODE = INCREMENTAL
+    INITIALIZE = ON_CREATE
+    COMMENT = 'DEMO: Current location per badge (dynamic table)'
+AS
+    WITH daily_counts AS (
+        SELECT badge_id, event_date, COUNT(*) AS event_count
+        FROM SNOWFLAKE_EXAMPLE.ANALYTICS_LAYER.FCT_ACCESS_EVENTS
+        GROUP BY badge_id, event_date
+    )
+    SELECT
+        f.badge_id,
+        f.user_key,
+        z.zone_id AS current_zone_id,
+        f.direction = 'ENTRY' AS is_inside,
+        f.direction AS last_direction,
+        f.event_timestamp AS last_event_timestamp,
+        f.event_date AS event_count_date,
+        d.event_count AS event_count_today,
+        f.ingestion_time AS updated_time
+    FROM SNOWFLAKE_EXAMPLE.ANALYTICS_LAYER.FCT_ACCESS_EVENTS f
+    JOIN SNOWFLAKE_EXAMPLE.ANALYTICS_LAYER.DIM_ZONES z
+        ON f.zone_key = z.zone_key
+    JOIN daily_counts d
+        ON f.badge_id = d.badge_id AND f.event_date = d.event_date
+    QUALIFY ROW_NUMBER() OVER (PARTITION BY f.badge_id ORDER BY f.event_timestamp DESC) = 1;
+
+CREATE OR REPLACE DYNAMIC TABLE SNOWFLAKE_EXAMPLE.ANALYTICS_LAYER.ZONE_OCCUPANCY
+    TARGET_LAG = '1 minute'
+    WAREHOUSE = COMPUTE_WH
+    REFRESH_MODE = INCREMENTAL
+    INITIALIZE = ON_CREATE
+    COMMENT = 'DEMO: Current occupant count per zone (dynamic table)'
+AS
+    SELECT
+        current_zone_id AS zone_id,
+        COUNT_IF(is_inside) AS occupant_count,
+        MAX(updated_time) AS updated_time
+    FROM SNOWFLAKE_EXAMPLE.ANALYTICS_LAYER.BADGE_OCCUPANCY_STATE
+    GROUP BY current_zone_id;
+
+-- Data-quality counters per ingestion hour (same columns as the task-maintained
+-- table). Duplicates are repeats of (badge_id, event_timestamp) within an hour;
+-- orphans are checked against the current dimensions at refresh time.
+CREATE OR REPLACE DYNAMIC TABLE SNOWFLAKE_EXAMPLE.ANALYTICS_LAYER.DATA_QUALITY_HOURLY
+    TARGET_LAG = '5 minutes'
+    WAREHOUSE = COMPUTE_WH
+    REFRESH_MODE = AUTO
+    INITIALIZE = ON_CREATE
+    COMMENT = 'DEMO: Hourly data-quality counters (dynamic table)'
+AS
+    WITH event_keys AS (
+        SELECT
+            DATE_TRUNC('hour', ingestion_time) AS metric_hour,
+            badge_id,
+            event_timestamp,
+            ANY_VALUE(user_id) AS user_id,
+            ANY_VALUE(zone_id) AS zone_id,
+            COUNT(*) AS copies,
+            COUNT_IF(signal_quality = 'WEAK') AS weak_copies,
+            MAX(ingestion_time) AS last_ingestion_time
+        FROM SNOWFLAKE_EXAMPLE.RAW_INGESTION.RAW_BADGE_EVENTS
+        GROUP BY DATE_TRUNC('hour', ingestion_time), badge_id, event_timestamp
+    )
+    SELECT
+        k.metric_hour,
+        SUM(k.copies) AS raw_event_count,
+        SUM(k.weak_copies) AS weak_signal_count,
+        SUM(k.copies - 1) AS duplicate_count,
+        COUNT(*) AS staged_event_count,
+        COUNT_IF(u.user_id IS NULL) AS orphan_user_count,
+        COUNT_IF(z.zone_id IS NULL) AS orphan_zone_count,
+        COUNT_IF(z.zone_id IS NOT NULL) AS fact_event_count,
+        MAX(k.last_ingestion_time) AS updated_time
+    FROM event_keys k
+    LEFT JOIN SNOWFLAKE_EXAMPLE.ANALYTICS_LAYER.DIM_USERS u
+        ON k.user_id = u.user_id AND u.is_current = TRUE
+    LEFT JOIN SNOWFLAKE_EXAMPLE.ANALYTICS_LAYER.DIM_ZONES z
+        ON k.zone_id = z.zone_id
+    GROUP BY k.metric_hour;
+
+-- Apply the configured target lag (deploy_all.sql: SET DT_TARGET_LAG = '...')
+EXECUTE IMMEDIATE $$
+DECLARE
+  target_lag VARCHAR DEFAULT '1 minute';
+BEGIN
+  target_lag := COALESCE(GETVARIABLE('DT_TARGET_LAG'), target_lag);
+  EXECUTE IMMEDIATE 'ALTER DYNAMIC TABLE SNOWFLAKE_EXAMPLE.ANALYTICS_LAYER.FCT_ACCESS_EVENTS SET TARGET_LAG = ''' || target_lag || '''';
+  EXECUTE IMMEDIATE 'ALTER DYNAMIC TABLE SNOWFLAKE_EXAMPLE.ANALYTICS_LAYER.ZONE_OCCUPANCY SET TARGET_LAG = ''' || target_lag || '''';
+  INSERT INTO SNOWFLAKE_EXAMPLE.RAW_INGESTION.TASK_SCHEDULE_HISTORY (schedule_mode, schedule_detail)
+    VALUES ('DYNAMIC_TABLES', 'Incremental dynamic tables | TARGET_LAG = ' || :target_lag || ' | WAREHOUSE = COMPUTE_WH');
+  RETURN 'FCT_ACCESS_EVENTS target lag: ' || target_lag;
+END;
+$$;
+
+SHOW DYNAMIC TABLES IN DATABASE SNOWFLAKE_EXAMPLE;
@@ -17,6 +17,17 @@
  *   6. V_STREAMING_COSTS: Cost tracking with actual credits (FILE_MIGRATION_HISTORY)
  *   7. V_TASK_EXECUTION_HISTORY: Task performance (TASK_HISTORY)
  *   8. V_STREAMING_CLIENT_METRICS: Client-side ingestion metrics (CLIENT_HISTORY)
+ *   9. V_TRANSFORM_REFRESH_COMPARISON: Tasks vs dynamic tables refresh time/credits
+ *  10. V_ACTIVE_BADGES / V_ZONE_OCCUPANCY: Current occupancy (state tables)
+ *  11. V_PIPELINE_COST_PERFORMANCE: Daily cost per million events and stage latency
+ *  12. V_TASK_SIZING_RECOMMENDATION: Serverless vs warehouse sizing per task
+ *  13. V_DASHBOARD_QUERY_HISTORY: Streamlit dashboard queries by page/panel (QUERY_HISTORY)
+ *  14. V_SITE_INGESTION_METRICS: Hourly ingestion per site (filter by site_id)
+ *  15. V_ALERT_SUMMARY: Hourly anomaly alerts per type and site (BADGE_ALERTS)
+ *
+ * FUNCTIONS CREATED:
+ *   - sfe_data_quality_metrics(lookback_hours): DQ summary over hourly buckets
+ *     (backs V_DATA_QUALITY_METRICS)
  *
  * WARNING:  NOTE: ACCOUNT_USAGE views have latency (up to 120 minutes).
  *     V_CHANNEL_STATUS and V_STREAMING_COSTS use FILE_MIGRATION_HISTORY.
@@ -93,52 +104,97 @@ SELECT
 FROM hourly_stats
 ORDER BY ingestion_hour DESC;
 
+-- ============================================================================
+-- View 2b: Site Ingestion Metrics
+-- ============================================================================
+-- V_INGESTION_METRICS per site. RAW_BADGE_EVENTS is clustered by
+-- (site_id, ingestion date), so a per-site dashboard that filters
+-- WHERE site_id = '<site>' scans only that site's recent micro-partitions.
+
+CREATE OR REPLACE VIEW V_SITE_INGESTION_METRICS
+COMMENT = 'DEMO: sfe-simple-stream - Hourly ingestion metrics per site for the last 24 hours'
+AS
+SELECT
+    site_id,
+    DATE_TRUNC('hour', ingestion_time) AS ingestion_hour,
+    COUNT(*) AS event_count,
+    COUNT(DISTINCT badge_id) AS unique_badges,
+    COUNT(DISTINCT zone_id) AS unique_zones,
+    COUNT(DISTINCT reader_id) AS active_readers,
+    SUM(CASE WHEN signal_quality = 'WEAK' THEN 1 ELSE 0 END) AS weak_signal_count,
+    SUM(CASE WHEN direction = 'ENTRY' THEN 1 ELSE 0 END) AS entry_count,
+    SUM(CASE WHEN direction = 'EXIT' THEN 1 ELSE 0 END) AS exit_count,
+    MAX(ingestion_time) AS last_ingestion_time
+FROM RAW_BADGE_EVENTS
+WHERE ingestion_time >= DATEADD('day', -1, CURRENT_TIMESTAMP())
+GROUP BY site_id, DATE_TRUNC('hour', ingestion_time);
+
 -- ============================================================================
 -- View 3: Active Badges
 -- ============================================================================
--- "Active" means seen in the last 24 hours. For higher volume workloads, reduce the window.
+-- "Active" means seen in the last 24 hours. Reads the per-badge occupancy state
+-- maintained by sfe_process_badge_events() (or the BADGE_OCCUPANCY_STATE dynamic
+-- table), so the cost is one row per badge instead of a scan of event history.
 
 CREATE OR REPLACE VIEW V_ACTIVE_BADGES
 COMMENT = 'DEMO: simple-stream - Active badges (last seen location and activity)'
 AS
-WITH events AS (
-    SELECT
-        badge_id,
-        user_id,
-        zone_id,
-        event_timestamp,
-        ingestion_time
-    FROM RAW_BADGE_EVENTS
-    WHERE ingestion_time >= DATEADD('day', -1, CURRENT_TIMESTAMP())
-),
-latest AS (
-    SELECT
-        badge_id,
-        user_id,
-        zone_id AS last_zone,
-        event_timestamp AS last_seen
-    FROM events
-    QUALIFY ROW_NUMBER() OVER (PARTITION BY badge_id ORDER BY event_timestamp DESC) = 1
-),
-counts AS (
-    SELECT
-        badge_id,
-        COUNT_IF(DATE(event_timestamp) = CURRENT_DATE()) AS event_count_today
-    FROM events
-    GROUP BY badge_id
-)
 SELECT
-    l.badge_id,
-    l.user_id,
+    s.badge_id,
+    u.user_id,
     u.user_name,
-    l.last_zone,
-    l.last_seen,
-    c.event_count_today
-FROM latest l
+    s.current_zone_id AS last_zone,
+    s.last_event_timestamp AS last_seen,
+    IFF(s.event_count_date = CURRENT_DATE(), s.event_count_today, 0) AS event_count_today,
+    s.is_inside
+FROM SNOWFLAKE_EXAMPLE.ANALYTICS_LAYER.BADGE_OCCUPANCY_STATE s
 LEFT JOIN SNOWFLAKE_EXAMPLE.ANALYTICS_LAYER.DIM_USERS u
-    ON l.user_id = u.user_id AND u.is_current = TRUE
-LEFT JOIN counts c
-    ON l.badge_id = c.badge_id;
+    ON s.user_key = u.user_key
+WHERE s.last_event_timestamp >= DATEADD('day', -1, CURRENT_TIMESTAMP());
+
+-- ============================================================================
+-- View 3b: Zone Occupancy
+-- ============================================================================
+-- Current occupant count per zone (point lookup on ZONE_OCCUPANCY).
+
+CREATE OR REPLACE VIEW V_ZONE_OCCUPANCY
+COMMENT = 'DEMO: simple-stream - Current occupancy per zone (incrementally maintained)'
+AS
+SELECT
+    z.zone_id,
+    z.zone_name,
+    z.building_name,
+    z.capacity,
+    COALESCE(o.occupant_count, 0) AS occupant_count,
+    ROUND(100.0 * COALESCE(o.occupant_count, 0) / NULLIF(z.capacity, 0), 1) AS utilization_pct,
+    o.updated_time
+FROM SNOWFLAKE_EXAMPLE.ANALYTICS_LAYER.DIM_ZONES z
+LEFT JOIN SNOWFLAKE_EXAMPLE.ANALYTICS_LAYER.ZONE_OCCUPANCY o
+    ON z.zone_id = o.zone_id;
+
+-- ============================================================================
+-- View 3c: Alert Summary
+-- ============================================================================
+-- Anomaly alerts per type, site and hour over the last 24 hours. BADGE_ALERTS
+-- is written by the streaming detector (simulator/anomaly.py); detection delay
+-- is event time to the alert landing in Snowflake.
+
+CREATE OR REPLACE VIEW V_ALERT_SUMMARY
+COMMENT = 'DEMO: sfe-simple-stream - Hourly anomaly alerts per type and site for the last 24 hours'
+AS
+SELECT
+    alert_type,
+    site_id,
+    DATE_TRUNC('hour', event_timestamp) AS alert_hour,
+    COUNT(*) AS alert_count,
+    SUM(CASE WHEN severity = 'HIGH' THEN 1 ELSE 0 END) AS high_severity_count,
+    COUNT(DISTINCT badge_id) AS unique_badges,
+    COUNT(DISTINCT reader_id) AS unique_readers,
+    MEDIAN(DATEDIFF('second', event_timestamp, ingestion_time)) AS p50_detection_delay_seconds,
+    MAX(event_timestamp) AS last_alert_time
+FROM BADGE_ALERTS
+WHERE event_timestamp >= DATEADD('day', -1, CURRENT_TIMESTAMP())
+GROUP BY alert_type, site_id, DATE_TRUNC('hour', event_timestamp);
 
 -- ============================================================================
 -- View 3: End-to-End Latency
@@ -223,72 +279,62 @@ FROM SNOWFLAKE_EXAMPLE.ANALYTICS_LAYER.FCT_ACCESS_EVENTS;
 -- ============================================================================
 -- View 5: Data Quality Metrics
 -- ============================================================================
--- Summary metrics for last 24 hours. Intended for demo monitoring (not a full DQ framework).
+-- Summary metrics over recent hourly buckets of ANALYTICS_LAYER.DATA_QUALITY_HOURLY,
+-- which the transformation tasks (or dynamic table) maintain incrementally, so
+-- reads do not scan RAW/STAGING/FACT. Intended for demo monitoring (not a full
+-- DQ framework).
+--   V_DATA_QUALITY_METRICS                                  last 24 hours
+--   SELECT * FROM TABLE(sfe_data_quality_metrics(<hours>))  any lookback
+-- Buckets are whole ingestion hours, so the oldest bucket may extend up to one
+-- hour beyond the lookback.
 
-CREATE OR REPLACE VIEW V_DATA_QUALITY_METRICS
-COMMENT = 'DEMO: simple-stream - Data quality summary metrics (last 24 hours)'
+CREATE OR REPLACE FUNCTION sfe_data_quality_metrics(lookback_hours NUMBER)
+RETURNS TABLE (
+    total_raw_events NUMBER,
+    total_staged_events NUMBER,
+    total_fact_events NUMBER,
+    duplicate_count NUMBER,
+    duplicate_rate_pct NUMBER(10, 2),
+    orphan_user_count NUMBER,
+    orphan_zone_count NUMBER,
+    orphan_rate_pct NUMBER(10, 2),
+    weak_signal_count NUMBER,
+    weak_signal_rate_pct NUMBER(10, 2)
+)
+COMMENT = 'DEMO: sfe-simple-stream - Data quality summary over the last N hours (hourly buckets)'
 AS
-WITH
-raw AS (
-    SELECT
-        COUNT(*) AS total_raw_events,
-        SUM(IFF(signal_quality = 'WEAK', 1, 0)) AS weak_signal_count
-    FROM RAW_BADGE_EVENTS
-    WHERE ingestion_time >= DATEADD('day', -1, CURRENT_TIMESTAMP())
-),
-stg AS (
-    SELECT
-        COUNT(*) AS total_staged_events
-    FROM SNOWFLAKE_EXAMPLE.STAGING_LAYER.STG_BADGE_EVENTS
-    WHERE staging_time >= DATEADD('day', -1, CURRENT_TIMESTAMP())
-),
-fct AS (
-    SELECT
-        COUNT(*) AS total_fact_events
-    FROM SNOWFLAKE_EXAMPLE.ANALYTICS_LAYER.FCT_ACCESS_EVENTS
-    WHERE fact_load_time >= DATEADD('day', -1, CURRENT_TIMESTAMP())
-),
-duplicates AS (
-    SELECT
-        COALESCE(SUM(dup_count - 1), 0) AS duplicate_count
-    FROM (
-        SELECT COUNT(*) AS dup_count
-        FROM RAW_BADGE_EVENTS
-        WHERE ingestion_time >= DATEADD('day', -1, CURRENT_TIMESTAMP())
-        GROUP BY badge_id, event_timestamp
-        HAVING COUNT(*) > 1
+$$
+    WITH totals AS (
+        SELECT
+            COALESCE(SUM(raw_event_count), 0) AS total_raw_events,
+            COALESCE(SUM(staged_event_count), 0) AS total_staged_events,
+            COALESCE(SUM(fact_event_count), 0) AS total_fact_events,
+            COALESCE(SUM(duplicate_count), 0) AS duplicate_count,
+            COALESCE(SUM(orphan_user_count), 0) AS orphan_user_count,
+            COALESCE(SUM(orphan_zone_count), 0) AS orphan_zone_count,
+            COALESCE(SUM(weak_signal_count), 0) AS weak_signal_count
+        FROM SNOWFLAKE_EXAMPLE.ANALYTICS_LAYER.DATA_QUALITY_HOURLY
+        WHERE metric_hour >= DATE_TRUNC('hour', DATEADD('hour', -lookback_hours, CURRENT_TIMESTAMP()))
     )
-),
-orphans AS (
     SELECT
-        COUNT_IF(u.user_key IS NULL) AS orphan_user_count,
-        COUNT_IF(z.zone_key IS NULL) AS orphan_zone_count
-    FROM SNOWFLAKE_EXAMPLE.STAGING_LAYER.STG_BADGE_EVENTS s
-    LEFT JOIN SNOWFLAKE_EXAMPLE.ANALYTICS_LAYER.DIM_USERS u
-        ON s.user_id = u.user_id AND u.is_current = TRUE
-    LEFT JOIN SNOWFLAKE_EXAMPLE.ANALYTICS_LAYER.DIM_ZONES z
-        ON s.zone_id = z.zone_id
-    WHERE s.staging_time >= DATEADD('day', -1, CURRENT_TIMESTAMP())
-)
-SELECT
-    raw.total_raw_events,
-    stg.total_staged_events,
-    fct.total_fact_events,
-    duplicates.duplicate_count,
-    ROUND(100.0 * duplicates.duplicate_count / NULLIF(raw.total_raw_events, 0), 2) AS duplicate_rate_pct,
-    orphans.orphan_user_count,
-    orphans.orphan_zone_count,
-    ROUND(
-        100.0 * (orphans.orphan_user_count + orphans.orphan_zone_count) / NULLIF(stg.total_staged_events, 0),
-        2
-    ) AS orphan_rate_pct,
-    raw.weak_signal_count,
-    ROUND(100.0 * raw.weak_signal_count / NULLIF(raw.total_raw_events, 0), 2) AS weak_signal_rate_pct
-FROM raw
-CROSS JOIN stg
-CROSS JOIN fct
-CROSS JOIN duplicates
-CROSS JOIN orphans;
+        total_raw_events,
+        total_staged_events,
+        total_fact_events,
+        duplicate_count,
+        ROUND(100.0 * duplicate_count / NULLIF(total_raw_events, 0), 2),
+        orphan_user_count,
+        orphan_zone_count,
+        ROUND(100.0 * (orphan_user_count + orphan_zone_count) / NULLIF(total_staged_events, 0), 2),
+        weak_signal_count,
+        ROUND(100.0 * weak_signal_count / NULLIF(total_raw_events, 0), 2)
+    FROM totals
+$$;
+
+CREATE OR REPLACE VIEW V_DATA_QUALITY_METRICS
+COMMENT = 'DEMO: simple-stream - Data quality summary metrics (last 24 hours)'
+AS
+SELECT *
+FROM TABLE(sfe_data_quality_metrics(24));
 
 -- ============================================================================
 -- View 5: Partition Efficiency
@@ -397,6 +443,329 @@ WHERE start_time >= DATEADD('day', -30, CURRENT_TIMESTAMP())
 GROUP BY client_name, DATE(start_time)
 ORDER BY ingestion_date DESC, client_name;
 
+-- ============================================================================
+-- View 9: Transformation Refresh Comparison (Tasks vs Dynamic Tables)
+-- ============================================================================
+-- Hourly refresh time and estimated credits for whichever transformation engine
+-- is deployed (03_tasks.sql or 05_dynamic_tables.sql). Both engines run on
+-- COMPUTE_WH (X-SMALL = 1 credit/hour); estimated credits = busy seconds / 3600
+-- and ignore the 60-second minimum billing per warehouse resume. Task refresh
+-- time is busy time (query_start_time -> completed_time, as in
+-- V_TASK_SIZING_RECOMMENDATION): time queued on COMPUTE_WH before the task
+-- query starts is excluded, since dynamic-table refresh time excludes it too.
+
+CREATE OR REPLACE VIEW V_TRANSFORM_REFRESH_COMPARISON
+COMMENT = 'DEMO: sfe-simple-stream - Hourly refresh time and estimated credits: tasks vs dynamic tables'
+AS
+WITH task_runs AS (
+    SELECT
+        'TASKS' AS transform_engine,
+        name AS object_name,
+        DATE_TRUNC('hour', scheduled_time) AS refresh_hour,
+        DATEDIFF('millisecond', query_start_time, completed_time) / 1000.0 AS refresh_seconds,
+        NULL AS lag_seconds,
+        IFF(state = 'SUCCEEDED', 1, 0) AS succeeded
+    FROM TABLE(
+        INFORMATION_SCHEMA.TASK_HISTORY(
+            SCHEDULED_TIME_RANGE_START => DATEADD('day', -1, CURRENT_TIMESTAMP()),
+            RESULT_LIMIT => 1000
+        )
+    )
+    WHERE database_name = 'SNOWFLAKE_EXAMPLE'
+        AND state IN ('SUCCEEDED', 'FAILED')
+),
+dt_runs AS (
+    SELECT
+        'DYNAMIC_TABLES' AS transform_engine,
+        name AS object_name,
+        DATE_TRUNC('hour', refresh_start_time) AS refresh_hour,
+        DATEDIFF('millisecond', refresh_start_time, refresh_end_time) / 1000.0 AS refresh_seconds,
+        DATEDIFF('second', data_timestamp, refresh_end_time) AS lag_seconds,
+        IFF(state = 'SUCCEEDED', 1, 0) AS succeeded
+    FROM TABLE(
+        INFORMATION_SCHEMA.DYNAMIC_TABLE_REFRESH_HISTORY(
+            DATA_TIMESTAMP_START => DATEADD('day', -1, CURRENT_TIMESTAMP()),
+            NAME_PREFIX => 'SNOWFLAKE_EXAMPLE.'
+        )
+    )
+    WHERE state IN ('SUCCEEDED', 'FAILED')
+        AND refresh_action <> 'NO_DATA'
+),
+all_runs AS (
+    SELECT * FROM task_runs
+    UNION ALL
+    SELECT * FROM dt_runs
+)
+SELECT
+    transform_engine,
+    object_name,
+    refresh_hour,
+    COUNT(*) AS refresh_count,
+    SUM(succeeded) AS succeeded_count,
+    ROUND(AVG(refresh_seconds), 2) AS avg_refresh_seconds,
+    ROUND(APPROX_PERCENTILE(refresh_seconds, 0.95), 2) AS p95_refresh_seconds,
+    ROUND(SUM(refresh_seconds), 2) AS total_refresh_seconds,
+    ROUND(AVG(lag_seconds), 1) AS avg_lag_seconds,
+    ROUND(SUM(refresh_seconds) / 3600.0, 6) AS est_credits_used
+FROM all_runs
+GROUP BY transform_engine, object_name, refresh_hour
+ORDER BY refresh_hour DESC, transform_engine, object_name;
+
+-- ============================================================================
+-- View 11: Pipeline Cost & Performance (Cost per Million Events)
+-- ============================================================================
+-- Daily join of ingest volume/credits, task runtime/credits and per-stage
+-- latency. Task warehouse credits come from QUERY_ATTRIBUTION_HISTORY (the task
+-- query plus every child query of the enrichment procedure) and exclude warehouse
+-- idle time; serverless task credits come from SERVERLESS_TASK_HISTORY.
+-- ACCOUNT_USAGE latency applies (up to a few hours).
+
+CREATE OR REPLACE VIEW V_PIPELINE_COST_PERFORMANCE
+COMMENT = 'DEMO: sfe-simple-stream - Daily cost per million events and per-stage latency (30 days)'
+AS
+WITH ingest AS (
+    SELECT
+        ingestion_date AS cost_date,
+        rows_ingested,
+        actual_credits_used AS ingest_credits
+    FROM V_STREAMING_COSTS
+),
+task_runs AS (
+    SELECT
+        DATE(scheduled_time) AS cost_date,
+        query_id,
+        DATEDIFF('millisecond', query_start_time, completed_time) / 1000.0 AS busy_seconds,
+        DATEDIFF('millisecond', scheduled_time, query_start_time) / 1000.0 AS queue_seconds
+    FROM SNOWFLAKE.ACCOUNT_USAGE.TASK_HISTORY
+    WHERE database_name = 'SNOWFLAKE_EXAMPLE'
+        AND name IN ('SFE_RAW_TO_STAGING_TASK', 'SFE_STAGING_TO_ANALYTICS_TASK')
+        AND state IN ('SUCCEEDED', 'FAILED')
+        AND scheduled_time >= DATEADD('day', -30, CURRENT_TIMESTAMP())
+),
+task_daily AS (
+    SELECT
+        cost_date,
+        COUNT(*) AS task_runs,
+        SUM(busy_seconds) AS task_busy_seconds,
+        SUM(queue_seconds) AS task_queue_seconds
+    FROM task_runs
+    GROUP BY cost_date
+),
+warehouse_task_credits AS (
+    SELECT
+        t.cost_date,
+        SUM(q.credits_attributed_compute) AS warehouse_task_credits
+    FROM task_runs t
+    JOIN SNOWFLAKE.ACCOUNT_USAGE.QUERY_ATTRIBUTION_HISTORY q
+        ON COALESCE(q.root_query_id, q.query_id) = t.query_id
+    WHERE q.start_time >= DATEADD('day', -31, CURRENT_TIMESTAMP())
+    GROUP BY t.cost_date
+),
+serverless_task_credits AS (
+    SELECT
+        DATE(start_time) AS cost_date,
+        SUM(credits_used) AS serverless_task_credits
+    FROM SNOWFLAKE.ACCOUNT_USAGE.SERVERLESS_TASK_HISTORY
+    WHERE database_name = 'SNOWFLAKE_EXAMPLE'
+        AND task_name IN ('SFE_RAW_TO_STAGING_TASK', 'SFE_STAGING_TO_ANALYTICS_TASK')
+        AND start_time >= DATEADD('day', -30, CURRENT_TIMESTAMP())
+    GROUP BY DATE(start_time)
+),
+-- First staged copy per event: the one the fact load picked up (later copies
+-- from other batches are skipped by its anti-join and would skew percentiles)
+staged AS (
+    SELECT badge_id, event_timestamp, ingestion_time, staging_time
+    FROM SNOWFLAKE_EXAMPLE.STAGING_LAYER.STG_BADGE_EVENTS
+    WHERE staging_time >= DATEADD('day', -31, CURRENT_TIMESTAMP())
+    QUALIFY ROW_NUMBER() OVER (PARTITION BY badge_id, event_timestamp ORDER BY staging_time) = 1
+),
+stage_latency AS (
+    SELECT
+        DATE(f.ingestion_time) AS cost_date,
+        APPROX_PERCENTILE(DATEDIFF('millisecond', s.ingestion_time, s.staging_time) / 1000.0, 0.5) AS raw_to_staging_p50_seconds,
+        APPROX_PERCENTILE(DATEDIFF('millisecond', s.staging_time, f.fact_load_time) / 1000.0, 0.5) AS staging_to_analytics_p50_seconds,
+        APPROX_PERCENTILE(DATEDIFF('millisecond', f.ingestion_time, f.fact_load_time) / 1000.0, 0.5) AS raw_to_analytics_p50_seconds,
+        APPROX_PERCENTILE(DATEDIFF('millisecond', f.ingestion_time, f.fact_load_time) / 1000.0, 0.95) AS raw_to_analytics_p95_seconds
+    FROM SNOWFLAKE_EXAMPLE.ANALYTICS_LAYER.FCT_ACCESS_EVENTS f
+    JOIN staged s
+        ON f.badge_id = s.badge_id
+        AND f.event_timestamp = s.event_timestamp
+    WHERE f.ingestion_time >= DATEADD('day', -30, CURRENT_TIMESTAMP())
+    GROUP BY DATE(f.ingestion_time)
+),
+days AS (
+    SELECT cost_date FROM ingest
+    UNION
+    SELECT cost_date FROM task_daily
+),
+daily AS (
+    SELECT
+        d.cost_date,
+        COALESCE(i.rows_ingested, 0) AS events_ingested,
+        COALESCE(i.ingest_credits, 0) AS ingest_credits,
+        COALESCE(t.task_runs, 0) AS task_runs,
+        COALESCE(t.task_busy_seconds, 0) AS task_busy_seconds,
+        COALESCE(t.task_queue_seconds, 0) AS task_queue_seconds,
+        COALESCE(w.warehouse_task_credits, 0) + COALESCE(sl.serverless_task_credits, 0) AS task_credits,
+        l.raw_to_staging_p50_seconds,
+        l.staging_to_analytics_p50_seconds,
+        l.raw_to_analytics_p50_seconds,
+        l.raw_to_analytics_p95_seconds
+    FROM days d
+    LEFT JOIN ingest i ON d.cost_date = i.cost_date
+    LEFT JOIN task_daily t ON d.cost_date = t.cost_date
+    LEFT JOIN warehouse_task_credits w ON d.cost_date = w.cost_date
+    LEFT JOIN serverless_task_credits sl ON d.cost_date = sl.cost_date
+    LEFT JOIN stage_latency l ON d.cost_date = l.cost_date
+)
+SELECT
+    cost_date,
+    events_ingested,
+    ROUND(ingest_credits, 6) AS ingest_credits,
+    ROUND(task_credits, 6) AS task_credits,
+    ROUND(ingest_credits + task_credits, 6) AS total_credits,
+    ROUND(1000000 * (ingest_credits + task_credits) / NULLIF(events_ingested, 0), 4) AS credits_per_million_events,
+    task_runs,
+    ROUND(task_busy_seconds / NULLIF(task_runs, 0), 2) AS avg_task_seconds,
+    ROUND(task_queue_seconds / NULLIF(task_runs, 0), 2) AS avg_task_queue_seconds,
+    ROUND(raw_to_staging_p50_seconds, 1) AS raw_to_staging_p50_seconds,
+    ROUND(staging_to_analytics_p50_seconds, 1) AS staging_to_analytics_p50_seconds,
+    ROUND(raw_to_analytics_p50_seconds, 1) AS raw_to_analytics_p50_seconds,
+    ROUND(raw_to_analytics_p95_seconds, 1) AS raw_to_analytics_p95_seconds
+FROM daily
+ORDER BY cost_date DESC;
+
+-- ============================================================================
+-- View 12: Task Sizing Recommendation (Serverless vs Warehouse)
+-- ============================================================================
+-- Per-task runtime profile over the last 7 days with a sizing recommendation.
+--   est_warehouse_credits:  what the task costs on COMPUTE_WH today, i.e. its
+--                           attributed credits (QUERY_ATTRIBUTION_HISTORY; the
+--                           shared warehouse's idle time is not charged to it).
+--                           Until attribution lands (up to 8 hours), a dedicated
+--                           X-SMALL warehouse (1 credit/hour) with AUTO_SUSPEND =
+--                           60 is modelled instead: each run is billed its busy
+--                           time plus the idle gap until the next run, capped at
+--                           the auto-suspend delay. A suspended warehouse bills at
+--                           least 60 seconds per resume, which the cap covers.
+--   est_serverless_credits: per-second billing at 0.9x the warehouse rate
+--                           (serverless task multiplier; check the current
+--                           Snowflake credit consumption table)
+
+CREATE OR REPLACE VIEW V_TASK_SIZING_RECOMMENDATION
+COMMENT = 'DEMO: sfe-simple-stream - Serverless vs warehouse sizing recommendation per task (7 days)'
+AS
+WITH task_runs AS (
+    SELECT
+        name AS task_name,
+        query_id,
+        DATEDIFF('millisecond', query_start_time, completed_time) / 1000.0 AS busy_seconds,
+        DATEDIFF('millisecond', scheduled_time, query_start_time) / 1000.0 AS queue_seconds,
+        -- Idle warehouse time after the run: until the next run, at most AUTO_SUSPEND (60 s)
+        LEAST(GREATEST(COALESCE(DATEDIFF('millisecond', completed_time,
+            LEAD(query_start_time) OVER (PARTITION BY name ORDER BY query_start_time)) / 1000.0, 60), 0), 60)
+            AS idle_seconds
+    FROM SNOWFLAKE.ACCOUNT_USAGE.TASK_HISTORY
+    WHERE database_name = 'SNOWFLAKE_EXAMPLE'
+        AND name IN ('SFE_RAW_TO_STAGING_TASK', 'SFE_STAGING_TO_ANALYTICS_TASK')
+        AND state IN ('SUCCEEDED', 'FAILED')
+        AND scheduled_time >= DATEADD('day', -7, CURRENT_TIMESTAMP())
+),
+attributed AS (
+    SELECT
+        t.task_name,
+        SUM(q.credits_attributed_compute) AS attributed_credits
+    FROM task_runs t
+    JOIN SNOWFLAKE.ACCOUNT_USAGE.QUERY_ATTRIBUTION_HISTORY q
+        ON COALESCE(q.root_query_id, q.query_id) = t.query_id
+    WHERE q.start_time >= DATEADD('day', -8, CURRENT_TIMESTAMP())
+    GROUP BY t.task_name
+),
+profile AS (
+    SELECT
+        t.task_name,
+        COUNT(*) AS runs,
+        COUNT(*) / (7 * 24.0) AS runs_per_hour,
+        AVG(t.busy_seconds) AS avg_busy_seconds,
+        APPROX_PERCENTILE(t.busy_seconds, 0.95) AS p95_busy_seconds,
+        AVG(t.queue_seconds) AS avg_queue_seconds,
+        SUM(t.busy_seconds) AS total_busy_seconds,
+        SUM(t.busy_seconds + t.idle_seconds) AS dedicated_billed_seconds
+    FROM task_runs t
+    GROUP BY t.task_name
+),
+estimates AS (
+    SELECT
+        p.*,
+        COALESCE(a.attributed_credits, 0) AS attributed_credits,
+        COALESCE(NULLIF(a.attributed_credits, 0), p.dedicated_billed_seconds / 3600.0) AS est_warehouse_credits,
+        COALESCE(a.attributed_credits, 0) > 0 AS is_attributed,
+        p.total_busy_seconds * 0.9 / 3600.0 AS est_serverless_credits
+    FROM profile p
+    LEFT JOIN attributed a ON p.task_name = a.task_name
+)
+SELECT
+    task_name,
+    runs,
+    ROUND(runs_per_hour, 1) AS runs_per_hour,
+    ROUND(avg_busy_seconds, 2) AS avg_busy_seconds,
+    ROUND(p95_busy_seconds, 2) AS p95_busy_seconds,
+    ROUND(avg_queue_seconds, 2) AS avg_queue_seconds,
+    ROUND(attributed_credits, 6) AS attributed_credits,
+    ROUND(est_warehouse_credits, 6) AS est_warehouse_credits,
+    ROUND(est_serverless_credits, 6) AS est_serverless_credits,
+    CASE
+        WHEN p95_busy_seconds > 45 THEN 'SCALE UP WAREHOUSE'
+        WHEN avg_queue_seconds > 10 THEN 'DEDICATED WAREHOUSE'
+        WHEN est_serverless_credits < est_warehouse_credits THEN 'SERVERLESS'
+        ELSE 'KEEP WAREHOUSE'
+    END AS recommendation,
+    CASE
+        WHEN p95_busy_seconds > 45 THEN 'p95 runtime approaches the 1-minute schedule; runs will start to overlap'
+        WHEN avg_queue_seconds > 10 THEN 'Runs queue behind other COMPUTE_WH workloads before starting'
+        WHEN est_serverless_credits < est_warehouse_credits AND is_attributed
+            THEN 'Serverless per-second billing costs less than the credits attributed on COMPUTE_WH'
+        WHEN est_serverless_credits < est_warehouse_credits
+            THEN 'No attributed credits yet; a dedicated warehouse would idle between runs until auto-suspend'
+        ELSE 'Runs share COMPUTE_WH with other work, so their attributed credits are below the serverless rate'
+    END AS rationale
+FROM estimates
+ORDER BY task_name;
+
+-- ============================================================================
+-- View 13: Dashboard Query History
+-- ============================================================================
+-- Every dashboard query runs with QUERY_TAG =
+--   {"app": "sfe_simple_stream_dashboard", "page": "<page>", "panel": "<panel>"}
+-- (streamlit/streamlit_app.py). INFORMATION_SCHEMA.QUERY_HISTORY has no
+-- ACCOUNT_USAGE latency, so panels show up as soon as they run.
+
+CREATE OR REPLACE VIEW V_DASHBOARD_QUERY_HISTORY
+COMMENT = 'DEMO: sfe-simple-stream - Streamlit dashboard queries by page and panel (last 24 hours)'
+AS
+SELECT
+    query_id,
+    TRY_PARSE_JSON(query_tag):page::STRING AS page,
+    TRY_PARSE_JSON(query_tag):panel::STRING AS panel,
+    start_time,
+    execution_status,
+    warehouse_name,
+    total_elapsed_time / 1000.0 AS total_elapsed_seconds,
+    compilation_time / 1000.0 AS compilation_seconds,
+    (queued_provisioning_time + queued_overload_time) / 1000.0 AS queued_seconds,
+    execution_time / 1000.0 AS warehouse_seconds,
+    bytes_scanned,
+    percentage_scanned_from_cache * 100 AS pct_scanned_from_cache,
+    rows_produced
+FROM TABLE(
+    INFORMATION_SCHEMA.QUERY_HISTORY(
+        END_TIME_RANGE_START => DATEADD('day', -1, CURRENT_TIMESTAMP()),
+        RESULT_LIMIT => 10000
+    )
+)
+WHERE TRY_PARSE_JSON(query_tag):app::STRING = 'sfe_simple_stream_dashboard'
+ORDER BY start_time DESC;
+
 -- ============================================================================
 -- Verify view creation
 -- ============================================================================
@@ -416,12 +785,20 @@ SHOW VIEWS LIKE 'V_%' IN SCHEMA RAW_INGESTION;
 -- Review hourly ingestion patterns:
 --   SELECT ingestion_hour, event_count, events_per_second, unique_badges, unique_zones FROM V_INGESTION_METRICS ORDER BY ingestion_hour DESC LIMIT 24;
 --
+-- One site's last 24 hours (prunes to the site's partitions):
+--   SELECT ingestion_hour, event_count, active_readers, weak_signal_count
+--   FROM V_SITE_INGESTION_METRICS WHERE site_id = 'SITE-001' ORDER BY ingestion_hour DESC;
+--
 -- Check data freshness:
 --   SELECT table_name, last_event_timestamp, event_age_seconds, total_rows, rows_last_hour FROM V_DATA_FRESHNESS;
 --
 -- Verify query performance:
 --   SELECT table_name, query_count, avg_scan_ratio_pct, row_prune_ratio_pct, pruning_efficiency FROM V_PARTITION_EFFICIENCY;
 --
+-- Data quality over a custom lookback (hourly buckets):
+--   SELECT duplicate_rate_pct, orphan_rate_pct, weak_signal_rate_pct
+--   FROM TABLE(sfe_data_quality_metrics(168));
+--
 -- Track costs:
 --   SELECT SUM(actual_credits_used) AS total_credits_last_30_days
 --   FROM V_STREAMING_COSTS;
@@ -432,6 +809,32 @@ SHOW VIEWS LIKE 'V_%' IN SCHEMA RAW_INGESTION;
 --   WHERE execution_status = 'SUCCESS'
 --   GROUP BY task_name;
 --
+-- Current occupancy per zone (security desk polling):
+--   SELECT zone_id, zone_name, occupant_count, capacity, utilization_pct FROM V_ZONE_OCCUPANCY;
+--
+-- Anomaly alerts in the last 24 hours, and the newest alerts:
+--   SELECT alert_type, SUM(alert_count) AS alerts, MAX(last_alert_time) AS last_alert
+--   FROM V_ALERT_SUMMARY GROUP BY alert_type;
+--   SELECT event_timestamp, alert_type, severity, badge_id, zone_id, detail
+--   FROM BADGE_ALERTS ORDER BY ingestion_time DESC LIMIT 50;
+--
+-- Cost per million events and sizing advice:
+--   SELECT cost_date, events_ingested, total_credits, credits_per_million_events, raw_to_analytics_p50_seconds
+--   FROM V_PIPELINE_COST_PERFORMANCE ORDER BY cost_date DESC;
+--   SELECT task_name, avg_busy_seconds, est_warehouse_credits, est_serverless_credits, recommendation
+--   FROM V_TASK_SIZING_RECOMMENDATION;
+--
+-- Slowest dashboard panels:
+--   SELECT page, panel, COUNT(*) AS queries, MEDIAN(total_elapsed_seconds) AS p50_seconds,
+--          SUM(warehouse_seconds) AS warehouse_seconds
+--   FROM V_DASHBOARD_QUERY_HISTORY GROUP BY page, panel ORDER BY p50_seconds DESC;
+--
+-- Compare transformation engines (tasks vs dynamic tables):
+--   SELECT transform_engine, SUM(refresh_count) AS refreshes, AVG(avg_refresh_seconds) AS avg_seconds,
+--          SUM(est_credits_used) AS est_credits
+--   FROM V_TRANSFORM_REFRESH_COMPARISON
+--   GROUP BY transform_engine;
+--
 -- Track client SDK metrics:
 --   SELECT client_name, SUM(total_client_credits) AS credits, SUM(total_rows_sent) AS rows
 --   FROM V_STREAMING_CLIENT_METRICS
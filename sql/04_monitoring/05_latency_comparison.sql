@@ -0,0 +1,114 @@
+/*******************************************************************************
+ * DEMO PROJECT: sfe-simple-stream
+ * Script: Task Schedule Latency Comparison
+ *
+ * WARNING:  NOT FOR PRODUCTION USE - EXAMPLE IMPLEMENTATION ONLY
+ *
+ * PURPOSE:
+ *   Compare p50/p99 RAW -> STAGING and RAW -> ANALYTICS latency between the
+ *   scheduled (1-minute) task graph and the triggered, serverless task graph.
+ *
+ * HOW TO MEASURE:
+ *   1. Deploy normally (03_tasks.sql records mode SCHEDULED)
+ *   2. Send events for a few minutes:  ./simulator/send_events.sh --count 500
+ *   3. Switch modes:  @sql/03_transformations/04_tasks_low_latency.sql
+ *   4. Send the same workload again
+ *   5. Run this script
+ *
+ * Each event is attributed to the schedule mode that was active when it was
+ * ingested (TASK_SCHEDULE_HISTORY). DYNAMIC_TABLES windows are excluded:
+ * dynamic tables do not stamp load times, so their lag is reported by
+ * V_TRANSFORM_REFRESH_COMPARISON instead. Latencies are per-row:
+ *   staging_latency   = STG_BADGE_EVENTS.staging_time  - ingestion_time
+ *   analytics_latency = FCT_ACCESS_EVENTS.fact_load_time - ingestion_time
+ ******************************************************************************/
+
+USE ROLE SYSADMIN;
+USE DATABASE SNOWFLAKE_EXAMPLE;
+USE SCHEMA RAW_INGESTION;
+
+-- Lookback window (days) for the comparison
+SET LOOKBACK_DAYS = 7;
+
+WITH modes AS (
+    SELECT
+        schedule_mode,
+        schedule_detail,
+        effective_from,
+        LEAD(effective_from) OVER (ORDER BY effective_from) AS effective_to
+    FROM TASK_SCHEDULE_HISTORY
+),
+-- First staged copy per event: the one the fact load picked up (later copies
+-- from other batches are skipped by its anti-join and would skew percentiles)
+staged AS (
+    SELECT badge_id, event_timestamp, ingestion_time, staging_time
+    FROM SNOWFLAKE_EXAMPLE.STAGING_LAYER.STG_BADGE_EVENTS
+    WHERE staging_time >= DATEADD('day', -$LOOKBACK_DAYS, CURRENT_TIMESTAMP())
+    QUALIFY ROW_NUMBER() OVER (PARTITION BY badge_id, event_timestamp ORDER BY staging_time) = 1
+),
+row_latency AS (
+    SELECT
+        f.ingestion_time,
+        DATEDIFF('millisecond', s.ingestion_time, s.staging_time) / 1000.0 AS staging_latency_seconds,
+        DATEDIFF('millisecond', f.ingestion_time, f.fact_load_time) / 1000.0 AS analytics_latency_seconds
+    FROM SNOWFLAKE_EXAMPLE.ANALYTICS_LAYER.FCT_ACCESS_EVENTS f
+    JOIN staged s
+        ON f.badge_id = s.badge_id
+        AND f.event_timestamp = s.event_timestamp
+    WHERE f.ingestion_time >= DATEADD('day', -$LOOKBACK_DAYS, CURRENT_TIMESTAMP())
+)
+SELECT
+    m.schedule_mode,
+    m.effective_from,
+    m.effective_to,
+    COUNT(*) AS events_measured,
+    ROUND(PERCENTILE_CONT(0.50) WITHIN GROUP (ORDER BY r.staging_latency_seconds), 1) AS staging_p50_seconds,
+    ROUND(PERCENTILE_CONT(0.99) WITHIN GROUP (ORDER BY r.staging_latency_seconds), 1) AS staging_p99_seconds,
+    ROUND(PERCENTILE_CONT(0.50) WITHIN GROUP (ORDER BY r.analytics_latency_seconds), 1) AS analytics_p50_seconds,
+    ROUND(PERCENTILE_CONT(0.99) WITHIN GROUP (ORDER BY r.analytics_latency_seconds), 1) AS analytics_p99_seconds,
+    ROUND(MAX(r.analytics_latency_seconds), 1) AS analytics_max_seconds,
+    m.schedule_detail
+FROM modes m
+JOIN row_latency r
+    ON r.ingestion_time >= m.effective_from
+    AND (m.effective_to IS NULL OR r.ingestion_time < m.effective_to)
+WHERE m.schedule_mode <> 'DYNAMIC_TABLES'
+GROUP BY m.schedule_mode, m.schedule_detail, m.effective_from, m.effective_to
+ORDER BY m.effective_from;
+
+-- Side-by-side summary: all SCHEDULED windows vs all TRIGGERED windows
+WITH modes AS (
+    SELECT
+        schedule_mode,
+        effective_from,
+        LEAD(effective_from) OVER (ORDER BY effective_from) AS effective_to
+    FROM TASK_SCHEDULE_HISTORY
+),
+per_mode AS (
+    SELECT
+        m.schedule_mode,
+        PERCENTILE_CONT(0.50) WITHIN GROUP (
+            ORDER BY DATEDIFF('millisecond', f.ingestion_time, f.fact_load_time) / 1000.0
+        ) AS p50_seconds,
+        PERCENTILE_CONT(0.99) WITHIN GROUP (
+            ORDER BY DATEDIFF('millisecond', f.ingestion_time, f.fact_load_time) / 1000.0
+        ) AS p99_seconds
+    FROM modes m
+    JOIN SNOWFLAKE_EXAMPLE.ANALYTICS_LAYER.FCT_ACCESS_EVENTS f
+        ON f.ingestion_time >= m.effective_from
+        AND (m.effective_to IS NULL OR f.ingestion_time < m.effective_to)
+    WHERE f.ingestion_time >= DATEADD('day', -$LOOKBACK_DAYS, CURRENT_TIMESTAMP())
+    GROUP BY m.schedule_mode
+)
+SELECT
+    'RAW -> ANALYTICS' AS path,
+    ROUND(MAX(IFF(schedule_mode = 'SCHEDULED', p50_seconds, NULL)), 1) AS scheduled_p50_seconds,
+    ROUND(MAX(IFF(schedule_mode = 'TRIGGERED', p50_seconds, NULL)), 1) AS triggered_p50_seconds,
+    ROUND(MAX(IFF(schedule_mode = 'SCHEDULED', p99_seconds, NULL)), 1) AS scheduled_p99_seconds,
+    ROUND(MAX(IFF(schedule_mode = 'TRIGGERED', p99_seconds, NULL)), 1) AS triggered_p99_seconds,
+    ROUND(
+        MAX(IFF(schedule_mode = 'SCHEDULED', p50_seconds, NULL))
+        / NULLIF(MAX(IFF(schedule_mode = 'TRIGGERED', p50_seconds, NULL)), 0),
+        1
+    ) AS p50_speedup
+FROM per_mode;
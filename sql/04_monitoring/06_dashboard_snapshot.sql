@@ -0,0 +1,147 @@
+/*******************************************************************************
+ * DEMO PROJECT: sfe-simple-stream
+ * Script: Dashboard Snapshot (shared cache for the Streamlit dashboard)
+ *
+ * WARNING:  NOT FOR PRODUCTION USE - EXAMPLE IMPLEMENTATION ONLY
+ *
+ * PURPOSE:
+ *   Materialize the monitoring views the dashboard reads into one snapshot
+ *   table on a fixed cadence. Every dashboard session reads the snapshot with a
+ *   single query, so warehouse load no longer grows with open dashboards:
+ *   one query per view per refresh interval, however many viewers.
+ *
+ * OBJECTS CREATED:
+ *   - RAW_INGESTION.DASHBOARD_SNAPSHOT (one row per view: refresh settings + payload)
+ *   - RAW_INGESTION.sfe_refresh_dashboard_snapshot() (refresher procedure)
+ *   - RAW_INGESTION.sfe_dashboard_snapshot_task (runs the refresher every minute)
+ *
+ * REFRESH CADENCE:
+ *   refresh_seconds per view: 60 for views over live tables / INFORMATION_SCHEMA,
+ *   900 for ACCOUNT_USAGE-based views (their source lags by hours anyway).
+ *   A view is re-queried only when its snapshot is older than refresh_seconds.
+ *
+ * PREREQUISITES:
+ *   - Monitoring views created (sql/04_monitoring/04_monitoring.sql)
+ ******************************************************************************/
+
+USE ROLE SYSADMIN;
+USE DATABASE SNOWFLAKE_EXAMPLE;
+USE SCHEMA RAW_INGESTION;
+
+ALTER TASK IF EXISTS sfe_dashboard_snapshot_task SUSPEND;
+
+-- ============================================================================
+-- Snapshot table
+-- ============================================================================
+-- payload holds the view rows as an array of objects, ordered by order_by and
+-- capped at row_limit. column_names / column_types preserve the view's column
+-- order and types (objects are unordered and JSON has no timestamp type).
+
+CREATE OR REPLACE TABLE DASHBOARD_SNAPSHOT (
+    view_name VARCHAR(100) NOT NULL PRIMARY KEY,
+    order_by VARCHAR(200),
+    row_limit NUMBER,
+    refresh_seconds NUMBER NOT NULL DEFAULT 60,
+    snapshot_time TIMESTAMP_LTZ,
+    refresh_ms NUMBER,
+    row_count NUMBER,
+    column_names ARRAY,
+    column_types ARRAY,
+    payload VARIANT
+)
+COMMENT = 'DEMO: sfe-simple-stream - Shared dashboard snapshot (one row per monitoring view)';
+
+INSERT INTO DASHBOARD_SNAPSHOT (view_name, order_by, row_limit, refresh_seconds)
+VALUES
+    ('V_END_TO_END_LATENCY', NULL, NULL, 60),
+    ('V_DATA_FRESHNESS', NULL, NULL, 60),
+    ('V_INGESTION_METRICS', 'INGESTION_HOUR DESC', 24, 60),
+    ('V_TASK_EXECUTION_HISTORY', 'SCHEDULED_TIME DESC', 50, 60),
+    ('V_TRANSFORM_REFRESH_COMPARISON', 'REFRESH_HOUR DESC', NULL, 60),
+    ('V_CHANNEL_STATUS', NULL, NULL, 900),
+    ('V_STREAMING_COSTS', 'INGESTION_DATE DESC', 30, 900),
+    ('V_PARTITION_EFFICIENCY', NULL, NULL, 900),
+    ('V_STREAMING_CLIENT_METRICS', 'INGESTION_DATE DESC', 30, 900),
+    ('V_PIPELINE_COST_PERFORMANCE', 'COST_DATE DESC', 30, 900),
+    ('V_TASK_SIZING_RECOMMENDATION', NULL, NULL, 900);
+
+-- ============================================================================
+-- Refresher procedure
+-- ============================================================================
+
+CREATE OR REPLACE PROCEDURE sfe_refresh_dashboard_snapshot()
+RETURNS VARCHAR
+LANGUAGE SQL
+COMMENT = 'DEMO: sfe-simple-stream - Refresh stale rows of DASHBOARD_SNAPSHOT'
+EXECUTE AS OWNER
+AS
+$$
+DECLARE
+    refreshed NUMBER DEFAULT 0;
+    started_at TIMESTAMP_LTZ;
+    current_view VARCHAR;
+    rank_order VARCHAR;
+    limit_clause VARCHAR;
+    stale_views CURSOR FOR
+        SELECT view_name, order_by, row_limit
+        FROM SNOWFLAKE_EXAMPLE.RAW_INGESTION.DASHBOARD_SNAPSHOT
+        WHERE snapshot_time IS NULL
+            OR DATEDIFF('second', snapshot_time, CURRENT_TIMESTAMP()) >= refresh_seconds - 5;
+BEGIN
+    FOR v IN stale_views DO
+        started_at := CURRENT_TIMESTAMP();
+        current_view := v.view_name;
+        rank_order := COALESCE(v.order_by, '1');
+        limit_clause := IFF(v.row_limit IS NULL, '', ' ORDER BY ' || rank_order || ' LIMIT ' || v.row_limit);
+
+        -- One query against the view; rn keeps the row order inside the array
+        EXECUTE IMMEDIATE
+            'UPDATE SNOWFLAKE_EXAMPLE.RAW_INGESTION.DASHBOARD_SNAPSHOT t ' ||
+            'SET payload = s.payload, row_count = s.row_count, ' ||
+            '    column_names = c.column_names, column_types = c.column_types, ' ||
+            '    snapshot_time = CURRENT_TIMESTAMP() ' ||
+            'FROM (' ||
+            '    SELECT COUNT(*) AS row_count, ' ||
+            '           COALESCE(ARRAY_AGG(OBJECT_DELETE(OBJECT_CONSTRUCT_KEEP_NULL(*), ''RN'')) WITHIN GROUP (ORDER BY rn), ARRAY_CONSTRUCT()) AS payload ' ||
+            '    FROM (' ||
+            '        SELECT *, ROW_NUMBER() OVER (ORDER BY ' || rank_order || ') AS rn ' ||
+            '        FROM SNOWFLAKE_EXAMPLE.RAW_INGESTION.' || current_view || limit_clause ||
+            '    )' ||
+            ') s, (' ||
+            '    SELECT ARRAY_AGG(column_name) WITHIN GROUP (ORDER BY ordinal_position) AS column_names, ' ||
+            '           ARRAY_AGG(data_type) WITHIN GROUP (ORDER BY ordinal_position) AS column_types ' ||
+            '    FROM SNOWFLAKE_EXAMPLE.INFORMATION_SCHEMA.COLUMNS ' ||
+            '    WHERE table_schema = ''RAW_INGESTION'' AND table_name = ''' || current_view || '''' ||
+            ') c ' ||
+            'WHERE t.view_name = ''' || current_view || '''';
+
+        UPDATE SNOWFLAKE_EXAMPLE.RAW_INGESTION.DASHBOARD_SNAPSHOT
+        SET refresh_ms = DATEDIFF('millisecond', :started_at, CURRENT_TIMESTAMP())
+        WHERE view_name = :current_view;
+
+        refreshed := refreshed + 1;
+    END FOR;
+
+    RETURN 'Refreshed ' || refreshed || ' view snapshot(s)';
+END;
+$$;
+
+-- Populate once so the dashboard has data immediately
+CALL sfe_refresh_dashboard_snapshot();
+
+-- ============================================================================
+-- Refresher task (the single writer; dashboards only read)
+-- ============================================================================
+
+CREATE OR REPLACE TASK sfe_dashboard_snapshot_task
+    WAREHOUSE = COMPUTE_WH
+    SCHEDULE = '1 MINUTE'
+    COMMENT = 'DEMO: Refresh the shared dashboard snapshot'
+AS
+    CALL SNOWFLAKE_EXAMPLE.RAW_INGESTION.sfe_refresh_dashboard_snapshot();
+
+ALTER TASK sfe_dashboard_snapshot_task RESUME;
+
+SELECT view_name, refresh_seconds, snapshot_time, row_count, refresh_ms
+FROM DASHBOARD_SNAPSHOT
+ORDER BY view_name;
@@ -20,6 +20,7 @@
  *
  * PREREQUISITES:
  *   - Monitoring views created (sql/04_monitoring/04_monitoring.sql)
+ *   - Dashboard snapshot + refresher task (sql/04_monitoring/06_dashboard_snapshot.sql)
  *   - Git repository configured (done in deploy_all.sql)
  *
  * CLEANUP:
@@ -33,6 +33,7 @@ BEGIN
     -- Suspend child tasks
     ALTER TASK IF EXISTS RAW_INGESTION.sfe_staging_to_analytics_task SUSPEND;
     ALTER TASK IF EXISTS RAW_INGESTION.sfe_alert_on_data_quality_violations SUSPEND;
+    ALTER TASK IF EXISTS RAW_INGESTION.sfe_dashboard_snapshot_task SUSPEND;
     CALL SYSTEM$WAIT(3);
   END IF;
 END;
@@ -0,0 +1,542 @@
+"""
+Dashboard Data Access - one function per monitoring view, pluggable backend
+
+Author: SE Community
+Purpose: Keep SQL out of the dashboard pages so they run against Snowflake or a
+         local DuckDB stand-in (profiling and load tests without an account)
+
+USAGE:
+    from data_access import DashboardData, DuckDBBackend, SnowparkBackend
+
+    data = DashboardData(SnowparkBackend(session))                  # Streamlit in Snowflake
+    data = DashboardData(DuckDBBackend.open("SNOWFLAKE_EXAMPLE.duckdb"))   # local
+    latency_df = data.end_to_end_latency()
+    volume_df = data.event_volume(range_seconds=6 * 3600, bucket_seconds=300)
+    data.site_id = "SITE-001"    # event_volume / new_events / site_ingestion for one site
+
+BACKENDS:
+    SnowparkBackend  session.sql().to_pandas(block=False) under a QUERY_TAG naming
+                     page and panel (read back by V_DASHBOARD_QUERY_HISTORY)
+    DuckDBBackend    local SNOWFLAKE_EXAMPLE.duckdb with the pipeline tables and
+                     monitoring views (tools/scale_test_views.py builds one).
+                     "Now" is the as-of time of its generated history, and
+                     refresh_snapshot() fills DASHBOARD_SNAPSHOT from the local
+                     views the way sfe_refresh_dashboard_snapshot() does.
+
+    A backend has run(query, query_tag) -> (DataFrame, query_id, fetched_at)
+    plus the few SQL fragments that differ by dialect (now, timestamp,
+    seconds_before, time_bucket).
+
+CACHING:
+    Every query goes through fetch(query, query_tag, cache), where cache is
+    "snapshot" (the shared snapshot), "query" (panel queries) or None (live,
+    never cached). The default fetch runs the backend directly; the dashboard
+    passes st.cache_data-wrapped functions. on_fetch(page, panel, query_id,
+    seconds, cache_hit, rows) is called after every fetch.
+
+SITES:
+    site_id None means all sites. Set, the RAW queries filter on site_id (the
+    leading clustering key of RAW_BADGE_EVENTS), so one site's page scans only
+    that site's micro-partitions; hourly buckets then come from RAW too, since
+    DATA_QUALITY_HOURLY is not per site.
+
+ALERTS:
+    alerts() polls BADGE_ALERTS live (it is small: one row per anomaly, from
+    send_events.py --detect); alert_summary() reads V_ALERT_SUMMARY.
+
+Headless page benchmark: python tools/bench_dashboard.py
+"""
+
+import json
+import time
+from datetime import datetime
+from typing import Callable, Optional, Tuple
+
+import pandas as pd
+
+DASHBOARD_APP_TAG = "sfe_simple_stream_dashboard"
+LOCAL_BACKEND_ENV = "SFE_DASHBOARD_DUCKDB"  # Path of a local DuckDB file; unset in Snowflake
+
+# Columns the pages read from each snapshot view
+SNAPSHOT_VIEWS = {
+    "V_END_TO_END_LATENCY": [
+        'LAYER', 'LAST_UPDATE', 'SECONDS_SINCE_UPDATE', 'ROW_COUNT', 'HEALTH_STATUS'
+    ],
+    "V_CHANNEL_STATUS": [
+        'PIPE_NAME', 'LAST_INGESTION_TIME', 'SECONDS_SINCE_LAST_INGESTION', 'TOTAL_ROWS_INSERTED',
+        'TOTAL_GB_INSERTED', 'ACTIVE_MINUTES_LAST_HOUR', 'AVG_ROWS_PER_INSERT', 'MAX_ROWS_PER_INSERT',
+        'TOTAL_CREDITS_USED'
+    ],
+    "V_DATA_FRESHNESS": [
+        'TABLE_NAME', 'LAST_EVENT_TIMESTAMP', 'LAST_INGESTION_TIMESTAMP', 'EVENT_AGE_SECONDS',
+        'INGESTION_AGE_SECONDS', 'TOTAL_ROWS', 'ROWS_LAST_HOUR'
+    ],
+    "V_INGESTION_METRICS": [
+        'INGESTION_HOUR', 'EVENT_COUNT', 'EVENTS_PER_SECOND', 'UNIQUE_BADGES', 'UNIQUE_ZONES',
+        'AVG_SIGNAL_STRENGTH', 'WEAK_SIGNAL_COUNT', 'WEAK_SIGNAL_PCT', 'ENTRY_COUNT', 'EXIT_COUNT',
+        'NET_OCCUPANCY_CHANGE'
+    ],
+    "V_STREAMING_COSTS": [
+        'INGESTION_DATE', 'GB_INGESTED', 'ROWS_INGESTED', 'ACTUAL_CREDITS_USED', 'ROWS_PER_GB'
+    ],
+    "V_TASK_EXECUTION_HISTORY": [
+        'TASK_NAME', 'STATE', 'SCHEDULED_TIME', 'COMPLETED_TIME', 'DURATION_SECONDS', 'ERROR_CODE',
+        'ERROR_MESSAGE', 'EXECUTION_STATUS'
+    ],
+    "V_PARTITION_EFFICIENCY": [
+        'TABLE_NAME', 'QUERY_COUNT', 'AVG_SCAN_RATIO_PCT', 'TOTAL_GB_SCANNED_APPROX',
+        'ROW_PRUNE_RATIO_PCT', 'PRUNING_EFFICIENCY'
+    ],
+    "V_STREAMING_CLIENT_METRICS": [
+        'CLIENT_NAME', 'INGESTION_DATE', 'SESSION_COUNT', 'TOTAL_CLIENT_CREDITS', 'TOTAL_GB_SENT',
+        'AVG_MB_PER_SESSION', 'TOTAL_ROWS_SENT', 'AVG_SESSION_DURATION_SECONDS', 'EARLIEST_SESSION',
+        'LATEST_SESSION'
+    ],
+    "V_TRANSFORM_REFRESH_COMPARISON": [
+        'TRANSFORM_ENGINE', 'OBJECT_NAME', 'REFRESH_HOUR', 'REFRESH_COUNT', 'SUCCEEDED_COUNT',
+        'AVG_REFRESH_SECONDS', 'P95_REFRESH_SECONDS', 'TOTAL_REFRESH_SECONDS', 'AVG_LAG_SECONDS',
+        'EST_CREDITS_USED'
+    ],
+    "V_PIPELINE_COST_PERFORMANCE": [
+        'COST_DATE', 'EVENTS_INGESTED', 'INGEST_CREDITS', 'TASK_CREDITS', 'TOTAL_CREDITS',
+        'CREDITS_PER_MILLION_EVENTS', 'TASK_RUNS', 'AVG_TASK_SECONDS', 'RAW_TO_STAGING_P50_SECONDS',
+        'STAGING_TO_ANALYTICS_P50_SECONDS', 'RAW_TO_ANALYTICS_P50_SECONDS', 'RAW_TO_ANALYTICS_P95_SECONDS'
+    ],
+    "V_TASK_SIZING_RECOMMENDATION": [
+        'TASK_NAME', 'RUNS', 'RUNS_PER_HOUR', 'AVG_BUSY_SECONDS', 'P95_BUSY_SECONDS',
+        'AVG_QUEUE_SECONDS', 'ATTRIBUTED_CREDITS', 'EST_WAREHOUSE_CREDITS', 'EST_SERVERLESS_CREDITS',
+        'RECOMMENDATION', 'RATIONALE'
+    ],
+}
+
+# (order_by, row_limit, refresh_seconds) as seeded in sql/04_monitoring/06_dashboard_snapshot.sql
+SNAPSHOT_REFRESH = {
+    "V_END_TO_END_LATENCY": (None, None, 60),
+    "V_DATA_FRESHNESS": (None, None, 60),
+    "V_INGESTION_METRICS": ("INGESTION_HOUR DESC", 24, 60),
+    "V_TASK_EXECUTION_HISTORY": ("SCHEDULED_TIME DESC", 50, 60),
+    "V_TRANSFORM_REFRESH_COMPARISON": ("REFRESH_HOUR DESC", None, 60),
+    "V_CHANNEL_STATUS": (None, None, 900),
+    "V_STREAMING_COSTS": ("INGESTION_DATE DESC", 30, 900),
+    "V_PARTITION_EFFICIENCY": (None, None, 900),
+    "V_STREAMING_CLIENT_METRICS": ("INGESTION_DATE DESC", 30, 900),
+    "V_PIPELINE_COST_PERFORMANCE": ("COST_DATE DESC", 30, 900),
+    "V_TASK_SIZING_RECOMMENDATION": (None, None, 900),
+}
+
+QUERY_HISTORY_COLUMNS = [
+    'QUERY_ID', 'PAGE', 'PANEL', 'START_TIME', 'EXECUTION_STATUS', 'TOTAL_ELAPSED_SECONDS',
+    'COMPILATION_SECONDS', 'QUEUED_SECONDS', 'WAREHOUSE_SECONDS', 'BYTES_SCANNED',
+    'PCT_SCANNED_FROM_CACHE', 'ROWS_PRODUCED'
+]
+
+Fetch = Callable[[str, str, Optional[str]], Tuple[pd.DataFrame, str, float]]
+
+
+# ============================================================================
+# Backends
+# ============================================================================
+
+class SnowparkBackend:
+    """Queries through a Snowpark session (Streamlit in Snowflake)."""
+
+    name = "snowpark"
+
+    def __init__(self, session):
+        self.session = session
+
+    def run(self, query: str, query_tag: str) -> Tuple[pd.DataFrame, str, float]:
+        """Execute query under a query tag; return (DataFrame, query_id, fetched_at)."""
+        job = self.session.sql(query).to_pandas(block=False, statement_params={"QUERY_TAG": query_tag})
+        df = job.result()
+        return df, job.query_id, time.time()
+
+    def now(self) -> str:
+        return "CURRENT_TIMESTAMP()"
+
+    def timestamp(self, value: datetime) -> str:
+        return f"'{value.strftime('%Y-%m-%d %H:%M:%S.%f')}'::TIMESTAMP_NTZ"
+
+    def seconds_before(self, timestamp_sql: str, seconds: int) -> str:
+        return f"DATEADD('second', -{seconds}, {timestamp_sql})"
+
+    def time_bucket(self, column: str, seconds: int) -> str:
+        if seconds % 3600 == 0:
+            return f"TIME_SLICE({column}, {seconds // 3600}, 'HOUR')"
+        return f"TIME_SLICE({column}, {seconds // 60}, 'MINUTE')"
+
+
+class DuckDBBackend:
+    """Queries against a local DuckDB copy of SNOWFLAKE_EXAMPLE (no account needed)."""
+
+    name = "duckdb"
+
+    def __init__(self, connection, as_of: Optional[datetime] = None):
+        self.connection = connection
+        self.as_of = as_of
+        self.query_count = 0
+
+    @classmethod
+    def open(cls, path, read_only: bool = True) -> "DuckDBBackend":
+        """Open a database built by tools/scale_test_views.py (its as-of time becomes "now")."""
+        import duckdb
+        connection = duckdb.connect(str(path), read_only=read_only)
+        as_of = None
+        try:
+            as_of = connection.execute("SELECT as_of FROM main.scale_test_info").fetchone()[0]
+        except duckdb.Error:
+            pass
+        return cls(connection, as_of)
+
+    def run(self, query: str, query_tag: str) -> Tuple[pd.DataFrame, str, float]:
+        self.query_count += 1
+        # One cursor per query: Streamlit runs each session in its own thread
+        df = self.connection.cursor().execute(query).fetchdf()
+        df.columns = [name.upper() for name in df.columns]  # As Snowflake returns unquoted identifiers
+        return df, f"duckdb-{self.query_count}", time.time()
+
+    def now(self) -> str:
+        return self.timestamp(self.as_of) if self.as_of else "CAST(now() AS TIMESTAMP)"
+
+    def timestamp(self, value: datetime) -> str:
+        return f"TIMESTAMP '{value.strftime('%Y-%m-%d %H:%M:%S.%f')}'"
+
+    def seconds_before(self, timestamp_sql: str, seconds: int) -> str:
+        return f"({timestamp_sql} - to_seconds({seconds}))"
+
+    def time_bucket(self, column: str, seconds: int) -> str:
+        return f"time_bucket(INTERVAL '{seconds} seconds', {column})"
+
+    def refresh_snapshot(self):
+        """Rebuild RAW_INGESTION.DASHBOARD_SNAPSHOT from the local views (or stand-in tables).
+
+        Views missing locally get a row without payload, as before their first refresh.
+        """
+        con = self.connection
+        con.execute("""
+            CREATE OR REPLACE TABLE RAW_INGESTION.DASHBOARD_SNAPSHOT (
+                view_name VARCHAR NOT NULL,
+                order_by VARCHAR,
+                row_limit INTEGER,
+                refresh_seconds INTEGER NOT NULL,
+                snapshot_time TIMESTAMP,
+                refresh_ms INTEGER,
+                row_count INTEGER,
+                column_names VARCHAR,
+                column_types VARCHAR,
+                payload VARCHAR
+            )
+        """)
+        local = {name.upper() for (name,) in con.execute(
+            "SELECT table_name FROM information_schema.tables WHERE table_schema = 'RAW_INGESTION'"
+        ).fetchall()}
+
+        for view_name, (order_by, row_limit, refresh_seconds) in SNAPSHOT_REFRESH.items():
+            if view_name not in local:
+                con.execute("INSERT INTO RAW_INGESTION.DASHBOARD_SNAPSHOT (view_name, order_by, row_limit, "
+                            "refresh_seconds) VALUES (?, ?, ?, ?)", [view_name, order_by, row_limit, refresh_seconds])
+                continue
+            query = f"SELECT * FROM RAW_INGESTION.{view_name}"
+            if row_limit is not None:
+                query += f" ORDER BY {order_by or 1} LIMIT {row_limit}"
+            elif order_by:
+                query += f" ORDER BY {order_by}"
+
+            started = time.perf_counter()
+            described = con.execute(f"DESCRIBE {query}").fetchall()
+            rows = con.execute(query).fetchall()
+            names = [column[0].upper() for column in described]
+            con.execute(
+                "INSERT INTO RAW_INGESTION.DASHBOARD_SNAPSHOT VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [view_name, order_by, row_limit, refresh_seconds, self.as_of or datetime.now(),
+                 round((time.perf_counter() - started) * 1000), len(rows), json.dumps(names),
+                 json.dumps([_snowflake_type(column[1]) for column in described]),
+                 json.dumps([dict(zip(names, row)) for row in rows], default=_json_value)]
+            )
+
+
+def _json_value(value):
+    """Fixed-width timestamps: pandas infers one format for the whole column."""
+    if isinstance(value, datetime):
+        return value.isoformat(sep=" ", timespec="microseconds")
+    return str(value)
+
+
+def _snowflake_type(duckdb_type: str) -> str:
+    """DuckDB column type -> the INFORMATION_SCHEMA.COLUMNS data_type Snowflake would report."""
+    duckdb_type = duckdb_type.upper()
+    if duckdb_type.startswith("TIMESTAMP"):
+        return "TIMESTAMP_NTZ"
+    if duckdb_type == "DATE":
+        return "DATE"
+    if duckdb_type in ("DOUBLE", "FLOAT", "REAL"):
+        return "FLOAT"
+    if duckdb_type.startswith("DECIMAL") or duckdb_type.rstrip("U").endswith("INT") or duckdb_type in (
+            "HUGEINT", "UHUGEINT", "UTINYINT", "USMALLINT", "UINTEGER", "UBIGINT"):
+        return "NUMBER"
+    if duckdb_type == "BOOLEAN":
+        return "BOOLEAN"
+    return "TEXT"
+
+
+# ============================================================================
+# Data access
+# ============================================================================
+
+class DashboardData:
+    """Dashboard queries, one method per monitoring view; tagged and timed per page/panel."""
+
+    def __init__(self, backend, fetch: Optional[Fetch] = None,
+                 on_fetch: Optional[Callable[..., None]] = None, page: str = "default",
+                 site_id: Optional[str] = None):
+        self.backend = backend
+        self.fetch = fetch or (lambda query, query_tag, cache: backend.run(query, query_tag))
+        self.on_fetch = on_fetch
+        self.page = page
+        self.site_id = site_id
+
+    def _site_filter(self, keyword: str = "AND") -> str:
+        """Predicate for the selected site ('' for all sites)."""
+        if self.site_id is None:
+            return ""
+        return "{} site_id = '{}'".format(keyword, self.site_id.replace("'", "''"))
+
+    def _fetch(self, query: str, panel: str, cache: Optional[str], page: Optional[str] = None) -> tuple:
+        page = page or self.page
+        query_tag = json.dumps({"app": DASHBOARD_APP_TAG, "page": page, "panel": panel})
+        started_at = time.time()
+        start = time.perf_counter()
+        df, query_id, fetched_at = self.fetch(query, query_tag, cache)
+        if self.on_fetch is not None:
+            self.on_fetch(page, panel, query_id, time.perf_counter() - start, fetched_at < started_at, len(df))
+        return df, fetched_at
+
+    def query(self, query: str, panel: str = "default", cache: Optional[str] = "query") -> pd.DataFrame:
+        """Run an ad-hoc panel query (60-second cache in the dashboard)."""
+        return self._fetch(query, panel, cache)[0]
+
+    # ------------------------------------------------------------------------
+    # Shared snapshot (sql/04_monitoring/06_dashboard_snapshot.sql)
+    # ------------------------------------------------------------------------
+
+    def snapshot(self) -> Tuple[pd.DataFrame, float]:
+        """All snapshot rows (one query per session per 15 seconds); return (DataFrame, fetched_at)."""
+        query = f"""
+            SELECT
+              VIEW_NAME,
+              REFRESH_SECONDS,
+              SNAPSHOT_TIME,
+              DATEDIFF('second', SNAPSHOT_TIME, {self.backend.now()}) AS SNAPSHOT_AGE_SECONDS,
+              ROW_COUNT,
+              REFRESH_MS,
+              COLUMN_NAMES,
+              COLUMN_TYPES,
+              PAYLOAD
+            FROM SNOWFLAKE_EXAMPLE.RAW_INGESTION.DASHBOARD_SNAPSHOT
+        """
+        return self._fetch(query, "snapshot", "snapshot", page="Shared")
+
+    def view_frame(self, view_name: str) -> pd.DataFrame:
+        """Rows of one monitoring view from the shared snapshot, typed like the view."""
+        columns = SNAPSHOT_VIEWS[view_name]
+        snapshot_df, _ = self.snapshot()
+        match = snapshot_df[snapshot_df['VIEW_NAME'] == view_name]
+        if match.empty or pd.isna(match['PAYLOAD'].iloc[0]):
+            return pd.DataFrame(columns=columns)
+
+        row = match.iloc[0]
+        column_names = json.loads(row['COLUMN_NAMES'])
+        df = pd.DataFrame(json.loads(row['PAYLOAD']), columns=column_names)
+        for name, data_type in zip(column_names, json.loads(row['COLUMN_TYPES'])):
+            if data_type.startswith('TIMESTAMP') or data_type == 'DATE':
+                df[name] = pd.to_datetime(df[name], errors='coerce')
+            elif data_type in ('NUMBER', 'FLOAT'):
+                df[name] = pd.to_numeric(df[name], errors='coerce')
+        return df[columns]
+
+    def end_to_end_latency(self) -> pd.DataFrame:
+        return self.view_frame("V_END_TO_END_LATENCY")
+
+    def channel_status(self) -> pd.DataFrame:
+        return self.view_frame("V_CHANNEL_STATUS")
+
+    def data_freshness(self) -> pd.DataFrame:
+        return self.view_frame("V_DATA_FRESHNESS")
+
+    def ingestion_metrics(self) -> pd.DataFrame:
+        return self.view_frame("V_INGESTION_METRICS")
+
+    def streaming_costs(self) -> pd.DataFrame:
+        return self.view_frame("V_STREAMING_COSTS")
+
+    def task_execution_history(self) -> pd.DataFrame:
+        return self.view_frame("V_TASK_EXECUTION_HISTORY")
+
+    def partition_efficiency(self) -> pd.DataFrame:
+        return self.view_frame("V_PARTITION_EFFICIENCY")
+
+    def streaming_client_metrics(self) -> pd.DataFrame:
+        return self.view_frame("V_STREAMING_CLIENT_METRICS")
+
+    def transform_refresh_comparison(self) -> pd.DataFrame:
+        return self.view_frame("V_TRANSFORM_REFRESH_COMPARISON")
+
+    def pipeline_cost_performance(self) -> pd.DataFrame:
+        return self.view_frame("V_PIPELINE_COST_PERFORMANCE")
+
+    def task_sizing_recommendation(self) -> pd.DataFrame:
+        return self.view_frame("V_TASK_SIZING_RECOMMENDATION")
+
+    # ------------------------------------------------------------------------
+    # Direct queries
+    # ------------------------------------------------------------------------
+
+    def sites(self) -> pd.DataFrame:
+        """Active sites for the site selector."""
+        return self.query("""
+            SELECT SITE_ID, SITE_NAME
+            FROM SNOWFLAKE_EXAMPLE.ANALYTICS_LAYER.DIM_SITES
+            WHERE is_active
+            ORDER BY SITE_ID
+        """, panel="sites")
+
+    def site_ingestion(self) -> pd.DataFrame:
+        """Per-site totals over the last 24 hours (V_SITE_INGESTION_METRICS; the selected site only if set)."""
+        return self.query(f"""
+            SELECT
+              SITE_ID,
+              SUM(event_count) AS EVENT_COUNT,
+              MAX(unique_badges) AS PEAK_HOURLY_BADGES,
+              MAX(active_readers) AS ACTIVE_READERS,
+              ROUND(100.0 * SUM(weak_signal_count) / NULLIF(SUM(event_count), 0), 2) AS WEAK_SIGNAL_PCT,
+              SUM(entry_count) - SUM(exit_count) AS NET_OCCUPANCY_CHANGE,
+              MAX(last_ingestion_time) AS LAST_INGESTION_TIME
+            FROM SNOWFLAKE_EXAMPLE.RAW_INGESTION.V_SITE_INGESTION_METRICS
+            {self._site_filter('WHERE')}
+            GROUP BY SITE_ID
+            ORDER BY EVENT_COUNT DESC
+        """, panel="site_ingestion")
+
+    def event_volume(self, range_seconds: int, bucket_seconds: int,
+                     range_end: Optional[datetime] = None) -> pd.DataFrame:
+        """Event volume per bucket, aggregated server-side (hourly counters for >= 1h buckets, RAW otherwise).
+
+        range_end None means now. With a site selected every bucket size reads RAW.
+        """
+        backend = self.backend
+        end = backend.now() if range_end is None else backend.timestamp(range_end)
+        if bucket_seconds >= 3600 and self.site_id is None:
+            query = f"""
+                SELECT
+                  {backend.time_bucket('metric_hour', bucket_seconds)} AS BUCKET_START,
+                  SUM(raw_event_count) AS EVENT_COUNT,
+                  SUM(weak_signal_count) AS WEAK_SIGNAL_COUNT
+                FROM SNOWFLAKE_EXAMPLE.ANALYTICS_LAYER.DATA_QUALITY_HOURLY
+                WHERE metric_hour >= {backend.seconds_before(end, range_seconds)}
+                  AND metric_hour < {end}
+                GROUP BY BUCKET_START
+                ORDER BY BUCKET_START
+            """
+        else:
+            query = f"""
+                SELECT
+                  {backend.time_bucket('ingestion_time', bucket_seconds)} AS BUCKET_START,
+                  COUNT(*) AS EVENT_COUNT,
+                  COUNT_IF(signal_quality = 'WEAK') AS WEAK_SIGNAL_COUNT
+                FROM SNOWFLAKE_EXAMPLE.RAW_INGESTION.RAW_BADGE_EVENTS
+                WHERE ingestion_time >= {backend.seconds_before(end, range_seconds)}
+                  AND ingestion_time < {end}
+                  {self._site_filter()}
+                GROUP BY BUCKET_START
+                ORDER BY BUCKET_START
+            """
+        df = self.query(query, panel="events_bucketed")
+        if not df.empty:
+            df['WEAK_SIGNAL_PCT'] = (100.0 * df['WEAK_SIGNAL_COUNT'] / df['EVENT_COUNT']).round(2)
+        return df
+
+    def new_events(self, cursor: Optional[datetime], max_rows: int, overlap_seconds: int) -> pd.DataFrame:
+        """Newest rows ingested after the cursor (minus overlap), oldest first. Never cached.
+
+        The range predicate on ingestion_time prunes to the newest micro-partitions,
+        so poll cost does not grow with table size. At most max_rows rows are
+        returned; above that rate the tail skips ahead to the newest rows.
+        """
+        backend = self.backend
+        if cursor is None:
+            lower_bound = backend.seconds_before(backend.now(), 60)
+        else:
+            lower_bound = backend.seconds_before(backend.timestamp(cursor), overlap_seconds)
+        query = f"""
+            SELECT
+              INGESTION_TIME,
+              EVENT_TIMESTAMP,
+              SITE_ID,
+              BADGE_ID,
+              USER_ID,
+              ZONE_ID,
+              READER_ID,
+              DIRECTION,
+              SIGNAL_STRENGTH,
+              SIGNAL_QUALITY
+            FROM SNOWFLAKE_EXAMPLE.RAW_INGESTION.RAW_BADGE_EVENTS
+            WHERE ingestion_time >= {lower_bound}
+              {self._site_filter()}
+            ORDER BY ingestion_time DESC
+            LIMIT {max_rows}
+        """
+        df, _ = self._fetch(query, "tail", None, page="Live Tail")
+        return df.iloc[::-1]
+
+    def alerts(self, range_seconds: int, max_rows: int) -> pd.DataFrame:
+        """Newest anomaly alerts (BADGE_ALERTS, written by send_events.py --detect), newest first. Never cached."""
+        backend = self.backend
+        query = f"""
+            SELECT
+              DETECTED_TIME,
+              EVENT_TIMESTAMP,
+              ALERT_TYPE,
+              SEVERITY,
+              SITE_ID,
+              ZONE_ID,
+              READER_ID,
+              BADGE_ID,
+              USER_ID,
+              METRIC_VALUE,
+              DETAIL
+            FROM SNOWFLAKE_EXAMPLE.RAW_INGESTION.BADGE_ALERTS
+            WHERE ingestion_time >= {backend.seconds_before(backend.now(), range_seconds)}
+              {self._site_filter()}
+            ORDER BY detected_time DESC
+            LIMIT {max_rows}
+        """
+        df, _ = self._fetch(query, "alerts", None, page="Security Alerts")
+        return df
+
+    def alert_summary(self) -> pd.DataFrame:
+        """Alerts per type and site over the last 24 hours (V_ALERT_SUMMARY; the selected site only if set)."""
+        return self.query(f"""
+            SELECT
+              ALERT_TYPE,
+              SITE_ID,
+              SUM(alert_count) AS ALERT_COUNT,
+              SUM(high_severity_count) AS HIGH_SEVERITY_COUNT,
+              MAX(unique_badges) AS PEAK_HOURLY_BADGES,
+              MAX(unique_readers) AS PEAK_HOURLY_READERS,
+              MAX(p50_detection_delay_seconds) AS MAX_HOURLY_P50_DELAY_SECONDS,
+              MAX(last_alert_time) AS LAST_ALERT_TIME
+            FROM SNOWFLAKE_EXAMPLE.RAW_INGESTION.V_ALERT_SUMMARY
+            {self._site_filter('WHERE')}
+            GROUP BY ALERT_TYPE, SITE_ID
+            ORDER BY ALERT_COUNT DESC
+        """, panel="alert_summary")
+
+    def dashboard_query_history(self) -> pd.DataFrame:
+        """Tagged dashboard queries from QUERY_HISTORY (last 24 hours)."""
+        columns = ",\n              ".join(QUERY_HISTORY_COLUMNS)
+        return self.query(f"""
+            SELECT
+              {columns}
+            FROM SNOWFLAKE_EXAMPLE.RAW_INGESTION.V_DASHBOARD_QUERY_HISTORY
+        """, panel="query_history")
+
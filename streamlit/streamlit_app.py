@@ -11,12 +11,38 @@ DEPLOYMENT:
     This creates the app natively in Snowflake (no external hosting)
 """
 
+import importlib
+import math
+import os
+import time
+from collections import deque
+import numpy as np
 import streamlit as st
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
 from datetime import datetime, timedelta
-from snowflake.snowpark.context import get_active_session
+from data_access import LOCAL_BACKEND_ENV, DashboardData, DuckDBBackend, SnowparkBackend
+
+
+class LazyModule:
+    """Import a module on first attribute access.
+
+    Plotly is only needed by pages that chart, so the Overview page (the
+    landing page) starts without importing it.
+    Benchmark: python tools/bench_import_time.py
+    """
+
+    def __init__(self, name: str):
+        self._name = name
+        self._module = None
+
+    def __getattr__(self, attr: str):
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return getattr(self._module, attr)
+
+
+px = LazyModule("plotly.express")
+go = LazyModule("plotly.graph_objects")
 
 # ============================================================================
 # Page Configuration
@@ -30,20 +56,148 @@ st.set_page_config(
 )
 
 # ============================================================================
-# Snowflake Session (Native Streamlit in Snowflake)
+# Data Access (streamlit/data_access.py)
 # ============================================================================
 
-# Get active Snowflake session (automatically provided by Streamlit in Snowflake)
-session = get_active_session()
+# Streamlit in Snowflake: the active Snowpark session. Locally, point
+# SFE_DASHBOARD_DUCKDB at a SNOWFLAKE_EXAMPLE.duckdb built by
+# tools/scale_test_views.py (profiling without an account).
+
+@st.cache_resource
+def _local_backend(path: str) -> DuckDBBackend:
+    return DuckDBBackend.open(path)
+
+def get_backend():
+    """DuckDB stand-in when SFE_DASHBOARD_DUCKDB is set, the Snowpark session otherwise."""
+    local_path = os.environ.get(LOCAL_BACKEND_ENV)
+    if local_path:
+        return _local_backend(local_path)
+    from snowflake.snowpark.context import get_active_session
+    return SnowparkBackend(get_active_session())
+
+backend = get_backend()
 
 # ============================================================================
 # Helper Functions
 # ============================================================================
 
+MAX_PANEL_TIMINGS = 500
+
+# Shared snapshot written once per minute by sfe_dashboard_snapshot_task
+# (sql/04_monitoring/06_dashboard_snapshot.sql); sessions only read it
+SNAPSHOT_TTL_SECONDS = 15
+
 @st.cache_data(ttl=60)  # Cache for 60 seconds
-def query_snowflake(query: str) -> pd.DataFrame:
-    """Execute query and return DataFrame with 60-second cache."""
-    return session.sql(query).to_pandas()
+def _fetch_tagged(query: str, query_tag: str) -> tuple:
+    return backend.run(query, query_tag)
+
+@st.cache_data(ttl=SNAPSHOT_TTL_SECONDS)
+def _fetch_snapshot(query: str, query_tag: str) -> tuple:
+    return backend.run(query, query_tag)
+
+def _fetch(query: str, query_tag: str, cache) -> tuple:
+    """Route a DashboardData query to its cache ("snapshot", "query") or run it live (None)."""
+    if cache == "snapshot":
+        return _fetch_snapshot(query, query_tag)
+    if cache == "query":
+        return _fetch_tagged(query, query_tag)
+    return backend.run(query, query_tag)
+
+def _record_timing(page_name: str, panel: str, query_id: str, seconds: float, cache_hit: bool, rows: int):
+    """Append one load to the session's panel timings (bounded)."""
+    timings = st.session_state.setdefault("panel_timings", [])
+    timings.append({
+        "PAGE": page_name,
+        "PANEL": panel,
+        "QUERY_ID": query_id,
+        "CLIENT_SECONDS": seconds,
+        "CACHE_HIT": cache_hit,
+        "ROWS": rows,
+        "RECORDED_AT": datetime.now()
+    })
+    del timings[:-MAX_PANEL_TIMINGS]
+
+data = DashboardData(backend, fetch=_fetch, on_fetch=_record_timing)
+
+# Time-range charts: bucket width from range and chart pixel width
+TIME_RANGES = {
+    "Last hour": 3600,
+    "Last 6 hours": 6 * 3600,
+    "Last 24 hours": 24 * 3600,
+    "Last 7 days": 7 * 24 * 3600,
+    "Last 30 days": 30 * 24 * 3600,
+    "Last 90 days": 90 * 24 * 3600
+}
+BUCKET_WIDTHS_SECONDS = [60, 300, 900, 1800, 3600, 3 * 3600, 6 * 3600, 12 * 3600, 24 * 3600]
+CHART_PIXEL_WIDTH = 1200  # Wide layout, full-width chart
+PIXELS_PER_POINT = 2
+MAX_CHART_POINTS = CHART_PIXEL_WIDTH // PIXELS_PER_POINT
+
+def choose_bucket_seconds(range_seconds: int, pixel_width: int = CHART_PIXEL_WIDTH) -> int:
+    """Smallest bucket width that keeps the range within one point per PIXELS_PER_POINT pixels."""
+    max_points = max(pixel_width // PIXELS_PER_POINT, 1)
+    for width in BUCKET_WIDTHS_SECONDS:
+        if range_seconds / width <= max_points:
+            return width
+    return BUCKET_WIDTHS_SECONDS[-1]
+
+def lttb_downsample(df: pd.DataFrame, x: str, y: str, threshold: int = MAX_CHART_POINTS) -> pd.DataFrame:
+    """Largest-Triangle-Three-Buckets: keep at most `threshold` rows, preserving the visual shape."""
+    n = len(df)
+    if threshold >= n or threshold < 3:
+        return df
+
+    df = df.sort_values(x)
+    x_values = df[x]
+    if pd.api.types.is_datetime64_any_dtype(x_values):
+        x_values = x_values.astype('int64')
+    xs = x_values.to_numpy(dtype=float)
+    ys = df[y].to_numpy(dtype=float)
+
+    every = (n - 2) / (threshold - 2)
+    selected = [0]
+    a = 0
+    for i in range(threshold - 2):
+        # Average of the next bucket is the third triangle vertex
+        next_start = int(math.floor((i + 1) * every)) + 1
+        next_end = min(int(math.floor((i + 2) * every)) + 1, n)
+        avg_x = xs[next_start:next_end].mean()
+        avg_y = ys[next_start:next_end].mean()
+
+        # Keep the point in this bucket with the largest triangle area
+        start = int(math.floor(i * every)) + 1
+        end = int(math.floor((i + 1) * every)) + 1
+        areas = np.abs(
+            (xs[a] - avg_x) * (ys[start:end] - ys[a])
+            - (xs[a] - xs[start:end]) * (avg_y - ys[a])
+        )
+        a = start + int(np.argmax(areas))
+        selected.append(a)
+
+    selected.append(n - 1)
+    return df.iloc[selected]
+
+def format_bucket(seconds: int) -> str:
+    """Format a bucket width (1 min, 3 h, 1 day)."""
+    if seconds < 3600:
+        return f"{seconds // 60} min"
+    elif seconds < 86400:
+        return f"{seconds // 3600} h"
+    return f"{seconds // 86400} day"
+
+# Live tail: cursor over RAW_BADGE_EVENTS.ingestion_time
+LIVE_TAIL_POLL_SECONDS = 2
+LIVE_TAIL_BUFFER_ROWS = 500       # Ring buffer shown on the page
+LIVE_TAIL_MAX_ROWS_PER_POLL = 1000
+LIVE_TAIL_OVERLAP_SECONDS = 5     # Re-read window for rows committed late with an older ingestion_time
+LIVE_TAIL_SEEN_KEYS = 5000
+LIVE_TAIL_RATE_WINDOW_SECONDS = 60
+LIVE_TAIL_MAX_SPARKLINES = 12      # Busiest zones (or sites, across sites)
+
+# Security alerts: BADGE_ALERTS from the ingest-side anomaly detector (send_events.py --detect)
+ALERTS_POLL_SECONDS = 10
+ALERTS_RANGE_SECONDS = 24 * 3600
+ALERTS_MAX_ROWS = 500
 
 def format_timedelta(seconds: int) -> str:
     """Format seconds into human-readable timedelta."""
@@ -73,7 +227,20 @@ def get_health_color(status: str) -> str:
 # ============================================================================
 
 st.title("Simple Stream - Real-Time Monitor")
-st.caption(f"Last updated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} | Auto-refresh: 60s")
+
+try:
+    header_snapshot_df, snapshot_fetched_at = data.snapshot()
+    live_views = header_snapshot_df[
+        header_snapshot_df['REFRESH_SECONDS'] == header_snapshot_df['REFRESH_SECONDS'].min()
+    ]
+    snapshot_age = int(live_views['SNAPSHOT_AGE_SECONDS'].max() + (time.time() - snapshot_fetched_at))
+    st.caption(
+        f"Last updated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} | "
+        f"Snapshot age: {format_timedelta(snapshot_age)} | Auto-refresh: 60s"
+    )
+except Exception as e:
+    st.caption(f"Last updated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} | Auto-refresh: 60s")
+    st.warning(f"Dashboard snapshot unavailable (run sql/04_monitoring/06_dashboard_snapshot.sql): {str(e)}")
 
 # Add refresh button
 col1, col2 = st.columns([6, 1])
@@ -94,13 +261,31 @@ page = st.sidebar.radio(
     [
         "Overview",
         "Ingestion Metrics",
+        "Live Tail",
+        "Security Alerts",
         "Pipeline Health",
         "Cost Tracking",
         "Task Performance",
         "Query Efficiency",
-        "Client Metrics"
+        "Client Metrics",
+        "Transform Comparison",
+        "Cost & Sizing",
+        "Dashboard Performance"
     ]
 )
+data.page = page
+
+# Site filter for the RAW-backed panels (Ingestion Metrics, Live Tail, Security Alerts)
+try:
+    site_ids = data.sites()['SITE_ID'].tolist()
+except Exception:
+    site_ids = []  # DIM_SITES not deployed yet
+site_choice = st.sidebar.selectbox(
+    "Site",
+    ["All sites"] + site_ids,
+    help="Event volume, Live Tail and alerts for one site only (scans just that site's partitions)"
+)
+data.site_id = None if site_choice == "All sites" else site_choice
 
 st.sidebar.divider()
 st.sidebar.caption("Demo project (timeboxed; see deploy_all.sql)")
@@ -116,43 +301,13 @@ if page == "Overview":
     # Query all key metrics
     try:
         # End-to-end latency
-        latency_df = query_snowflake("""
-            SELECT
-              LAYER,
-              LAST_UPDATE,
-              SECONDS_SINCE_UPDATE,
-              ROW_COUNT,
-              HEALTH_STATUS
-            FROM SNOWFLAKE_EXAMPLE.RAW_INGESTION.V_END_TO_END_LATENCY
-        """)
+        latency_df = data.end_to_end_latency()
 
         # Channel status
-        channel_df = query_snowflake("""
-            SELECT
-              PIPE_NAME,
-              LAST_INGESTION_TIME,
-              SECONDS_SINCE_LAST_INGESTION,
-              TOTAL_ROWS_INSERTED,
-              TOTAL_GB_INSERTED,
-              ACTIVE_MINUTES_LAST_HOUR,
-              AVG_ROWS_PER_INSERT,
-              MAX_ROWS_PER_INSERT,
-              TOTAL_CREDITS_USED
-            FROM SNOWFLAKE_EXAMPLE.RAW_INGESTION.V_CHANNEL_STATUS
-        """)
+        channel_df = data.channel_status()
 
         # Data freshness
-        freshness_df = query_snowflake("""
-            SELECT
-              TABLE_NAME,
-              LAST_EVENT_TIMESTAMP,
-              LAST_INGESTION_TIMESTAMP,
-              EVENT_AGE_SECONDS,
-              INGESTION_AGE_SECONDS,
-              TOTAL_ROWS,
-              ROWS_LAST_HOUR
-            FROM SNOWFLAKE_EXAMPLE.RAW_INGESTION.V_DATA_FRESHNESS
-        """)
+        freshness_df = data.data_freshness()
 
         # Top-level KPIs
         col1, col2, col3, col4 = st.columns(4)
@@ -253,24 +408,35 @@ if page == "Overview":
 elif page == "Ingestion Metrics":
     st.header("Ingestion Metrics")
 
+    col_range, col_drill = st.columns([2, 3])
+    with col_range:
+        range_label = st.selectbox("Time range", list(TIME_RANGES.keys()), index=2)
+    with col_drill:
+        drill_down = st.checkbox("Drill into a specific day / hour")
+        drill_day = st.date_input("Day", value=datetime.now().date(), disabled=not drill_down)
+        drill_hour = st.selectbox(
+            "Hour",
+            ["All day"] + [f"{h:02d}:00" for h in range(24)],
+            disabled=not drill_down
+        )
+
+    if drill_down:
+        # Drilldown window ends at the selected day (or hour) boundary
+        if drill_hour == "All day":
+            range_seconds = 24 * 3600
+            range_end = datetime.combine(drill_day, datetime.min.time()) + timedelta(days=1)
+            range_title = f"{drill_day}"
+        else:
+            range_seconds = 3600
+            range_end = datetime.strptime(f"{drill_day} {drill_hour}", "%Y-%m-%d %H:%M") + timedelta(hours=1)
+            range_title = f"{drill_day} {drill_hour}"
+    else:
+        range_seconds = TIME_RANGES[range_label]
+        range_end = None  # Now
+        range_title = range_label
+
     try:
-        metrics_df = query_snowflake("""
-            SELECT
-              INGESTION_HOUR,
-              EVENT_COUNT,
-              EVENTS_PER_SECOND,
-              UNIQUE_BADGES,
-              UNIQUE_ZONES,
-              AVG_SIGNAL_STRENGTH,
-              WEAK_SIGNAL_COUNT,
-              WEAK_SIGNAL_PCT,
-              ENTRY_COUNT,
-              EXIT_COUNT,
-              NET_OCCUPANCY_CHANGE
-            FROM SNOWFLAKE_EXAMPLE.RAW_INGESTION.V_INGESTION_METRICS
-            ORDER BY INGESTION_HOUR DESC
-            LIMIT 24
-        """)
+        metrics_df = data.ingestion_metrics()
 
         if not metrics_df.empty:
             # Top metrics
@@ -294,21 +460,34 @@ elif page == "Ingestion Metrics":
 
             st.divider()
 
-            # Events over time chart
-            st.subheader("Events Over Time (Last 24 Hours)")
-
-            fig = px.line(
-                metrics_df.sort_values('INGESTION_HOUR'),
-                x='INGESTION_HOUR',
-                y='EVENT_COUNT',
-                title='Hourly Event Volume',
-                labels={'EVENT_COUNT': 'Events', 'INGESTION_HOUR': 'Hour'}
-            )
-            fig.update_traces(line_color='#29B5E8')
-            st.plotly_chart(fig, use_container_width=True)
+            # Events over time chart. The default 24-hour view uses the shared
+            # hourly snapshot (all sites); other ranges and single sites are
+            # bucketed server-side.
+            if not drill_down and range_label == "Last 24 hours" and data.site_id is None:
+                bucket_seconds = 3600
+                volume_df = metrics_df.rename(columns={'INGESTION_HOUR': 'BUCKET_START'})
+            else:
+                bucket_seconds = choose_bucket_seconds(range_seconds)
+                volume_df = data.event_volume(range_seconds, bucket_seconds, range_end)
+
+            site_title = f"{data.site_id}, " if data.site_id else ""
+            st.subheader(f"Events Over Time ({site_title}{range_title}, {format_bucket(bucket_seconds)} buckets)")
+
+            if not volume_df.empty:
+                fig = px.line(
+                    lttb_downsample(volume_df, 'BUCKET_START', 'EVENT_COUNT'),
+                    x='BUCKET_START',
+                    y='EVENT_COUNT',
+                    title=f'Event Volume per {format_bucket(bucket_seconds)}',
+                    labels={'EVENT_COUNT': 'Events', 'BUCKET_START': 'Time'}
+                )
+                fig.update_traces(line_color='#29B5E8')
+                st.plotly_chart(fig, use_container_width=True)
+            else:
+                st.info("No events in the selected range.")
 
             # Entry vs Exit chart
-            st.subheader("Entry vs Exit Events")
+            st.subheader("Entry vs Exit Events (Last 24 Hours)")
 
             fig = go.Figure()
             fig.add_trace(go.Bar(
@@ -334,18 +513,27 @@ elif page == "Ingestion Metrics":
             # Signal quality distribution
             st.subheader("Signal Quality Distribution")
 
-            fig = px.line(
-                metrics_df.sort_values('INGESTION_HOUR'),
-                x='INGESTION_HOUR',
-                y='WEAK_SIGNAL_PCT',
-                title='Weak Signal Percentage Over Time',
-                labels={'WEAK_SIGNAL_PCT': 'Weak Signal %', 'INGESTION_HOUR': 'Hour'}
-            )
-            fig.update_traces(line_color='#FF6B6B')
-            st.plotly_chart(fig, use_container_width=True)
+            if not volume_df.empty:
+                fig = px.line(
+                    lttb_downsample(volume_df, 'BUCKET_START', 'WEAK_SIGNAL_PCT'),
+                    x='BUCKET_START',
+                    y='WEAK_SIGNAL_PCT',
+                    title=f'Weak Signal Percentage ({range_title})',
+                    labels={'WEAK_SIGNAL_PCT': 'Weak Signal %', 'BUCKET_START': 'Time'}
+                )
+                fig.update_traces(line_color='#FF6B6B')
+                st.plotly_chart(fig, use_container_width=True)
+
+            # Per-site totals
+            st.subheader("Sites (Last 24 Hours)")
+            site_df = data.site_ingestion()
+            if not site_df.empty:
+                st.dataframe(site_df, use_container_width=True, hide_index=True)
+            else:
+                st.info("No events for this site in the last 24 hours.")
 
             # Detailed table
-            st.subheader("Detailed Metrics Table")
+            st.subheader("Detailed Metrics Table (All Sites)")
             st.dataframe(
                 metrics_df[[
                     'INGESTION_HOUR', 'EVENT_COUNT', 'EVENTS_PER_SECOND',
@@ -361,6 +549,223 @@ elif page == "Ingestion Metrics":
     except Exception as e:
         st.error(f"Error loading ingestion metrics: {str(e)}")
 
+# ============================================================================
+# Page: Live Tail
+# ============================================================================
+
+elif page == "Live Tail":
+    st.header("Live Event Tail")
+    st.caption(
+        f"Polls RAW_BADGE_EVENTS every {LIVE_TAIL_POLL_SECONDS}s for rows newer than the last ingestion_time seen "
+        f"(latest {LIVE_TAIL_BUFFER_ROWS} rows kept; {site_choice.lower() if data.site_id is None else site_choice})"
+    )
+
+    if st.session_state.get("live_tail", {}).get("site_id", data.site_id) != data.site_id:
+        st.session_state.pop("live_tail")  # Site changed: start over from its newest rows
+    # Across several sites the rate sparklines are per site, otherwise per zone
+    rate_key = 'ZONE_ID' if data.site_id or len(site_ids) <= 1 else 'SITE_ID'
+
+    tail = st.session_state.setdefault("live_tail", {
+        "site_id": data.site_id,
+        "cursor": None,
+        "buffer": deque(maxlen=LIVE_TAIL_BUFFER_ROWS),
+        "seen": deque(maxlen=LIVE_TAIL_SEEN_KEYS),
+        "seen_set": set(),
+        "rates": {},
+        "last_poll_rows": 0,
+        "last_poll_seconds": 0.0,
+        "saturated": False
+    })
+
+    col_pause, col_reset = st.columns([1, 1])
+    with col_pause:
+        paused = st.checkbox("Pause", value=False)
+    with col_reset:
+        if st.button("Reset cursor"):
+            st.session_state.pop("live_tail")
+            st.rerun()
+
+    def poll_live_tail():
+        """Fetch rows past the cursor into the ring buffer and per-second counters."""
+        start = time.perf_counter()
+        new_df = data.new_events(tail["cursor"], LIVE_TAIL_MAX_ROWS_PER_POLL, LIVE_TAIL_OVERLAP_SECONDS)
+        tail["last_poll_seconds"] = time.perf_counter() - start
+        tail["saturated"] = len(new_df) >= LIVE_TAIL_MAX_ROWS_PER_POLL
+        added = 0
+
+        for row in new_df.to_dict('records'):
+            key = (row['BADGE_ID'], str(row['EVENT_TIMESTAMP']), str(row['INGESTION_TIME']))
+            if key in tail["seen_set"]:
+                continue  # Already delivered in the overlap window
+            if len(tail["seen"]) == tail["seen"].maxlen:
+                tail["seen_set"].discard(tail["seen"][0])
+            tail["seen"].append(key)
+            tail["seen_set"].add(key)
+            tail["buffer"].append(row)
+
+            second = pd.Timestamp(row['INGESTION_TIME']).floor('s')
+            key_counts = tail["rates"].setdefault(second, {})
+            key_counts[row[rate_key]] = key_counts.get(row[rate_key], 0) + 1
+            added += 1
+
+        if not new_df.empty:
+            tail["cursor"] = pd.Timestamp(new_df['INGESTION_TIME'].max())
+            newest = max(tail["rates"])
+            expired = [sec for sec in tail["rates"] if (newest - sec).total_seconds() > LIVE_TAIL_RATE_WINDOW_SECONDS]
+            for second in expired:
+                del tail["rates"][second]
+        tail["last_poll_rows"] = added
+
+    def render_live_tail():
+        if not paused:
+            try:
+                poll_live_tail()
+            except Exception as e:
+                st.error(f"Error polling events: {str(e)}")
+
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            st.metric("New Rows (last poll)", f"{tail['last_poll_rows']:,}")
+        with col2:
+            st.metric("Poll Latency", f"{tail['last_poll_seconds']:.2f}s")
+        with col3:
+            st.metric("Rows in Buffer", f"{len(tail['buffer']):,}")
+        with col4:
+            cursor = tail["cursor"]
+            st.metric("Cursor (ingestion_time)", cursor.strftime('%H:%M:%S') if cursor is not None else "N/A")
+
+        if tail["saturated"]:
+            st.warning(
+                f"More than {LIVE_TAIL_MAX_ROWS_PER_POLL:,} rows per poll: showing the newest rows only "
+                "(rates below are a lower bound)."
+            )
+
+        if tail["rates"]:
+            rate_df = pd.DataFrame([
+                {'SECOND': second, 'KEY': key, 'EVENTS': count}
+                for second, keys in tail["rates"].items()
+                for key, count in keys.items()
+            ])
+
+            # Overall events per second
+            total_df = rate_df.groupby('SECOND', as_index=False)['EVENTS'].sum()
+            fig = px.area(total_df, x='SECOND', y='EVENTS', height=160)
+            fig.update_traces(line_color='#29B5E8', fillcolor='rgba(41, 181, 232, 0.3)')
+            fig.update_layout(
+                title=f'Events per Second (last {LIVE_TAIL_RATE_WINDOW_SECONDS}s)',
+                margin=dict(l=0, r=0, t=30, b=0),
+                xaxis_title=None,
+                yaxis_title=None
+            )
+            st.plotly_chart(fig, use_container_width=True)
+
+            # Per-zone (or per-site) sparklines for the busiest keys
+            busiest = rate_df.groupby('KEY')['EVENTS'].sum().nlargest(LIVE_TAIL_MAX_SPARKLINES)
+            keys = sorted(busiest.index)
+            key_cols = st.columns(max(len(keys), 1))
+            for idx, key in enumerate(keys):
+                key_df = rate_df[rate_df['KEY'] == key]
+                with key_cols[idx]:
+                    fig = px.line(key_df, x='SECOND', y='EVENTS', height=100)
+                    fig.update_traces(line_color='#00C851')
+                    fig.update_layout(
+                        title=dict(text=key, font=dict(size=11)),
+                        margin=dict(l=0, r=0, t=25, b=0),
+                        xaxis=dict(visible=False),
+                        yaxis=dict(visible=False)
+                    )
+                    st.plotly_chart(fig, use_container_width=True)
+
+        if tail["buffer"]:
+            st.dataframe(
+                pd.DataFrame(reversed(tail["buffer"])),
+                use_container_width=True,
+                hide_index=True
+            )
+        else:
+            st.info("Waiting for events. Start the simulator to see rows arrive.")
+
+    # Re-run only this section on a timer when fragments are available;
+    # otherwise each page rerun (Refresh Now) polls once
+    fragment = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", None)
+    if fragment is not None:
+        fragment(run_every=LIVE_TAIL_POLL_SECONDS)(render_live_tail)()
+    else:
+        render_live_tail()
+
+# ============================================================================
+# Page: Security Alerts
+# ============================================================================
+
+elif page == "Security Alerts":
+    st.header("Security Alerts")
+    st.caption(
+        f"Impossible travel, tailgating and reader signal degradation flagged at ingest "
+        f"(send_events.py --detect). Polls BADGE_ALERTS every {ALERTS_POLL_SECONDS}s "
+        f"(last {format_timedelta(ALERTS_RANGE_SECONDS)}; "
+        f"{site_choice.lower() if data.site_id is None else site_choice})"
+    )
+
+    alert_types = st.multiselect(
+        "Alert types",
+        ["IMPOSSIBLE_TRAVEL", "TAILGATING", "SIGNAL_DEGRADATION"],
+        default=["IMPOSSIBLE_TRAVEL", "TAILGATING", "SIGNAL_DEGRADATION"]
+    )
+
+    def render_alerts():
+        try:
+            alerts_df = data.alerts(ALERTS_RANGE_SECONDS, ALERTS_MAX_ROWS)
+        except Exception as e:
+            st.warning(f"BADGE_ALERTS unavailable (redeploy sql/02_core/01_core.sql): {str(e)}")
+            return
+
+        col1, col2, col3, col4 = st.columns(4)
+        counts = alerts_df['ALERT_TYPE'].value_counts()
+        with col1:
+            st.metric("Impossible Travel", f"{counts.get('IMPOSSIBLE_TRAVEL', 0):,}")
+        with col2:
+            st.metric("Tailgating", f"{counts.get('TAILGATING', 0):,}")
+        with col3:
+            st.metric("Signal Degradation", f"{counts.get('SIGNAL_DEGRADATION', 0):,}")
+        with col4:
+            newest = alerts_df['DETECTED_TIME'].max() if not alerts_df.empty else None
+            st.metric("Latest Alert", pd.Timestamp(newest).strftime('%H:%M:%S') if newest is not None else "N/A")
+
+        if len(alerts_df) >= ALERTS_MAX_ROWS:
+            st.caption(f"Counts cover the newest {ALERTS_MAX_ROWS:,} alerts; see the summary below for totals.")
+
+        shown_df = alerts_df[alerts_df['ALERT_TYPE'].isin(alert_types)]
+        if shown_df.empty:
+            st.success("No alerts in range. Stream with send_events.py --detect to check events at ingest.")
+            return
+
+        st.dataframe(shown_df, use_container_width=True, hide_index=True)
+
+    fragment = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", None)
+    if fragment is not None:
+        fragment(run_every=ALERTS_POLL_SECONDS)(render_alerts)()
+    else:
+        render_alerts()
+
+    st.subheader("Alerts by Type and Site (24h)")
+    try:
+        summary_df = data.alert_summary()
+        if not summary_df.empty:
+            fig = px.bar(
+                summary_df,
+                x='SITE_ID',
+                y='ALERT_COUNT',
+                color='ALERT_TYPE',
+                title='Alerts per Site',
+                height=300
+            )
+            st.plotly_chart(fig, use_container_width=True)
+            st.dataframe(summary_df, use_container_width=True, hide_index=True)
+        else:
+            st.info("No alerts in the last 24 hours.")
+    except Exception as e:
+        st.warning(f"V_ALERT_SUMMARY unavailable (redeploy sql/04_monitoring/04_monitoring.sql): {str(e)}")
+
 # ============================================================================
 # Page: Pipeline Health
 # ============================================================================
@@ -369,15 +774,7 @@ elif page == "Pipeline Health":
     st.header("Pipeline Health & Latency")
 
     try:
-        latency_df = query_snowflake("""
-            SELECT
-              LAYER,
-              LAST_UPDATE,
-              SECONDS_SINCE_UPDATE,
-              ROW_COUNT,
-              HEALTH_STATUS
-            FROM SNOWFLAKE_EXAMPLE.RAW_INGESTION.V_END_TO_END_LATENCY
-        """)
+        latency_df = data.end_to_end_latency()
 
         if not latency_df.empty:
             # Health status cards
@@ -445,17 +842,7 @@ elif page == "Cost Tracking":
     st.header("Cost Tracking")
 
     try:
-        cost_df = query_snowflake("""
-            SELECT
-              INGESTION_DATE,
-              GB_INGESTED,
-              ROWS_INGESTED,
-              ACTUAL_CREDITS_USED,
-              ROWS_PER_GB
-            FROM SNOWFLAKE_EXAMPLE.RAW_INGESTION.V_STREAMING_COSTS
-            ORDER BY INGESTION_DATE DESC
-            LIMIT 30
-        """)
+        cost_df = data.streaming_costs()
 
         if not cost_df.empty:
             # Top metrics
@@ -542,20 +929,7 @@ elif page == "Task Performance":
     st.header("Task Execution History")
 
     try:
-        task_df = query_snowflake("""
-            SELECT
-              TASK_NAME,
-              STATE,
-              SCHEDULED_TIME,
-              COMPLETED_TIME,
-              DURATION_SECONDS,
-              ERROR_CODE,
-              ERROR_MESSAGE,
-              EXECUTION_STATUS
-            FROM SNOWFLAKE_EXAMPLE.RAW_INGESTION.V_TASK_EXECUTION_HISTORY
-            ORDER BY SCHEDULED_TIME DESC
-            LIMIT 50
-        """)
+        task_df = data.task_execution_history()
 
         if not task_df.empty:
             # Summary metrics
@@ -657,16 +1031,7 @@ elif page == "Query Efficiency":
     st.header("Query Pruning Efficiency")
 
     try:
-        efficiency_df = query_snowflake("""
-            SELECT
-              TABLE_NAME,
-              QUERY_COUNT,
-              AVG_SCAN_RATIO_PCT,
-              TOTAL_GB_SCANNED_APPROX,
-              ROW_PRUNE_RATIO_PCT,
-              PRUNING_EFFICIENCY
-            FROM SNOWFLAKE_EXAMPLE.RAW_INGESTION.V_PARTITION_EFFICIENCY
-        """)
+        efficiency_df = data.partition_efficiency()
 
         if not efficiency_df.empty:
             # Summary metrics
@@ -761,22 +1126,7 @@ elif page == "Client Metrics":
     st.caption("Client-side SDK ingestion metrics (SNOWPIPE_STREAMING_CLIENT_HISTORY)")
 
     try:
-        client_df = query_snowflake("""
-            SELECT
-              CLIENT_NAME,
-              INGESTION_DATE,
-              SESSION_COUNT,
-              TOTAL_CLIENT_CREDITS,
-              TOTAL_GB_SENT,
-              AVG_MB_PER_SESSION,
-              TOTAL_ROWS_SENT,
-              AVG_SESSION_DURATION_SECONDS,
-              EARLIEST_SESSION,
-              LATEST_SESSION
-            FROM SNOWFLAKE_EXAMPLE.RAW_INGESTION.V_STREAMING_CLIENT_METRICS
-            ORDER BY INGESTION_DATE DESC
-            LIMIT 30
-        """)
+        client_df = data.streaming_client_metrics()
 
         if not client_df.empty:
             # Summary metrics
@@ -861,6 +1211,326 @@ elif page == "Client Metrics":
     except Exception as e:
         st.error(f"Error loading client metrics: {str(e)}")
 
+# ============================================================================
+# Page: Transform Comparison
+# ============================================================================
+
+elif page == "Transform Comparison":
+    st.header("Transformation Engine Comparison")
+    st.caption("Stream + tasks vs dynamic tables: refresh time and estimated credits (last 24 hours)")
+
+    try:
+        refresh_df = data.transform_refresh_comparison()
+
+        if not refresh_df.empty:
+            # Per-engine summary
+            engine_df = refresh_df.groupby('TRANSFORM_ENGINE').agg({
+                'REFRESH_COUNT': 'sum',
+                'SUCCEEDED_COUNT': 'sum',
+                'TOTAL_REFRESH_SECONDS': 'sum',
+                'EST_CREDITS_USED': 'sum'
+            }).reset_index()
+            engine_df['AVG_REFRESH_SECONDS'] = (
+                engine_df['TOTAL_REFRESH_SECONDS'] / engine_df['REFRESH_COUNT']
+            )
+
+            cols = st.columns(max(len(engine_df), 1))
+            for idx, row in engine_df.iterrows():
+                with cols[idx]:
+                    st.markdown(f"### {row['TRANSFORM_ENGINE']}")
+                    st.metric("Refreshes (24h)", f"{row['REFRESH_COUNT']:,.0f}")
+                    st.metric("Avg Refresh Time", f"{row['AVG_REFRESH_SECONDS']:.2f}s")
+                    st.metric("Est. Credits (24h)", f"{row['EST_CREDITS_USED']:.4f}")
+
+            st.divider()
+
+            # Refresh time over time
+            st.subheader("Average Refresh Time by Hour")
+
+            fig = px.line(
+                refresh_df.sort_values('REFRESH_HOUR'),
+                x='REFRESH_HOUR',
+                y='AVG_REFRESH_SECONDS',
+                color='OBJECT_NAME',
+                line_dash='TRANSFORM_ENGINE',
+                title='Average Refresh Time (seconds)',
+                labels={'AVG_REFRESH_SECONDS': 'Seconds', 'REFRESH_HOUR': 'Hour'}
+            )
+            st.plotly_chart(fig, use_container_width=True)
+
+            # Credits over time
+            st.subheader("Estimated Credits by Hour")
+
+            fig = px.bar(
+                refresh_df.sort_values('REFRESH_HOUR'),
+                x='REFRESH_HOUR',
+                y='EST_CREDITS_USED',
+                color='TRANSFORM_ENGINE',
+                title='Estimated Warehouse Credits (X-SMALL)',
+                labels={'EST_CREDITS_USED': 'Credits', 'REFRESH_HOUR': 'Hour'},
+                color_discrete_map={
+                    'TASKS': '#29B5E8',
+                    'DYNAMIC_TABLES': '#00C851'
+                }
+            )
+            st.plotly_chart(fig, use_container_width=True)
+
+            # Detailed table
+            st.subheader("Detailed Refresh Metrics")
+            st.dataframe(refresh_df, use_container_width=True, hide_index=True)
+        else:
+            st.info("No refresh history available. Data appears after tasks or dynamic tables refresh.")
+
+    except Exception as e:
+        st.error(f"Error loading transform comparison: {str(e)}")
+
+# ============================================================================
+# Page: Cost & Sizing
+# ============================================================================
+
+elif page == "Cost & Sizing":
+    st.header("Cost per Million Events & Sizing")
+    st.caption("Ingest + task credits against event volume and stage latency (ACCOUNT_USAGE, up to a few hours behind)")
+
+    try:
+        perf_df = data.pipeline_cost_performance()
+
+        if not perf_df.empty:
+            # Top metrics
+            col1, col2, col3, col4 = st.columns(4)
+
+            total_events = perf_df['EVENTS_INGESTED'].sum()
+            total_credits = perf_df['TOTAL_CREDITS'].sum()
+
+            with col1:
+                st.metric("Events (30d)", f"{total_events:,.0f}")
+
+            with col2:
+                st.metric("Total Credits (30d)", f"{total_credits:.4f}")
+
+            with col3:
+                per_million = total_credits * 1_000_000 / total_events if total_events > 0 else 0
+                st.metric("Credits / Million Events", f"{per_million:.4f}")
+
+            with col4:
+                latest_p50 = perf_df['RAW_TO_ANALYTICS_P50_SECONDS'].dropna()
+                st.metric(
+                    "RAW -> Analytics p50",
+                    f"{latest_p50.iloc[0]:.1f}s" if not latest_p50.empty else "N/A"
+                )
+
+            st.divider()
+
+            trend_df = perf_df.sort_values('COST_DATE')
+
+            # Cost per million events trend
+            st.subheader("Cost per Million Events")
+
+            fig = px.line(
+                trend_df,
+                x='COST_DATE',
+                y='CREDITS_PER_MILLION_EVENTS',
+                title='Credits per Million Events (ingest + tasks)',
+                labels={'CREDITS_PER_MILLION_EVENTS': 'Credits / 1M events', 'COST_DATE': 'Date'},
+                markers=True
+            )
+            fig.update_traces(line_color='#29B5E8')
+            st.plotly_chart(fig, use_container_width=True)
+
+            # Credits split by stage
+            st.subheader("Credits by Stage")
+
+            fig = px.bar(
+                trend_df,
+                x='COST_DATE',
+                y=['INGEST_CREDITS', 'TASK_CREDITS'],
+                title='Daily Credits: Snowpipe Streaming vs Transformation Tasks',
+                labels={'value': 'Credits', 'COST_DATE': 'Date', 'variable': 'Stage'},
+                color_discrete_sequence=['#29B5E8', '#FFA900']
+            )
+            st.plotly_chart(fig, use_container_width=True)
+
+            # Latency per stage
+            st.subheader("Latency per Stage")
+
+            fig = px.line(
+                trend_df,
+                x='COST_DATE',
+                y=[
+                    'RAW_TO_STAGING_P50_SECONDS',
+                    'STAGING_TO_ANALYTICS_P50_SECONDS',
+                    'RAW_TO_ANALYTICS_P95_SECONDS'
+                ],
+                title='Stage Latency (seconds)',
+                labels={'value': 'Seconds', 'COST_DATE': 'Date', 'variable': 'Stage'}
+            )
+            st.plotly_chart(fig, use_container_width=True)
+
+            # Detailed table
+            st.subheader("Daily Cost & Latency")
+            st.dataframe(perf_df, use_container_width=True, hide_index=True)
+        else:
+            st.info("No cost data available. Data appears after ingestion activity.")
+
+        st.divider()
+
+        # Sizing recommendation
+        st.subheader("Task Sizing Recommendation (last 7 days)")
+
+        sizing_df = data.task_sizing_recommendation()
+
+        if not sizing_df.empty:
+            for _, row in sizing_df.iterrows():
+                message = f"**{row['TASK_NAME']}**: {row['RECOMMENDATION']} - {row['RATIONALE']}"
+                if row['RECOMMENDATION'] == 'KEEP WAREHOUSE':
+                    st.success(message)
+                else:
+                    st.warning(message)
+
+            fig = go.Figure(data=[
+                go.Bar(name='Warehouse (attributed)', x=sizing_df['TASK_NAME'],
+                       y=sizing_df['EST_WAREHOUSE_CREDITS'], marker_color='#29B5E8'),
+                go.Bar(name='Serverless (per second)', x=sizing_df['TASK_NAME'],
+                       y=sizing_df['EST_SERVERLESS_CREDITS'], marker_color='#00C851')
+            ])
+            fig.update_layout(
+                barmode='group',
+                title='Estimated Credits per Billing Model (7 days)',
+                yaxis_title='Credits'
+            )
+            st.plotly_chart(fig, use_container_width=True)
+
+            st.dataframe(sizing_df, use_container_width=True, hide_index=True)
+        else:
+            st.info("No task history available yet. Recommendations appear after tasks have run.")
+
+    except Exception as e:
+        st.error(f"Error loading cost & sizing: {str(e)}")
+
+# ============================================================================
+# Page: Dashboard Performance
+# ============================================================================
+
+elif page == "Dashboard Performance":
+    st.header("Dashboard Performance")
+    st.caption("Per-panel latency from QUERY_HISTORY (tagged queries, last 24 hours) plus local fetch timings from this session")
+
+    try:
+        history_df = data.dashboard_query_history()
+
+        local_df = pd.DataFrame(st.session_state.get("panel_timings", []))
+
+        if not history_df.empty:
+            # Server-side per-panel profile
+            panel_df = history_df.groupby(['PAGE', 'PANEL']).agg(
+                QUERIES=('QUERY_ID', 'count'),
+                P50_ELAPSED_SECONDS=('TOTAL_ELAPSED_SECONDS', lambda x: x.quantile(0.50)),
+                P95_ELAPSED_SECONDS=('TOTAL_ELAPSED_SECONDS', lambda x: x.quantile(0.95)),
+                WAREHOUSE_SECONDS=('WAREHOUSE_SECONDS', 'sum'),
+                AVG_MB_SCANNED=('BYTES_SCANNED', lambda x: x.mean() / 1024 / 1024),
+                AVG_PCT_FROM_CACHE=('PCT_SCANNED_FROM_CACHE', 'mean')
+            ).reset_index()
+
+            # Local timings: cache hit rate and client-side fetch + DataFrame conversion
+            if not local_df.empty:
+                local_panel_df = local_df.groupby(['PAGE', 'PANEL']).agg(
+                    LOADS=('CLIENT_SECONDS', 'count'),
+                    CACHE_HIT_PCT=('CACHE_HIT', lambda x: 100.0 * x.mean()),
+                    P50_CLIENT_SECONDS=('CLIENT_SECONDS', lambda x: x.quantile(0.50)),
+                    P95_CLIENT_SECONDS=('CLIENT_SECONDS', lambda x: x.quantile(0.95))
+                ).reset_index()
+                panel_df = panel_df.merge(local_panel_df, on=['PAGE', 'PANEL'], how='left')
+
+                misses_df = local_df[~local_df['CACHE_HIT']].merge(
+                    history_df[['QUERY_ID', 'TOTAL_ELAPSED_SECONDS']], on='QUERY_ID'
+                )
+                misses_df['FETCH_CONVERT_SECONDS'] = (
+                    misses_df['CLIENT_SECONDS'] - misses_df['TOTAL_ELAPSED_SECONDS']
+                ).clip(lower=0)
+                fetch_df = misses_df.groupby(['PAGE', 'PANEL']).agg(
+                    AVG_FETCH_CONVERT_SECONDS=('FETCH_CONVERT_SECONDS', 'mean')
+                ).reset_index()
+                panel_df = panel_df.merge(fetch_df, on=['PAGE', 'PANEL'], how='left')
+
+            panel_df = panel_df.sort_values('P95_ELAPSED_SECONDS', ascending=False)
+            panel_df['PAGE_PANEL'] = panel_df['PAGE'] + ' / ' + panel_df['PANEL']
+
+            # Top metrics
+            col1, col2, col3, col4 = st.columns(4)
+
+            with col1:
+                st.metric("Tagged Queries (24h)", f"{len(history_df):,}")
+
+            with col2:
+                st.metric("Warehouse Seconds (24h)", f"{history_df['WAREHOUSE_SECONDS'].sum():,.1f}")
+
+            with col3:
+                st.metric("p95 Query Latency", f"{history_df['TOTAL_ELAPSED_SECONDS'].quantile(0.95):.2f}s")
+
+            with col4:
+                if not local_df.empty:
+                    st.metric("Session Cache Hit Rate", f"{100.0 * local_df['CACHE_HIT'].mean():.0f}%")
+                else:
+                    st.metric("Session Cache Hit Rate", "N/A")
+
+            st.divider()
+
+            # Slowest panels
+            st.subheader("Panel Latency (p50 / p95)")
+
+            fig = go.Figure(data=[
+                go.Bar(name='p50', x=panel_df['PAGE_PANEL'], y=panel_df['P50_ELAPSED_SECONDS'], marker_color='#29B5E8'),
+                go.Bar(name='p95', x=panel_df['PAGE_PANEL'], y=panel_df['P95_ELAPSED_SECONDS'], marker_color='#FF4444')
+            ])
+            fig.update_layout(
+                barmode='group',
+                title='Query Elapsed Time by Panel (seconds)',
+                yaxis_title='Seconds'
+            )
+            st.plotly_chart(fig, use_container_width=True)
+
+            # Warehouse seconds
+            st.subheader("Warehouse Seconds by Panel")
+
+            fig = px.bar(
+                panel_df.sort_values('WAREHOUSE_SECONDS', ascending=False),
+                x='PAGE_PANEL',
+                y='WAREHOUSE_SECONDS',
+                title='Warehouse Execution Seconds (24 hours)',
+                labels={'WAREHOUSE_SECONDS': 'Seconds', 'PAGE_PANEL': 'Page / Panel'},
+                color_discrete_sequence=['#FFA900']
+            )
+            st.plotly_chart(fig, use_container_width=True)
+
+            # Detailed table
+            st.subheader("Per-Panel Profile")
+            st.dataframe(panel_df.drop(columns=['PAGE_PANEL']), use_container_width=True, hide_index=True)
+        else:
+            st.info("No tagged dashboard queries yet. Browse the other pages, then return here.")
+
+        # Shared snapshot: one refresher query per view per interval
+        st.subheader("Shared Snapshot Refresh")
+        snapshot_df, _ = data.snapshot()
+        st.dataframe(
+            snapshot_df[[
+                'VIEW_NAME', 'REFRESH_SECONDS', 'SNAPSHOT_TIME',
+                'SNAPSHOT_AGE_SECONDS', 'ROW_COUNT', 'REFRESH_MS'
+            ]],
+            use_container_width=True,
+            hide_index=True
+        )
+
+        if not local_df.empty:
+            st.subheader("Recent Local Fetches (this session)")
+            st.dataframe(
+                local_df.sort_values('RECORDED_AT', ascending=False).head(50),
+                use_container_width=True,
+                hide_index=True
+            )
+
+    except Exception as e:
+        st.error(f"Error loading dashboard performance: {str(e)}")
+
 # ============================================================================
 # Footer
 # ============================================================================
@@ -230,6 +230,8 @@ echo GRANT USAGE ON DATABASE SNOWFLAKE_EXAMPLE TO ROLE sfe_ingest_role;
 echo GRANT USAGE ON SCHEMA SNOWFLAKE_EXAMPLE.RAW_INGESTION TO ROLE sfe_ingest_role;
 echo GRANT INSERT ON TABLE SNOWFLAKE_EXAMPLE.RAW_INGESTION.RAW_BADGE_EVENTS TO ROLE sfe_ingest_role;
 echo GRANT OPERATE ON PIPE SNOWFLAKE_EXAMPLE.RAW_INGESTION.SFE_BADGE_EVENTS_PIPE TO ROLE sfe_ingest_role;
+echo GRANT INSERT ON TABLE SNOWFLAKE_EXAMPLE.RAW_INGESTION.BADGE_ALERTS TO ROLE sfe_ingest_role;
+echo GRANT OPERATE ON PIPE SNOWFLAKE_EXAMPLE.RAW_INGESTION.SFE_BADGE_ALERTS_PIPE TO ROLE sfe_ingest_role;
 echo.
 echo -- Verify
 echo USE ROLE SECURITYADMIN;
@@ -274,6 +276,7 @@ echo   "private_key_path": "keys/rsa_key.p8",
 echo   "database": "SNOWFLAKE_EXAMPLE",
 echo   "schema": "RAW_INGESTION",
 echo   "pipe_name": "sfe_badge_events_pipe",
+echo   "alerts_pipe_name": "sfe_badge_alerts_pipe",
 echo   "sample_events": 10
 echo }
 ) > "%SECRETS_DIR%\config.json"
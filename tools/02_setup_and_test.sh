@@ -201,6 +201,8 @@ GRANT USAGE ON DATABASE SNOWFLAKE_EXAMPLE TO ROLE sfe_ingest_role;
 GRANT USAGE ON SCHEMA SNOWFLAKE_EXAMPLE.RAW_INGESTION TO ROLE sfe_ingest_role;
 GRANT INSERT ON TABLE SNOWFLAKE_EXAMPLE.RAW_INGESTION.RAW_BADGE_EVENTS TO ROLE sfe_ingest_role;
 GRANT OPERATE ON PIPE SNOWFLAKE_EXAMPLE.RAW_INGESTION.SFE_BADGE_EVENTS_PIPE TO ROLE sfe_ingest_role;
+GRANT INSERT ON TABLE SNOWFLAKE_EXAMPLE.RAW_INGESTION.BADGE_ALERTS TO ROLE sfe_ingest_role;
+GRANT OPERATE ON PIPE SNOWFLAKE_EXAMPLE.RAW_INGESTION.SFE_BADGE_ALERTS_PIPE TO ROLE sfe_ingest_role;
 
 -- Verify
 USE ROLE SECURITYADMIN;
@@ -250,6 +252,7 @@ step_4_create_config() {
   "database": "SNOWFLAKE_EXAMPLE",
   "schema": "RAW_INGESTION",
   "pipe_name": "sfe_badge_events_pipe",
+  "alerts_pipe_name": "sfe_badge_alerts_pipe",
   "sample_events": 10
 }
 EOF
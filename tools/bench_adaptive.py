@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Adaptive Ingest Benchmark - fixed batch sizes vs AIMD against a fake channel
+
+Author: SE Community
+Purpose: Show how AdaptiveChannelSink picks batch size / in-flight limit under
+         different channel conditions, with no Snowflake account
+
+USAGE:
+    python tools/bench_adaptive.py
+    python tools/bench_adaptive.py --events 200000 --scenario spike --trace
+    python tools/bench_adaptive.py --json adaptive.json
+
+SCENARIOS (fake_streaming.FakeStreamingClient):
+    steady       20 ms + 10 us/row append latency, 200k rows/s commit
+    spike        steady, plus +300 ms per append from 0.5 s to 2 s
+    slow-server  commit capped at 20k rows/s; append latency grows 10 us per
+                 uncommitted row (an overwhelmed channel)
+
+Each scenario runs fixed batch sizes (ChannelSink) and the adaptive sink;
+elapsed time is until every row is committed on the fake server.
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Any, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "simulator"))
+
+from adaptive import AdaptiveChannelSink  # noqa: E402
+from event_stream import ChannelSink, EventStream, sample_event_source  # noqa: E402
+from fake_streaming import FakeStreamingClient, latency_model  # noqa: E402
+from streaming_session import StreamingSession  # noqa: E402
+
+CONFIG = {"database": "SNOWFLAKE_EXAMPLE", "schema": "RAW_INGESTION", "pipe_name": "FAKE_PIPE"}
+FIXED_BATCH_SIZES = [100, 2_000, 10_000]
+TARGET_LATENCY_MS = 100.0
+
+
+def make_client(scenario: str) -> FakeStreamingClient:
+    if scenario == "steady":
+        return FakeStreamingClient(latency_model(base=0.02, per_row=1e-5), commit_rows_per_second=200_000)
+    if scenario == "spike":
+        return FakeStreamingClient(latency_model(base=0.02, per_row=1e-5, spikes=[(0.5, 1.5, 0.3)]),
+                                   commit_rows_per_second=200_000)
+    if scenario == "slow-server":
+        return FakeStreamingClient(latency_model(base=0.02, per_row=1e-5, per_backlog_row=1e-5),
+                                   commit_rows_per_second=20_000)
+    raise ValueError(f"Unknown scenario: {scenario}")
+
+
+def run_case(scenario: str, events: int, batch_size: int = None) -> Dict[str, Any]:
+    """Send events through EventStream; batch_size None = adaptive."""
+    client = make_client(scenario)
+    with StreamingSession(CONFIG, client_factory=lambda: client) as session:
+        if batch_size is None:
+            sink = AdaptiveChannelSink(session, target_latency_ms=TARGET_LATENCY_MS)
+        else:
+            sink = ChannelSink(session)
+        started = time.perf_counter()
+        stats = EventStream(sample_event_source(events), sink, batch_size=batch_size or 500,
+                            max_buffered=20_000, close_sink=False).run()
+
+        state = client.server[session.default_channel]
+        while len(state.rows) < events:
+            session.committed_offset()  # lets the fake commit due batches
+            time.sleep(0.005)
+        elapsed = time.perf_counter() - started
+
+    result = {
+        "scenario": scenario,
+        "mode": "adaptive" if batch_size is None else f"fixed {batch_size}",
+        "events": events,
+        "batches": stats.batches,
+        "elapsed_seconds": round(elapsed, 2),
+        "committed_per_second": round(events / elapsed),
+    }
+    if batch_size is None:
+        result["metrics"] = sink.metrics()
+        result["trace"] = sink.history
+    return result
+
+
+def print_report(results: List[Dict[str, Any]], trace: bool):
+    print("=" * 78)
+    print(f"Adaptive Ingest Benchmark (fake channel, target append latency {TARGET_LATENCY_MS:.0f} ms)")
+    print("=" * 78)
+    print(f"{'Scenario':<12} {'Mode':<12} {'Batches':>8} {'Seconds':>8} {'Rows/s':>9}  Final parameters")
+    for r in results:
+        final = ""
+        if "metrics" in r:
+            m = r["metrics"]
+            final = (f"batch {m['batch_size']}, in-flight {m['max_in_flight']}, "
+                     f"append p95 {m['append_p95_ms']} ms, -{m['decreases']} "
+                     f"({m['last_decrease_reason'] or 'no decrease'})")
+        print(f"{r['scenario']:<12} {r['mode']:<12} {r['batches']:>8} {r['elapsed_seconds']:>8.2f} "
+              f"{r['committed_per_second']:>9,}  {final}")
+
+    if trace:
+        for r in results:
+            if "trace" in r:
+                print(f"\n{r['scenario']} adaptive trace (every 10th batch):")
+                for step in r["trace"][::10]:
+                    print(f"  batch {step['batch']:>4}: rows {step['rows']:>6}  append {step['append_ms']:>7.1f} ms  "
+                          f"-> batch_size {step['batch_size']:>6}  max_in_flight {step['max_in_flight']:>2}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark fixed vs AIMD batch sizing against a fake channel")
+    parser.add_argument("--events", type=int, default=100_000, help="Events per case")
+    parser.add_argument("--scenario", choices=["steady", "spike", "slow-server"], action="append",
+                        help="Scenario(s) to run (default: all)")
+    parser.add_argument("--trace", action="store_true", help="Print the adaptive parameter trajectory")
+    parser.add_argument("--json", type=Path, help="Write results to this JSON file")
+    args = parser.parse_args()
+
+    results = []
+    for scenario in args.scenario or ["steady", "spike", "slow-server"]:
+        for batch_size in FIXED_BATCH_SIZES + [None]:
+            results.append(run_case(scenario, args.events, batch_size))
+
+    print_report(results, args.trace)
+
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2))
+        print(f"\nResults written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""
+Anomaly Detection Benchmark - detector throughput and recall at a million badges
+
+Author: SE Community
+Purpose: Measure AnomalyDetector events/sec and memory with 1M distinct badges,
+         and check that injected anomalies are found (no Snowflake account)
+
+USAGE:
+    python tools/bench_anomaly.py                        # 1M badges, 3M events
+    python tools/bench_anomaly.py --badges 100000 --events 500000
+    python tools/bench_anomaly.py --json anomaly.json
+    python tools/bench_anomaly.py --duckdb SNOWFLAKE_EXAMPLE.duckdb   # alerts for the local dashboard
+
+WORKLOAD:
+    --badges distinct badges across --sites generated sites (SiteLayout, 10
+    zones x 2 readers each). Every badge stays at its home site; events are
+    --rate per second of event time, ISO timestamps as the simulator sends them;
+    one badge scans at most every 10 s (less with few badges), and injected
+    badges only where injected.
+    Injected (--inject of each):
+      impossible travel   a badge seen at another site 30 s after its last scan
+      tailgating          four entries by one badge at one zone within 15 s
+      degraded readers    a reader whose scans are all WEAK (-90..-84 dBm)
+    Recall is the share of injected badges / readers that raised their alert
+    type; other alerts are counted as unexpected (the random background has a
+    few real repeat entries).
+
+MEASURE:
+    events/s    events / seconds inside AnomalyDetector.observe_batch()
+                (event generation is not timed)
+    state       badges tracked, sketch size, process peak RSS growth
+
+Exit code 1 when recall is below 100%.
+"""
+
+import argparse
+from array import array
+import json
+import random
+import resource
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "simulator"))
+
+from anomaly import ALERT_TYPES, AnomalyDetector, IMPOSSIBLE_TRAVEL, SIGNAL_DEGRADATION, TAILGATING  # noqa: E402
+from event_stream import DIRECTIONS, SIGNAL_STRENGTH_RANGE, USER_IDS, SiteLayout  # noqa: E402
+
+ALERT_COLUMNS = [
+    "alert_type", "severity", "site_id", "zone_id", "reader_id", "badge_id", "user_id",
+    "event_timestamp", "metric_value", "detail", "detected_time",
+]
+TRAVEL_GAP_SECONDS = 30
+TAILGATE_GAPS_SECONDS = (0, 5, 10, 15)
+ANOMALY_SPAN_SECONDS = max(TRAVEL_GAP_SECONDS, max(TAILGATE_GAPS_SECONDS))  # Event time one anomaly covers
+WEAK_SIGNAL_RANGE = (-90, -84)
+MIN_SCAN_GAP_SECONDS = 10  # Background scans of one badge are at least this far apart
+ZONES_PER_SITE = 10
+READERS_PER_ZONE = 2
+
+
+def badge_id(n: int) -> str:
+    return f"BADGE-{n:07d}"
+
+
+def workload(badges: int, events: int, rate: float, layout: SiteLayout, inject: int, start: datetime,
+             seed: int) -> Dict[str, Any]:
+    """Injected anomalies: event index -> extra events, plus the ground truth."""
+    rng = random.Random(seed)
+    site_ids = layout.site_ids
+    picked = rng.sample(range(badges), 2 * inject)
+    travel, tailgate = picked[:inject], picked[inject:]
+    degraded = set(rng.sample([reader for _, _, readers in layout.zones for reader in readers], inject))
+
+    extra: Dict[int, List[tuple]] = {}
+    last_index = events - int(ANOMALY_SPAN_SECONDS * rate) - 1
+    for n in travel:
+        i = rng.randrange(last_index)
+        home = site_ids[n % len(site_ids)]
+        away = site_ids[(n + 1) % len(site_ids)]
+        extra.setdefault(i, []).append((n, rng.choice(list(layout.sites[home])), "entry"))
+        extra.setdefault(i + int(TRAVEL_GAP_SECONDS * rate), []).append(
+            (n, rng.choice(list(layout.sites[away])), "entry"))
+    for n in tailgate:
+        i = rng.randrange(last_index)
+        zone = rng.choice(list(layout.sites[site_ids[n % len(site_ids)]]))
+        for gap in TAILGATE_GAPS_SECONDS:
+            extra.setdefault(i + int(gap * rate), []).append((n, zone, "entry"))
+
+    return {
+        "extra": extra,
+        "expected": {
+            IMPOSSIBLE_TRAVEL: {badge_id(n) for n in travel},
+            TAILGATING: {badge_id(n) for n in tailgate},
+            SIGNAL_DEGRADATION: degraded,
+        },
+        "degraded": degraded,
+        "injected_badges": set(picked),
+        "start": start,
+    }
+
+
+def event_batches(badges: int, events: int, rate: float, layout: SiteLayout, plan: Dict[str, Any],
+                  batch_size: int, seed: int) -> Iterator[List[Dict[str, Any]]]:
+    """Events in event-time order: random badges at their home site, plus the injected ones."""
+    rng = random.Random(seed + 1)
+    site_ids = layout.site_ids
+    zones_by_site = {site_id: [(zone_id, readers) for zone_id, readers in zones.items()]
+                     for site_id, zones in layout.sites.items()}
+    site_of = {zone_id: site_id for site_id, zone_id, _ in layout.zones}
+    reader_of = {zone_id: readers for _, zone_id, readers in layout.zones}
+    extra, degraded, injected, start = plan["extra"], plan["degraded"], plan["injected_badges"], plan["start"]
+
+    def make(n: int, zone_id: str, readers: List[str], direction: str, timestamp: str) -> Dict[str, Any]:
+        reader_id = rng.choice(readers)
+        low, high = WEAK_SIGNAL_RANGE if reader_id in degraded else SIGNAL_STRENGTH_RANGE
+        return {
+            "site_id": site_of[zone_id],
+            "badge_id": badge_id(n),
+            "user_id": USER_IDS[n % len(USER_IDS)],
+            "zone_id": zone_id,
+            "reader_id": reader_id,
+            "event_timestamp": timestamp,
+            "signal_strength": rng.randint(low, high),
+            "direction": direction,
+        }
+
+    # Capped so that half the badges are always free to scan
+    min_gap = min(MIN_SCAN_GAP_SECONDS, badges / rate / 2)
+    last_scan = array("d", [float("-inf")]) * badges
+    batch: List[Dict[str, Any]] = []
+    for i in range(events):
+        timestamp = (start + timedelta(seconds=i / rate)).isoformat()
+        n = rng.randrange(badges)
+        while i / rate - last_scan[n] < min_gap or n in injected:
+            n = rng.randrange(badges)
+        last_scan[n] = i / rate
+        zone_id, readers = rng.choice(zones_by_site[site_ids[n % len(site_ids)]])
+        batch.append(make(n, zone_id, readers, rng.choice(DIRECTIONS), timestamp))
+        for n, zone_id, direction in extra.get(i, ()):
+            batch.append(make(n, zone_id, reader_of[zone_id], direction, timestamp))
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def peak_rss_mb() -> float:
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+def run(args) -> Dict[str, Any]:
+    layout = SiteLayout.generate(args.sites, zones_per_site=ZONES_PER_SITE, readers_per_zone=READERS_PER_ZONE)
+    duration = args.events / args.rate
+    end = args.as_of or datetime.now(timezone.utc)
+    plan = workload(args.badges, args.events, args.rate, layout, args.inject,
+                    end - timedelta(seconds=duration), args.seed)
+
+    detector = AnomalyDetector()
+    alerts: List[Dict[str, Any]] = []
+    rss_before = peak_rss_mb()
+    detect_seconds = 0.0
+    started = time.perf_counter()
+    for batch in event_batches(args.badges, args.events, args.rate, layout, plan, args.batch_size, args.seed):
+        batch_started = time.perf_counter()
+        alerts.extend(detector.observe_batch(batch))
+        detect_seconds += time.perf_counter() - batch_started
+    elapsed = time.perf_counter() - started
+
+    recall = {}
+    for alert_type in ALERT_TYPES:
+        key = "reader_id" if alert_type == SIGNAL_DEGRADATION else "badge_id"
+        found = {alert[key] for alert in alerts if alert["alert_type"] == alert_type}
+        expected = plan["expected"][alert_type]
+        recall[alert_type] = {
+            "expected": len(expected),
+            "found": len(expected & found),
+            "unexpected": len(found - expected),
+        }
+
+    metrics = detector.metrics()
+    return {
+        "badges": args.badges,
+        "events": metrics["events"],
+        "sites": args.sites,
+        "event_time_seconds": round(duration),
+        "detect_seconds": round(detect_seconds, 2),
+        "events_per_second": round(metrics["events"] / detect_seconds) if detect_seconds else 0,
+        "total_seconds": round(elapsed, 2),
+        "peak_rss_growth_mb": round(peak_rss_mb() - rss_before, 1),
+        "recall": recall,
+        "metrics": metrics,
+        "alerts": alerts,
+    }
+
+
+def write_duckdb(path: Path, alerts: List[Dict[str, Any]]):
+    """Replace RAW_INGESTION.BADGE_ALERTS in a local database (tools/scale_test_views.py)."""
+    import duckdb
+
+    con = duckdb.connect(str(path))
+    con.execute("CREATE SCHEMA IF NOT EXISTS RAW_INGESTION")
+    con.execute("""
+        CREATE TABLE IF NOT EXISTS RAW_INGESTION.BADGE_ALERTS (
+            alert_type VARCHAR NOT NULL, severity VARCHAR NOT NULL, site_id VARCHAR NOT NULL,
+            zone_id VARCHAR, reader_id VARCHAR, badge_id VARCHAR, user_id VARCHAR,
+            event_timestamp TIMESTAMP NOT NULL, metric_value DECIMAL(10, 2), detail VARCHAR,
+            detected_time TIMESTAMP, ingestion_time TIMESTAMP
+        )
+    """)
+    con.execute("DELETE FROM RAW_INGESTION.BADGE_ALERTS")
+    rows = []
+    for alert in alerts:
+        event_time = datetime.fromisoformat(alert["event_timestamp"]).replace(tzinfo=None)
+        rows.append([alert[column] for column in ALERT_COLUMNS[:7]]
+                    + [event_time, alert["metric_value"], alert["detail"], event_time, event_time])
+    con.executemany("INSERT INTO RAW_INGESTION.BADGE_ALERTS VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+    con.close()
+
+
+def local_as_of(path: Path) -> Optional[datetime]:
+    """As-of time of a scale-test database, so alerts land in its dashboard's last 24 hours."""
+    import duckdb
+
+    if not path.exists():
+        return None
+    con = duckdb.connect(str(path), read_only=True)
+    try:
+        row = con.execute("SELECT as_of FROM main.scale_test_info").fetchone()
+    except duckdb.Error:
+        row = None
+    con.close()
+    return row[0].replace(tzinfo=timezone.utc) if row else None
+
+
+def print_report(result: Dict[str, Any]):
+    m = result["metrics"]
+    print("=" * 78)
+    print(f"Anomaly Detection Benchmark ({result['badges']:,} badges, {result['sites']} sites, "
+          f"{result['event_time_seconds']:,}s of event time)")
+    print("=" * 78)
+    print(f"Events:           {result['events']:,}")
+    print(f"Detection:        {result['detect_seconds']:.2f}s  ->  {result['events_per_second']:,} events/s "
+          f"(total with generation {result['total_seconds']:.2f}s)")
+    print(f"State:            {m['badges_tracked']:,} badges tracked ({m['swept_badges']:,} swept), "
+          f"{m['readers_tracked']:,} readers, sketch {m['sketch_bytes'] / 1e6:.1f} MB, "
+          f"peak RSS +{result['peak_rss_growth_mb']:.0f} MB")
+    print(f"Late events:      {m['late_events']:,}")
+    print()
+    print(f"{'Alert type':<20} {'Injected':>9} {'Found':>7} {'Recall':>8} {'Unexpected':>11}")
+    for alert_type, r in result["recall"].items():
+        recall = 100.0 * r["found"] / r["expected"] if r["expected"] else 100.0
+        print(f"{alert_type:<20} {r['expected']:>9,} {r['found']:>7,} {recall:>7.1f}% {r['unexpected']:>11,}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the streaming anomaly detector")
+    parser.add_argument("--badges", type=int, default=1_000_000, help="Distinct badges (default: 1,000,000)")
+    parser.add_argument("--events", type=int, default=3_000_000, help="Background events (default: 3,000,000)")
+    parser.add_argument("--rate", type=float, default=2_000, help="Events per second of event time (default: 2000)")
+    parser.add_argument("--sites", type=int, default=20, help="Generated sites (default: 20)")
+    parser.add_argument("--inject", type=int, default=100, help="Injected anomalies of each type (default: 100)")
+    parser.add_argument("--batch-size", type=int, default=1_000, help="Events per observe_batch() call")
+    parser.add_argument("--seed", type=int, default=42, help="Workload seed")
+    parser.add_argument("--json", type=Path, help="Write results (without the alerts) to this JSON file")
+    parser.add_argument("--duckdb", type=Path,
+                        help="Write the alerts to RAW_INGESTION.BADGE_ALERTS of this local database, "
+                             "ending at its as-of time")
+    args = parser.parse_args()
+    if args.rate <= 0:
+        parser.error("--rate must be positive")
+    # workload() starts each anomaly before index events - span - 1
+    anomaly_span = int(ANOMALY_SPAN_SECONDS * args.rate)
+    if args.events < anomaly_span + 2:
+        parser.error(f"--events must exceed {anomaly_span + 1:,} ({ANOMALY_SPAN_SECONDS} s at --rate {args.rate:,.0f}) "
+                     f"to fit the injected anomalies; raise --events or lower --rate")
+    if args.badges < 2 * args.inject:
+        parser.error(f"--badges must be at least 2 x --inject ({2 * args.inject:,})")
+    if args.sites * ZONES_PER_SITE * READERS_PER_ZONE < args.inject:
+        parser.error(f"--inject {args.inject} needs at least that many readers "
+                     f"({ZONES_PER_SITE * READERS_PER_ZONE} per site); raise --sites")
+    args.as_of = local_as_of(args.duckdb) if args.duckdb else None
+
+    result = run(args)
+    print_report(result)
+
+    if args.duckdb:
+        write_duckdb(args.duckdb, result["alerts"])
+        print(f"\n{len(result['alerts']):,} alerts written to {args.duckdb} (RAW_INGESTION.BADGE_ALERTS)")
+    if args.json:
+        args.json.write_text(json.dumps({k: v for k, v in result.items() if k != "alerts"}, indent=2))
+        print(f"\nResults written to {args.json}")
+
+    missed = any(r["found"] < r["expected"] for r in result["recall"].values())
+    sys.exit(1 if missed else 0)
+
+
+if __name__ == "__main__":
+    main()
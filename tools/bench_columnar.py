@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Columnar Benchmark - dict-per-event path vs Arrow record batch path
+
+Author: SE Community
+Purpose: Measure client CPU and payload bytes of the simulator's two event paths
+
+USAGE:
+    python tools/bench_columnar.py
+    python tools/bench_columnar.py --sizes 1000 100000 --repeat 5 --json columnar.json
+
+MEASURES (fastest of --repeat, per batch size):
+    generate_ms     build the events (dicts vs record batch)
+    to_sink_ms      hand them to an in-memory row sink (dict path: EventStream
+                    batching; columnar: to_rows() at the sink, rows built last).
+                    This is what a channel send costs: the SDK takes rows only
+    native_ms       columnar only: hand the batch over as-is. Only file sinks
+                    with write_columns (ParquetSink) do this; no channel does
+    bytes           JSON text of all rows vs Arrow IPC stream of the batch
+
+The headline is generate + rows, the channel path.
+
+The columnar path needs pyarrow and numpy; without them only the dict path runs.
+No Snowflake connection is used.
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Any, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "simulator"))
+
+from event_stream import EventStream, MemorySink  # noqa: E402
+from send_events import generate_sample_events  # noqa: E402
+
+try:
+    import columnar
+except ImportError as e:
+    columnar = None
+    COLUMNAR_SKIP_REASON = str(e)
+
+
+class NativeMemorySink(MemorySink):
+    """MemorySink that accepts record batches as-is (like ParquetSink.write_columns)."""
+
+    def write_columns(self, batch):
+        self.batches.append(batch)
+
+
+def best_ms(fn, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - started) * 1000)
+    return min(timings)
+
+
+def bench_dict(size: int, repeat: int) -> Dict[str, Any]:
+    events = generate_sample_events(size)
+    return {
+        "generate_ms": best_ms(lambda: generate_sample_events(size), repeat),
+        "to_sink_ms": best_ms(lambda: EventStream(events, MemorySink(), batch_size=size,
+                                                  max_buffered=size).run(), repeat),
+        "native_ms": None,
+        "bytes": sum(len(json.dumps(event)) for event in events),
+    }
+
+
+def bench_columnar(size: int, repeat: int) -> Dict[str, Any]:
+    batch = columnar.sample_record_batch(size)
+    return {
+        "generate_ms": best_ms(lambda: columnar.sample_record_batch(size), repeat),
+        "to_sink_ms": best_ms(lambda: columnar.write_record_batches([batch], MemorySink()), repeat),
+        "native_ms": best_ms(lambda: columnar.write_record_batches([batch], NativeMemorySink()), repeat),
+        "bytes": columnar.ipc_size(batch),
+    }
+
+
+def print_report(results: List[Dict[str, Any]]):
+    print("=" * 78)
+    print("Columnar Benchmark (fastest run, in-memory sinks)")
+    print("=" * 78)
+    print(f"{'Events':>8} {'Path':<9} {'Generate ms':>12} {'To sink ms':>11} {'Native ms':>10} "
+          f"{'Bytes':>12} {'B/event':>8}")
+    for r in results:
+        native = f"{r['native_ms']:.1f}" if r["native_ms"] is not None else "-"
+        print(f"{r['events']:>8} {r['path']:<9} {r['generate_ms']:>12.1f} {r['to_sink_ms']:>11.1f} "
+              f"{native:>10} {r['bytes']:>12,} {r['bytes'] / r['events']:>8.1f}")
+
+    by_size = {}
+    for r in results:
+        by_size.setdefault(r["events"], {})[r["path"]] = r
+    print()
+    for size, paths in by_size.items():
+        if "columnar" not in paths:
+            continue
+        d, c = paths["dict"], paths["columnar"]
+        print(
+            f"{size:>8} events: channel path (generate + rows) {(d['generate_ms'] + d['to_sink_ms']) / (c['generate_ms'] + c['to_sink_ms']):.1f}x faster; "
+            f"Parquet only (generate + native) {(d['generate_ms'] + d['to_sink_ms']) / (c['generate_ms'] + c['native_ms']):.1f}x; "
+            f"bytes {d['bytes'] / c['bytes']:.1f}x smaller"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark dict vs Arrow columnar event paths")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000],
+                        help="Events per batch")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement (fastest is kept)")
+    parser.add_argument("--json", type=Path, help="Write results to this JSON file")
+    args = parser.parse_args()
+
+    results = []
+    for size in args.sizes:
+        results.append({"events": size, "path": "dict", **bench_dict(size, args.repeat)})
+        if columnar is not None:
+            results.append({"events": size, "path": "columnar", **bench_columnar(size, args.repeat)})
+
+    print_report(results)
+    if columnar is None:
+        print(f"\nColumnar path SKIPPED ({COLUMNAR_SKIP_REASON}): pip install pyarrow numpy")
+
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2))
+        print(f"\nResults written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
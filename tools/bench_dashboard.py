@@ -0,0 +1,412 @@
+#!/usr/bin/env python3
+"""
+Dashboard Page Benchmark - headless per-page timings against local data
+
+Author: SE Community
+Purpose: Run every dashboard page through its data access and figure-building
+         path without a Snowflake account, so a page (or panel) that got slower
+         shows up before deployment
+
+USAGE:
+    pip install duckdb streamlit pandas plotly numpy
+    python tools/bench_dashboard.py                                   # 1M rows, all pages
+    python tools/bench_dashboard.py --rows 10M --pages Overview "Ingestion Metrics"
+    python tools/bench_dashboard.py --json pages.json
+    python tools/bench_dashboard.py --baseline pages.json --max-regression-pct 25
+
+HOW IT WORKS:
+    data      the local SNOWFLAKE_EXAMPLE.duckdb of tools/scale_test_views.py
+              (same --db), grown to --rows. Views over ACCOUNT_USAGE and
+              INFORMATION_SCHEMA (channel status, costs, task history, pruning,
+              client metrics, transform refreshes, sizing, query history) get
+              stand-in tables of plausible rows, daily volumes taken from the
+              generated history. DASHBOARD_SNAPSHOT is then refreshed from the
+              local views, as sfe_dashboard_snapshot_task does.
+    render    streamlit.testing.v1.AppTest runs streamlit/streamlit_app.py with
+              SFE_DASHBOARD_DUCKDB set (DuckDBBackend in data_access.py), picks
+              each page in the sidebar and runs the script as a browser session
+              would: queries, pandas shaping, Plotly figures and their
+              serialization. Browser-side rendering is not included.
+    timings   cold = first run after st.cache_data.clear(), warm = median of the
+              cached re-runs; fetch ms and queries are from the page's panel
+              timings (st.session_state["panel_timings"]), charts counts
+              plotly_chart elements
+    failures  a page that raises or shows st.error fails the run (exit code 1)
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Any, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "streamlit"))
+
+import scale_test_views  # noqa: E402
+from scale_test_views import DEFAULT_DB, PROJECT_ROOT, parse_scale, scale_label  # noqa: E402
+
+os.environ.setdefault("STREAMLIT_LOGGER_LEVEL", "error")  # Deprecation notices per chart
+
+try:
+    import pandas as pd
+    from streamlit.testing.v1 import AppTest
+    import streamlit as st
+    from data_access import LOCAL_BACKEND_ENV, DuckDBBackend  # noqa: E402
+except ImportError:
+    AppTest = None
+
+APP_PATH = PROJECT_ROOT / "streamlit" / "streamlit_app.py"
+PAGES = [
+    "Overview",
+    "Ingestion Metrics",
+    "Live Tail",
+    "Security Alerts",
+    "Pipeline Health",
+    "Cost Tracking",
+    "Task Performance",
+    "Query Efficiency",
+    "Client Metrics",
+    "Transform Comparison",
+    "Cost & Sizing",
+    "Dashboard Performance",
+]
+# Scenario -> (sidebar page, {selectbox label: value}); the default 24-hour
+# Ingestion Metrics chart reads the snapshot, other ranges and a single site
+# query event_volume()
+SCENARIOS = {}
+for _page in PAGES:
+    SCENARIOS[_page] = (_page, {})
+    if _page == "Ingestion Metrics":
+        for _range in ("Last hour", "Last 7 days", "Last 90 days"):
+            SCENARIOS[f"{_page} ({_range.split(' ', 1)[1]})"] = (_page, {"Time range": _range})
+        SCENARIOS[f"{_page} (one site)"] = (_page, {"Site": scale_test_views.DEFAULT_SITE_ID})
+TASKS = ["SFE_RAW_TO_STAGING_TASK", "SFE_STAGING_TO_ANALYTICS_TASK", "SFE_DASHBOARD_SNAPSHOT_TASK"]
+MIN_REGRESSION_MS = 50.0  # Smaller page-time changes are Streamlit script-run noise
+
+
+# ============================================================================
+# Stand-in data for views over ACCOUNT_USAGE / INFORMATION_SCHEMA
+# ============================================================================
+
+def standin_frames(con, as_of: datetime, seed: int = 7) -> Dict[str, "pd.DataFrame"]:
+    """Plausible rows for the views DuckDB cannot build (no ACCOUNT_USAGE locally)."""
+    rng = random.Random(seed)
+    daily = con.execute("""
+        SELECT CAST(metric_hour AS DATE) AS day, SUM(raw_event_count) AS events
+        FROM ANALYTICS_LAYER.DATA_QUALITY_HOURLY
+        GROUP BY day ORDER BY day DESC LIMIT 30
+    """).fetchall() or [(as_of.date(), 0)]
+    bytes_per_row = 180
+
+    costs = [{
+        "INGESTION_DATE": day,
+        "GB_INGESTED": round(events * bytes_per_row / 1024 ** 3, 4),
+        "ROWS_INGESTED": events,
+        "ACTUAL_CREDITS_USED": round(events * bytes_per_row / 1024 ** 3 * 0.0037, 6),
+        "ROWS_PER_GB": round(1024 ** 3 / bytes_per_row),
+    } for day, events in daily]
+
+    last_hour_events = daily[0][1] / 24
+    channel = [{
+        "PIPE_NAME": "SFE_BADGE_EVENTS_PIPE",
+        "LAST_INGESTION_TIME": as_of - timedelta(seconds=4),
+        "SECONDS_SINCE_LAST_INGESTION": 4,
+        "TOTAL_ROWS_INSERTED": round(last_hour_events),
+        "TOTAL_GB_INSERTED": round(last_hour_events * bytes_per_row / 1024 ** 3, 4),
+        "ACTIVE_MINUTES_LAST_HOUR": 60,
+        "AVG_ROWS_PER_INSERT": 500.0,
+        "MAX_ROWS_PER_INSERT": 5_000,
+        "TOTAL_CREDITS_USED": round(costs[0]["ACTUAL_CREDITS_USED"] / 24, 6),
+    }]
+
+    task_history = []
+    for minute in range(1, 51):
+        task = TASKS[minute % 2]
+        scheduled = as_of - timedelta(minutes=minute)
+        failed = rng.random() < 0.04
+        duration = round(rng.uniform(2.0, 12.0), 3)
+        task_history.append({
+            "TASK_NAME": task,
+            "STATE": "FAILED" if failed else "SUCCEEDED",
+            "SCHEDULED_TIME": scheduled,
+            "COMPLETED_TIME": scheduled + timedelta(seconds=duration),
+            "DURATION_SECONDS": duration,
+            "ERROR_CODE": "100038" if failed else None,
+            "ERROR_MESSAGE": "Numeric value is not recognized" if failed else None,
+            "EXECUTION_STATUS": "FAILED" if failed else "SUCCESS",
+        })
+
+    pruning = [{
+        "TABLE_NAME": table,
+        "QUERY_COUNT": rng.randint(200, 2_000),
+        "AVG_SCAN_RATIO_PCT": ratio,
+        "TOTAL_GB_SCANNED_APPROX": round(rng.uniform(0.5, 20.0), 2),
+        "ROW_PRUNE_RATIO_PCT": round(100 - ratio, 2),
+        "PRUNING_EFFICIENCY": "EXCELLENT" if ratio < 20 else "GOOD" if ratio < 50 else "FAIR",
+    } for table, ratio in (("RAW_BADGE_EVENTS", 12.5), ("FCT_ACCESS_EVENTS", 41.0))]
+
+    clients = [{
+        "CLIENT_NAME": client,
+        "INGESTION_DATE": day,
+        "SESSION_COUNT": rng.randint(20, 200),
+        "TOTAL_CLIENT_CREDITS": round(events * share * 1e-8, 6),
+        "TOTAL_GB_SENT": round(events * share * bytes_per_row / 1024 ** 3, 4),
+        "AVG_MB_PER_SESSION": round(rng.uniform(1.0, 50.0), 2),
+        "TOTAL_ROWS_SENT": round(events * share),
+        "AVG_SESSION_DURATION_SECONDS": round(rng.uniform(30, 600), 1),
+        "EARLIEST_SESSION": datetime.combine(day, datetime.min.time()),
+        "LATEST_SESSION": datetime.combine(day, datetime.min.time()) + timedelta(hours=23, minutes=59),
+    } for day, events in daily for client, share in (("simulator", 0.8), ("java_sdk_client", 0.2))]
+
+    refreshes = []
+    for hour in range(1, 25):
+        refresh_hour = as_of - timedelta(hours=hour)
+        for engine, objects in (("TASKS", TASKS[:2]), ("DYNAMIC_TABLES", ["STG_BADGE_EVENTS", "FCT_ACCESS_EVENTS"])):
+            for name in objects:
+                avg = rng.uniform(2.0, 10.0)
+                refreshes.append({
+                    "TRANSFORM_ENGINE": engine,
+                    "OBJECT_NAME": name,
+                    "REFRESH_HOUR": refresh_hour,
+                    "REFRESH_COUNT": 60,
+                    "SUCCEEDED_COUNT": 60 - (rng.random() < 0.1),
+                    "AVG_REFRESH_SECONDS": round(avg, 2),
+                    "P95_REFRESH_SECONDS": round(avg * 1.8, 2),
+                    "TOTAL_REFRESH_SECONDS": round(avg * 60, 2),
+                    "AVG_LAG_SECONDS": round(rng.uniform(30, 90), 1),
+                    "EST_CREDITS_USED": round(avg * 60 / 3600 * 0.9, 6),
+                })
+
+    cost_performance = []
+    for cost, (day, events) in zip(costs, daily):
+        task_credits = round(rng.uniform(0.5, 2.0), 6)
+        total = cost["ACTUAL_CREDITS_USED"] + task_credits
+        p50 = rng.uniform(20, 60)
+        cost_performance.append({
+            "COST_DATE": day,
+            "EVENTS_INGESTED": events,
+            "INGEST_CREDITS": cost["ACTUAL_CREDITS_USED"],
+            "TASK_CREDITS": task_credits,
+            "TOTAL_CREDITS": round(total, 6),
+            "CREDITS_PER_MILLION_EVENTS": round(total / max(events, 1) * 1e6, 6),
+            "TASK_RUNS": 2_880,
+            "AVG_TASK_SECONDS": round(rng.uniform(2.0, 10.0), 2),
+            "RAW_TO_STAGING_P50_SECONDS": round(p50, 1),
+            "STAGING_TO_ANALYTICS_P50_SECONDS": round(p50 * 0.8, 1),
+            "RAW_TO_ANALYTICS_P50_SECONDS": round(p50 * 1.8, 1),
+            "RAW_TO_ANALYTICS_P95_SECONDS": round(p50 * 3.2, 1),
+        })
+
+    sizing = [{
+        "TASK_NAME": task,
+        "RUNS": 1_440,
+        "RUNS_PER_HOUR": 60.0,
+        "AVG_BUSY_SECONDS": busy,
+        "P95_BUSY_SECONDS": round(busy * 2.1, 2),
+        "AVG_QUEUE_SECONDS": 0.4,
+        "ATTRIBUTED_CREDITS": round(1_440 * busy / 3600.0, 6),
+        "EST_WAREHOUSE_CREDITS": round(1_440 * busy / 3600.0, 6),
+        "EST_SERVERLESS_CREDITS": round(1_440 * busy * 0.9 / 3600.0, 6),
+        "RECOMMENDATION": "SERVERLESS",
+        "RATIONALE": "Serverless per-second billing costs less than the credits attributed on COMPUTE_WH",
+    } for task, busy in zip(TASKS, (4.2, 6.8, 1.5))]
+
+    history = []
+    for i in range(300):
+        page = rng.choice(PAGES)
+        elapsed = rng.lognormvariate(-1.0, 0.8)
+        history.append({
+            "QUERY_ID": f"history-{i}",
+            "PAGE": page,
+            "PANEL": "snapshot" if rng.random() < 0.7 else "events_bucketed",
+            "START_TIME": as_of - timedelta(seconds=rng.randint(0, 86_400)),
+            "EXECUTION_STATUS": "SUCCESS",
+            "TOTAL_ELAPSED_SECONDS": round(elapsed, 3),
+            "COMPILATION_SECONDS": round(elapsed * 0.2, 3),
+            "QUEUED_SECONDS": 0.0,
+            "WAREHOUSE_SECONDS": round(elapsed * 0.7, 3),
+            "BYTES_SCANNED": rng.randint(0, 50_000_000),
+            "PCT_SCANNED_FROM_CACHE": round(rng.uniform(0, 100), 1),
+            "ROWS_PRODUCED": rng.randint(1, 500),
+        })
+
+    return {
+        "V_CHANNEL_STATUS": pd.DataFrame(channel),
+        "V_STREAMING_COSTS": pd.DataFrame(costs),
+        "V_TASK_EXECUTION_HISTORY": pd.DataFrame(task_history),
+        "V_PARTITION_EFFICIENCY": pd.DataFrame(pruning),
+        "V_STREAMING_CLIENT_METRICS": pd.DataFrame(clients),
+        "V_TRANSFORM_REFRESH_COMPARISON": pd.DataFrame(refreshes),
+        "V_PIPELINE_COST_PERFORMANCE": pd.DataFrame(cost_performance),
+        "V_TASK_SIZING_RECOMMENDATION": pd.DataFrame(sizing),
+        "V_DASHBOARD_QUERY_HISTORY": pd.DataFrame(history),
+    }
+
+
+def prepare_database(args) -> Dict[str, Any]:
+    """Grow the local database, load stand-ins and refresh the snapshot; returns info."""
+    con, info = scale_test_views.open_database(args.db, args.fresh, args.days, args.badges)
+    try:
+        info["generate_seconds"] = scale_test_views.grow_to(con, info, args.rows)
+        info["raw_rows"] = con.execute("SELECT count(*) FROM RAW_INGESTION.RAW_BADGE_EVENTS").fetchone()[0]
+        for view, frame in standin_frames(con, info["as_of"]).items():
+            con.register("standin_frame", frame)
+            con.execute(f"CREATE OR REPLACE TABLE RAW_INGESTION.{view} AS SELECT * FROM standin_frame")
+            con.unregister("standin_frame")
+        started = time.perf_counter()
+        DuckDBBackend(con, info["as_of"]).refresh_snapshot()
+        info["snapshot_refresh_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        con.execute("CHECKPOINT")
+    finally:
+        con.close()
+    return info
+
+
+# ============================================================================
+# Page runs
+# ============================================================================
+
+def run_page(scenario: str, repeat: int, timeout: float) -> Dict[str, Any]:
+    """Render one scenario repeat times in a fresh AppTest session (first run cold)."""
+    page, widgets = SCENARIOS[scenario]
+    app = AppTest.from_file(str(APP_PATH), default_timeout=timeout)
+    app.run()  # Landing page; the sidebar radio exists after the first run
+    if page != app.sidebar.radio[0].value:
+        app.sidebar.radio[0].set_value(page).run()
+    for label, value in widgets.items():
+        next(w for w in app.selectbox if w.label == label).set_value(value)
+    if app.exception:
+        return {"status": "ERROR", "error": app.exception[0].message}
+
+    st.cache_data.clear()
+    timings, fetch_ms, queries = [], [], []
+    for _ in range(repeat):
+        before = len(app.session_state["panel_timings"]) if "panel_timings" in app.session_state else 0
+        started = time.perf_counter()
+        app.run()
+        timings.append((time.perf_counter() - started) * 1000)
+        fetches = app.session_state["panel_timings"][before:] if "panel_timings" in app.session_state else []
+        fetch_ms.append(sum(f["CLIENT_SECONDS"] for f in fetches) * 1000)
+        queries.append(sum(not f["CACHE_HIT"] for f in fetches))
+
+        problems = [e.message for e in app.exception] + [e.value for e in app.error]
+        if problems:
+            return {"status": "ERROR", "error": str(problems[0]).splitlines()[0]}
+
+    warm = timings[1:] or timings
+    return {
+        "status": "OK",
+        "cold_ms": round(timings[0], 1),
+        "warm_ms": round(statistics.median(warm), 1),
+        "cold_fetch_ms": round(fetch_ms[0], 1),
+        "cold_queries": queries[0],
+        "warm_queries": max(queries[1:] or queries),
+        "charts": len(app.get("plotly_chart")),
+    }
+
+
+def compare(results: Dict[str, Dict[str, Any]], baseline: Dict[str, Any], max_regression_pct: float) -> List[str]:
+    """Regression messages for pages slower (warm) than the baseline run."""
+    regressions = []
+    for page, result in results.items():
+        before = baseline.get("pages", {}).get(page, {})
+        if result["status"] != "OK":
+            if before.get("status") == "OK":
+                regressions.append(f"{page}: {result['error']}")
+            continue
+        if before.get("status") != "OK":
+            continue
+        # Warm median only: a single cold run is too noisy to gate on
+        change_pct = 100.0 * (result["warm_ms"] - before["warm_ms"]) / max(before["warm_ms"], 1.0)
+        result["change_pct"] = round(change_pct, 1)
+        if change_pct > max_regression_pct and result["warm_ms"] - before["warm_ms"] >= MIN_REGRESSION_MS:
+            regressions.append(f"{page}: {before['warm_ms']:.1f} ms -> {result['warm_ms']:.1f} ms "
+                               f"(+{change_pct:.1f}%)")
+    return regressions
+
+
+def print_report(results: Dict[str, Dict[str, Any]], info: Dict[str, Any]):
+    print("=" * 102)
+    print(f"Dashboard Page Benchmark (AppTest + DuckDB, {scale_label(info['raw_rows'])} raw rows, "
+          f"as of {info['as_of']:%Y-%m-%d %H:%M}, snapshot refresh {info['snapshot_refresh_ms']:.0f} ms)")
+    print("=" * 102)
+    print(f"{'Page':<28} {'Cold ms':>9} {'Fetch ms':>9} {'Queries':>8} {'Warm ms':>9} {'Warm q':>7} "
+          f"{'Charts':>7} {'vs base':>8}")
+    for page, r in results.items():
+        if r["status"] != "OK":
+            print(f"{page:<28} ERROR  {r['error']}")
+            continue
+        change = f"{r['change_pct']:+.1f}%" if "change_pct" in r else ""
+        print(f"{page:<28} {r['cold_ms']:>9.1f} {r['cold_fetch_ms']:>9.1f} {r['cold_queries']:>8} "
+              f"{r['warm_ms']:>9.1f} {r['warm_queries']:>7} {r['charts']:>7} {change:>8}")
+    print()
+    print("Cold: empty st.cache_data (fetch ms = time in DashboardData queries). Warm: cached re-runs;")
+    print("warm queries > 0 means the page queries on every run (live tail, uncached panels).")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless per-page dashboard benchmark on local data")
+    parser.add_argument("--rows", type=parse_scale, default=parse_scale("1M"),
+                        help="Raw rows in the local database (default 1M; reuses a larger one)")
+    parser.add_argument("--pages", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS),
+                        help="Pages (and Ingestion Metrics ranges) to run (default: all)")
+    parser.add_argument("--days", type=int, default=90, help="Days of history the rows are spread over")
+    parser.add_argument("--badges", type=int, default=len(scale_test_views.BADGE_IDS),
+                        help="Distinct badges (default: simulator pool)")
+    parser.add_argument("--db", type=Path, default=DEFAULT_DB,
+                        help="DuckDB file (shared with scale_test_views.py)")
+    parser.add_argument("--fresh", action="store_true", help="Delete the database and start over")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per page (first = cold)")
+    parser.add_argument("--timeout", type=float, default=300.0, help="Seconds allowed per page run")
+    parser.add_argument("--json", type=Path, help="Write results to this JSON file")
+    parser.add_argument("--baseline", type=Path, help="Compare against a previous --json result")
+    parser.add_argument("--max-regression-pct", type=float, default=25.0,
+                        help="Slowdown vs --baseline that fails the run")
+    args = parser.parse_args()
+
+    if scale_test_views.duckdb is None or AppTest is None:
+        print("ERROR: needs duckdb and the dashboard packages: pip install duckdb streamlit pandas plotly numpy")
+        sys.exit(1)
+
+    print(f"Preparing {args.db} ...", flush=True)
+    info = prepare_database(args)
+    os.environ[LOCAL_BACKEND_ENV] = str(args.db)
+
+    results = {}
+    for page in args.pages:
+        print(f"  rendering {page} ...", flush=True)
+        results[page] = run_page(page, args.repeat, args.timeout)
+
+    regressions = []
+    if args.baseline:
+        regressions = compare(results, json.loads(args.baseline.read_text()), args.max_regression_pct)
+
+    print()
+    print_report(results, info)
+    if args.json:
+        args.json.write_text(json.dumps({
+            "raw_rows": info["raw_rows"],
+            "days": info["days"],
+            "snapshot_refresh_ms": info["snapshot_refresh_ms"],
+            "pages": results,
+        }, indent=2))
+        print(f"\nResults written to {args.json}")
+
+    failed = [page for page, r in results.items() if r["status"] != "OK"]
+    if regressions:
+        print(f"\nREGRESSIONS vs {args.baseline} (> {args.max_regression_pct:.0f}%):")
+        for regression in regressions:
+            print(f"  {regression}")
+    if failed:
+        print(f"\nFAILED pages: {', '.join(failed)}")
+    sys.exit(1 if regressions or failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Import-Time Benchmark - cold-start cost of the simulator and dashboard
+
+Author: SE Community
+Purpose: Track startup time of the entry points (gateway containers restart the
+         simulator often) by parsing `python -X importtime` output.
+
+USAGE:
+    python tools/bench_import_time.py                     # default targets, table output
+    python tools/bench_import_time.py --repeat 10 --top 10
+    python tools/bench_import_time.py --json results.json
+    python tools/bench_import_time.py --baseline results.json --max-regression-pct 20
+
+TARGETS:
+    simulator-import    import send_events (module-level imports only)
+    simulator-help      send_events.py --help (argparse path, no SDK)
+    plotly-express      plotly.express (loaded lazily by chart pages)
+    plotly-graph        plotly.graph_objects (loaded lazily by chart pages)
+    streaming-sdk       snowflake.ingest.streaming (loaded when streaming starts)
+    cryptography        cryptography serialization (loaded when the key is parsed)
+
+Targets whose modules are not installed are reported as SKIPPED.
+Each target runs in a fresh interpreter; the fastest of --repeat runs is kept.
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+SIMULATOR_DIR = PROJECT_ROOT / "simulator"
+
+TARGETS = {
+    "simulator-import": ["-c", "import send_events"],
+    "simulator-help": [str(SIMULATOR_DIR / "send_events.py"), "--help"],
+    "plotly-express": ["-c", "import plotly.express"],
+    "plotly-graph": ["-c", "import plotly.graph_objects"],
+    "streaming-sdk": ["-c", "import snowflake.ingest.streaming"],
+    "cryptography": ["-c", "from cryptography.hazmat.primitives import serialization"],
+}
+
+
+def parse_importtime(stderr: str) -> List[Dict[str, Any]]:
+    """Parse `-X importtime` lines into {module, depth, self_us, cumulative_us} records."""
+    records = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # Header line
+        name = fields[2].rstrip()
+        stripped = name.lstrip()
+        records.append({
+            "module": stripped,
+            "depth": (len(name) - len(stripped) - 1) // 2,
+            "self_us": int(fields[0]),
+            "cumulative_us": int(fields[1]),
+        })
+    return records
+
+
+def run_target(args: List[str]) -> Optional[Dict[str, Any]]:
+    """Run one target in a fresh interpreter; return timings or None if it failed."""
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime"] + args,
+        cwd=SIMULATOR_DIR,
+        capture_output=True,
+        text=True,
+    )
+    wall_ms = (time.perf_counter() - start) * 1000
+    if result.returncode != 0:
+        return None
+
+    records = parse_importtime(result.stderr)
+    return {
+        "wall_ms": wall_ms,
+        "import_ms": sum(r["cumulative_us"] for r in records if r["depth"] == 0) / 1000,
+        "module_count": len(records),
+        "slowest": sorted(records, key=lambda r: r["self_us"], reverse=True),
+    }
+
+
+def benchmark(names: List[str], repeat: int, top: int) -> Dict[str, Any]:
+    """Benchmark each target; keep the fastest run."""
+    results = {}
+    for name in names:
+        runs = [run_target(TARGETS[name]) for _ in range(repeat)]
+        runs = [r for r in runs if r is not None]
+        if not runs:
+            results[name] = {"status": "SKIPPED"}
+            continue
+        best = min(runs, key=lambda r: r["import_ms"])
+        results[name] = {
+            "status": "OK",
+            "import_ms": round(best["import_ms"], 1),
+            "wall_ms": round(min(r["wall_ms"] for r in runs), 1),
+            "module_count": best["module_count"],
+            "slowest_modules": [
+                {"module": r["module"], "self_ms": round(r["self_us"] / 1000, 1)}
+                for r in best["slowest"][:top]
+            ],
+        }
+    return results
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], max_regression_pct: float) -> List[str]:
+    """Return regression messages for targets slower than baseline by more than the threshold."""
+    regressions = []
+    for name, result in results.items():
+        before = baseline.get(name, {})
+        if result.get("status") != "OK" or before.get("status") != "OK":
+            continue
+        change_pct = 100.0 * (result["import_ms"] - before["import_ms"]) / max(before["import_ms"], 0.1)
+        result["baseline_import_ms"] = before["import_ms"]
+        result["change_pct"] = round(change_pct, 1)
+        if change_pct > max_regression_pct:
+            regressions.append(
+                f"{name}: {before['import_ms']:.1f} ms -> {result['import_ms']:.1f} ms (+{change_pct:.1f}%)"
+            )
+    return regressions
+
+
+def print_report(results: Dict[str, Any]):
+    print("=" * 70)
+    print("Import-Time Benchmark (python -X importtime, fastest run)")
+    print("=" * 70)
+    print(f"{'Target':<20} {'Import ms':>10} {'Wall ms':>10} {'Modules':>8} {'vs base':>9}")
+    for name, result in results.items():
+        if result["status"] != "OK":
+            print(f"{name:<20} {'SKIPPED':>10}")
+            continue
+        change = f"{result['change_pct']:+.1f}%" if "change_pct" in result else ""
+        print(
+            f"{name:<20} {result['import_ms']:>10.1f} {result['wall_ms']:>10.1f} "
+            f"{result['module_count']:>8} {change:>9}"
+        )
+    print()
+    for name, result in results.items():
+        if result["status"] == "OK" and result["slowest_modules"]:
+            slowest = ", ".join(f"{m['module']} {m['self_ms']}ms" for m in result["slowest_modules"])
+            print(f"{name}: {slowest}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure cold-start import time of the simulator and dashboard")
+    parser.add_argument("targets", nargs="*", default=[],
+                        help=f"Targets to run: {', '.join(TARGETS)} (default: all)")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per target (fastest is kept)")
+    parser.add_argument("--top", type=int, default=5, help="Slowest modules to list per target")
+    parser.add_argument("--json", type=Path, help="Write results to this JSON file")
+    parser.add_argument("--baseline", type=Path, help="Compare against a previous --json result")
+    parser.add_argument("--max-regression-pct", type=float, default=20.0,
+                        help="Fail when import time grows more than this vs baseline")
+    args = parser.parse_args()
+    unknown = [name for name in args.targets if name not in TARGETS]
+    if unknown:
+        parser.error(f"unknown target(s): {', '.join(unknown)} (choose from {', '.join(TARGETS)})")
+
+    results = benchmark(args.targets or list(TARGETS), args.repeat, args.top)
+
+    regressions = []
+    if args.baseline:
+        regressions = compare(results, json.loads(args.baseline.read_text()), args.max_regression_pct)
+
+    print_report(results)
+
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2))
+        print(f"\nResults written to {args.json}")
+
+    if regressions:
+        print("\nREGRESSIONS:")
+        for message in regressions:
+            print(f"  {message}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
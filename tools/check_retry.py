@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Retry Engine Check - fault-injection scenarios against the fake streaming client
+
+Author: SE Community
+Purpose: Verify that ReliableSession delivers every row exactly once through
+         channel failures, lost responses and outages, and gives up cleanly
+
+USAGE:
+    python tools/check_retry.py              # all scenarios; exit code 1 on any failure
+    python tools/check_retry.py --events 50000 --seed 7
+
+SCENARIOS:
+    baseline           no faults (throughput reference)
+    failed-appends     appends 3, 7 and 8 fail; the channel is invalidated each time
+    random-faults      append 2 + 5% fail, 5% lost responses (rows committed, call raised)
+    outage             from append call 2, the next 6 appends and channel opens fail
+    adaptive           append 1 + random faults under AdaptiveChannelSink
+    bounded-buffer     slow commits, append 5 + 2% fail; the replay buffer must stay within its bound
+    exhausted          permanent outage from append call 2; RetryExhausted must be raised
+
+Every event carries a sequence number; the committed rows on the fake server
+must be exactly 0..N-1, in order, with no duplicates. Every fault scenario
+fails at least one early append by call number (not wall-clock time or a random
+draw), so it injects faults whatever --events and --seed are (the adaptive sink
+picks its own batch size); a fault scenario that injected nothing fails.
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "simulator"))
+
+from adaptive import AdaptiveChannelSink  # noqa: E402
+from event_stream import ChannelSink, EventStream, sample_event_source  # noqa: E402
+from fake_streaming import FakeStreamingClient, FaultInjector, latency_model  # noqa: E402
+from retry import ReliableSession, RetryExhausted, RetryPolicy  # noqa: E402
+from streaming_session import StreamingSession  # noqa: E402
+
+CONFIG = {"database": "SNOWFLAKE_EXAMPLE", "schema": "RAW_INGESTION", "pipe_name": "FAKE_PIPE"}
+FAST_POLICY = RetryPolicy(max_attempts=8, base_delay=0.01, max_delay=0.25)
+
+
+def numbered(events: int):
+    """Sample events with a sequence number for exactly-once checks."""
+    for seq, event in enumerate(sample_event_source(events)):
+        event["seq"] = seq
+        yield event
+
+
+def run_scenario(name: str, events: int, seed: int, faults: Optional[FaultInjector] = None,
+                 adaptive: bool = False, max_buffered_rows: int = 100_000,
+                 commit_rows_per_second: float = 200_000, policy: RetryPolicy = FAST_POLICY) -> Dict[str, Any]:
+    client = FakeStreamingClient(latency_model(base=0.002, per_row=2e-6), commit_latency=0.02,
+                                 commit_rows_per_second=commit_rows_per_second, faults=faults)
+    session = StreamingSession(CONFIG, client_factory=lambda: client)
+    reliable = ReliableSession(session, policy, max_buffered_rows=max_buffered_rows, poll_interval=0.005)
+    sink = AdaptiveChannelSink(reliable, target_latency_ms=50) if adaptive else ChannelSink(reliable)
+
+    batch_size = max(1, min(1_000, events // 20))
+    started = time.perf_counter()
+    error = None
+    try:
+        EventStream(numbered(events), sink, batch_size=batch_size, max_buffered=10_000).run()
+    except RetryExhausted as e:
+        error = e
+    elapsed = time.perf_counter() - started
+    metrics = reliable.metrics()
+    try:
+        session.close()
+    except Exception:
+        pass
+
+    committed = [row["seq"] for row in client.server[session.default_channel].rows]
+    return {
+        "scenario": name,
+        "events": events,
+        "committed": len(committed),
+        "exactly_once_in_order": committed == list(range(events)),
+        "duplicates": len(committed) - len(set(committed)),
+        "fault_scenario": faults is not None,
+        "injected_faults": faults.injected if faults else 0,
+        "elapsed_seconds": round(elapsed, 2),
+        "rows_per_second": round(len(committed) / elapsed) if elapsed else 0,
+        "error": f"{type(error).__name__}: {error}" if error else None,
+        **metrics,
+    }
+
+
+def check(result: Dict[str, Any], expect_exhausted: bool = False, max_buffer: Optional[int] = None) -> List[str]:
+    problems = []
+    if result["fault_scenario"] and not result["injected_faults"]:
+        problems.append("no faults injected")
+    if expect_exhausted:
+        if not (result["error"] or "").startswith("RetryExhausted"):
+            problems.append("expected RetryExhausted")
+        if result["duplicates"]:
+            problems.append(f"{result['duplicates']} duplicate rows")
+        return problems
+    if result["error"]:
+        problems.append(result["error"])
+    if not result["exactly_once_in_order"]:
+        problems.append(f"committed {result['committed']}/{result['events']} rows, "
+                        f"{result['duplicates']} duplicates or out of order")
+    if result["injected_faults"] and not result["recoveries"]:
+        problems.append("faults injected but no recovery recorded")
+    if max_buffer is not None and result["max_replay_buffer_rows"] > max_buffer:
+        problems.append(f"replay buffer reached {result['max_replay_buffer_rows']} rows (bound {max_buffer})")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fault-injection checks for the retry engine")
+    parser.add_argument("--events", type=int, default=20_000, help="Events per scenario")
+    parser.add_argument("--seed", type=int, default=42, help="Seed for injected faults")
+    args = parser.parse_args()
+    random.seed(args.seed)
+    n, seed = args.events, args.seed
+
+    scenarios = [
+        (run_scenario("baseline", n, seed), {}),
+        (run_scenario("failed-appends", n, seed, FaultInjector(fail_calls=[3, 7, 8], seed=seed)), {}),
+        (run_scenario("random-faults", n, seed,
+                      FaultInjector(fail_calls=[2], failure_rate=0.05, lost_ack_rate=0.05, seed=seed)), {}),
+        (run_scenario("outage", n, seed, FaultInjector(outage_calls=[(2, 6)], seed=seed),
+                      policy=RetryPolicy(max_attempts=10, base_delay=0.05, max_delay=0.5)), {}),
+        (run_scenario("adaptive", n, seed,
+                      FaultInjector(fail_calls=[1], failure_rate=0.05, lost_ack_rate=0.05, seed=seed),
+                      adaptive=True), {}),
+        (run_scenario("bounded-buffer", n, seed, FaultInjector(fail_calls=[5], failure_rate=0.02, seed=seed),
+                      max_buffered_rows=3_000, commit_rows_per_second=20_000), {"max_buffer": 3_000}),
+        (run_scenario("exhausted", n, seed, FaultInjector(outage_calls=[(2, 10**9)], seed=seed),
+                      policy=RetryPolicy(max_attempts=3, base_delay=0.01, max_delay=0.05)),
+         {"expect_exhausted": True}),
+    ]
+
+    print("=" * 100)
+    print("Retry Engine Check (fake streaming client with injected faults)")
+    print("=" * 100)
+    print(f"{'Scenario':<16} {'Result':<6} {'Committed':>10} {'Faults':>7} {'Recovered':>9} {'Resent':>8} "
+          f"{'Backoff s':>9} {'Max buffer':>10} {'Rows/s':>9}")
+    failed = 0
+    for result, expectations in scenarios:
+        problems = check(result, **expectations)
+        failed += bool(problems)
+        print(f"{result['scenario']:<16} {'FAIL' if problems else 'PASS':<6} {result['committed']:>10,} "
+              f"{result['injected_faults']:>7} {result['recoveries']:>9} {result['resent_rows']:>8,} "
+              f"{result['backoff_seconds']:>9.2f} {result['max_replay_buffer_rows']:>10,} "
+              f"{result['rows_per_second']:>9,}")
+        for problem in problems:
+            print(f"    {problem}")
+
+    print()
+    print(f"{len(scenarios) - failed}/{len(scenarios)} scenarios passed")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,1034 @@
+#!/usr/bin/env python3
+"""
+Load Test - run a scenario through the simulator, probe the pipeline, write a report
+
+Author: SE Community
+Purpose: One command for a performance test: stream a scenario (rate, duration,
+         channels, workload mix) through the simulator, sample pipeline lag at
+         RAW / STAGING / ANALYTICS and client-side append stats while it runs,
+         and write a self-contained HTML + JSON report
+
+USAGE:
+    pip install duckdb pandas
+    python tools/load_test.py                                  # smoke scenario, offline
+    python tools/load_test.py --scenario ramp
+    python tools/load_test.py --scenario peak.json --report reports/peak
+    python tools/load_test.py --scenario steady --live         # config.json, Snowflake
+    python tools/load_test.py --list
+
+SCENARIOS:
+    smoke    200 events/s for 20 s on one channel; tasks every 5 s
+    steady   2,000 events/s for 60 s over 4 site channels, 1% duplicates, 1% late
+    ramp     500 -> 2,000 -> 5,000 -> 1,000 events/s, 20 s each, 4 channels
+    outage   1,000 events/s for 60 s; appends fail for 5 s from 20 s (retry and replay)
+
+    A spec file is JSON with any keys of DEFAULT_SPEC (unknown keys are an error):
+        {"name": "peak", "phases": [{"seconds": 30, "rate": 3000}], "channels": 8,
+         "mix": {"duplicate": 0.02, "late": 0.01, "weak_signal": 0.05},
+         "slo": {"append_p95_ms": 250, "analytics_lag_p95_seconds": 30}}
+
+MODES:
+    offline  (default) fake_streaming.FakeStreamingClient with the spec's "client"
+             latency, commit and fault model, and a local DuckDB stand-in
+             (SNOWFLAKE_EXAMPLE.duckdb with the tables of scale_test_views.py,
+             recreated per run in sfe_load_test/ under the system temp
+             directory, next to the reports). Committed rows land in RAW_BADGE_EVENTS with
+             their commit time as ingestion_time; the staging and analytics
+             tasks run every task_interval_seconds (per-batch dedup, dimension
+             joins, fact anti-join) as sql/03_transformations/03_tasks.sql does
+    live     --live: config.json and the Snowpipe Streaming SDK. The pipeline is
+             sampled with snowflake-connector-python when config.json has
+             "probe_warehouse" (and a "probe_role" that can read the three
+             layers); otherwise the report covers the client side only
+
+SAMPLES (every --sample-seconds):
+    client    target, generated and appended events/s; append latency per
+              interval (p50 / p95 / max, retries included); rows per append;
+              replay buffer rows and channel failures
+    pipeline  rows of this run per layer, and lag: now minus the newest
+              event_timestamp the layer holds. RAW lag is the client buffer plus
+              commit delay; STAGING and ANALYTICS add the task schedule.
+
+After the last phase the run drains until ANALYTICS holds every unique event
+(or --drain-seconds pass). Exit code 1 when the spec's "slo" is missed or
+events are missing.
+"""
+
+import argparse
+import copy
+import html
+import json
+import math
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from scale_test_views import RESTRICTED_ZONES, SCHEMA_DDL, duckdb  # noqa: E402
+from adaptive import AdaptiveChannelSink, AimdController  # noqa: E402
+from anomaly import AnomalyDetector, DetectingSink  # noqa: E402
+from event_stream import (  # noqa: E402
+    DEFAULT_LAYOUT, USER_IDS, ChannelSink, Event, EventStream, SiteLayout, SiteRoutingSink, Sink, sample_event,
+)
+from fake_streaming import FakeStreamingClient, FaultInjector, latency_model  # noqa: E402
+from retry import ReliableSession  # noqa: E402
+from send_events import load_config, open_alert_session, site_channel_name  # noqa: E402
+from streaming_session import SECRETS_DIR, StreamingSession, load_private_key_pem  # noqa: E402
+
+DEFAULT_SPEC: Dict[str, Any] = {
+    "name": "custom",
+    "rate": 500,                   # events/s, when phases is empty
+    "duration_seconds": 30,
+    "phases": [],                  # [{"seconds": 20, "rate": 500}, ...]; overrides rate / duration
+    "channels": 1,                 # one generated site per channel (SITE-001..); 1 = default site
+    "zones_per_site": 10,
+    "mix": {
+        "duplicate": 0.0,          # resent copy of the previous event (staging drops it)
+        "late": 0.0,               # event_timestamp 1-10 minutes old
+        "weak_signal": 0.0,        # signal below -80 dBm (WEAK)
+    },
+    "batch_size": 500,
+    "adaptive": False,             # AIMD batch size and in-flight limit (one channel only)
+    "detect": False,               # anomaly.py stage; alerts go to BADGE_ALERTS
+    "client": {                    # offline FakeStreamingClient
+        "append_ms": 5.0,
+        "per_row_us": 2.0,
+        "commit_ms": 1000.0,
+        "commit_rows_per_second": 100_000,
+        "latency_spikes": [],      # [start_seconds, duration_seconds, extra_ms]
+        "failure_rate": 0.0,
+        "outages": [],             # [start_seconds, duration_seconds]: appends and opens fail
+    },
+    "task_interval_seconds": 10,   # offline staging / analytics tasks (Snowflake: 1 minute)
+    "slo": {},                     # throughput_pct, append_p95_ms, {raw,staging,analytics}_lag_p95_seconds
+}
+
+SCENARIOS: Dict[str, Dict[str, Any]] = {
+    "smoke": {"name": "smoke", "rate": 200, "duration_seconds": 20, "task_interval_seconds": 5,
+              "slo": {"throughput_pct": 95}},
+    "steady": {"name": "steady", "rate": 2_000, "duration_seconds": 60, "channels": 4,
+               "mix": {"duplicate": 0.01, "late": 0.01, "weak_signal": 0.02},
+               "slo": {"throughput_pct": 95, "append_p95_ms": 250, "analytics_lag_p95_seconds": 30}},
+    "ramp": {"name": "ramp", "channels": 4,
+             "phases": [{"seconds": 20, "rate": 500}, {"seconds": 20, "rate": 2_000},
+                        {"seconds": 20, "rate": 5_000}, {"seconds": 20, "rate": 1_000}],
+             "mix": {"duplicate": 0.01}},
+    "outage": {"name": "outage", "rate": 1_000, "duration_seconds": 60,
+               "client": {"outages": [[20, 5]]}},
+}
+
+LAYERS = ["RAW", "STAGING", "ANALYTICS"]
+SLO_KEYS = ["throughput_pct", "append_p95_ms"] + [f"{layer.lower()}_lag_p95_seconds" for layer in LAYERS]
+LATE_SECONDS_RANGE = (60, 600)
+WEAK_SIGNAL_RANGE = (-95, -81)
+PACING_SLACK_SECONDS = 0.002  # Sleep only when this far ahead of schedule
+LOAD_TEST_APP_TAG = "sfe_simple_stream_load_test"
+OUTPUT_DIR = Path(tempfile.gettempdir()) / "sfe_load_test"
+
+# Rows of this run and event-time lag per layer (Snowflake SQL; now_utc / since filled per backend)
+PROBE_SQL = """
+SELECT 'RAW' AS layer, COUNT(*) AS row_count,
+       DATEDIFF('millisecond', MAX(event_timestamp), {now_utc}) AS lag_ms
+FROM SNOWFLAKE_EXAMPLE.RAW_INGESTION.RAW_BADGE_EVENTS
+WHERE ingestion_time >= {since}
+UNION ALL
+SELECT 'STAGING', COUNT(*), DATEDIFF('millisecond', MAX(event_timestamp), {now_utc})
+FROM SNOWFLAKE_EXAMPLE.STAGING_LAYER.STG_BADGE_EVENTS
+WHERE staging_time >= {since}
+UNION ALL
+SELECT 'ANALYTICS', COUNT(*), DATEDIFF('millisecond', MAX(event_timestamp), {now_utc})
+FROM SNOWFLAKE_EXAMPLE.ANALYTICS_LAYER.FCT_ACCESS_EVENTS
+WHERE fact_load_time >= {since}
+"""
+
+
+# sfe_badge_events_pipe's column mapping (sql/02_core/01_core.sql) over a batch of committed rows
+PIPE_SELECT = """
+SELECT site_id, badge_id, user_id, zone_id, reader_id,
+       CAST(CAST(event_timestamp AS TIMESTAMPTZ) AS TIMESTAMP),
+       signal_strength,
+       CASE WHEN signal_strength < -80 THEN 'WEAK' WHEN signal_strength < -60 THEN 'MEDIUM' ELSE 'STRONG' END,
+       upper(direction), ingestion_time, NULL
+FROM committed_batch
+"""
+
+
+# ============================================================================
+# Scenario spec
+# ============================================================================
+
+def merge_spec(base: Dict[str, Any], override: Dict[str, Any], path: str = "") -> Dict[str, Any]:
+    """base with override's keys replaced (nested dicts merged); unknown keys raise ValueError."""
+    merged = copy.deepcopy(base)
+    for key, value in override.items():
+        if key not in base:
+            raise ValueError(f"Unknown scenario key: {path}{key}")
+        if isinstance(base[key], dict) and base[key] and isinstance(value, dict):
+            merged[key] = merge_spec(base[key], value, f"{path}{key}.")
+        else:
+            merged[key] = value
+    return merged
+
+
+def load_spec(scenario: str) -> Dict[str, Any]:
+    """A built-in scenario by name, or a JSON spec file."""
+    if scenario in SCENARIOS:
+        spec = merge_spec(DEFAULT_SPEC, SCENARIOS[scenario])
+    else:
+        path = Path(scenario)
+        if not path.exists():
+            raise ValueError(f"No scenario named {scenario!r} and no such file (built-in: {', '.join(SCENARIOS)})")
+        spec = merge_spec(DEFAULT_SPEC, {"name": path.stem, **json.loads(path.read_text())})
+
+    if spec["channels"] < 1:
+        raise ValueError("channels must be at least 1")
+    if spec["adaptive"] and spec["channels"] > 1:
+        raise ValueError("adaptive tunes one channel: set channels to 1")
+    if any(rate <= 0 or seconds <= 0 for seconds, rate in phases(spec)):
+        raise ValueError("every phase needs seconds > 0 and rate > 0")
+    if sum(spec["mix"].values()) > 1:
+        raise ValueError("mix fractions add up to more than 1")
+    unknown = set(spec["slo"]) - set(SLO_KEYS)
+    if unknown:
+        raise ValueError(f"Unknown slo keys: {', '.join(sorted(unknown))} (known: {', '.join(SLO_KEYS)})")
+    return spec
+
+
+def phases(spec: Dict[str, Any]) -> List[Tuple[float, float]]:
+    """(seconds, events/s) per phase."""
+    if spec["phases"]:
+        return [(float(p["seconds"]), float(p["rate"])) for p in spec["phases"]]
+    return [(float(spec["duration_seconds"]), float(spec["rate"]))]
+
+
+def target_rate(spec: Dict[str, Any], elapsed: float) -> float:
+    start = 0.0
+    for seconds, rate in phases(spec):
+        if elapsed < start + seconds:
+            return rate
+        start += seconds
+    return 0.0
+
+
+# ============================================================================
+# Workload and client-side metering
+# ============================================================================
+
+class Workload:
+    """Events paced to the spec's phases, with its mix; counts what it generated.
+
+    event_timestamp is the scheduled time, so rows held back by backpressure
+    (an outage) show up as lag instead of being re-stamped.
+    """
+
+    def __init__(self, spec: Dict[str, Any], layout: SiteLayout):
+        self.phases = phases(spec)
+        self.mix = spec["mix"]
+        self.layout = layout
+        self.generated = 0
+        self.duplicates = 0
+        self.late = 0
+        self.weak_signal = 0
+        self.started: Optional[float] = None
+
+    def events(self, started: float) -> Iterator[Event]:
+        self.started = started
+        base_time = datetime.now(timezone.utc)
+        duplicate, late = self.mix["duplicate"], self.mix["late"]
+        weak = late + self.mix["weak_signal"]
+        offset = 0.0
+        previous: Optional[Event] = None
+        for seconds, rate in self.phases:
+            for i in range(int(seconds * rate)):
+                due = offset + i / rate
+                ahead = due - (time.monotonic() - started)
+                if ahead > PACING_SLACK_SECONDS:
+                    time.sleep(ahead)
+
+                roll = random.random()
+                if previous is not None and roll < duplicate:
+                    event = dict(previous)
+                    self.duplicates += 1
+                else:
+                    event = sample_event(base_time + timedelta(seconds=due), self.layout)
+                    roll = random.random()
+                    if roll < late:
+                        event_time = base_time + timedelta(seconds=due - random.uniform(*LATE_SECONDS_RANGE))
+                        event["event_timestamp"] = event_time.isoformat()
+                        self.late += 1
+                    elif roll < weak:
+                        event["signal_strength"] = random.randint(*WEAK_SIGNAL_RANGE)
+                        self.weak_signal += 1
+                    previous = event
+                self.generated += 1
+                yield event
+            offset += seconds
+
+    @property
+    def unique_events(self) -> int:
+        return self.generated - self.duplicates
+
+
+class AppendMeter:
+    """Append timings of every channel, taken per sample interval (thread-safe)."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.appended = 0
+        self.latencies_ms: List[float] = []
+        self._interval: List[Tuple[float, int]] = []
+
+    def record(self, ms: float, rows: int):
+        with self.lock:
+            self.appended += rows
+            self.latencies_ms.append(ms)
+            self._interval.append((ms, rows))
+
+    def take(self) -> List[Tuple[float, int]]:
+        with self.lock:
+            interval, self._interval = self._interval, []
+        return interval
+
+
+class MeteredSink(Sink):
+    """Time each write of one channel's sink (as the client sees it, retries included)."""
+
+    def __init__(self, sink: Sink, meter: AppendMeter):
+        self.sink = sink
+        self.meter = meter
+
+    @property
+    def preferred_batch_size(self) -> Optional[int]:
+        return getattr(self.sink, "preferred_batch_size", None)
+
+    @property
+    def channel_name(self) -> Optional[str]:
+        return getattr(self.sink, "channel_name", None)
+
+    def write(self, rows: List[Event]):
+        started = time.perf_counter()
+        self.sink.write(rows)
+        self.meter.record((time.perf_counter() - started) * 1000, len(rows))
+
+    def flush(self):
+        self.sink.flush()
+
+    def close(self):
+        self.sink.close()
+
+
+# ============================================================================
+# Pipeline probes
+# ============================================================================
+
+def utc_now() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def duckdb_timestamp(value: datetime) -> str:
+    return f"TIMESTAMP '{value:%Y-%m-%d %H:%M:%S.%f}'"
+
+
+class LocalPipeline:
+    """DuckDB stand-in for Snowflake: committed fake-client rows -> RAW, tasks -> STAGING / ANALYTICS."""
+
+    name = "offline"
+
+    def __init__(self, path: Path, layout: SiteLayout, task_interval: float):
+        for stale in (path, path.with_name(path.name + ".wal")):
+            stale.unlink(missing_ok=True)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.con = duckdb.connect(str(path))
+        self.con.execute("SET TimeZone = 'UTC'")
+        self.con.execute(SCHEMA_DDL)
+        # sfe_badge_events_stream: RAW rows not yet consumed by the staging task
+        self.con.execute("CREATE TABLE main.sfe_badge_events_stream AS "
+                         "SELECT * FROM RAW_INGESTION.RAW_BADGE_EVENTS LIMIT 0")
+        self.con.executemany("INSERT INTO ANALYTICS_LAYER.DIM_USERS VALUES (?, ?, ?, TRUE)",
+                             [[i + 1, user_id, user_id] for i, user_id in enumerate(USER_IDS)])
+        self.con.executemany("INSERT INTO ANALYTICS_LAYER.DIM_SITES VALUES (?, ?, ?, TRUE)",
+                             [[i + 1, site_id, site_id] for i, site_id in enumerate(layout.site_ids)])
+        self.con.executemany("INSERT INTO ANALYTICS_LAYER.DIM_ZONES VALUES (?, ?, ?, ?, ?)",
+                             [[i + 1, zone_id, site_id, readers[0], zone_id in RESTRICTED_ZONES]
+                              for i, (site_id, zone_id, readers) in enumerate(layout.zones)])
+        self.task_interval = task_interval
+        self.next_task = task_interval
+        self.since = utc_now()
+        self.sources: List[Tuple[FakeStreamingClient, str]] = []
+        self._consumed: Dict[Tuple[int, str], int] = {}
+        self.tasks: List[Dict[str, Any]] = []
+
+    def add_source(self, client: FakeStreamingClient, table: str):
+        """Load rows the client's server commits into table (RAW_BADGE_EVENTS or BADGE_ALERTS)."""
+        self.sources.append((client, table))
+
+    def _load(self):
+        for client, table in self.sources:
+            client.commit_due()
+            rows, times = [], []
+            with client.lock:
+                for name, state in client.server.items():
+                    key = (id(client), name)
+                    consumed = self._consumed.get(key, 0)
+                    start = state.commits[consumed - 1][0] if consumed else 0
+                    for end, committed_at in state.commits[consumed:]:
+                        rows.extend(state.rows[start:end])
+                        times.extend([committed_at] * (end - start))
+                        start = end
+                    self._consumed[key] = len(state.commits)
+            if rows:
+                self._insert(table, rows, times)
+
+    def _insert(self, table: str, rows: List[Event], times: List[float]):
+        import pandas as pd
+        batch = pd.DataFrame.from_records(rows)
+        batch["ingestion_time"] = pd.to_datetime(times, unit="s")
+        self.con.register("committed_batch", batch)
+        try:
+            if table == "RAW_BADGE_EVENTS":
+                for target in ("RAW_INGESTION.RAW_BADGE_EVENTS", "main.sfe_badge_events_stream"):
+                    self.con.execute(f"INSERT INTO {target} {PIPE_SELECT}")
+            else:
+                self.con.execute("""
+                    INSERT INTO RAW_INGESTION.BADGE_ALERTS
+                    SELECT alert_type, severity, site_id, zone_id, reader_id, badge_id, user_id,
+                           CAST(CAST(event_timestamp AS TIMESTAMPTZ) AS TIMESTAMP), metric_value, detail,
+                           CAST(CAST(detected_time AS TIMESTAMPTZ) AS TIMESTAMP), ingestion_time
+                    FROM committed_batch
+                """)
+        finally:
+            self.con.unregister("committed_batch")
+
+    def _run_tasks(self, elapsed: float):
+        """sfe_raw_to_staging_task (consumes the stream), then sfe_staging_to_analytics_task (AFTER)."""
+        now = duckdb_timestamp(utc_now())
+        started = time.perf_counter()
+        staged = self.con.execute(f"""
+            INSERT INTO STAGING_LAYER.STG_BADGE_EVENTS
+            SELECT site_id, badge_id, user_id, zone_id, reader_id, event_timestamp, signal_strength,
+                   signal_quality, direction, ingestion_time, {now}
+            FROM main.sfe_badge_events_stream
+            QUALIFY row_number() OVER (PARTITION BY badge_id, event_timestamp ORDER BY ingestion_time DESC) = 1
+        """).fetchone()[0]
+        self.con.execute("DELETE FROM main.sfe_badge_events_stream")
+        self.tasks.append({"t": round(elapsed, 2), "task": "raw_to_staging", "rows": staged,
+                           "ms": round((time.perf_counter() - started) * 1000, 1)})
+
+        now = duckdb_timestamp(utc_now())
+        started = time.perf_counter()
+        loaded = self.con.execute(f"""
+            INSERT INTO ANALYTICS_LAYER.FCT_ACCESS_EVENTS
+            SELECT u.user_key, z.zone_key, z.site_id, s.badge_id, s.reader_id, s.event_timestamp,
+                   CAST(s.event_timestamp AS DATE), hour(s.event_timestamp), dayofweek(s.event_timestamp),
+                   s.direction, s.signal_strength, s.signal_quality, z.is_restricted,
+                   hour(s.event_timestamp) < 6 OR hour(s.event_timestamp) >= 22,
+                   dayofweek(s.event_timestamp) IN (0, 6),
+                   s.ingestion_time, {now}
+            FROM STAGING_LAYER.STG_BADGE_EVENTS s
+            JOIN ANALYTICS_LAYER.DIM_USERS u ON s.user_id = u.user_id AND u.is_current
+            JOIN ANALYTICS_LAYER.DIM_ZONES z ON s.zone_id = z.zone_id
+            WHERE NOT EXISTS (
+                SELECT 1 FROM ANALYTICS_LAYER.FCT_ACCESS_EVENTS f
+                WHERE f.badge_id = s.badge_id AND f.event_timestamp = s.event_timestamp
+            )
+        """).fetchone()[0]
+        self.tasks.append({"t": round(elapsed, 2), "task": "staging_to_analytics", "rows": loaded,
+                           "ms": round((time.perf_counter() - started) * 1000, 1)})
+
+    def sample(self, elapsed: float) -> Dict[str, Dict[str, Any]]:
+        """Load committed rows, run the tasks when due, then probe the layers."""
+        self._load()
+        if elapsed >= self.next_task:
+            self._run_tasks(elapsed)
+            while self.next_task <= elapsed:
+                self.next_task += self.task_interval
+        query = PROBE_SQL.format(now_utc=duckdb_timestamp(utc_now()), since=duckdb_timestamp(self.since))
+        return {layer: {"rows": rows, "lag_seconds": None if lag_ms is None else lag_ms / 1000}
+                for layer, rows, lag_ms in self.con.execute(query).fetchall()}
+
+    def close(self):
+        self.con.close()
+
+
+class SnowflakeProbe:
+    """Pipeline probe against Snowflake (snowflake-connector-python, key-pair auth from config.json)."""
+
+    name = "live"
+
+    def __init__(self, config: Dict[str, Any]):
+        import snowflake.connector
+        from cryptography.hazmat.primitives import serialization
+
+        private_key = serialization.load_pem_private_key(
+            load_private_key_pem(SECRETS_DIR / config["private_key_path"]).encode(), password=None
+        )
+        self.connection = snowflake.connector.connect(
+            account=config["account"],
+            user=config["user"],
+            role=config.get("probe_role", config["role"]),
+            warehouse=config["probe_warehouse"],
+            private_key=private_key.private_bytes(
+                encoding=serialization.Encoding.DER,
+                format=serialization.PrivateFormat.PKCS8,
+                encryption_algorithm=serialization.NoEncryption(),
+            ),
+            session_parameters={"QUERY_TAG": json.dumps({"app": LOAD_TEST_APP_TAG})},
+        )
+        self.tasks: List[Dict[str, Any]] = []  # Task runs are in V_TASK_EXECUTION_HISTORY
+
+    def sample(self, elapsed: float) -> Dict[str, Dict[str, Any]]:
+        # event_timestamp is UTC (SYSDATE()); ingestion / staging / fact times use the server clock
+        query = PROBE_SQL.format(
+            now_utc="SYSDATE()",
+            since=f"DATEADD('second', -{math.ceil(elapsed) + 1}, CURRENT_TIMESTAMP())",
+        )
+        rows = self.connection.cursor().execute(query).fetchall()
+        return {layer: {"rows": count, "lag_seconds": None if lag_ms is None else lag_ms / 1000}
+                for layer, count, lag_ms in rows}
+
+    def close(self):
+        self.connection.close()
+
+
+# ============================================================================
+# Run
+# ============================================================================
+
+def percentile(values: List[float], pct: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, math.ceil(pct / 100 * len(ordered)) - 1))]
+
+
+def fake_client(spec: Dict[str, Any]) -> FakeStreamingClient:
+    c = spec["client"]
+    faults = None
+    if c["failure_rate"] or c["outages"]:
+        faults = FaultInjector(failure_rate=c["failure_rate"], outages=[tuple(o) for o in c["outages"]])
+    return FakeStreamingClient(
+        append_latency=latency_model(base=c["append_ms"] / 1000, per_row=c["per_row_us"] / 1e6,
+                                     spikes=[(s, d, ms / 1000) for s, d, ms in c["latency_spikes"]]),
+        commit_latency=c["commit_ms"] / 1000,
+        commit_rows_per_second=c["commit_rows_per_second"],
+        faults=faults,
+    )
+
+
+class Sampler:
+    """Background thread: one sample per interval (client counters plus the pipeline probe)."""
+
+    def __init__(self, interval: float, take_sample):
+        self.interval = interval
+        self.take_sample = take_sample
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="load-test-sampler", daemon=True)
+
+    def _run(self):
+        deadline = time.monotonic()
+        while not self._stop.is_set():
+            deadline += self.interval
+            self._stop.wait(max(0.0, deadline - time.monotonic()))
+            self.take_sample()
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+
+def run_load_test(spec: Dict[str, Any], live: bool, db: Path, sample_seconds: float,
+                  drain_seconds: float) -> Dict[str, Any]:
+    """Stream the scenario, sampling throughout; returns the report data."""
+    layout = (SiteLayout.generate(spec["channels"], spec["zones_per_site"])
+              if spec["channels"] > 1 else DEFAULT_LAYOUT)
+    workload = Workload(spec, layout)
+    meter = AppendMeter()
+    probe = None
+    probe_error = None
+
+    if live:
+        config = load_config()
+        session = StreamingSession(config)
+        alert_session = open_alert_session(config) if spec["detect"] else None
+        if config.get("probe_warehouse"):
+            try:
+                probe = SnowflakeProbe(config)
+            except Exception as e:
+                probe_error = f"{type(e).__name__}: {e}"
+        else:
+            probe_error = "config.json has no probe_warehouse: client-side stats only"
+    else:
+        probe = LocalPipeline(db, layout, spec["task_interval_seconds"])
+        client = fake_client(spec)
+        config = {"database": "SNOWFLAKE_EXAMPLE", "schema": "RAW_INGESTION", "pipe_name": "sfe_badge_events_pipe"}
+        session = StreamingSession(config, client_factory=lambda: client)
+        probe.add_source(client, "RAW_BADGE_EVENTS")
+        alert_session = None
+        if spec["detect"]:
+            alert_client = FakeStreamingClient(commit_latency=spec["client"]["commit_ms"] / 1000)
+            alert_session = StreamingSession({**config, "pipe_name": "sfe_badge_alerts_pipe"},
+                                             channel_prefix="alerts_channel", client_factory=lambda: alert_client)
+            probe.add_source(alert_client, "BADGE_ALERTS")
+
+    reliable = ReliableSession(session)
+    if spec["channels"] > 1:
+        sink = SiteRoutingSink(lambda site_id: MeteredSink(
+            ChannelSink(reliable, site_channel_name(session, site_id)), meter))
+    elif spec["adaptive"]:
+        sink = MeteredSink(AdaptiveChannelSink(reliable, controller=AimdController()), meter)
+    else:
+        sink = MeteredSink(ChannelSink(reliable), meter)
+    detector = AnomalyDetector() if spec["detect"] else None
+    pipeline = DetectingSink(sink, detector, ChannelSink(alert_session)) if detector else sink
+
+    samples: List[Dict[str, Any]] = []
+    state = {"t": 0.0, "generated": 0, "appended": 0, "layers": {}, "send_end": None}
+    started = time.monotonic()
+
+    def take_sample():
+        nonlocal probe_error
+        t = time.monotonic() - started
+        dt = max(t - state["t"], 1e-6)
+        interval = meter.take()
+        latencies = [ms for ms, _ in interval]
+        try:
+            retries = reliable.metrics()
+        except RuntimeError:
+            retries = {"replay_buffer_rows": None, "failures": None}  # Channel added mid-read
+        sample = {
+            "t": round(t, 2),
+            "phase": "send" if state["send_end"] is None else "drain",
+            "target_rate": target_rate(spec, t),
+            "generated_per_second": round((workload.generated - state["generated"]) / dt, 1),
+            "appended_per_second": round((meter.appended - state["appended"]) / dt, 1),
+            "appends": len(interval),
+            "rows_per_append": round(sum(rows for _, rows in interval) / len(interval), 1) if interval else None,
+            "append_p50_ms": percentile(latencies, 50),
+            "append_p95_ms": percentile(latencies, 95),
+            "append_max_ms": max(latencies) if latencies else None,
+            "replay_buffer_rows": retries["replay_buffer_rows"],
+            "channel_failures": retries["failures"],
+            "layers": {},
+            "rows_per_second": {},
+        }
+        if probe is not None:
+            try:
+                layers = probe.sample(t)
+                sample["layers"] = layers
+                sample["rows_per_second"] = {
+                    layer: round((layers[layer]["rows"] - state["layers"].get(layer, 0)) / dt, 1)
+                    for layer in LAYERS
+                }
+                state["layers"] = {layer: layers[layer]["rows"] for layer in LAYERS}
+            except Exception as e:
+                probe_error = probe_error or f"{type(e).__name__}: {str(e).splitlines()[0]}"
+        state.update(t=t, generated=workload.generated, appended=meter.appended)
+        samples.append(sample)
+
+    sampler = Sampler(sample_seconds, take_sample)
+    sampler.start()
+    error = None
+    try:
+        stats = EventStream(workload.events(started), pipeline, batch_size=spec["batch_size"],
+                            max_buffered=max(spec["batch_size"], 20_000), close_sink=False).run()
+        state["send_end"] = time.monotonic() - started
+        channel_sinks = sink.sinks.values() if isinstance(sink, SiteRoutingSink) else [sink]
+        for channel_sink in channel_sinks:
+            reliable.flush(channel_sink.channel_name)
+        if detector:
+            alert_session.close()
+    except Exception as e:
+        stats = None
+        error = f"{type(e).__name__}: {e}"
+    if state["send_end"] is None:
+        state["send_end"] = time.monotonic() - started
+
+    # Drain: flushed above; wait for the tasks to carry every unique event into ANALYTICS
+    drain_deadline = time.monotonic() + drain_seconds
+    while probe is not None and error is None and time.monotonic() < drain_deadline:
+        facts = state["layers"].get("ANALYTICS", 0)
+        if facts >= workload.unique_events:
+            break
+        time.sleep(sample_seconds / 4)
+    sampler.stop()
+    drained_at = time.monotonic() - started
+
+    try:
+        reliable.close()
+    except Exception as e:
+        error = error or f"{type(e).__name__}: {e}"
+    if probe is not None:
+        probe.close()
+
+    result = {
+        "scenario": spec,
+        "mode": "live" if live else "offline",
+        "started": utc_now().isoformat(timespec="seconds") + "Z",
+        "sample_seconds": sample_seconds,
+        "send_seconds": round(state["send_end"], 2),
+        "drain_seconds": round(drained_at - state["send_end"], 2),
+        "error": error,
+        "probe_error": probe_error,
+        "workload": {
+            "generated": workload.generated,
+            "duplicates": workload.duplicates,
+            "late": workload.late,
+            "weak_signal": workload.weak_signal,
+            "unique_events": workload.unique_events,
+        },
+        "client": {
+            "appended": meter.appended,
+            "batches": stats.batches if stats else None,
+            "max_buffered": stats.max_buffered if stats else None,
+            "append_p50_ms": percentile(meter.latencies_ms, 50),
+            "append_p95_ms": percentile(meter.latencies_ms, 95),
+            "append_p99_ms": percentile(meter.latencies_ms, 99),
+            "append_max_ms": max(meter.latencies_ms) if meter.latencies_ms else None,
+            "retry": reliable.metrics(),
+            "adaptive": sink.sink.metrics() if spec["adaptive"] else None,
+            "anomalies": detector.metrics() if detector else None,
+        },
+        "tasks": probe.tasks if probe is not None else [],
+        "samples": samples,
+    }
+    result["summary"] = summarize(result)
+    return result
+
+
+def summarize(result: Dict[str, Any]) -> Dict[str, Any]:
+    """Throughput, latency and lag over the send phase, final layer counts and SLO checks."""
+    spec = result["scenario"]
+    send = [s for s in result["samples"] if s["phase"] == "send"]
+    planned = sum(int(seconds * rate) for seconds, rate in phases(spec))
+    planned_seconds = sum(seconds for seconds, _ in phases(spec))
+    appended = result["client"]["appended"]
+    achieved = appended / result["send_seconds"] if result["send_seconds"] else 0.0
+
+    last_layers = next((s["layers"] for s in reversed(result["samples"]) if s["layers"]), {})
+    lag = {}
+    for layer in LAYERS:
+        values = [s["layers"][layer]["lag_seconds"] for s in send
+                  if s["layers"] and s["layers"][layer]["lag_seconds"] is not None]
+        lag[layer] = {"p50": percentile(values, 50), "p95": percentile(values, 95),
+                      "max": max(values) if values else None}
+
+    summary = {
+        "planned_events": planned,
+        "offered_rate": round(planned / planned_seconds, 1),
+        "achieved_rate": round(achieved, 1),
+        "throughput_pct": round(100.0 * achieved / (planned / planned_seconds), 1) if planned else None,
+        "peak_appended_per_second": max((s["appended_per_second"] for s in send), default=0.0),
+        "append_p95_ms": result["client"]["append_p95_ms"],
+        "lag_seconds": lag,
+        "layer_rows": {layer: last_layers[layer]["rows"] for layer in LAYERS} if last_layers else {},
+        "missing_events": (result["workload"]["unique_events"] - last_layers["ANALYTICS"]["rows"]
+                           if last_layers else None),
+    }
+
+    checks = []
+    limits = spec["slo"]
+    if "throughput_pct" in limits:
+        checks.append(("throughput_pct", limits["throughput_pct"], summary["throughput_pct"], "min"))
+    if "append_p95_ms" in limits:
+        checks.append(("append_p95_ms", limits["append_p95_ms"], summary["append_p95_ms"], "max"))
+    for layer in LAYERS:
+        key = f"{layer.lower()}_lag_p95_seconds"
+        if key in limits:
+            checks.append((key, limits[key], lag[layer]["p95"], "max"))
+    summary["slo"] = [{
+        "name": name, "limit": limit, "value": value,
+        "passed": value is not None and (value >= limit if kind == "min" else value <= limit),
+    } for name, limit, value, kind in checks]
+    summary["passed"] = (result["error"] is None and all(c["passed"] for c in summary["slo"])
+                         and not summary["missing_events"])
+    return summary
+
+
+# ============================================================================
+# Report
+# ============================================================================
+
+CHART_COLORS = ["#29B5E8", "#FF9F36", "#00C851", "#9B59B6", "#E74C3C"]
+
+
+def svg_chart(title: str, unit: str, xs: List[float], series: List[Tuple[str, List[Optional[float]]]],
+              marker: Optional[float] = None, width: int = 900, height: int = 220) -> str:
+    """Line chart as inline SVG (no scripts, no external assets); None values break the line."""
+    left, right, top, bottom = 60, 10, 28, 24
+    plot_w, plot_h = width - left - right, height - top - bottom
+    x_max = max(xs, default=1.0) or 1.0
+    y_values = [v for _, values in series for v in values if v is not None]
+    y_max = max(y_values, default=0.0)
+    magnitude = 10 ** math.floor(math.log10(y_max)) if y_max > 0 else 1
+    y_max = math.ceil(y_max / magnitude) * magnitude if y_max > 0 else 1
+
+    def x_px(x):
+        return left + plot_w * x / x_max
+
+    def y_px(y):
+        return top + plot_h * (1 - y / y_max)
+
+    parts = [f'<svg viewBox="0 0 {width} {height}" width="100%" role="img">',
+             f'<text x="{left}" y="16" class="title">{html.escape(title)}</text>']
+    for i in range(5):
+        y = y_max * i / 4
+        parts.append(f'<line x1="{left}" x2="{width - right}" y1="{y_px(y):.1f}" y2="{y_px(y):.1f}" class="grid"/>')
+        parts.append(f'<text x="{left - 6}" y="{y_px(y) + 4:.1f}" class="axis" text-anchor="end">'
+                     f'{y:,.{0 if y_max >= 10 else 2}f}</text>')
+    for i in range(6):
+        x = x_max * i / 5
+        parts.append(f'<text x="{x_px(x):.1f}" y="{height - 6}" class="axis" text-anchor="middle">{x:.0f}s</text>')
+    if marker is not None:
+        parts.append(f'<line x1="{x_px(marker):.1f}" x2="{x_px(marker):.1f}" y1="{top}" y2="{top + plot_h}" '
+                     f'class="marker"/>')
+    legend_x = left + 240
+    for idx, (label, values) in enumerate(series):
+        color = CHART_COLORS[idx % len(CHART_COLORS)]
+        segment: List[str] = []
+        for x, v in list(zip(xs, values)) + [(None, None)]:
+            if v is None:
+                if len(segment) > 1:
+                    parts.append(f'<polyline points="{" ".join(segment)}" fill="none" stroke="{color}" '
+                                 f'stroke-width="1.5"/>')
+                segment = []
+            else:
+                segment.append(f"{x_px(x):.1f},{y_px(v):.1f}")
+        parts.append(f'<rect x="{legend_x}" y="8" width="10" height="10" fill="{color}"/>'
+                     f'<text x="{legend_x + 14}" y="17" class="axis">{html.escape(label)}</text>')
+        legend_x += 24 + 7 * len(label)
+    parts.append(f'<text x="{width - right}" y="16" class="axis" text-anchor="end">{html.escape(unit)}</text>')
+    parts.append("</svg>")
+    return "\n".join(parts)
+
+
+def fmt(value, digits: int = 1) -> str:
+    if value is None:
+        return "-"
+    if isinstance(value, float):
+        return f"{value:,.{digits}f}"
+    if isinstance(value, int):
+        return f"{value:,}"
+    return str(value)
+
+
+def html_table(rows: List[Tuple[str, Any]]) -> str:
+    return "<table>" + "".join(f"<tr><th>{html.escape(str(k))}</th><td>{html.escape(fmt(v))}</td></tr>"
+                               for k, v in rows) + "</table>"
+
+
+def render_html(result: Dict[str, Any]) -> str:
+    """Self-contained HTML report: summary tables and inline SVG curves."""
+    summary, client, workload = result["summary"], result["client"], result["workload"]
+    samples = result["samples"]
+    xs = [s["t"] for s in samples]
+    marker = result["send_seconds"]
+
+    def column(key):
+        return [s[key] for s in samples]
+
+    def layer_column(layer, key):
+        return [s[key].get(layer) if key == "rows_per_second" else
+                (s["layers"][layer]["lag_seconds"] if s["layers"] else None) for s in samples]
+
+    charts = [
+        svg_chart("Throughput", "events/s", xs, [
+            ("target", column("target_rate")),
+            ("generated", column("generated_per_second")),
+            ("appended", column("appended_per_second")),
+            ("RAW", layer_column("RAW", "rows_per_second")),
+            ("ANALYTICS", layer_column("ANALYTICS", "rows_per_second")),
+        ], marker),
+        svg_chart("Append latency", "ms", xs, [
+            ("p50", column("append_p50_ms")),
+            ("p95", column("append_p95_ms")),
+            ("max", column("append_max_ms")),
+        ], marker),
+        svg_chart("Pipeline lag (now - newest event_timestamp)", "seconds", xs,
+                  [(layer, layer_column(layer, "lag")) for layer in LAYERS], marker),
+        svg_chart("Client backlog", "rows", xs, [
+            ("replay buffer", column("replay_buffer_rows")),
+            ("rows per append", column("rows_per_append")),
+        ], marker),
+    ]
+
+    verdict = "PASS" if summary["passed"] else "FAIL"
+    overview = [
+        ("Mode", result["mode"]),
+        ("Started (UTC)", result["started"]),
+        ("Send / drain seconds", f"{result['send_seconds']} / {result['drain_seconds']}"),
+        ("Offered rate (events/s)", summary["offered_rate"]),
+        ("Achieved rate (events/s)", summary["achieved_rate"]),
+        ("Throughput (% of offered)", summary["throughput_pct"]),
+        ("Peak appended (events/s)", summary["peak_appended_per_second"]),
+        ("Events generated / unique", f"{workload['generated']:,} / {workload['unique_events']:,}"),
+        ("Duplicates / late / weak signal",
+         f"{workload['duplicates']:,} / {workload['late']:,} / {workload['weak_signal']:,}"),
+        ("Missing from ANALYTICS", summary["missing_events"]),
+    ]
+    if result["error"]:
+        overview.append(("Error", result["error"]))
+    if result["probe_error"]:
+        overview.append(("Probe", result["probe_error"]))
+
+    latency = [
+        ("Appends (batches)", client["batches"]),
+        ("p50 / p95 / p99 / max ms", " / ".join(fmt(client[k]) for k in
+                                                ("append_p50_ms", "append_p95_ms", "append_p99_ms", "append_max_ms"))),
+        ("Channel failures / rows resent", f"{client['retry']['failures']} / {client['retry']['resent_rows']:,}"),
+        ("Backoff seconds", client["retry"]["backoff_seconds"]),
+        ("Max replay buffer rows", client["retry"]["max_replay_buffer_rows"]),
+    ]
+    if client["adaptive"]:
+        latency.append(("Adaptive final batch / in-flight",
+                        f"{client['adaptive']['batch_size']} / {client['adaptive']['max_in_flight']}"))
+    if client["anomalies"]:
+        a = client["anomalies"]
+        latency.append(("Anomaly alerts (travel / tailgating / signal)",
+                        f"{a['impossible_travel']} / {a['tailgating']} / {a['signal_degradation']}"))
+
+    pipeline = [(f"{layer} rows / lag p50 / p95 / max s",
+                 f"{fmt(summary['layer_rows'].get(layer))} / {fmt(summary['lag_seconds'][layer]['p50'])} / "
+                 f"{fmt(summary['lag_seconds'][layer]['p95'])} / {fmt(summary['lag_seconds'][layer]['max'])}")
+                for layer in LAYERS]
+    if result["tasks"]:
+        for task in ("raw_to_staging", "staging_to_analytics"):
+            runs = [r for r in result["tasks"] if r["task"] == task]
+            pipeline.append((f"{task} runs / median ms / max rows",
+                             f"{len(runs)} / {fmt(statistics.median(r['ms'] for r in runs))} / "
+                             f"{max(r['rows'] for r in runs):,}"))
+
+    slo = "".join(
+        f"<tr><th>{html.escape(c['name'])}</th><td>{fmt(c['limit'])}</td><td>{fmt(c['value'])}</td>"
+        f"<td class=\"{'pass' if c['passed'] else 'fail'}\">{'PASS' if c['passed'] else 'FAIL'}</td></tr>"
+        for c in summary["slo"]
+    ) or "<tr><td colspan=\"4\">No SLO in the scenario spec</td></tr>"
+
+    return f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>Load Test - {html.escape(result['scenario']['name'])}</title>
+<style>
+body {{ font-family: -apple-system, "Segoe UI", Helvetica, Arial, sans-serif; margin: 24px; color: #1f2d3d; }}
+h1 {{ font-size: 22px; }} h2 {{ font-size: 17px; margin-top: 28px; }}
+.verdict {{ font-weight: bold; padding: 2px 8px; border-radius: 4px; color: white; }}
+.PASS, .pass {{ background: #00C851; color: white; }} .FAIL, .fail {{ background: #E74C3C; color: white; }}
+.grid-2 {{ display: grid; grid-template-columns: 1fr 1fr; gap: 24px; }}
+table {{ border-collapse: collapse; font-size: 13px; width: 100%; }}
+th, td {{ border-bottom: 1px solid #e3e8ee; padding: 4px 8px; text-align: left; }}
+th {{ font-weight: 600; width: 55%; }}
+svg .title {{ font-size: 14px; font-weight: 600; }} svg .axis {{ font-size: 11px; fill: #5a6b7b; }}
+svg .grid {{ stroke: #e3e8ee; }} svg .marker {{ stroke: #5a6b7b; stroke-dasharray: 4 3; }}
+pre {{ background: #f6f8fa; padding: 12px; font-size: 12px; overflow-x: auto; }}
+</style>
+</head>
+<body>
+<h1>Load Test: {html.escape(result['scenario']['name'])} <span class="verdict {verdict}">{verdict}</span></h1>
+<p>Samples every {result['sample_seconds']}s; the dashed line marks the end of sending (drain after it).</p>
+<div class="grid-2">
+<div><h2>Run</h2>{html_table(overview)}</div>
+<div><h2>Client</h2>{html_table(latency)}<h2>Pipeline</h2>{html_table(pipeline)}</div>
+</div>
+<h2>SLO</h2>
+<table><tr><th>Check</th><th>Limit</th><th>Value</th><th>Result</th></tr>{slo}</table>
+<h2>Curves</h2>
+{"".join(f"<div>{chart}</div>" for chart in charts)}
+<h2>Scenario</h2>
+<pre>{html.escape(json.dumps(result['scenario'], indent=2))}</pre>
+</body>
+</html>
+"""
+
+
+def print_report(result: Dict[str, Any], html_path: Path, json_path: Path):
+    summary, client, workload = result["summary"], result["client"], result["workload"]
+    print("=" * 78)
+    print(f"Load Test: {result['scenario']['name']} ({result['mode']}, {result['send_seconds']}s send, "
+          f"{result['drain_seconds']}s drain)")
+    print("=" * 78)
+    print(f"Events:        {workload['generated']:,} generated ({workload['duplicates']:,} duplicates, "
+          f"{workload['late']:,} late), {client['appended']:,} appended")
+    print(f"Throughput:    {summary['achieved_rate']:,.0f} events/s of {summary['offered_rate']:,.0f} offered "
+          f"({fmt(summary['throughput_pct'])}%), peak {summary['peak_appended_per_second']:,.0f}/s")
+    print(f"Append:        p50 {fmt(client['append_p50_ms'])} ms, p95 {fmt(client['append_p95_ms'])} ms, "
+          f"max {fmt(client['append_max_ms'])} ms; {client['retry']['failures']} channel failure(s)")
+    for layer in LAYERS:
+        lag = summary["lag_seconds"][layer]
+        print(f"{layer + ':':<14} {fmt(summary['layer_rows'].get(layer))} rows, lag p50 {fmt(lag['p50'])}s "
+              f"p95 {fmt(lag['p95'])}s max {fmt(lag['max'])}s")
+    if summary["missing_events"]:
+        print(f"Missing:       {summary['missing_events']:,} unique events not in ANALYTICS")
+    if result["probe_error"]:
+        print(f"Probe:         {result['probe_error']}")
+    if result["error"]:
+        print(f"ERROR:         {result['error']}")
+    for check in summary["slo"]:
+        print(f"SLO {check['name']:<26} limit {fmt(check['limit']):>8}  value {fmt(check['value']):>8}  "
+              f"{'PASS' if check['passed'] else 'FAIL'}")
+    print()
+    print(f"Report: {html_path}")
+    print(f"        {json_path}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a load-test scenario and write an HTML/JSON report")
+    parser.add_argument("--scenario", default="smoke",
+                        help=f"Built-in scenario ({', '.join(SCENARIOS)}) or a JSON spec file (default: smoke)")
+    parser.add_argument("--live", action="store_true",
+                        help="Stream to Snowflake with config.json (default: fake client and local DuckDB)")
+    parser.add_argument("--db", type=Path, default=OUTPUT_DIR / "SNOWFLAKE_EXAMPLE.duckdb",
+                        help="Offline DuckDB stand-in, recreated each run (default: sfe_load_test/ in the "
+                             "system temp directory)")
+    parser.add_argument("--report", type=Path,
+                        help="Report path without extension (default: sfe_load_test/<scenario name> in the "
+                             "system temp directory)")
+    parser.add_argument("--sample-seconds", type=float, default=1.0, help="Sample interval (default: 1)")
+    parser.add_argument("--drain-seconds", type=float,
+                        help="Longest wait for ANALYTICS after sending (default: 3 task intervals + 10 s "
+                             "offline, 180 s live)")
+    parser.add_argument("--list", action="store_true", help="Print the built-in scenarios and exit")
+    args = parser.parse_args()
+
+    if args.list:
+        for name in SCENARIOS:
+            print(json.dumps(merge_spec(DEFAULT_SPEC, SCENARIOS[name])))
+        sys.exit(0)
+    try:
+        spec = load_spec(args.scenario)
+    except ValueError as e:
+        parser.error(str(e))
+    if args.db.name != "SNOWFLAKE_EXAMPLE.duckdb":
+        parser.error("--db file must be named SNOWFLAKE_EXAMPLE.duckdb (the views use three-part names)")
+    if not args.live and duckdb is None:
+        print("ERROR: the offline load test needs duckdb and pandas (pip install duckdb pandas)")
+        sys.exit(1)
+    drain_seconds = args.drain_seconds
+    if drain_seconds is None:
+        drain_seconds = 180.0 if args.live else 3 * spec["task_interval_seconds"] + 10
+
+    report = args.report or OUTPUT_DIR / spec["name"]
+    print(f"Running scenario {spec['name']} ({'live' if args.live else 'offline'}): "
+          + ", ".join(f"{rate:,.0f}/s for {seconds:.0f}s" for seconds, rate in phases(spec))
+          + f" over {spec['channels']} channel(s)", flush=True)
+    result = run_load_test(spec, args.live, args.db, args.sample_seconds, drain_seconds)
+
+    report.parent.mkdir(parents=True, exist_ok=True)
+    html_path, json_path = report.with_suffix(".html"), report.with_suffix(".json")
+    html_path.write_text(render_html(result))
+    json_path.write_text(json.dumps(result, indent=2, default=str))
+    print_report(result, html_path, json_path)
+    sys.exit(0 if result["summary"]["passed"] else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,648 @@
+#!/usr/bin/env python3
+"""
+Monitoring View Scale Test - view latency and memory at 10M / 100M / 1B rows
+
+Author: SE Community
+Purpose: Run the monitoring views from sql/04_monitoring/04_monitoring.sql
+         against months of synthetic badge history in a local DuckDB copy of
+         the schema, so a view change that scans history (instead of the last
+         hour / the state tables) shows up before deployment
+
+USAGE:
+    pip install duckdb
+    python tools/scale_test_views.py --scales 1M 10M                  # quick run
+    python tools/scale_test_views.py                                  # 10M, 100M, 1B
+    python tools/scale_test_views.py --json scale.json
+    python tools/scale_test_views.py --baseline scale.json --max-regression-pct 25
+
+VIEWS:
+    V_INGESTION_METRICS, V_SITE_INGESTION_METRICS, V_DATA_FRESHNESS,
+    V_END_TO_END_LATENCY, V_ACTIVE_BADGES, V_DATA_QUALITY_METRICS,
+    V_ALERT_SUMMARY (and sfe_data_quality_metrics)
+
+HOW IT WORKS:
+    schema      SNOWFLAKE_EXAMPLE.duckdb with the RAW_INGESTION, STAGING_LAYER and
+                ANALYTICS_LAYER tables the views read (columns as in
+                sql/02_core and sql/03_transformations)
+    history     --days of events ending at a fixed as-of time, built with the
+                simulator's pools (event_stream.BADGE_IDS, USER_IDS,
+                DEFAULT_LAYOUT, DIRECTIONS, SIGNAL_STRENGTH_RANGE) in DuckDB
+                SQL; a Python generator would take hours at 1B rows. Rows arrive
+                in ingestion-time order (as streamed rows do), all for the default
+                site (SITE-HQ); 1% of raw rows are duplicates that staging
+                drops. BADGE_OCCUPANCY_STATE and
+                DATA_QUALITY_HOURLY are rebuilt from the fact / raw tables.
+                BADGE_ALERTS stays empty unless tools/bench_anomaly.py
+                --duckdb writes its alerts there.
+    scales      the database grows to each scale in turn (raw rows; staging and
+                fact hold ~99% of that); re-runs reuse it, --fresh starts over.
+                --db defaults to sfe_scale_test/ in the system temp directory,
+                outside the repository
+    view SQL    read from 04_monitoring.sql and translated: CURRENT_TIMESTAMP()
+                and CURRENT_DATE() become the as-of time, DATEADD becomes
+                interval arithmetic, IFF becomes if(), the UDTF becomes a table
+                macro. Anything else Snowflake-specific fails the run.
+    measure     each view runs in a fresh process: cold = first run, warm =
+                median of the rest, peak MB = process peak RSS growth
+
+Disk: about 35 bytes per raw row for the three event tables (~35 GB at 1B).
+Generation is the slow part (about a minute per 10M rows per core). Use
+--memory-limit and --threads to model a smaller machine.
+"""
+
+import argparse
+import json
+import math
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+MONITORING_SQL = PROJECT_ROOT / "sql" / "04_monitoring" / "04_monitoring.sql"
+DEFAULT_DB = Path(tempfile.gettempdir()) / "sfe_scale_test" / "SNOWFLAKE_EXAMPLE.duckdb"
+
+sys.path.insert(0, str(PROJECT_ROOT / "simulator"))
+
+from event_stream import (  # noqa: E402
+    BADGE_IDS, DEFAULT_LAYOUT, DEFAULT_SITE_ID, DIRECTIONS, SIGNAL_STRENGTH_RANGE, USER_IDS,
+)
+
+try:
+    import duckdb
+except ImportError:
+    duckdb = None
+
+VIEWS = [
+    "V_INGESTION_METRICS",
+    "V_SITE_INGESTION_METRICS",
+    "V_DATA_FRESHNESS",
+    "V_END_TO_END_LATENCY",
+    "V_ACTIVE_BADGES",
+    "V_DATA_QUALITY_METRICS",
+    "V_ALERT_SUMMARY",
+]
+DEFAULT_SCALES = ["10M", "100M", "1B"]
+CHUNK_ROWS = 50_000_000
+MIN_REGRESSION_MS = 5.0  # Smaller latency changes are timer noise
+
+SCHEMA_DDL = """
+CREATE SCHEMA IF NOT EXISTS RAW_INGESTION;
+CREATE SCHEMA IF NOT EXISTS STAGING_LAYER;
+CREATE SCHEMA IF NOT EXISTS ANALYTICS_LAYER;
+
+CREATE TABLE IF NOT EXISTS main.scale_test_info (
+    as_of TIMESTAMP NOT NULL,
+    days INTEGER NOT NULL,
+    badges INTEGER NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS RAW_INGESTION.RAW_BADGE_EVENTS (
+    site_id VARCHAR NOT NULL,
+    badge_id VARCHAR NOT NULL,
+    user_id VARCHAR NOT NULL,
+    zone_id VARCHAR NOT NULL,
+    reader_id VARCHAR NOT NULL,
+    event_timestamp TIMESTAMP NOT NULL,
+    signal_strength DECIMAL(5, 2),
+    signal_quality VARCHAR,
+    direction VARCHAR,
+    ingestion_time TIMESTAMP,
+    raw_json VARCHAR
+);
+
+CREATE TABLE IF NOT EXISTS STAGING_LAYER.STG_BADGE_EVENTS (
+    site_id VARCHAR NOT NULL,
+    badge_id VARCHAR NOT NULL,
+    user_id VARCHAR NOT NULL,
+    zone_id VARCHAR NOT NULL,
+    reader_id VARCHAR NOT NULL,
+    event_timestamp TIMESTAMP NOT NULL,
+    signal_strength DECIMAL(5, 2),
+    signal_quality VARCHAR,
+    direction VARCHAR,
+    ingestion_time TIMESTAMP NOT NULL,
+    staging_time TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS ANALYTICS_LAYER.DIM_USERS (
+    user_key INTEGER NOT NULL,
+    user_id VARCHAR NOT NULL,
+    user_name VARCHAR,
+    is_current BOOLEAN
+);
+
+CREATE TABLE IF NOT EXISTS ANALYTICS_LAYER.DIM_SITES (
+    site_key INTEGER NOT NULL,
+    site_id VARCHAR NOT NULL,
+    site_name VARCHAR NOT NULL,
+    is_active BOOLEAN
+);
+
+CREATE TABLE IF NOT EXISTS ANALYTICS_LAYER.DIM_ZONES (
+    zone_key INTEGER NOT NULL,
+    zone_id VARCHAR NOT NULL,
+    site_id VARCHAR NOT NULL,
+    reader_id VARCHAR,
+    is_restricted BOOLEAN
+);
+
+CREATE TABLE IF NOT EXISTS ANALYTICS_LAYER.FCT_ACCESS_EVENTS (
+    user_key INTEGER NOT NULL,
+    zone_key INTEGER NOT NULL,
+    site_id VARCHAR NOT NULL,
+    badge_id VARCHAR NOT NULL,
+    reader_id VARCHAR NOT NULL,
+    event_timestamp TIMESTAMP NOT NULL,
+    event_date DATE NOT NULL,
+    event_hour TINYINT NOT NULL,
+    event_day_of_week TINYINT NOT NULL,
+    direction VARCHAR,
+    signal_strength DECIMAL(5, 2),
+    signal_quality VARCHAR,
+    is_restricted_access BOOLEAN,
+    is_after_hours BOOLEAN,
+    is_weekend BOOLEAN,
+    ingestion_time TIMESTAMP NOT NULL,
+    fact_load_time TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS ANALYTICS_LAYER.BADGE_OCCUPANCY_STATE (
+    badge_id VARCHAR NOT NULL,
+    user_key INTEGER,
+    current_zone_id VARCHAR,
+    is_inside BOOLEAN NOT NULL,
+    last_direction VARCHAR,
+    last_event_timestamp TIMESTAMP NOT NULL,
+    event_count_date DATE,
+    event_count_today BIGINT,
+    updated_time TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS RAW_INGESTION.BADGE_ALERTS (
+    alert_type VARCHAR NOT NULL,
+    severity VARCHAR NOT NULL,
+    site_id VARCHAR NOT NULL,
+    zone_id VARCHAR,
+    reader_id VARCHAR,
+    badge_id VARCHAR,
+    user_id VARCHAR,
+    event_timestamp TIMESTAMP NOT NULL,
+    metric_value DECIMAL(10, 2),
+    detail VARCHAR,
+    detected_time TIMESTAMP,
+    ingestion_time TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS ANALYTICS_LAYER.DATA_QUALITY_HOURLY (
+    metric_hour TIMESTAMP NOT NULL,
+    raw_event_count BIGINT NOT NULL,
+    weak_signal_count BIGINT NOT NULL,
+    duplicate_count BIGINT NOT NULL,
+    staged_event_count BIGINT NOT NULL,
+    orphan_user_count BIGINT NOT NULL,
+    orphan_zone_count BIGINT NOT NULL,
+    fact_event_count BIGINT NOT NULL,
+    updated_time TIMESTAMP
+);
+"""
+
+# Restricted zones, as seeded in DIM_ZONES (sql/03_transformations/02_analytics.sql)
+RESTRICTED_ZONES = {"ZONE-OFFICE-2A", "ZONE-SERVER-B1"}
+
+
+# ============================================================================
+# View SQL (Snowflake -> DuckDB)
+# ============================================================================
+
+VIEW_RE = re.compile(
+    r"CREATE OR REPLACE VIEW (\w+)\s+COMMENT\s*=\s*'(?:[^']|'')*'\s+AS\s+(.*?);\s*$",
+    re.S | re.M,
+)
+FUNCTION_RE = re.compile(
+    r"CREATE OR REPLACE FUNCTION (\w+)\((\w+) \w+\)\s*RETURNS TABLE \((.*?)\)\s*COMMENT.*?\$\$(.*?)\$\$",
+    re.S,
+)
+DATEADD_RE = re.compile(r"DATEADD\(\s*'(day|hour|minute|second)'\s*,\s*([^,]+?)\s*,\s*([^()]+?)\s*\)", re.I)
+UNTRANSLATED_RE = re.compile(r"\b(DATEADD|IFF|CURRENT_TIMESTAMP|CURRENT_DATE|TABLE)\s*\(|\bFLATTEN\b", re.I)
+
+
+def translate(sql: str, as_of: datetime) -> str:
+    """Translate the Snowflake constructs the monitoring views use into DuckDB SQL."""
+    sql = re.sub(r"CURRENT_TIMESTAMP\(\)", f"TIMESTAMP '{as_of:%Y-%m-%d %H:%M:%S}'", sql, flags=re.I)
+    sql = re.sub(r"CURRENT_DATE\(\)", f"DATE '{as_of:%Y-%m-%d}'", sql, flags=re.I)
+    sql = DATEADD_RE.sub(
+        lambda m: f"({m.group(3)} + to_{m.group(1).lower()}s(CAST({m.group(2)} AS INTEGER)))", sql
+    )
+    sql = re.sub(r"\bIFF\(", "if(", sql, flags=re.I)
+    sql = re.sub(r"\bTABLE\((\w+\([^()]*\))\)", r"\1", sql, flags=re.I)
+    leftover = UNTRANSLATED_RE.search(sql)
+    if leftover:
+        raise ValueError(f"Untranslated Snowflake SQL: {leftover.group(0)!r}")
+    return sql
+
+
+def load_view_sql(as_of: datetime) -> Dict[str, str]:
+    """DuckDB DDL for the views under test (and the UDTF they call), keyed by name."""
+    text = MONITORING_SQL.read_text()
+    ddl = {}
+    for name, params, returns, body in FUNCTION_RE.findall(text):
+        columns = ", ".join(re.findall(r"^\s*(\w+)\s", returns, re.M))
+        try:
+            ddl[name] = (f"CREATE OR REPLACE MACRO RAW_INGESTION.{name}({params}) AS TABLE "
+                         f"SELECT * FROM ({translate(body.strip(), as_of)}) AS t({columns})")
+        except ValueError as e:
+            raise ValueError(f"{name}: {e}") from None
+    views = dict(VIEW_RE.findall(text))
+    for name in VIEWS:
+        if name not in views:
+            raise ValueError(f"{name} not found in {MONITORING_SQL}")
+        try:
+            ddl[name] = f"CREATE OR REPLACE VIEW RAW_INGESTION.{name} AS\n{translate(views[name], as_of)}"
+        except ValueError as e:
+            raise ValueError(f"{name}: {e}") from None
+    return ddl
+
+
+# ============================================================================
+# Synthetic history
+# ============================================================================
+
+def parse_scale(text: str) -> int:
+    """'10M' -> 10_000_000 (K, M, B suffixes)."""
+    match = re.fullmatch(r"(\d+(?:\.\d+)?)([KMB]?)", text.strip().upper())
+    if not match:
+        raise argparse.ArgumentTypeError(f"Invalid scale: {text} (examples: 500K, 10M, 1B)")
+    return int(float(match.group(1)) * {"": 1, "K": 10**3, "M": 10**6, "B": 10**9}[match.group(2)])
+
+
+def scale_label(rows: int) -> str:
+    for suffix, size in (("B", 10**9), ("M", 10**6), ("K", 10**3)):
+        if rows >= size and rows % size == 0:
+            return f"{rows // size}{suffix}"
+    return str(rows)
+
+
+def sql_list(values: List[str]) -> str:
+    return "[" + ", ".join(f"'{v}'" for v in values) + "]"
+
+
+def epoch_us(value: datetime) -> int:
+    return (value - datetime(1970, 1, 1)) // timedelta(microseconds=1)
+
+
+def generated_rows(lo: int, hi: int, step_lo: int, step_hi: int, info: Dict[str, Any]) -> str:
+    """Rows lo..hi of a step that spreads step_lo..step_hi evenly over the history window."""
+    as_of_us = epoch_us(info["as_of"])
+    start_us = epoch_us(info["as_of"] - timedelta(days=info["days"]))
+    us_per_row = info["days"] * 86_400 * 1_000_000 / (step_hi - step_lo)
+    signal_min, signal_max = SIGNAL_STRENGTH_RANGE
+    zones = [zone_id for _, zone_id, _ in DEFAULT_LAYOUT.zones]
+    readers = [zone_readers[0] for _, _, zone_readers in DEFAULT_LAYOUT.zones]
+    # Timestamps are built as integer microseconds (interval arithmetic is ~20x slower)
+    return f"""
+        SELECT
+            '{DEFAULT_SITE_ID}' AS site_id,
+            printf('BADGE-%04d', CAST(hash(i, 1) % {info['badges']} AS BIGINT) + 1) AS badge_id,
+            CAST(hash(i, 2) % {len(USER_IDS)} AS INTEGER) + 1 AS user_key,
+            CAST(hash(i, 3) % {len(zones)} AS INTEGER) + 1 AS zone_key,
+            {sql_list(USER_IDS)}[user_key] AS user_id,
+            {sql_list(zones)}[zone_key] AS zone_id,
+            {sql_list(readers)}[zone_key] AS reader_id,
+            {signal_min} + CAST(hash(i, 4) % {signal_max - signal_min + 1} AS INTEGER) AS signal_strength,
+            CASE WHEN signal_strength < -80 THEN 'WEAK' WHEN signal_strength < -60 THEN 'MEDIUM'
+                 ELSE 'STRONG' END AS signal_quality,
+            upper({sql_list(DIRECTIONS)}[CAST(hash(i, 5) % {len(DIRECTIONS)} AS INTEGER) + 1]) AS direction,
+            hash(i, 6) % 100 = 0 AS is_duplicate,
+            {start_us} + CAST((i - {step_lo})::DOUBLE * {us_per_row!r}::DOUBLE AS BIGINT) AS ingestion_us,
+            least(ingestion_us + CAST(hash(i, 8) % 60 + 1 AS BIGINT) * 1000000, {as_of_us}) AS staging_us,
+            make_timestamp(ingestion_us) AS ingestion_time,
+            make_timestamp(ingestion_us - CAST(hash(i, 7) % 5000 AS BIGINT) * 1000) AS event_timestamp,
+            make_timestamp(staging_us) AS staging_time,
+            make_timestamp(least(staging_us + CAST(hash(i, 9) % 60 + 1 AS BIGINT) * 1000000,
+                                 {as_of_us})) AS fact_load_time
+        FROM range({lo}, {hi}) r(i)
+    """
+
+
+def insert_rows(con, rows_sql: str):
+    con.execute(f"""
+        INSERT INTO RAW_INGESTION.RAW_BADGE_EVENTS
+        SELECT site_id, badge_id, user_id, zone_id, reader_id, event_timestamp, signal_strength,
+               signal_quality, direction, ingestion_time, NULL
+        FROM ({rows_sql})
+    """)
+    con.execute(f"""
+        INSERT INTO STAGING_LAYER.STG_BADGE_EVENTS
+        SELECT site_id, badge_id, user_id, zone_id, reader_id, event_timestamp, signal_strength,
+               signal_quality, direction, ingestion_time, staging_time
+        FROM ({rows_sql})
+        WHERE NOT is_duplicate
+    """)
+    restricted = ", ".join(f"'{z}'" for z in sorted(RESTRICTED_ZONES))
+    con.execute(f"""
+        INSERT INTO ANALYTICS_LAYER.FCT_ACCESS_EVENTS
+        SELECT user_key, zone_key, site_id, badge_id, reader_id, event_timestamp,
+               CAST(event_timestamp AS DATE), hour(event_timestamp), dayofweek(event_timestamp),
+               direction, signal_strength, signal_quality,
+               zone_id IN ({restricted}),
+               hour(event_timestamp) < 6 OR hour(event_timestamp) >= 22,
+               dayofweek(event_timestamp) IN (0, 6),
+               ingestion_time, fact_load_time
+        FROM ({rows_sql})
+        WHERE NOT is_duplicate
+    """)
+
+
+def rebuild_state_tables(con, as_of: datetime):
+    """Rebuild what the tasks maintain incrementally: occupancy state and hourly DQ counters."""
+    now = f"TIMESTAMP '{as_of:%Y-%m-%d %H:%M:%S}'"
+    con.execute("DELETE FROM ANALYTICS_LAYER.BADGE_OCCUPANCY_STATE")
+    con.execute(f"""
+        INSERT INTO ANALYTICS_LAYER.BADGE_OCCUPANCY_STATE
+        WITH latest AS (
+            SELECT
+                badge_id,
+                arg_max(user_key, event_timestamp) AS user_key,
+                arg_max(zone_key, event_timestamp) AS zone_key,
+                arg_max(direction, event_timestamp) AS last_direction,
+                max(event_timestamp) AS last_event_timestamp,
+                max(event_date) AS event_count_date,
+                count_if(event_date = CAST({now} AS DATE)) AS event_count_today
+            FROM ANALYTICS_LAYER.FCT_ACCESS_EVENTS
+            GROUP BY badge_id
+        )
+        SELECT l.badge_id, l.user_key, z.zone_id AS current_zone_id,
+               l.last_direction = 'ENTRY' AS is_inside, l.last_direction, l.last_event_timestamp,
+               l.event_count_date, l.event_count_today, {now} AS updated_time
+        FROM latest l
+        LEFT JOIN ANALYTICS_LAYER.DIM_ZONES z ON l.zone_key = z.zone_key
+    """)
+    con.execute("DELETE FROM ANALYTICS_LAYER.DATA_QUALITY_HOURLY")
+    con.execute(f"""
+        INSERT INTO ANALYTICS_LAYER.DATA_QUALITY_HOURLY
+        WITH raw AS (
+            SELECT date_trunc('hour', ingestion_time) AS metric_hour, count(*) AS raw_event_count,
+                   count_if(signal_quality = 'WEAK') AS weak_signal_count
+            FROM RAW_INGESTION.RAW_BADGE_EVENTS GROUP BY 1
+        ),
+        stg AS (
+            SELECT date_trunc('hour', ingestion_time) AS metric_hour, count(*) AS staged_event_count
+            FROM STAGING_LAYER.STG_BADGE_EVENTS GROUP BY 1
+        ),
+        fct AS (
+            SELECT date_trunc('hour', ingestion_time) AS metric_hour, count(*) AS fact_event_count
+            FROM ANALYTICS_LAYER.FCT_ACCESS_EVENTS GROUP BY 1
+        )
+        SELECT metric_hour, raw_event_count, weak_signal_count,
+               raw_event_count - COALESCE(staged_event_count, 0) AS duplicate_count,
+               COALESCE(staged_event_count, 0) AS staged_event_count,
+               0 AS orphan_user_count, 0 AS orphan_zone_count,
+               COALESCE(fact_event_count, 0) AS fact_event_count, {now} AS updated_time
+        FROM raw LEFT JOIN stg USING (metric_hour) LEFT JOIN fct USING (metric_hour)
+    """)
+
+
+def open_database(path: Path, fresh: bool, days: int, badges: int):
+    """Open (or create) the scale database; returns (connection, info)."""
+    if fresh:
+        for stale in (path, path.with_name(path.name + ".wal")):
+            stale.unlink(missing_ok=True)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    con = duckdb.connect(str(path))
+    raw_columns = {name for (name,) in con.execute(
+        "SELECT column_name FROM information_schema.columns "
+        "WHERE table_schema = 'RAW_INGESTION' AND table_name = 'RAW_BADGE_EVENTS'"
+    ).fetchall()}
+    if raw_columns and "site_id" not in raw_columns:
+        con.close()
+        raise SystemExit(f"{path} was built before site_id was added; pass --fresh")
+    con.execute(SCHEMA_DDL)
+
+    row = con.execute("SELECT as_of, days, badges FROM main.scale_test_info").fetchone()
+    if row is None:
+        as_of = datetime.now().replace(minute=0, second=0, microsecond=0)
+        con.execute("INSERT INTO main.scale_test_info VALUES (?, ?, ?)", [as_of, days, badges])
+        con.executemany("INSERT INTO ANALYTICS_LAYER.DIM_USERS VALUES (?, ?, ?, TRUE)",
+                        [[i + 1, user_id, user_id] for i, user_id in enumerate(USER_IDS)])
+        con.execute("INSERT INTO ANALYTICS_LAYER.DIM_SITES VALUES (1, ?, 'Headquarters', TRUE)", [DEFAULT_SITE_ID])
+        con.executemany("INSERT INTO ANALYTICS_LAYER.DIM_ZONES VALUES (?, ?, ?, ?, ?)",
+                        [[i + 1, zone_id, site_id, readers[0], zone_id in RESTRICTED_ZONES]
+                         for i, (site_id, zone_id, readers) in enumerate(DEFAULT_LAYOUT.zones)])
+        row = (as_of, days, badges)
+    elif (row[1], row[2]) != (days, badges):
+        con.close()
+        raise SystemExit(f"{path} was built with --days {row[1]} --badges {row[2]}; "
+                         f"pass those or --fresh")
+
+    info = {"as_of": row[0], "days": row[1], "badges": row[2]}
+    for name, ddl in load_view_sql(info["as_of"]).items():
+        con.execute(ddl)
+    return con, info
+
+
+def grow_to(con, info: Dict[str, Any], target: int) -> float:
+    """Append synthetic rows until RAW_BADGE_EVENTS holds target rows; returns seconds spent."""
+    current = con.execute("SELECT count(*) FROM RAW_INGESTION.RAW_BADGE_EVENTS").fetchone()[0]
+    if current >= target:
+        return 0.0
+    started = time.perf_counter()
+    for lo in range(current, target, CHUNK_ROWS):
+        hi = min(lo + CHUNK_ROWS, target)
+        print(f"  generating rows {lo:,}..{hi:,} of {target:,}", flush=True)
+        insert_rows(con, generated_rows(lo, hi, current, target, info))
+    rebuild_state_tables(con, info["as_of"])
+    con.execute("CHECKPOINT")
+    return time.perf_counter() - started
+
+
+# ============================================================================
+# Measurement
+# ============================================================================
+
+def peak_rss_mb() -> Optional[float]:
+    try:
+        import resource
+    except ImportError:
+        return None  # Windows
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def measure_view(db: Path, view: str, repeat: int, threads: Optional[int], memory_limit: Optional[str]):
+    """Child process: run one view repeat times and print timings as JSON."""
+    con = duckdb.connect(str(db), read_only=True)
+    if threads:
+        con.execute(f"SET threads = {threads}")
+    if memory_limit:
+        con.execute(f"SET memory_limit = '{memory_limit}'")
+    con.execute("USE SNOWFLAKE_EXAMPLE.RAW_INGESTION")
+    baseline_mb = peak_rss_mb()
+
+    timings, rows = [], 0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        rows = len(con.execute(f"SELECT * FROM {view}").fetchall())
+        timings.append((time.perf_counter() - started) * 1000)
+
+    peak_mb = peak_rss_mb()
+    print(json.dumps({
+        "rows": rows,
+        "cold_ms": round(timings[0], 1),
+        "warm_ms": round(statistics.median(timings[1:] or timings), 1),
+        "peak_mb": round(peak_mb - baseline_mb, 1) if peak_mb is not None else None,
+    }))
+
+
+def run_view(db: Path, view: str, args) -> Dict[str, Any]:
+    command = [sys.executable, __file__, "--measure", view, "--db", str(db), "--repeat", str(args.repeat)]
+    if args.threads:
+        command += ["--threads", str(args.threads)]
+    if args.memory_limit:
+        command += ["--memory-limit", args.memory_limit]
+    result = subprocess.run(command, capture_output=True, text=True)
+    if result.returncode != 0:
+        error = (result.stderr.strip().splitlines() or ["failed"])[-1]
+        return {"status": "ERROR", "error": error}
+    return {"status": "OK", **json.loads(result.stdout)}
+
+
+def add_growth(results: List[Dict[str, Any]]):
+    """Growth exponent k per view between consecutive scales (warm_ms ~ rows ** k)."""
+    for previous, current in zip(results, results[1:]):
+        size_ratio = current["raw_rows"] / previous["raw_rows"]
+        for view, result in current["views"].items():
+            before = previous["views"].get(view, {})
+            if result["status"] == "OK" and before.get("status") == "OK" and size_ratio > 1:
+                ratio = max(result["warm_ms"], 0.1) / max(before["warm_ms"], 0.1)
+                result["growth_exponent"] = round(math.log(ratio) / math.log(size_ratio), 2)
+
+
+def compare(results: List[Dict[str, Any]], baseline: List[Dict[str, Any]], max_regression_pct: float) -> List[str]:
+    """Regression messages for views slower (or bigger) than baseline at the same scale."""
+    before_by_scale = {entry["scale"]: entry["views"] for entry in baseline}
+    regressions = []
+    for entry in results:
+        for view, result in entry["views"].items():
+            before = before_by_scale.get(entry["scale"], {}).get(view, {})
+            if result["status"] != "OK":
+                if before.get("status") == "OK":
+                    regressions.append(f"{entry['scale']} {view}: {result['error']}")
+                continue
+            if before.get("status") != "OK":
+                continue
+            change_pct = 100.0 * (result["warm_ms"] - before["warm_ms"]) / max(before["warm_ms"], 1.0)
+            result["baseline_warm_ms"] = before["warm_ms"]
+            result["change_pct"] = round(change_pct, 1)
+            if change_pct > max_regression_pct and result["warm_ms"] - before["warm_ms"] >= MIN_REGRESSION_MS:
+                regressions.append(f"{entry['scale']} {view}: {before['warm_ms']:.1f} ms -> "
+                                   f"{result['warm_ms']:.1f} ms (+{change_pct:.1f}%)")
+            if result["peak_mb"] and before.get("peak_mb"):
+                # Small allocations are noise; only flag growth of 64 MB or more
+                if result["peak_mb"] - before["peak_mb"] >= max(64.0, before["peak_mb"] * max_regression_pct / 100):
+                    regressions.append(f"{entry['scale']} {view}: peak memory {before['peak_mb']:.0f} MB -> "
+                                       f"{result['peak_mb']:.0f} MB")
+    return regressions
+
+
+def print_report(results: List[Dict[str, Any]], info: Dict[str, Any]):
+    print("=" * 92)
+    print(f"Monitoring View Scale Test (DuckDB, {info['days']} days of history, {info['badges']} badges, "
+          f"as of {info['as_of']:%Y-%m-%d %H:%M})")
+    print("=" * 92)
+    print(f"{'Scale':<6} {'View':<24} {'Rows':>6} {'Cold ms':>9} {'Warm ms':>9} {'Peak MB':>8} "
+          f"{'Growth':>7} {'vs base':>8}")
+    for entry in results:
+        for view, r in entry["views"].items():
+            if r["status"] != "OK":
+                print(f"{entry['scale']:<6} {view:<24} ERROR  {r['error']}")
+                continue
+            peak = f"{r['peak_mb']:.0f}" if r["peak_mb"] is not None else "n/a"
+            growth = f"n^{r['growth_exponent']:.2f}" if "growth_exponent" in r else ""
+            change = f"{r['change_pct']:+.1f}%" if "change_pct" in r else ""
+            print(f"{entry['scale']:<6} {view:<24} {r['rows']:>6} {r['cold_ms']:>9.1f} {r['warm_ms']:>9.1f} "
+                  f"{peak:>8} {growth:>7} {change:>8}")
+        print(f"{'':<6} database {entry['db_mb']:,.0f} MB, generated in {entry['generate_seconds']:.0f} s")
+    print()
+    print("Growth n^k: warm latency grew as rows^k since the previous scale (k ~ 0 = reads")
+    print("recent data or state tables only, k ~ 1 = scans all history).")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Latency and memory of the monitoring views at 10M-1B rows")
+    parser.add_argument("--scales", nargs="+", type=parse_scale, default=[parse_scale(s) for s in DEFAULT_SCALES],
+                        help="Raw row counts to test, e.g. 1M 10M 100M 1B (default: 10M 100M 1B)")
+    parser.add_argument("--views", nargs="+", choices=VIEWS, default=VIEWS, help="Views to run (default: all)")
+    parser.add_argument("--days", type=int, default=90, help="Days of history the rows are spread over")
+    parser.add_argument("--badges", type=int, default=len(BADGE_IDS), help="Distinct badges (default: simulator pool)")
+    parser.add_argument("--db", type=Path, default=DEFAULT_DB,
+                        help="DuckDB file, named SNOWFLAKE_EXAMPLE so three-part names resolve "
+                             "(default: sfe_scale_test/ in the system temp directory)")
+    parser.add_argument("--fresh", action="store_true", help="Delete the database and start over")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per view (first = cold)")
+    parser.add_argument("--threads", type=int, help="DuckDB threads per view run")
+    parser.add_argument("--memory-limit", help="DuckDB memory_limit per view run, e.g. 4GB")
+    parser.add_argument("--json", type=Path, help="Write results to this JSON file")
+    parser.add_argument("--baseline", type=Path, help="Compare against a previous --json result")
+    parser.add_argument("--max-regression-pct", type=float, default=25.0,
+                        help="Fail when a view's warm latency grows more than this vs baseline")
+    parser.add_argument("--measure", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if duckdb is None:
+        print("ERROR: duckdb is not installed. Install it with: pip install duckdb")
+        sys.exit(1)
+    if args.db.stem != "SNOWFLAKE_EXAMPLE":
+        parser.error("--db file must be named SNOWFLAKE_EXAMPLE.duckdb (the view SQL uses that catalog name)")
+
+    if args.measure:
+        measure_view(args.db, args.measure, args.repeat, args.threads, args.memory_limit)
+        return
+
+    con, info = open_database(args.db, args.fresh, args.days, args.badges)
+    results = []
+    for target in sorted(set(args.scales)):
+        print(f"Scale {scale_label(target)}:", flush=True)
+        generate_seconds = grow_to(con, info, target)
+        raw_rows = con.execute("SELECT count(*) FROM RAW_INGESTION.RAW_BADGE_EVENTS").fetchone()[0]
+        if raw_rows > target:
+            print(f"  skipped: {args.db} already holds {raw_rows:,} rows (use --fresh)")
+            continue
+        con.execute("CHECKPOINT")
+        con.close()  # The view runs open the file read-only
+        results.append({
+            "scale": scale_label(target),
+            "raw_rows": raw_rows,
+            "db_mb": round(args.db.stat().st_size / 1024 / 1024, 1),
+            "generate_seconds": round(generate_seconds, 1),
+            "views": {view: run_view(args.db, view, args) for view in args.views},
+        })
+        con = duckdb.connect(str(args.db))
+    con.close()
+
+    add_growth(results)
+    regressions = []
+    if args.baseline:
+        regressions = compare(results, json.loads(args.baseline.read_text()), args.max_regression_pct)
+
+    print_report(results, info)
+
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2, default=str))
+        print(f"\nResults written to {args.json}")
+
+    failed = [f"{e['scale']} {v}: {r['error']}" for e in results for v, r in e["views"].items() if r["status"] != "OK"]
+    if regressions or failed:
+        print("\nREGRESSIONS:" if regressions else "\nERRORS:")
+        for message in regressions or failed:
+            print(f"  {message}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()